@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class FilesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "archivos"
+
+    def ready(self):
+        from . import signals  # noqa: F401
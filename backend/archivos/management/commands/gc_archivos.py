@@ -0,0 +1,41 @@
+"""
+Management command to garbage-collect unreferenced file contents
+Usage: python manage.py gc_archivos [--grace-hours 24] [--recount] [--dry-run]
+"""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from archivos.models import Archivo, ArchivoContenido
+from archivos.storage import recolectar_huerfanos
+
+
+class Command(BaseCommand):
+    help = 'Delete stored file contents no longer referenced by any Archivo'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--grace-hours', type=int, default=24,
+                            help='Only delete contents unreferenced for at least this many hours')
+        parser.add_argument('--recount', action='store_true',
+                            help='Recompute reference counts from the archivo table before collecting')
+        parser.add_argument('--dry-run', action='store_true', help='Report what would be deleted without deleting')
+
+    def handle(self, *args, **options):
+        if options['recount']:
+            referencias = Archivo.objects.filter(aco_id=OuterRef('pk')).values('aco_id').annotate(total=Count('*')).values('total')
+            corregidos = ArchivoContenido.objects.exclude(
+                aco_referencias=Coalesce(Subquery(referencias), 0)
+            ).update(aco_referencias=Coalesce(Subquery(referencias), 0), aco_fecha_hora=timezone.now())
+            self.stdout.write(f'Reference counts corrected: {corregidos}')
+
+        eliminados = recolectar_huerfanos(timedelta(hours=options['grace_hours']), dry_run=options['dry_run'])
+
+        self.stdout.write(self.style.SUCCESS('=' * 60))
+        self.stdout.write(self.style.SUCCESS(
+            f"{'Would delete' if options['dry_run'] else 'Deleted'} {len(eliminados)} unreferenced contents"
+        ))
+        self.stdout.write(self.style.SUCCESS('=' * 60))
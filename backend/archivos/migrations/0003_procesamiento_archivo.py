@@ -0,0 +1,48 @@
+# Generated by Django 5.2.8 on 2026-10-18 10:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('archivos', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivo',
+            name='arc_hash',
+            field=models.CharField(blank=True, db_index=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='archivo',
+            name='arc_tamano',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='archivo',
+            name='arc_mime',
+            field=models.CharField(blank=True, max_length=100, null=True),
+        ),
+        migrations.AddField(
+            model_name='archivo',
+            name='arc_estado_proceso',
+            field=models.CharField(choices=[('pendiente', 'Pendiente'), ('procesado', 'Procesado'), ('rechazado', 'Rechazado'), ('error', 'Error')], default='pendiente', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='archivo',
+            name='arc_paginas',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='archivo',
+            name='arc_ruta_miniatura',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='archivo',
+            name='arc_detalle_proceso',
+            field=models.TextField(blank=True, null=True),
+        ),
+    ]
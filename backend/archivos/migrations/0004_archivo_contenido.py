@@ -0,0 +1,40 @@
+# Generated by Django 5.2.8 on 2026-10-18 10:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('archivos', '0003_procesamiento_archivo'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivoContenido',
+            fields=[
+                ('aco_id', models.AutoField(primary_key=True, serialize=False)),
+                ('aco_hash', models.CharField(max_length=64, unique=True)),
+                ('aco_ruta', models.TextField()),
+                ('aco_tamano', models.BigIntegerField()),
+                ('aco_referencias', models.IntegerField(default=0)),
+                ('aco_fecha_hora', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Contenido de Archivo',
+                'verbose_name_plural': 'Contenidos de Archivos',
+                'db_table': 'archivo_contenido',
+            },
+        ),
+        migrations.AddField(
+            model_name='archivo',
+            name='aco_id',
+            field=models.ForeignKey(blank=True, db_column='aco_id', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='archivos', to='archivos.archivocontenido'),
+        ),
+        migrations.AddField(
+            model_name='archivo',
+            name='arc_nombre_original',
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+    ]
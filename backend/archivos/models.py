@@ -4,6 +4,36 @@ from cursos.models import CursoSeccion
 from maestros.models import TipoArchivo
 from personas.models import Persona
 
+ESTADO_PROCESO_CHOICES = [
+    ('pendiente', 'Pendiente'),
+    ('procesado', 'Procesado'),
+    ('rechazado', 'Rechazado'),
+    ('error', 'Error'),
+]
+
+# Tabla: archivo_contenido (almacenamiento direccionado por contenido)
+class ArchivoContenido(models.Model):
+    # aco_id: Identificador único del contenido (clave primaria)
+    aco_id = models.AutoField(primary_key=True)
+    # aco_hash: SHA-256 del contenido; un mismo contenido se guarda una sola vez
+    aco_hash = models.CharField(max_length=64, unique=True)
+    # aco_ruta: Ruta del archivo en el storage (derivada del hash)
+    aco_ruta = models.TextField()
+    # aco_tamano: Tamaño en bytes
+    aco_tamano = models.BigIntegerField()
+    # aco_referencias: Cantidad de registros Archivo que usan este contenido
+    aco_referencias = models.IntegerField(default=0)
+    # aco_fecha_hora: Último cambio de referencias (período de gracia del GC)
+    aco_fecha_hora = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'archivo_contenido'
+        verbose_name = 'Contenido de Archivo'
+        verbose_name_plural = 'Contenidos de Archivos'
+
+    def __str__(self):
+        return f"{self.aco_hash} ({self.aco_referencias} referencias)"
+
 # Tabla: archivo
 class Archivo(models.Model):
     # arc_id: Identificador único del archivo (clave primaria)
@@ -20,8 +50,26 @@ class Archivo(models.Model):
     arc_descripcion = models.CharField(max_length=100)
     # arc_ruta: Ruta completa al archivo en el sistema
     arc_ruta = models.TextField()
+    # aco_id: Clave foránea al contenido almacenado (nullable para archivos anteriores)
+    aco_id = models.ForeignKey(ArchivoContenido, on_delete=models.PROTECT, db_column='aco_id', null=True, blank=True, related_name='archivos')
+    # arc_nombre_original: Nombre del archivo subido (para la descarga)
+    arc_nombre_original = models.CharField(max_length=255, null=True, blank=True)
     # arc_vigente: Indica si el archivo está activo (True) o inactivo (False)
     arc_vigente = models.BooleanField()
+    # arc_hash: SHA-256 del contenido, calculado mientras se recibe la subida
+    arc_hash = models.CharField(max_length=64, null=True, blank=True, db_index=True)
+    # arc_tamano: Tamaño del archivo en bytes
+    arc_tamano = models.BigIntegerField(null=True, blank=True)
+    # arc_mime: Tipo de contenido (informado por el cliente y confirmado al procesar)
+    arc_mime = models.CharField(max_length=100, null=True, blank=True)
+    # arc_estado_proceso: Estado del procesamiento en segundo plano
+    arc_estado_proceso = models.CharField(max_length=20, choices=ESTADO_PROCESO_CHOICES, default='pendiente')
+    # arc_paginas: Cantidad de páginas (sólo PDF)
+    arc_paginas = models.IntegerField(null=True, blank=True)
+    # arc_ruta_miniatura: Ruta a la miniatura (sólo imágenes)
+    arc_ruta_miniatura = models.TextField(null=True, blank=True)
+    # arc_detalle_proceso: Motivo de rechazo del escáner o error de procesamiento
+    arc_detalle_proceso = models.TextField(null=True, blank=True)
 
     class Meta:
         db_table = 'archivo'
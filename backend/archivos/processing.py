@@ -0,0 +1,88 @@
+"""
+Post-procesamiento de archivos subidos (se ejecuta en el worker de Celery)
+- Escáneres configurables (ARCHIVO_SCANNERS), p. ej. un antivirus
+- Miniatura para imágenes (Pillow)
+- Conteo de páginas para PDF
+"""
+import io
+import re
+
+from PIL import Image, UnidentifiedImageError
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.utils.module_loading import import_string
+
+from .storage import contenido_storage, ruta_miniatura
+
+CHUNK_SIZE = 1024 * 1024
+PDF_PAGE_RE = re.compile(rb'/Type\s{0,8}/Page(?![A-Za-z])')
+PDF_TAIL = 32
+
+
+# Imágenes que no se pueden procesar: reintentar no cambia el resultado
+IMAGEN_INVALIDA = (Image.DecompressionBombError, UnidentifiedImageError)
+
+
+class ErrorEscaner(Exception):
+    """Un escáner falló al revisar el archivo (distinto de rechazarlo)"""
+
+
+def get_scanners():
+    return [import_string(path) for path in settings.ARCHIVO_SCANNERS]
+
+
+def escanear(ruta):
+    """Ejecuta los escáneres configurados; retorna el primer motivo de rechazo o None"""
+    for scanner in get_scanners():
+        try:
+            motivo = scanner(ruta)
+        except Exception as exc:
+            raise ErrorEscaner(f'{getattr(scanner, "__name__", scanner)}: {exc}') from exc
+        if motivo:
+            return motivo
+    return None
+
+
+def es_pdf(ruta):
+    with open(ruta, 'rb') as f:
+        return f.read(5) == b'%PDF-'
+
+
+def contar_paginas_pdf(ruta):
+    """
+    Cuenta los objetos /Type /Page leyendo por chunks.
+    Los PDF con object streams comprimidos no exponen esos objetos; en ese
+    caso retorna None en lugar de un conteo incorrecto.
+    """
+    paginas = 0
+    cola = b''
+    with open(ruta, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            buffer = cola + chunk
+            # Las coincidencias dentro de la cola ya se contaron en la vuelta anterior
+            paginas += sum(1 for match in PDF_PAGE_RE.finditer(buffer) if match.end() > len(cola))
+            cola = buffer[-PDF_TAIL:]
+    return paginas or None
+
+
+def abrir_imagen(ruta):
+    """
+    Retorna la imagen Pillow o None si el archivo no es una imagen.
+    Una imagen que excede el límite de píxeles de Pillow lanza DecompressionBombError.
+    """
+    try:
+        return Image.open(ruta)
+    except (UnidentifiedImageError, OSError):
+        return None
+
+
+def generar_miniatura(imagen, nombre):
+    """
+    Guarda una miniatura JPEG de la imagen y retorna su ruta en el storage.
+    El nombre es fijo (se sobrescribe, sin sufijos) para que gc_archivos la encuentre.
+    """
+    miniatura = imagen.convert('RGB')
+    miniatura.thumbnail(settings.ARCHIVO_MINIATURA_TAMANO)
+    buffer = io.BytesIO()
+    miniatura.save(buffer, format='JPEG', quality=85)
+    return contenido_storage.save(ruta_miniatura(nombre), ContentFile(buffer.getvalue()))
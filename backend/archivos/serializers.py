@@ -0,0 +1,46 @@
+from rest_framework import serializers
+from scout_project.fieldsets import DynamicFieldsMixin, expandable
+from cursos.models import CursoSeccion
+from maestros.models import TipoArchivo
+from personas.models import Persona
+from usuarios.permisos import UsuarioActualDefault
+from .models import Archivo, ArchivoCurso, ArchivoPersona
+
+
+@expandable
+class ArchivoSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    class Meta:
+        model = Archivo
+        fields = '__all__'
+        read_only_fields = [
+            'arc_ruta', 'aco_id', 'arc_nombre_original', 'arc_hash', 'arc_tamano', 'arc_mime', 'arc_estado_proceso',
+            'arc_paginas', 'arc_ruta_miniatura', 'arc_detalle_proceso',
+        ]
+
+
+class ArchivoCursoSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    class Meta:
+        model = ArchivoCurso
+        fields = '__all__'
+
+
+class ArchivoPersonaSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    class Meta:
+        model = ArchivoPersona
+        fields = '__all__'
+
+
+class ArchivoSubidaSerializer(serializers.Serializer):
+    archivo = serializers.FileField()
+    tar_id = serializers.PrimaryKeyRelatedField(queryset=TipoArchivo.objects.all())
+    # Autor de la subida: el usuario del token, no un valor del formulario
+    usu_id_crea = serializers.HiddenField(default=UsuarioActualDefault())
+    arc_descripcion = serializers.CharField(max_length=100)
+    # Asociación opcional a una persona (ArchivoPersona) o sección de curso (ArchivoCurso)
+    per_id = serializers.PrimaryKeyRelatedField(queryset=Persona.objects.all(), required=False)
+    cus_id = serializers.PrimaryKeyRelatedField(queryset=CursoSeccion.objects.all(), required=False)
+
+    def validate(self, attrs):
+        if 'per_id' in attrs and 'cus_id' not in attrs:
+            raise serializers.ValidationError({'cus_id': 'Requerido para asociar el archivo a una persona.'})
+        return attrs
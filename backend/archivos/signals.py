@@ -0,0 +1,20 @@
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .models import Archivo
+from .storage import contenido_storage, liberar_contenido
+
+
+@receiver(post_delete, sender=Archivo, dispatch_uid='archivo_liberar_contenido')
+def archivo_eliminado(sender, instance, **kwargs):
+    """
+    Al eliminar un Archivo se resta la referencia a su contenido (el GC borra
+    archivo y miniatura). Los anteriores al almacenamiento por contenido no
+    pasan por el GC: su miniatura se borra al confirmarse la eliminación.
+    """
+    if instance.aco_id_id:
+        liberar_contenido(instance.aco_id_id)
+    elif instance.arc_ruta_miniatura:
+        ruta = instance.arc_ruta_miniatura
+        transaction.on_commit(lambda: contenido_storage.delete(ruta))
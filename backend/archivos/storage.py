@@ -0,0 +1,115 @@
+"""
+Almacenamiento direccionado por contenido para Archivo
+Cada contenido distinto (SHA-256) se guarda una sola vez en
+MEDIA_ROOT/contenidos/ab/cd/<hash> y ArchivoContenido lleva la cuenta de los
+Archivo que lo referencian. Los contenidos sin referencias se eliminan con
+`python manage.py gc_archivos` pasado un período de gracia, junto con su
+miniatura (MEDIA_ROOT/miniaturas/<hash>.jpg).
+
+Las descargas se entregan con X-Accel-Redirect: Django sólo valida permisos y
+nginx envía el archivo desde la location interna /media/.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.db import transaction
+from django.db.models import F
+from django.http import FileResponse, HttpResponse
+from django.utils import timezone
+from django.utils.encoding import iri_to_uri
+from django.utils.http import content_disposition_header
+
+from .models import ArchivoContenido
+
+MAX_INTENTOS = 3
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    El nombre es el hash, por lo que dos escrituras del mismo nombre tienen
+    el mismo contenido y sobrescribir es seguro (nunca agrega sufijos).
+    """
+    def __init__(self, **kwargs):
+        kwargs.setdefault('allow_overwrite', True)
+        super().__init__(**kwargs)
+
+
+contenido_storage = ContentAddressedStorage()
+
+
+def ruta_contenido(sha256):
+    return f'contenidos/{sha256[:2]}/{sha256[2:4]}/{sha256}'
+
+
+def ruta_miniatura(nombre):
+    """Ruta fija de la miniatura: el GC la ubica por el hash del contenido"""
+    return f'miniaturas/{nombre}.jpg'
+
+
+def registrar_contenido(subida, sha256):
+    """
+    Retorna el ArchivoContenido del hash con una referencia más, guardando el
+    archivo sólo si el contenido no existía.
+    """
+    for _ in range(MAX_INTENTOS):
+        contenido = ArchivoContenido.objects.filter(aco_hash=sha256).first()
+        if contenido is None:
+            ruta = contenido_storage.save(ruta_contenido(sha256), subida)
+            contenido, _ = ArchivoContenido.objects.get_or_create(
+                aco_hash=sha256, defaults={'aco_ruta': ruta, 'aco_tamano': subida.size}
+            )
+        # Si el GC eliminó la fila entre la lectura y el UPDATE se vuelve a crear
+        if ArchivoContenido.objects.filter(pk=contenido.pk).update(
+            aco_referencias=F('aco_referencias') + 1, aco_fecha_hora=timezone.now()
+        ):
+            return contenido
+    raise RuntimeError(f'No fue posible registrar el contenido {sha256}')
+
+
+def liberar_contenido(contenido_id):
+    """Resta una referencia; el archivo queda para el GC"""
+    ArchivoContenido.objects.filter(pk=contenido_id, aco_referencias__gt=0).update(
+        aco_referencias=F('aco_referencias') - 1, aco_fecha_hora=timezone.now()
+    )
+
+
+def recolectar_huerfanos(gracia=timedelta(hours=24), dry_run=False):
+    """
+    Elimina contenidos sin referencias más antiguos que el período de gracia
+    y sus miniaturas.
+    El archivo se borra dentro de la transacción, con la fila bloqueada, para
+    que una subida concurrente del mismo contenido espere y lo vuelva a escribir.
+    """
+    limite = timezone.now() - gracia
+    eliminados = []
+    huerfanos = ArchivoContenido.objects.filter(aco_referencias=0, aco_fecha_hora__lt=limite)
+    for contenido_id in huerfanos.values_list('aco_id', flat=True).iterator():
+        if dry_run:
+            eliminados.append(contenido_id)
+            continue
+        with transaction.atomic():
+            contenido = ArchivoContenido.objects.select_for_update().filter(
+                pk=contenido_id, aco_referencias=0, aco_fecha_hora__lt=limite
+            ).first()
+            if contenido is None:
+                continue
+            contenido_storage.delete(contenido.aco_ruta)
+            contenido_storage.delete(ruta_miniatura(contenido.aco_hash))
+            contenido.delete()
+            eliminados.append(contenido_id)
+    return eliminados
+
+
+def servir_archivo(ruta, nombre, content_type=None):
+    """
+    Respuesta de descarga: X-Accel-Redirect hacia nginx o, sin nginx
+    (ARCHIVO_X_ACCEL=False), el archivo transmitido por Django.
+    """
+    if settings.ARCHIVO_X_ACCEL:
+        response = HttpResponse(content_type=content_type or 'application/octet-stream')
+        response['X-Accel-Redirect'] = iri_to_uri(settings.ARCHIVO_X_ACCEL_PREFIX + ruta)
+    else:
+        response = FileResponse(default_storage.open(ruta, 'rb'), content_type=content_type)
+    response['Content-Disposition'] = content_disposition_header(True, nombre)
+    return response
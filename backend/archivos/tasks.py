@@ -0,0 +1,45 @@
+import logging
+
+from celery import shared_task
+from django.core.files.storage import default_storage
+
+from .models import Archivo
+from . import processing
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=30)
+def procesar_archivo(self, arc_id):
+    """Escanea el archivo y genera su miniatura o conteo de páginas"""
+    archivo = Archivo.objects.filter(pk=arc_id).first()
+    if archivo is None:
+        return
+    ruta = default_storage.path(archivo.arc_ruta)
+    cambios = {'arc_estado_proceso': 'procesado'}
+    try:
+        motivo = processing.escanear(ruta)
+        if motivo:
+            cambios = {'arc_estado_proceso': 'rechazado', 'arc_detalle_proceso': motivo}
+        elif processing.es_pdf(ruta):
+            cambios.update(arc_mime='application/pdf', arc_paginas=processing.contar_paginas_pdf(ruta))
+        else:
+            imagen = processing.abrir_imagen(ruta)
+            if imagen is not None:
+                with imagen:
+                    cambios.update(
+                        arc_mime=imagen.get_format_mimetype(),
+                        arc_ruta_miniatura=processing.generar_miniatura(imagen, archivo.arc_hash or str(arc_id)),
+                    )
+    except processing.IMAGEN_INVALIDA as exc:
+        cambios = {'arc_estado_proceso': 'error', 'arc_detalle_proceso': f'Imagen no procesable: {exc}'}
+    except (OSError, processing.ErrorEscaner) as exc:
+        # Fallas de disco o de un escáner externo pueden ser transitorias
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=exc)
+        cambios = {'arc_estado_proceso': 'error', 'arc_detalle_proceso': str(exc)}
+    except Exception as exc:
+        # Cualquier otra falla deja el archivo en error en vez de 'pendiente' para siempre
+        logger.exception('Error procesando el archivo %s', arc_id)
+        cambios = {'arc_estado_proceso': 'error', 'arc_detalle_proceso': str(exc)}
+    Archivo.objects.filter(pk=arc_id).update(**cambios)
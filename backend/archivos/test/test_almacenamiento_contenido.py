@@ -0,0 +1,113 @@
+import io
+from datetime import timedelta
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.utils import timezone
+from PIL import Image
+
+from archivos.models import Archivo, ArchivoContenido
+from archivos.tasks import procesar_archivo
+
+
+def _subir(usuario_client, contenido, tipo_archivo, usuario, nombre='ficha.txt'):
+    response = usuario_client.post('/api/archivos/archivos/subir/', {
+        'archivo': SimpleUploadedFile(nombre, contenido),
+        'tar_id': tipo_archivo.pk,
+        'arc_descripcion': nombre,
+    }, format='multipart')
+    assert response.status_code == 202
+    return Archivo.objects.get(pk=response.json()['arc_id'])
+
+
+@pytest.mark.django_db
+def test_mismo_contenido_se_guarda_una_vez(usuario_client, media, tipo_archivo, usuario, monkeypatch):
+    encolados = []
+    monkeypatch.setattr(procesar_archivo, 'delay', encolados.append)
+
+    primero = _subir(usuario_client, b'plantilla medica', tipo_archivo, usuario, 'a.txt')
+    Archivo.objects.filter(pk=primero.pk).update(arc_estado_proceso='procesado', arc_mime='text/plain')
+    segundo = _subir(usuario_client, b'plantilla medica', tipo_archivo, usuario, 'b.txt')
+
+    contenido = ArchivoContenido.objects.get()
+    assert contenido.aco_referencias == 2
+    assert primero.aco_id == segundo.aco_id == contenido
+    assert [p.name for p in media.rglob('*') if p.is_file()] == [contenido.aco_hash]
+    # El duplicado reutiliza el procesamiento y no se vuelve a encolar
+    assert segundo.arc_estado_proceso == 'procesado'
+    assert segundo.arc_nombre_original == 'b.txt'
+
+
+@pytest.mark.django_db
+def test_gc_elimina_contenidos_sin_referencias(usuario_client, media, tipo_archivo, usuario):
+    archivo = _subir(usuario_client, b'foto carnet', tipo_archivo, usuario)
+    conservado = _subir(usuario_client, b'otro', tipo_archivo, usuario)
+    ruta = media / archivo.arc_ruta
+
+    archivo.delete()
+    contenido = ArchivoContenido.objects.get(aco_hash=archivo.arc_hash)
+    assert contenido.aco_referencias == 0
+
+    call_command('gc_archivos')
+    assert ruta.exists()  # dentro del período de gracia
+
+    ArchivoContenido.objects.filter(pk=contenido.pk).update(aco_fecha_hora=timezone.now() - timedelta(days=2))
+    call_command('gc_archivos')
+
+    assert not ruta.exists()
+    assert list(ArchivoContenido.objects.values_list('aco_id', flat=True)) == [conservado.aco_id_id]
+
+
+@pytest.mark.django_db
+def test_gc_elimina_la_miniatura_del_contenido(usuario_client, media, tipo_archivo, usuario):
+    buffer = io.BytesIO()
+    Image.new('RGB', (400, 300), 'blue').save(buffer, format='PNG')
+    archivo = _subir(usuario_client, buffer.getvalue(), tipo_archivo, usuario, 'foto.png')
+    procesar_archivo.apply(args=[archivo.pk])
+    archivo.refresh_from_db()
+    miniatura = media / archivo.arc_ruta_miniatura
+    assert archivo.arc_ruta_miniatura == f'miniaturas/{archivo.arc_hash}.jpg' and miniatura.exists()
+
+    archivo.delete()
+    ArchivoContenido.objects.update(aco_fecha_hora=timezone.now() - timedelta(days=2))
+    call_command('gc_archivos')
+
+    assert not miniatura.exists()
+    assert not any(p.is_file() for p in media.rglob('*'))
+
+
+@pytest.mark.django_db
+def test_recount_corrige_referencias(usuario_client, media, tipo_archivo, usuario):
+    archivo = _subir(usuario_client, b'contenido', tipo_archivo, usuario)
+    ArchivoContenido.objects.update(aco_referencias=5)
+
+    call_command('gc_archivos', '--recount', '--dry-run')
+
+    assert ArchivoContenido.objects.get(pk=archivo.aco_id_id).aco_referencias == 1
+
+
+@pytest.mark.django_db
+def test_descarga_con_x_accel_redirect(usuario_client, media, tipo_archivo, usuario, settings):
+    settings.ARCHIVO_X_ACCEL = True
+    archivo = _subir(usuario_client, b'%PDF-1.4 ficha', tipo_archivo, usuario, 'ficha médica.pdf')
+
+    response = usuario_client.get(f'/api/archivos/archivos/{archivo.pk}/descargar/')
+
+    assert response.status_code == 200
+    assert response['X-Accel-Redirect'] == f'/media/{archivo.arc_ruta}'
+    assert response.content == b''
+    # nginx conserva este header en /media/ y no agrega uno propio
+    assert response['Content-Disposition'].startswith('attachment;')
+    assert "filename*=utf-8''ficha%20m%C3%A9dica.pdf" in response['Content-Disposition']
+
+
+@pytest.mark.django_db
+def test_descarga_sin_nginx_transmite_el_archivo(usuario_client, media, tipo_archivo, usuario, settings):
+    settings.ARCHIVO_X_ACCEL = False
+    archivo = _subir(usuario_client, b'contenido', tipo_archivo, usuario)
+
+    response = usuario_client.get(f'/api/archivos/archivos/{archivo.pk}/descargar/')
+
+    assert 'X-Accel-Redirect' not in response
+    assert b''.join(response.streaming_content) == b'contenido'
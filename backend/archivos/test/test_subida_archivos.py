@@ -0,0 +1,143 @@
+import hashlib
+import io
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+
+from archivos import processing, uploads
+from archivos.models import Archivo, ArchivoPersona
+from archivos.tasks import procesar_archivo
+from cursos.models import CursoSeccion
+
+
+def _png():
+    buffer = io.BytesIO()
+    Image.new('RGB', (800, 600), 'red').save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def _pdf(paginas):
+    objetos = b''.join(b'%d 0 obj << /Type /Page /Parent 1 0 R >> endobj\n' % (n + 2) for n in range(paginas))
+    return b'%PDF-1.4\n1 0 obj << /Type /Pages /Count ' + str(paginas).encode() + b' >> endobj\n' + objetos + b'%%EOF'
+
+
+def _subir(usuario_client, contenido, nombre, tipo_archivo, usuario, django_capture_on_commit_callbacks, **extra):
+    with django_capture_on_commit_callbacks() as callbacks:
+        response = usuario_client.post('/api/archivos/archivos/subir/', {
+            'archivo': SimpleUploadedFile(nombre, contenido),
+            'tar_id': tipo_archivo.pk,
+            'arc_descripcion': nombre,
+            **extra,
+        }, format='multipart')
+    return response, callbacks
+
+
+@pytest.mark.django_db
+def test_subida_calcula_hash_y_encola_procesamiento(usuario_client, media, tipo_archivo, usuario, persona, curso,
+                                                    django_capture_on_commit_callbacks, monkeypatch):
+    seccion = CursoSeccion.objects.create(cur_id=curso, cus_seccion=1, cus_cant_participante=10)
+    encolados = []
+    monkeypatch.setattr(procesar_archivo, 'delay', encolados.append)
+    hash_en_subida = []
+    monkeypatch.setattr('archivos.views.calcular_hash',
+                        lambda f: hash_en_subida.append(getattr(f, 'sha256', None)) or uploads.calcular_hash(f))
+    contenido = _png()
+
+    response, callbacks = _subir(usuario_client, contenido, 'foto.png', tipo_archivo, usuario,
+                                 django_capture_on_commit_callbacks, per_id=persona.pk, cus_id=seccion.pk)
+
+    assert response.status_code == 202
+    data = response.json()
+    assert data['arc_hash'] == hashlib.sha256(contenido).hexdigest()
+    # El hash se calculó mientras se recibían los chunks, sin releer el archivo
+    assert hash_en_subida == [data['arc_hash']]
+    assert data['arc_tamano'] == len(contenido)
+    assert data['arc_estado_proceso'] == 'pendiente'
+    assert data['usu_id_crea'] == usuario.pk
+    assert (media / data['arc_ruta']).read_bytes() == contenido
+    assert ArchivoPersona.objects.filter(arc_id=data['arc_id'], per_id=persona).exists()
+    # La tarea se encola sólo al confirmar la transacción, no dentro del request
+    assert encolados == []
+    for callback in callbacks:
+        callback()
+    assert encolados == [data['arc_id']]
+
+
+@pytest.mark.django_db
+def test_procesar_imagen_genera_miniatura(usuario_client, media, tipo_archivo, usuario, django_capture_on_commit_callbacks):
+    response, _ = _subir(usuario_client, _png(), 'foto.png', tipo_archivo, usuario, django_capture_on_commit_callbacks)
+
+    procesar_archivo.apply(args=[response.json()['arc_id']])
+
+    archivo = Archivo.objects.get(pk=response.json()['arc_id'])
+    assert archivo.arc_estado_proceso == 'procesado'
+    assert archivo.arc_mime == 'image/png'
+    with Image.open(media / archivo.arc_ruta_miniatura) as miniatura:
+        assert max(miniatura.size) == 256
+
+
+@pytest.mark.django_db
+def test_procesar_pdf_cuenta_paginas(usuario_client, media, tipo_archivo, usuario, django_capture_on_commit_callbacks):
+    response, _ = _subir(usuario_client, _pdf(3), 'ficha.pdf', tipo_archivo, usuario, django_capture_on_commit_callbacks)
+
+    procesar_archivo.apply(args=[response.json()['arc_id']])
+
+    archivo = Archivo.objects.get(pk=response.json()['arc_id'])
+    assert (archivo.arc_mime, archivo.arc_paginas) == ('application/pdf', 3)
+
+
+def test_conteo_pdf_no_duplica_entre_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(processing, 'CHUNK_SIZE', 7)
+    ruta = tmp_path / 'ficha.pdf'
+    ruta.write_bytes(_pdf(5))
+
+    assert processing.contar_paginas_pdf(ruta) == 5
+
+
+@pytest.mark.django_db
+def test_escaner_rechaza_archivo(usuario_client, media, tipo_archivo, usuario, django_capture_on_commit_callbacks,
+                                 monkeypatch):
+    monkeypatch.setattr(processing, 'get_scanners', lambda: [lambda ruta: 'Eicar-Test-Signature'])
+    response, _ = _subir(usuario_client, b'X5O!P%@AP', 'virus.txt', tipo_archivo, usuario,
+                         django_capture_on_commit_callbacks)
+
+    procesar_archivo.apply(args=[response.json()['arc_id']])
+
+    archivo = Archivo.objects.get(pk=response.json()['arc_id'])
+    assert (archivo.arc_estado_proceso, archivo.arc_detalle_proceso) == ('rechazado', 'Eicar-Test-Signature')
+
+
+@pytest.mark.django_db
+def test_imagen_bomba_de_descompresion_queda_en_error(usuario_client, media, tipo_archivo, usuario,
+                                                      django_capture_on_commit_callbacks, monkeypatch):
+    # 800x600 supera el doble del límite: Pillow lanza DecompressionBombError al abrirla
+    monkeypatch.setattr(Image, 'MAX_IMAGE_PIXELS', 1000)
+    response, _ = _subir(usuario_client, _png(), 'bomba.png', tipo_archivo, usuario, django_capture_on_commit_callbacks)
+
+    procesar_archivo.apply(args=[response.json()['arc_id']])
+
+    archivo = Archivo.objects.get(pk=response.json()['arc_id'])
+    assert archivo.arc_estado_proceso == 'error'
+    assert archivo.arc_detalle_proceso.startswith('Imagen no procesable')
+    assert archivo.arc_ruta_miniatura is None
+
+
+@pytest.mark.django_db
+def test_falla_del_escaner_reintenta_y_queda_en_error(usuario_client, media, tipo_archivo, usuario,
+                                                      django_capture_on_commit_callbacks, monkeypatch):
+    llamadas = []
+
+    def escaner_caido(ruta):
+        llamadas.append(ruta)
+        raise RuntimeError('clamd no responde')
+
+    monkeypatch.setattr(processing, 'get_scanners', lambda: [escaner_caido])
+    response, _ = _subir(usuario_client, _png(), 'foto.png', tipo_archivo, usuario, django_capture_on_commit_callbacks)
+
+    procesar_archivo.apply(args=[response.json()['arc_id']])
+
+    archivo = Archivo.objects.get(pk=response.json()['arc_id'])
+    assert len(llamadas) == procesar_archivo.max_retries + 1
+    assert archivo.arc_estado_proceso == 'error'
+    assert archivo.arc_detalle_proceso == 'escaner_caido: clamd no responde'
@@ -0,0 +1,37 @@
+"""
+Manejo de subidas de archivos
+El cuerpo de la petición se escribe por chunks a un archivo temporal en disco
+y el SHA-256 se calcula en el mismo recorrido, por lo que un archivo médico
+grande nunca se carga completo en memoria ni se vuelve a leer para el hash.
+"""
+import hashlib
+
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+
+
+class HashingFileUploadHandler(TemporaryFileUploadHandler):
+    """TemporaryFileUploadHandler que deja el hash en `archivo.sha256`"""
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.hasher = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        self.hasher.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        archivo = super().file_complete(file_size)
+        archivo.sha256 = self.hasher.hexdigest()
+        return archivo
+
+
+def calcular_hash(archivo):
+    """SHA-256 de un archivo subido; usa el calculado en la subida si existe"""
+    sha256 = getattr(archivo, 'sha256', None)
+    if sha256 is None:
+        hasher = hashlib.sha256()
+        for chunk in archivo.chunks():
+            hasher.update(chunk)
+        sha256 = hasher.hexdigest()
+    return sha256
+
@@ -0,0 +1,12 @@
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from .views import ArchivoViewSet, ArchivoCursoViewSet, ArchivoPersonaViewSet
+
+router = DefaultRouter()
+router.register(r'archivos', ArchivoViewSet)
+router.register(r'archivo-cursos', ArchivoCursoViewSet)
+router.register(r'archivo-personas', ArchivoPersonaViewSet)
+
+urlpatterns = [
+    path('', include(router.urls)),
+]
@@ -1,3 +1,100 @@
-from django.shortcuts import render
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from scout_project.metrics import MetricsMixin
+from scout_project.fieldsets import SparseFieldsMixin
+from usuarios.permisos import PermisoAplicacion
+from .models import Archivo, ArchivoCurso, ArchivoPersona
+from .serializers import ArchivoSerializer, ArchivoCursoSerializer, ArchivoPersonaSerializer, ArchivoSubidaSerializer
+from .storage import registrar_contenido, servir_archivo
+from .tasks import procesar_archivo
+from .uploads import calcular_hash
 
-# Create your views here.
+# Resultados del procesamiento que se copian desde un archivo con el mismo contenido
+CAMPOS_PROCESO = ['arc_mime', 'arc_estado_proceso', 'arc_paginas', 'arc_ruta_miniatura', 'arc_detalle_proceso']
+
+
+class ArchivoViewSet(MetricsMixin, SparseFieldsMixin, viewsets.ModelViewSet):
+    queryset = Archivo.objects.all()
+    serializer_class = ArchivoSerializer
+    permission_classes = [IsAuthenticated, PermisoAplicacion]
+    aplicacion = 'archivos'
+
+    @action(detail=False, methods=['post'], url_path='subir', parser_classes=[MultiPartParser])
+    def subir(self, request):
+        """
+        Subida de archivo con procesamiento en segundo plano
+        POST /api/archivos/archivos/subir/
+        Form data: archivo, tar_id, arc_descripcion, per_id y cus_id (opcionales)
+        El archivo queda a nombre del usuario del token.
+        Responde 202: el escaneo, la miniatura y el conteo de páginas quedan en cola.
+        """
+        serializer = ArchivoSubidaSerializer(data=request.data, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        subida = data['archivo']
+
+        sha256 = calcular_hash(subida)
+        with transaction.atomic():
+            # Un contenido ya almacenado no se vuelve a escribir ni a procesar
+            contenido = registrar_contenido(subida, sha256)
+            procesado = Archivo.objects.filter(
+                aco_id=contenido, arc_estado_proceso='procesado'
+            ).values(*CAMPOS_PROCESO).first()
+            archivo = Archivo.objects.create(
+                tar_id=data['tar_id'],
+                usu_id_crea=data['usu_id_crea'],
+                arc_fecha_hora=timezone.now(),
+                arc_descripcion=data['arc_descripcion'],
+                arc_ruta=contenido.aco_ruta,
+                aco_id=contenido,
+                arc_nombre_original=subida.name,
+                arc_vigente=True,
+                arc_hash=sha256,
+                arc_tamano=subida.size,
+                **(procesado or {'arc_mime': subida.content_type}),
+            )
+            if 'cus_id' in data:
+                if 'per_id' in data:
+                    ArchivoPersona.objects.create(arc_id=archivo, per_id=data['per_id'], cus_id=data['cus_id'])
+                else:
+                    ArchivoCurso.objects.create(arc_id=archivo, cus_id=data['cus_id'])
+            if procesado is None:
+                # El worker sólo debe ver el archivo una vez confirmada la transacción
+                transaction.on_commit(lambda: procesar_archivo.delay(archivo.pk))
+        return Response(ArchivoSerializer(archivo).data, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=True, methods=['get'], url_path='descargar')
+    def descargar(self, request, pk=None):
+        """
+        Descarga del archivo (o de su miniatura con ?miniatura=1)
+        GET /api/archivos/archivos/{id}/descargar/
+        En producción nginx entrega el archivo vía X-Accel-Redirect.
+        """
+        archivo = self.get_object()
+        if request.query_params.get('miniatura') in ('1', 'true'):
+            if not archivo.arc_ruta_miniatura:
+                return Response({'error': 'El archivo no tiene miniatura.'}, status=status.HTTP_404_NOT_FOUND)
+            return servir_archivo(archivo.arc_ruta_miniatura, f'miniatura-{archivo.pk}.jpg', 'image/jpeg')
+        if archivo.arc_estado_proceso == 'rechazado':
+            return Response({'error': 'El archivo fue rechazado por el escáner.'}, status=status.HTTP_403_FORBIDDEN)
+        nombre = archivo.arc_nombre_original or archivo.arc_ruta.rsplit('/', 1)[-1]
+        return servir_archivo(archivo.arc_ruta, nombre, archivo.arc_mime)
+
+
+class ArchivoCursoViewSet(MetricsMixin, SparseFieldsMixin, viewsets.ModelViewSet):
+    queryset = ArchivoCurso.objects.all()
+    serializer_class = ArchivoCursoSerializer
+    permission_classes = [IsAuthenticated, PermisoAplicacion]
+    aplicacion = 'archivos'
+
+
+class ArchivoPersonaViewSet(MetricsMixin, SparseFieldsMixin, viewsets.ModelViewSet):
+    queryset = ArchivoPersona.objects.all()
+    serializer_class = ArchivoPersonaSerializer
+    permission_classes = [IsAuthenticated, PermisoAplicacion]
+    aplicacion = 'archivos'
@@ -0,0 +1,159 @@
+"""
+Fixtures compartidas para los tests con base de datos
+"""
+from datetime import datetime, timezone
+from decimal import Decimal
+from itertools import count
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from rest_framework.test import APIClient
+
+from cursos.models import Curso, CursoSeccion
+from geografia.models import Region, Provincia, Comuna
+from maestros.models import Perfil, EstadoCivil, Cargo, TipoCurso, TipoArchivo, Rol, Alimentacion
+from personas.models import Persona, PersonaCurso
+from scout_project.carga import emitir_token
+from scout_project.throttling import get_limiter
+from usuarios.models import Usuario
+from usuarios.permisos import otorgar_todos_los_permisos
+
+
+_sequence = count(1)
+
+
+@pytest.fixture
+def api_client(settings):
+    settings.SECURE_SSL_REDIRECT = False
+    settings.THROTTLE_REDIS_URL = ''
+    cache.clear()
+    get_limiter().clear()
+    return APIClient()
+
+
+@pytest.fixture
+def auth_client(api_client):
+    # Staff: sin JWT, PermisoAplicacion solo deja pasar sesiones de staff
+    api_client.force_authenticate(user=User(username='tester', is_staff=True))
+    return api_client
+
+
+@pytest.fixture
+def usuario_client(api_client, usuario):
+    """Cliente autenticado con el JWT de `usuario`, con todos los permisos de la API"""
+    otorgar_todos_los_permisos(usuario.pel_id)
+    api_client.credentials(HTTP_AUTHORIZATION=f'Bearer {emitir_token(usuario)}')
+    return api_client
+
+
+@pytest.fixture
+def usuario(db):
+    perfil = Perfil.objects.create(pel_descripcion='Administrador', pel_vigente=True)
+    return Usuario.objects.create(
+        pel_id=perfil,
+        usu_username='admin_test',
+        usu_email='admin@test.com',
+        usu_password='!',
+    )
+
+
+@pytest.fixture
+def comuna(db):
+    region = Region.objects.create(reg_descripcion='Metropolitana', reg_vigente=True)
+    provincia = Provincia.objects.create(reg_id=region, pro_descripcion='Santiago', pro_vigente=True)
+    return Comuna.objects.create(pro_id=provincia, com_descripcion='Santiago Centro', com_vigente=True)
+
+
+@pytest.fixture
+def estado_civil(db):
+    return EstadoCivil.objects.create(esc_descripcion='Soltero', esc_vigente=True)
+
+
+@pytest.fixture
+def persona_factory(usuario, comuna, estado_civil):
+    def make_persona(**overrides):
+        n = next(_sequence)
+        fields = {
+            'esc_id': estado_civil,
+            'com_id': comuna,
+            'usu_id': usuario,
+            'per_run': 10000000 + n,
+            'per_dv': '0',
+            'per_apelpat': 'Pérez',
+            'per_nombres': f'Persona {n}',
+            'per_email': f'persona{n}@test.com',
+            'per_fecha_nac': datetime(1990, 1, 1, tzinfo=timezone.utc),
+            'per_direccion': 'Calle 123',
+            'per_tipo_fono': 2,
+            'per_fono': '912345678',
+            'per_apodo': f'P{n}',
+            'per_vigente': True,
+        }
+        fields.update(overrides)
+        return Persona.objects.create(**fields)
+    return make_persona
+
+
+@pytest.fixture
+def persona(persona_factory):
+    return persona_factory()
+
+
+@pytest.fixture
+def curso_factory(usuario, persona, comuna):
+    tipo_curso = TipoCurso.objects.create(tcu_descripcion='Formación Básica', tcu_tipo=1, tcu_vigente=True)
+    cargo = Cargo.objects.create(car_descripcion='Director', car_vigente=True)
+
+    def make_curso(**overrides):
+        n = next(_sequence)
+        fields = {
+            'usu_id': usuario,
+            'tcu_id': tipo_curso,
+            'per_id_responsable': persona,
+            'car_id_responsable': cargo,
+            'com_id_lugar': comuna,
+            'cur_fecha_solicitud': datetime(2025, 1, 1, tzinfo=timezone.utc),
+            'cur_codigo': f'C{n:04d}',
+            'cur_descripcion': f'Curso {n}',
+            'cur_administra': 1,
+            'cur_cuota_con_almuerzo': Decimal('25000'),
+            'cur_cuota_sin_almuerzo': Decimal('20000'),
+            'cur_modalidad': 1,
+            'cur_tipo_curso': 1,
+            'cur_estado': 1,
+        }
+        fields.update(overrides)
+        return Curso.objects.create(**fields)
+    return make_curso
+
+
+@pytest.fixture
+def curso(curso_factory):
+    return curso_factory()
+
+
+@pytest.fixture
+def media(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+@pytest.fixture
+def tipo_archivo(db):
+    return TipoArchivo.objects.create(tar_descripcion='Ficha médica', tar_vigente=True)
+
+
+@pytest.fixture
+def inscribir(curso):
+    rol = Rol.objects.create(rol_descripcion='Participante', rol_tipo=1, rol_vigente=True)
+    alimentacion = {
+        tipo: Alimentacion.objects.create(ali_descripcion=descripcion, ali_tipo=tipo, ali_vigente=True)
+        for tipo, descripcion in ((1, 'Con Almuerzo'), (2, 'Sin Almuerzo'))
+    }
+    seccion = CursoSeccion.objects.create(cur_id=curso, cus_seccion=1, cus_cant_participante=30)
+
+    def make(persona, tipo=1, seccion=seccion, acreditado=False):
+        return PersonaCurso.objects.create(per_id=persona, cus_id=seccion, rol_id=rol, ali_id=alimentacion[tipo],
+                                           pec_registro=True, pec_acreditado=acreditado)
+    return make
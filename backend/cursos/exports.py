@@ -0,0 +1,129 @@
+"""
+Exportación de participantes de un curso (PersonaCurso)
+Las filas se leen en bloques con paginación por llave (cus_id, pec_id), de modo
+que ni el driver (PyMySQL bufferiza el resultado completo) ni el worker
+mantienen el listado completo en memoria, y se escriben a medida que se leen.
+El CSV se transmite fila a fila. El XLSX es un ZIP que openpyxl solo cierra al
+final: se escribe completo en un archivo temporal (write_only, memoria acotada)
+y recién entonces se transmite por bloques, así que el primer byte llega cuando
+terminó de generarse.
+
+Los textos que una planilla interpretaría como fórmula (=, +, -, @) se
+neutralizan, y la columna de alergias/enfermedades solo se incluye con permiso
+sobre la aplicación de datos de salud.
+"""
+import csv
+import re
+import tempfile
+
+from django.db.models import Q
+
+from personas.models import PersonaCurso
+
+
+CHUNK_SIZE = 2000
+# Tamaño de los bloques con que se transmite el XLSX ya generado
+XLSX_BLOCK_SIZE = 64 * 1024
+
+COLUMNS = [
+    ('pec_id', 'ID Inscripción'),
+    ('cus_id__cus_seccion', 'Sección'),
+    ('per_id__per_run', 'RUN'),
+    ('per_id__per_dv', 'DV'),
+    ('per_id__per_nombres', 'Nombres'),
+    ('per_id__per_apelpat', 'Apellido Paterno'),
+    ('per_id__per_apelmat', 'Apellido Materno'),
+    ('per_id__per_apodo', 'Apodo'),
+    ('per_id__per_email', 'Email'),
+    ('per_id__per_fono', 'Teléfono'),
+    ('rol_id__rol_descripcion', 'Rol'),
+    ('ali_id__ali_descripcion', 'Alimentación'),
+    ('niv_id__niv_descripcion', 'Nivel'),
+    ('per_id__per_alergia_enfermedad', 'Alergias/Enfermedades'),
+    ('pec_registro', 'Registrado'),
+    ('pec_acreditado', 'Acreditado'),
+    ('pec_observacion', 'Observación'),
+]
+# Columnas con datos de salud: requieren permiso sobre settings.APLICACIONES['datos_salud']
+COLUMNAS_SALUD = {'per_id__per_alergia_enfermedad'}
+
+# Inicios de celda que Excel/LibreOffice evalúan como fórmula al abrir un CSV
+PREFIJOS_FORMULA = ('=', '+', '-', '@', '\t', '\r')
+# Números con signo (p. ej. teléfonos +569...) no ejecutan nada y se dejan igual
+NUMERO_RE = re.compile(r'[+-]?[\d\s().]+')
+
+
+def columnas(datos_salud=False):
+    """Columnas del export; sin datos_salud se omiten las de COLUMNAS_SALUD"""
+    return [column for column in COLUMNS if datos_salud or column[0] not in COLUMNAS_SALUD]
+
+
+def celda_csv(valor):
+    """Antepone ' a los textos que una planilla ejecutaría como fórmula (inyección CSV)"""
+    if isinstance(valor, str) and valor.startswith(PREFIJOS_FORMULA) and not NUMERO_RE.fullmatch(valor):
+        return "'" + valor
+    return valor
+
+
+def iter_participantes(curso_id, chunk_size=None, columns=COLUMNS):
+    """Itera las filas de participantes del curso, una consulta por bloque"""
+    chunk_size = chunk_size or CHUNK_SIZE
+    fields = [field for field, _ in columns]
+    queryset = (
+        PersonaCurso.objects.filter(cus_id__cur_id=curso_id)
+        .order_by('cus_id', 'pec_id')
+        .values_list('cus_id', *fields)
+    )
+    last = None
+    while True:
+        chunk = queryset
+        if last is not None:
+            cus_id, pec_id = last
+            chunk = chunk.filter(Q(cus_id__gt=cus_id) | Q(cus_id=cus_id, pec_id__gt=pec_id))
+        rows = list(chunk[:chunk_size])
+        for row in rows:
+            yield row[1:]
+        if len(rows) < chunk_size:
+            return
+        last = (rows[-1][0], rows[-1][1])
+
+
+class Echo:
+    """Buffer que retorna lo escrito, para generar CSV bajo demanda"""
+    def write(self, value):
+        return value
+
+
+def stream_csv(rows, columns=COLUMNS):
+    writer = csv.writer(Echo())
+    # BOM para que Excel detecte UTF-8
+    yield '\ufeff' + writer.writerow([header for _, header in columns])
+    for row in rows:
+        yield writer.writerow([celda_csv(valor) for valor in row])
+
+
+def build_xlsx(rows, columns=COLUMNS):
+    """
+    Escribe el XLSX en modo write_only sobre un archivo temporal y lo retorna
+    abierto. La memoria no crece con las filas, pero el archivo debe estar
+    completo antes de responder.
+    """
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+
+    def celda(valor):
+        # openpyxl guarda como fórmula todo texto que empieza con "="; se fuerza texto
+        if isinstance(valor, str) and valor.startswith('='):
+            valor = WriteOnlyCell(sheet, value=valor)
+            valor.data_type = 's'
+        return valor
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Participantes')
+    sheet.append([header for _, header in columns])
+    for row in rows:
+        sheet.append([celda(valor) for valor in row])
+    output = tempfile.TemporaryFile()
+    workbook.save(output)
+    output.seek(0)
+    return output
@@ -0,0 +1,31 @@
+"""
+Management command to rebuild the course dashboard read model
+Usage: python manage.py rebuild_curso_resumen [--curso 1 --curso 2]
+
+Recalcula curso_resumen desde PersonaCurso, Preinscripcion, PagoPersona y
+CupoConfiguracion. Necesario tras cargas por SQL directo o si un recálculo
+programado falló (queda registrado en el log de cursos.resumen).
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from cursos.resumen import actualizar_resumen
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the curso_resumen dashboard table from the source tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--curso', type=int, action='append', help='Course id (repeatable, default: all)')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        escritos = actualizar_resumen(options['curso'])
+
+        self.stdout.write(self.style.SUCCESS('=' * 60))
+        self.stdout.write(self.style.SUCCESS(
+            f'curso_resumen: {escritos} courses rebuilt in {time.perf_counter() - started:.2f} s'
+        ))
+        self.stdout.write(self.style.SUCCESS('=' * 60))
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.8 on 2026-10-18 10:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cursos', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CursoResumen',
+            fields=[
+                ('cre_id', models.AutoField(primary_key=True, serialize=False)),
+                ('cre_codigo', models.CharField(max_length=10)),
+                ('cre_descripcion', models.CharField(blank=True, max_length=50, null=True)),
+                ('cre_estado', models.IntegerField()),
+                ('cre_inscritos', models.IntegerField(default=0)),
+                ('cre_registrados', models.IntegerField(default=0)),
+                ('cre_acreditados', models.IntegerField(default=0)),
+                ('cre_preinscritos', models.IntegerField(default=0)),
+                ('cre_validados', models.IntegerField(default=0)),
+                ('cre_rechazados', models.IntegerField(default=0)),
+                ('cre_lista_espera', models.IntegerField(default=0)),
+                ('cre_pagos', models.IntegerField(default=0)),
+                ('cre_pagadores', models.IntegerField(default=0)),
+                ('cre_monto_pagado', models.DecimalField(decimal_places=6, default=0, max_digits=21)),
+                ('cre_cupo_total', models.IntegerField(default=0)),
+                ('cre_cupo_usado', models.IntegerField(default=0)),
+                ('cre_fecha_hora', models.DateTimeField()),
+                ('cur_id', models.OneToOneField(db_column='cur_id', on_delete=django.db.models.deletion.CASCADE, related_name='resumen', to='cursos.curso')),
+            ],
+            options={
+                'verbose_name': 'Resumen de Curso',
+                'verbose_name_plural': 'Resúmenes de Cursos',
+                'db_table': 'curso_resumen',
+                'indexes': [models.Index(fields=['cre_estado', 'cur_id'], name='curso_resumen_estado_idx')],
+            },
+        ),
+    ]
@@ -168,3 +168,46 @@ class CursoFormador(models.Model):
 
     def __str__(self):
         return f"Formador {self.per_id} en {self.cur_id} (Sección: {self.cus_id})"
+
+# Tabla: curso_resumen (modelo de lectura del dashboard, mantenido por cursos/resumen.py)
+class CursoResumen(models.Model):
+    # cre_id: Identificador único del resumen (clave primaria)
+    cre_id = models.AutoField(primary_key=True)
+    # cur_id: Curso resumido (uno a uno)
+    cur_id = models.OneToOneField(Curso, on_delete=models.CASCADE, db_column='cur_id', related_name='resumen')
+    # cre_codigo / cre_descripcion / cre_estado: Copia de los datos del curso para listar sin JOIN
+    cre_codigo = models.CharField(max_length=10)
+    cre_descripcion = models.CharField(max_length=50, null=True, blank=True)
+    cre_estado = models.IntegerField()
+    # cre_inscritos / cre_registrados / cre_acreditados: Conteos de PersonaCurso
+    cre_inscritos = models.IntegerField(default=0)
+    cre_registrados = models.IntegerField(default=0)
+    cre_acreditados = models.IntegerField(default=0)
+    # cre_preinscritos: Preinscripciones enviadas (excluye borradores)
+    cre_preinscritos = models.IntegerField(default=0)
+    # cre_validados: Preinscripciones validadas, con pago confirmado o acreditadas
+    cre_validados = models.IntegerField(default=0)
+    # cre_rechazados / cre_lista_espera: Preinscripciones rechazadas o en lista de espera
+    cre_rechazados = models.IntegerField(default=0)
+    cre_lista_espera = models.IntegerField(default=0)
+    # cre_pagos / cre_pagadores / cre_monto_pagado: Pagos registrados, personas que pagaron e ingresos menos egresos
+    cre_pagos = models.IntegerField(default=0)
+    cre_pagadores = models.IntegerField(default=0)
+    cre_monto_pagado = models.DecimalField(max_digits=21, decimal_places=6, default=0)
+    # cre_cupo_total / cre_cupo_usado: Suma de CupoConfiguracion del curso
+    cre_cupo_total = models.IntegerField(default=0)
+    cre_cupo_usado = models.IntegerField(default=0)
+    # cre_fecha_hora: Fecha y hora del último recálculo
+    cre_fecha_hora = models.DateTimeField()
+
+    class Meta:
+        db_table = 'curso_resumen'
+        verbose_name = 'Resumen de Curso'
+        verbose_name_plural = 'Resúmenes de Cursos'
+        indexes = [
+            # Listado del dashboard filtrado por estado
+            models.Index(fields=['cre_estado', 'cur_id'], name='curso_resumen_estado_idx'),
+        ]
+
+    def __str__(self):
+        return f"Resumen {self.cre_codigo}: {self.cre_inscritos} inscritos"
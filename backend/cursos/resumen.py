@@ -0,0 +1,155 @@
+"""
+Modelo de lectura del dashboard de cursos (CursoResumen)
+
+Los conteos de inscripciones, preinscripciones, pagos y cupos se recalculan
+por curso con una consulta agrupada por tabla y se guardan con un upsert. Los
+signals (cursos/signals.py) programan el recálculo de los cursos afectados al
+confirmarse la transacción; las operaciones masivas que no emiten signals
+(UPDATE en lote, bulk_create) llaman a programar_resumen() con sus cursos.
+"""
+import logging
+import threading
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from pagos.models import PagoPersona
+from personas.models import PersonaCurso
+from preinscripcion.models import CupoConfiguracion, Preinscripcion
+from scout_project.cache import bump_model_version
+from scout_project.db import opciones_upsert
+from .models import Curso, CursoResumen
+
+logger = logging.getLogger(__name__)
+
+_pendientes = threading.local()
+
+ESTADOS_VALIDADOS = ('validado', 'confirmado_pago', 'acreditado')
+# Preinscripciones contadas en cre_lista_espera (calcular_resumen y los deltas de ajustar_resumen)
+EN_LISTA_ESPERA = Q(en_lista_espera=True) | Q(estado='en_lista_espera')
+CAMPOS_RESUMEN = [
+    'cre_codigo', 'cre_descripcion', 'cre_estado', 'cre_inscritos', 'cre_registrados', 'cre_acreditados',
+    'cre_preinscritos', 'cre_validados', 'cre_rechazados', 'cre_lista_espera', 'cre_pagos', 'cre_pagadores',
+    'cre_monto_pagado', 'cre_cupo_total', 'cre_cupo_usado', 'cre_fecha_hora',
+]
+
+
+def _por_curso(queryset, campo_curso, cursos, **agregados):
+    if cursos is not None:
+        queryset = queryset.filter(**{f'{campo_curso}__in': cursos})
+    return {fila.pop('clave'): fila for fila in queryset.values(clave=F(campo_curso)).annotate(**agregados).order_by()}
+
+
+def calcular_resumen(cursos=None):
+    """Arma los CursoResumen (sin guardar) de los cursos indicados o de todos"""
+    queryset = Curso.objects.all() if cursos is None else Curso.objects.filter(pk__in=cursos)
+    inscripciones = _por_curso(
+        PersonaCurso.objects.all(), 'cus_id__cur_id', cursos,
+        inscritos=Count('pec_id'),
+        registrados=Count('pec_id', filter=Q(pec_registro=True)),
+        acreditados=Count('pec_id', filter=Q(pec_acreditado=True)),
+    )
+    preinscripciones = _por_curso(
+        Preinscripcion.objects.exclude(estado='borrador'), 'curso_id', cursos,
+        preinscritos=Count('id'),
+        validados=Count('id', filter=Q(estado__in=ESTADOS_VALIDADOS)),
+        rechazados=Count('id', filter=Q(estado='rechazado')),
+        lista_espera=Count('id', filter=EN_LISTA_ESPERA),
+    )
+    pagos = _por_curso(
+        PagoPersona.objects.all(), 'cur_id', cursos,
+        pagos=Count('pap_id'),
+        pagadores=Count('per_id', distinct=True),
+        ingresos=Sum('pap_valor', filter=Q(pap_tipo=1)),
+        egresos=Sum('pap_valor', filter=Q(pap_tipo=2)),
+    )
+    cupos = _por_curso(CupoConfiguracion.objects.all(), 'curso_id', cursos,
+                       total=Sum('cupo_total'), usado=Sum('cupo_usado'))
+
+    ahora = timezone.now()
+    resumenes = []
+    for cur_id, codigo, descripcion, estado in queryset.values_list(
+            'cur_id', 'cur_codigo', 'cur_descripcion', 'cur_estado').order_by('cur_id'):
+        inscripcion = inscripciones.get(cur_id, {})
+        preinscripcion = preinscripciones.get(cur_id, {})
+        pago = pagos.get(cur_id, {})
+        cupo = cupos.get(cur_id, {})
+        resumenes.append(CursoResumen(
+            cur_id_id=cur_id, cre_codigo=codigo, cre_descripcion=descripcion, cre_estado=estado,
+            cre_inscritos=inscripcion.get('inscritos', 0),
+            cre_registrados=inscripcion.get('registrados', 0),
+            cre_acreditados=inscripcion.get('acreditados', 0),
+            cre_preinscritos=preinscripcion.get('preinscritos', 0),
+            cre_validados=preinscripcion.get('validados', 0),
+            cre_rechazados=preinscripcion.get('rechazados', 0),
+            cre_lista_espera=preinscripcion.get('lista_espera', 0),
+            cre_pagos=pago.get('pagos', 0),
+            cre_pagadores=pago.get('pagadores', 0),
+            cre_monto_pagado=(pago.get('ingresos') or 0) - (pago.get('egresos') or 0),
+            cre_cupo_total=cupo.get('total') or 0,
+            cre_cupo_usado=cupo.get('usado') or 0,
+            cre_fecha_hora=ahora,
+        ))
+    return resumenes
+
+
+def actualizar_resumen(cursos=None):
+    """Recalcula y guarda los resúmenes (todos si cursos es None); retorna la cantidad escrita"""
+    resumenes = calcular_resumen(cursos)
+    CursoResumen.objects.bulk_create(resumenes, batch_size=1000,
+                                     **opciones_upsert(CursoResumen, ['cur_id'], CAMPOS_RESUMEN))
+    bump_model_version(CursoResumen)
+    return len(resumenes)
+
+
+def cuenta_en_lista_espera(estado, en_lista_espera):
+    """Misma regla que calcular_resumen para cre_lista_espera, sobre una preinscripción en memoria"""
+    return estado != 'borrador' and (en_lista_espera or estado == 'en_lista_espera')
+
+
+def _invalidar_resumen():
+    bump_model_version(CursoResumen)
+
+
+def ajustar_resumen(cur_id, **deltas):
+    """
+    Suma deltas a los contadores de un curso con un UPDATE atómico (cre_cupo_usado=1, ...).
+
+    Para rutas calientes como la reserva de cupos, donde recalcular el curso
+    completo en cada solicitud sería más caro que la operación misma. Si
+    modifica la fila, invalida los ETag del dashboard al confirmarse la
+    transacción.
+    """
+    deltas = {campo: F(campo) + delta for campo, delta in deltas.items() if delta}
+    if deltas and CursoResumen.objects.filter(cur_id=cur_id).update(**deltas, cre_fecha_hora=timezone.now()):
+        transaction.on_commit(_invalidar_resumen)
+
+
+def _actualizar_programados():
+    cursos = getattr(_pendientes, 'cursos', None)
+    _pendientes.cursos = set()
+    if not cursos:
+        return
+    try:
+        actualizar_resumen(cursos)
+    except Exception:
+        # El dato fuente ya está confirmado; un fallo aquí se corrige con rebuild_curso_resumen
+        logger.exception('No se pudo actualizar CursoResumen de los cursos %s', sorted(cursos))
+
+
+def programar_resumen(cursos):
+    """
+    Recalcula los cursos indicados cuando la transacción actual se confirme.
+
+    Los cursos se acumulan por hilo: el primer callback de la transacción
+    recalcula todos y los siguientes no hacen nada, así cien inscripciones del
+    mismo curso cuestan un solo recálculo.
+    """
+    cursos = {cur_id for cur_id in cursos if cur_id is not None}
+    if not cursos:
+        return
+    if not hasattr(_pendientes, 'cursos'):
+        _pendientes.cursos = set()
+    _pendientes.cursos.update(cursos)
+    transaction.on_commit(_actualizar_programados)
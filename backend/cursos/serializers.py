@@ -1,7 +1,55 @@
 from rest_framework import serializers
-from .models import Curso
+from scout_project.fieldsets import DynamicFieldsMixin, expandable
+from .models import Curso, CursoSeccion, CursoFecha, CursoCuota, CursoResumen
+from maestros.serializers import TipoCursoSerializer, CargoSerializer
+from geografia.serializers import ComunaSerializer
+from personas.models import Persona
 
-class CursoSerializer(serializers.ModelSerializer):
+@expandable
+class CursoSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Curso
         fields = '__all__'
+
+@expandable
+class CursoSeccionSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    class Meta:
+        model = CursoSeccion
+        fields = '__all__'
+
+class CursoFechaSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    class Meta:
+        model = CursoFecha
+        fields = '__all__'
+
+class CursoCuotaSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    class Meta:
+        model = CursoCuota
+        fields = '__all__'
+
+class ResponsableSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    class Meta:
+        model = Persona
+        fields = ['per_id', 'per_run', 'per_dv', 'per_nombres', 'per_apelpat', 'per_apelmat', 'per_email', 'per_fono']
+
+class CursoDetalleSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """
+    Representación de lectura con las relaciones anidadas.
+    Requiere el queryset de CursoViewSet con select_related/prefetch_related.
+    """
+    tcu_id = TipoCursoSerializer(read_only=True)
+    per_id_responsable = ResponsableSerializer(read_only=True)
+    car_id_responsable = CargoSerializer(read_only=True)
+    com_id_lugar = ComunaSerializer(read_only=True)
+    secciones = CursoSeccionSerializer(source='cursoseccion_set', many=True, read_only=True)
+    fechas = CursoFechaSerializer(source='cursofecha_set', many=True, read_only=True)
+    cuotas = CursoCuotaSerializer(source='cursocuota_set', many=True, read_only=True)
+
+    class Meta:
+        model = Curso
+        fields = '__all__'
+
+class CursoResumenSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    class Meta:
+        model = CursoResumen
+        exclude = ['cre_id']
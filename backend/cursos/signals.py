@@ -0,0 +1,37 @@
+from django.core.exceptions import ObjectDoesNotExist
+from django.db.models.signals import post_save, post_delete
+
+from scout_project.cache import connect_version_signals
+from pagos.models import PagoPersona
+from personas.models import Persona, PersonaCurso
+from preinscripcion.models import CupoConfiguracion, Preinscripcion
+from .models import Curso, CursoSeccion, CursoFecha, CursoCuota
+from .resumen import programar_resumen
+
+# Versiones para ETag/Last-Modified del listado de cursos (incluye el modo ?detalle=1)
+connect_version_signals([Curso, CursoSeccion, CursoFecha, CursoCuota, Persona])
+
+# Curso afectado por cada cambio que alimenta CursoResumen
+CURSO_DE = {
+    Curso: lambda instance: instance.pk,
+    PersonaCurso: lambda instance: instance.cus_id.cur_id_id,
+    Preinscripcion: lambda instance: instance.curso_id,
+    PagoPersona: lambda instance: instance.cur_id_id,
+    CupoConfiguracion: lambda instance: instance.curso_id,
+}
+
+
+def programar_resumen_curso(sender, instance, **kwargs):
+    if kwargs.get('raw'):
+        return
+    try:
+        programar_resumen([CURSO_DE[sender](instance)])
+    except ObjectDoesNotExist:
+        # Borrado en cascada desde el curso: su resumen se elimina con él
+        pass
+
+
+for model in CURSO_DE:
+    uid = f'curso_resumen:{model._meta.label_lower}'
+    post_save.connect(programar_resumen_curso, sender=model, dispatch_uid=uid)
+    post_delete.connect(programar_resumen_curso, sender=model, dispatch_uid=uid)
@@ -0,0 +1,54 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from cursos.models import CursoSeccion, CursoFecha, CursoCuota
+
+# count + cursos (con select_related) + secciones + fechas + cuotas
+DETALLE_QUERIES = 5
+
+
+def _add_children(curso):
+    fecha = datetime(2025, 3, 1, tzinfo=timezone.utc)
+    for seccion in (1, 2):
+        CursoSeccion.objects.create(cur_id=curso, cus_seccion=seccion, cus_cant_participante=30)
+    CursoFecha.objects.create(cur_id=curso, cuf_fecha_inicio=fecha, cuf_fecha_termino=fecha, cuf_tipo=1)
+    CursoCuota.objects.create(cur_id=curso, cuu_tipo=1, cuu_fecha=fecha, cuu_valor=Decimal('25000'))
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('total', [1, 15])
+def test_detalle_list_uses_constant_queries(auth_client, curso_factory, django_assert_num_queries, total):
+    for _ in range(total):
+        _add_children(curso_factory())
+
+    with django_assert_num_queries(DETALLE_QUERIES):
+        response = auth_client.get('/api/cursos/cursos/?detalle=1')
+
+    assert response.status_code == 200
+    assert len(response.json()['results']) == total
+
+
+@pytest.mark.django_db
+def test_detalle_returns_nested_relations(auth_client, curso):
+    _add_children(curso)
+
+    data = auth_client.get(f'/api/cursos/cursos/{curso.pk}/?detalle=1').json()
+
+    assert data['tcu_id']['tcu_descripcion'] == 'Formación Básica'
+    assert data['per_id_responsable']['per_id'] == curso.per_id_responsable_id
+    assert 'per_foto' not in data['per_id_responsable']
+    assert data['car_id_responsable']['car_descripcion'] == 'Director'
+    assert data['com_id_lugar']['com_descripcion'] == 'Santiago Centro'
+    assert [s['cus_seccion'] for s in data['secciones']] == [1, 2]
+    assert len(data['fechas']) == 1
+    assert len(data['cuotas']) == 1
+
+
+@pytest.mark.django_db
+def test_default_representation_keeps_foreign_key_ids(auth_client, curso):
+    data = auth_client.get(f'/api/cursos/cursos/{curso.pk}/').json()
+
+    assert data['tcu_id'] == curso.tcu_id_id
+    assert 'secciones' not in data
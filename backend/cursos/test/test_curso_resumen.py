@@ -0,0 +1,143 @@
+import io
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from cursos.models import CursoResumen
+from cursos.resumen import actualizar_resumen
+from maestros.models import Rol
+from pagos.models import PagoPersona
+from preinscripcion.models import CupoConfiguracion, Preinscripcion
+from preinscripcion.services import reservar_cupo, transicionar
+
+
+def _upserts(queries):
+    return sum(q['sql'].startswith('INSERT INTO "curso_resumen"') for q in queries.captured_queries)
+
+
+@pytest.mark.django_db
+def test_signals_recalculan_una_vez_por_transaccion(curso, usuario, persona_factory, inscribir,
+                                                      django_capture_on_commit_callbacks):
+    with CaptureQueriesContext(connection) as queries:
+        with django_capture_on_commit_callbacks(execute=True):
+            for n in range(3):
+                inscripcion = inscribir(persona_factory())
+                inscripcion.pec_acreditado = n == 0
+                inscripcion.save()
+            PagoPersona.objects.create(per_id=inscripcion.per_id, cur_id=curso, usu_id=usuario, pap_tipo=1,
+                                       pap_fecha_hora=datetime(2025, 3, 1, tzinfo=timezone.utc),
+                                       pap_valor=Decimal('25000'))
+
+    resumen = CursoResumen.objects.get(cur_id=curso)
+    assert (resumen.cre_inscritos, resumen.cre_registrados, resumen.cre_acreditados) == (3, 3, 1)
+    assert (resumen.cre_pagos, resumen.cre_pagadores, resumen.cre_monto_pagado) == (1, 1, 25000)
+    assert resumen.cre_codigo == curso.cur_codigo
+    assert _upserts(queries) == 1
+
+
+@pytest.mark.django_db
+def test_operaciones_en_lote_programan_el_recalculo(curso, persona_factory, django_capture_on_commit_callbacks):
+    rol = Rol.objects.create(rol_descripcion='Participante', rol_tipo=1, rol_vigente=True)
+    CupoConfiguracion.objects.create(curso=curso, rol=rol, cupo_total=1)
+    preinscripciones = [Preinscripcion.objects.create(persona=persona_factory(), curso=curso, estado='enviado')
+                        for _ in range(3)]
+
+    with CaptureQueriesContext(connection) as queries:
+        with django_capture_on_commit_callbacks(execute=True):
+            for pre in preinscripciones[:2]:
+                reservar_cupo(pre, rol.pk)
+            transicionar([preinscripciones[2].pk], 'rechazado', detalle='Sin documentos')
+
+    resumen = CursoResumen.objects.get(cur_id=curso)
+    assert (resumen.cre_preinscritos, resumen.cre_rechazados, resumen.cre_lista_espera) == (3, 1, 1)
+    assert (resumen.cre_cupo_total, resumen.cre_cupo_usado) == (1, 1)
+    assert _upserts(queries) == 1
+
+
+@pytest.mark.django_db
+def test_reserva_de_cupo_ajusta_contadores_sin_recalcular(curso, persona_factory):
+    rol = Rol.objects.create(rol_descripcion='Participante', rol_tipo=1, rol_vigente=True)
+    CupoConfiguracion.objects.create(curso=curso, rol=rol, cupo_total=1)
+    preinscripciones = [Preinscripcion.objects.create(persona=persona_factory(), curso=curso, estado='enviado')
+                        for _ in range(2)]
+    call_command('rebuild_curso_resumen', '--curso', str(curso.pk), stdout=io.StringIO())
+
+    with CaptureQueriesContext(connection) as queries:
+        for pre in preinscripciones:
+            reservar_cupo(pre, rol.pk)
+
+    resumen = CursoResumen.objects.get(cur_id=curso)
+    assert (resumen.cre_cupo_usado, resumen.cre_lista_espera) == (1, 1)
+    assert _upserts(queries) == 0
+
+
+@pytest.mark.django_db
+def test_dashboard_lee_solo_la_tabla_resumen(auth_client, curso_factory, persona_factory, inscribir):
+    curso_activo = curso_factory(cur_estado=1)
+    curso_factory(cur_estado=2)
+    inscribir(persona_factory())
+    call_command('rebuild_curso_resumen', stdout=io.StringIO())
+
+    with CaptureQueriesContext(connection) as queries:
+        response = auth_client.get('/api/cursos/resumen/?estado=1&paginacion=cursor')
+
+    assert response.status_code == 200
+    codigos = [fila['cre_codigo'] for fila in response.json()['results']]
+    assert curso_activo.cur_codigo in codigos and len(codigos) == CursoResumen.objects.filter(cre_estado=1).count()
+    sql = [q['sql'] for q in queries.captured_queries if 'curso_resumen' in q['sql']]
+    assert len(sql) == 1 and 'JOIN' not in sql[0]
+    etag = response['ETag']
+    assert auth_client.get('/api/cursos/resumen/?estado=1&paginacion=cursor',
+                           HTTP_IF_NONE_MATCH=etag).status_code == 304
+    assert auth_client.get('/api/cursos/resumen/?estado=x').status_code == 400
+
+
+@pytest.mark.django_db
+def test_reserva_invalida_etag_del_dashboard(auth_client, curso, persona_factory, django_capture_on_commit_callbacks):
+    rol = Rol.objects.create(rol_descripcion='Participante', rol_tipo=1, rol_vigente=True)
+    CupoConfiguracion.objects.create(curso=curso, rol=rol, cupo_total=1)
+    pre = Preinscripcion.objects.create(persona=persona_factory(), curso=curso, estado='enviado')
+    call_command('rebuild_curso_resumen', '--curso', str(curso.pk), stdout=io.StringIO())
+    anterior = auth_client.get('/api/cursos/resumen/')
+    assert anterior.json()['results'][0]['cre_cupo_usado'] == 0
+
+    with django_capture_on_commit_callbacks(execute=True):
+        reservar_cupo(pre, rol.pk)
+
+    response = auth_client.get('/api/cursos/resumen/', HTTP_IF_NONE_MATCH=anterior['ETag'])
+    assert response.status_code == 200
+    assert response.json()['results'][0]['cre_cupo_usado'] == 1
+
+
+@pytest.mark.django_db
+def test_borradores_no_cuentan_en_lista_espera(curso, persona_factory):
+    rol = Rol.objects.create(rol_descripcion='Participante', rol_tipo=1, rol_vigente=True)
+    CupoConfiguracion.objects.create(curso=curso, rol=rol, cupo_total=0)
+    borrador = Preinscripcion.objects.create(persona=persona_factory(), curso=curso, estado='borrador')
+    enviada = Preinscripcion.objects.create(persona=persona_factory(), curso=curso, estado='enviado')
+    call_command('rebuild_curso_resumen', '--curso', str(curso.pk), stdout=io.StringIO())
+
+    for pre in (borrador, enviada):
+        assert reservar_cupo(pre, rol.pk) is False
+
+    incremental = CursoResumen.objects.get(cur_id=curso).cre_lista_espera
+    call_command('rebuild_curso_resumen', '--curso', str(curso.pk), stdout=io.StringIO())
+    assert incremental == CursoResumen.objects.get(cur_id=curso).cre_lista_espera == 1
+
+
+@pytest.mark.django_db
+def test_upsert_sin_objetivo_de_conflicto_como_mysql(curso, monkeypatch):
+    # MySQL: ON DUPLICATE KEY UPDATE no admite unique_fields (NotSupportedError si se pasan)
+    monkeypatch.setattr(connection.features, 'supports_update_conflicts_with_target', False)
+    CursoResumen.objects.filter(cur_id=curso).delete()
+
+    with CaptureQueriesContext(connection) as queries:
+        assert actualizar_resumen([curso.pk]) == 1
+
+    assert _upserts(queries) == 1
+    assert 'ON CONFLICT("cur_id")' not in queries.captured_queries[-1]['sql']
+    assert CursoResumen.objects.get(cur_id=curso).cre_codigo == curso.cur_codigo
@@ -0,0 +1,113 @@
+import csv
+import io
+
+import pytest
+
+from cursos import exports
+from cursos.models import CursoSeccion
+from personas.models import PersonaCurso
+from scout_project.carga import emitir_token
+from usuarios.models import PerfilAplicacion
+
+
+@pytest.fixture
+def participantes(curso, persona_factory, inscribir):
+    """Inscribe `total` personas alternando la sección de conftest y una segunda"""
+    secciones = [
+        CursoSeccion.objects.get(cur_id=curso, cus_seccion=1),
+        CursoSeccion.objects.create(cur_id=curso, cus_seccion=2, cus_cant_participante=50),
+    ]
+
+    def inscribir_total(total):
+        for n in range(total):
+            inscribir(persona_factory(), seccion=secciones[n % 2], acreditado=n % 3 == 0)
+    return inscribir_total
+
+
+def _read(response):
+    content = b''.join(response.streaming_content).decode('utf-8-sig')
+    return list(csv.reader(io.StringIO(content)))
+
+
+@pytest.mark.django_db
+def test_csv_export_streams_all_participants_in_chunks(auth_client, curso, participantes, monkeypatch, django_assert_num_queries):
+    monkeypatch.setattr(exports, 'CHUNK_SIZE', 4)
+    participantes(10)
+
+    response = auth_client.get(f'/api/cursos/cursos/{curso.pk}/participantes/exportar/')
+    assert response.streaming
+    assert response['Content-Disposition'] == f'attachment; filename="participantes_{curso.cur_codigo}.csv"'
+
+    # 3 bloques de 4, 4 y 2 filas: una consulta por bloque
+    with django_assert_num_queries(3):
+        rows = _read(response)
+
+    assert rows[0][:3] == ['ID Inscripción', 'Sección', 'RUN']
+    assert len(rows) == 11
+    assert [row[1] for row in rows[1:]] == ['1'] * 5 + ['2'] * 5
+    assert len({row[0] for row in rows[1:]}) == 10
+
+
+@pytest.mark.django_db
+def test_export_excludes_other_courses(auth_client, curso, curso_factory, participantes):
+    participantes(2)
+    otro = curso_factory()
+
+    response = auth_client.get(f'/api/cursos/cursos/{otro.pk}/participantes/exportar/')
+
+    assert len(_read(response)) == 1
+
+
+@pytest.mark.django_db
+def test_xlsx_export(auth_client, curso, participantes):
+    openpyxl = pytest.importorskip('openpyxl')
+    participantes(3)
+
+    response = auth_client.get(f'/api/cursos/cursos/{curso.pk}/participantes/exportar/?formato=xlsx')
+
+    assert response.streaming and response.block_size == exports.XLSX_BLOCK_SIZE
+    sheet = openpyxl.load_workbook(io.BytesIO(b''.join(response.streaming_content))).active
+    assert sheet.max_row == 4
+
+
+@pytest.mark.django_db
+def test_export_neutraliza_formulas(auth_client, curso, participantes):
+    participantes(1)
+    PersonaCurso.objects.update(pec_observacion='=HYPERLINK("http://x.test","ver")')
+    persona = PersonaCurso.objects.get().per_id
+    persona.per_apodo, persona.per_nombres, persona.per_fono = '@SUM(A1)', '-2+3', '+56912345678'
+    persona.save()
+
+    fila = dict(zip(*_read(auth_client.get(f'/api/cursos/cursos/{curso.pk}/participantes/exportar/'))))
+
+    assert fila['Observación'] == '\'=HYPERLINK("http://x.test","ver")'
+    assert (fila['Apodo'], fila['Nombres']) == ("'@SUM(A1)", "'-2+3")
+    # Un número con signo no ejecuta nada y se conserva
+    assert fila['Teléfono'] == '+56912345678'
+
+    openpyxl = pytest.importorskip('openpyxl')
+    response = auth_client.get(f'/api/cursos/cursos/{curso.pk}/participantes/exportar/?formato=xlsx')
+    sheet = openpyxl.load_workbook(io.BytesIO(b''.join(response.streaming_content))).active
+    celdas = {encabezado.value: celda for encabezado, celda in zip(sheet[1], sheet[2])}
+    assert celdas['Observación'].data_type == 's'
+
+
+@pytest.mark.django_db
+def test_alergias_requieren_permiso_de_datos_de_salud(settings, usuario_client, usuario, curso, participantes):
+    participantes(1)
+    url = f'/api/cursos/cursos/{curso.pk}/participantes/exportar/'
+    assert 'Alergias/Enfermedades' in _read(usuario_client.get(url))[0]
+
+    PerfilAplicacion.objects.filter(pel_id=usuario.pel_id, apl_id=settings.APLICACIONES['datos_salud']).delete()
+    usuario_client.credentials(HTTP_AUTHORIZATION=f'Bearer {emitir_token(usuario)}')
+
+    filas = _read(usuario_client.get(url))
+    assert 'Alergias/Enfermedades' not in filas[0]
+    assert len(filas[0]) == len(filas[1]) == len(exports.COLUMNS) - 1
+
+
+@pytest.mark.django_db
+def test_export_rejects_unknown_format(auth_client, curso):
+    response = auth_client.get(f'/api/cursos/cursos/{curso.pk}/participantes/exportar/?formato=pdf')
+
+    assert response.status_code == 400
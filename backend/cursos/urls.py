@@ -1,9 +1,10 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import CursoViewSet
+from .views import CursoViewSet, CursoResumenViewSet
 
 router = DefaultRouter()
 router.register(r'cursos', CursoViewSet)
+router.register(r'resumen', CursoResumenViewSet)
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -1,9 +1,104 @@
-from rest_framework import viewsets
+from django.http import StreamingHttpResponse, FileResponse
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
-from .models import Curso
-from .serializers import CursoSerializer
+from rest_framework.response import Response
+from scout_project.metrics import MetricsMixin
+from scout_project.fieldsets import SparseFieldsMixin
+from scout_project.cache import ConditionalGetMixin
+from maestros.models import TipoCurso, Cargo
+from geografia.models import Comuna
+from personas.models import Persona
+from scout_project.pagination import OptionalCursorPagination
+from usuarios.permisos import CONSULTAR, PermisoAplicacion, tiene_permiso_en
+from .models import Curso, CursoSeccion, CursoFecha, CursoCuota, CursoResumen
+from .serializers import CursoSerializer, CursoDetalleSerializer, CursoResumenSerializer
+from .exports import XLSX_BLOCK_SIZE, columnas, iter_participantes, stream_csv, build_xlsx
 
-class CursoViewSet(viewsets.ModelViewSet):
+class CursoViewSet(MetricsMixin, ConditionalGetMixin, SparseFieldsMixin, viewsets.ModelViewSet):
+    """
+    Cursos. En lectura, ?detalle=1 retorna el tipo de curso, responsable, cargo,
+    comuna, secciones, fechas y cuotas anidados en un número constante de consultas.
+    """
     queryset = Curso.objects.all()
     serializer_class = CursoSerializer
-    permission_classes = [IsAuthenticated]
\ No newline at end of file
+    permission_classes = [IsAuthenticated, PermisoAplicacion]
+    aplicacion = 'cursos'
+
+    def is_detalle(self):
+        return self.request.method == 'GET' and self.request.query_params.get('detalle') in ('1', 'true')
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.is_detalle():
+            queryset = queryset.select_related(
+                'tcu_id', 'per_id_responsable', 'car_id_responsable', 'com_id_lugar'
+            ).prefetch_related('cursoseccion_set', 'cursofecha_set', 'cursocuota_set')
+        return queryset
+
+    def get_serializer_class(self):
+        if self.is_detalle():
+            return CursoDetalleSerializer
+        return super().get_serializer_class()
+
+    def get_conditional_models(self):
+        if self.is_detalle():
+            return (Curso, TipoCurso, Persona, Cargo, Comuna, CursoSeccion, CursoFecha, CursoCuota)
+        return super().get_conditional_models()
+
+
+    @action(detail=True, methods=['get'], url_path='participantes/exportar')
+    def exportar_participantes(self, request, pk=None):
+        """
+        Exporta los participantes del curso sin cargarlos en memoria
+        GET /api/cursos/cursos/{id}/participantes/exportar/?formato=csv|xlsx
+        CSV se transmite mientras se lee; XLSX se genera completo en disco y luego se transmite.
+        Alergias/enfermedades solo se incluyen con permiso de consulta sobre datos de salud.
+        """
+        curso = self.get_object()
+        formato = request.query_params.get('formato', 'csv')
+        filename = f'participantes_{curso.cur_codigo}'
+        columns = columnas(datos_salud=tiene_permiso_en(request, 'datos_salud', CONSULTAR))
+        rows = iter_participantes(curso.pk, columns=columns)
+
+        if formato == 'csv':
+            response = StreamingHttpResponse(stream_csv(rows, columns), content_type='text/csv; charset=utf-8')
+            response['Content-Disposition'] = f'attachment; filename="{filename}.csv"'
+            return response
+        if formato == 'xlsx':
+            response = FileResponse(
+                build_xlsx(rows, columns),
+                as_attachment=True,
+                filename=f'{filename}.xlsx',
+                content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+            )
+            response.block_size = XLSX_BLOCK_SIZE
+            return response
+        return Response(
+            {'error': 'Formato no soportado. Use csv o xlsx.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+
+class CursoResumenViewSet(MetricsMixin, ConditionalGetMixin, SparseFieldsMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Dashboard de cursos: conteos precalculados en curso_resumen, sin JOIN ni agregados.
+    GET /api/cursos/resumen/?estado=1
+    """
+    queryset = CursoResumen.objects.all()
+    serializer_class = CursoResumenSerializer
+    permission_classes = [IsAuthenticated, PermisoAplicacion]
+    aplicacion = 'cursos'
+    pagination_class = OptionalCursorPagination
+    cursor_ordering = 'cur_id'
+    lookup_field = 'cur_id'
+
+    def get_queryset(self):
+        queryset = super().get_queryset().order_by('cur_id')
+        estado = self.request.query_params.get('estado')
+        if estado is not None:
+            if not estado.lstrip('-').isdigit():
+                raise ValidationError({'estado': 'Debe ser un número entero'})
+            queryset = queryset.filter(cre_estado=int(estado))
+        return queryset
@@ -0,0 +1,117 @@
+"""
+Árbol geográfico vigente (Región → Provincia → Comuna) en memoria
+
+    GET /api/geografia/arbol/
+    {"version": "3f2a...", "regiones": [{"id": 1, "nombre": "...", "provincias":
+        [{"id": 1, "nombre": "...", "comunas": [{"id": 1, "nombre": "..."}]}]}]}
+
+Se construye una vez por proceso con tres consultas y se guarda junto con el
+JSON ya renderizado. Cada lectura compara las versiones de Region, Provincia y
+Comuna (scout_project/cache.py, incrementadas por las señales de geografía) con
+las del árbol y solo lo reconstruye si alguna cambió, así que todos los
+procesos se actualizan tras un cambio sin consultar la base en cada request.
+La version del payload es un hash del contenido y sirve de ETag.
+"""
+import hashlib
+import threading
+
+from django.utils.http import quote_etag
+
+from scout_project.cache import get_model_version
+from scout_project.renderers import FastJSONRenderer
+
+from .models import Region, Provincia, Comuna
+
+MODELOS = (Region, Provincia, Comuna)
+
+_arbol = None
+_lock = threading.Lock()
+
+
+class ArbolGeografico:
+    """Árbol vigente con índices por padre para las opciones en cascada"""
+
+    def __init__(self, regiones, provincias, comunas, versiones):
+        self.versiones = versiones
+        self.regiones = [(reg_id, nombre) for reg_id, nombre in regiones]
+        self.provincias, self.comunas, self.padres = {}, {}, {Region: {}, Provincia: {}, Comuna: {}}
+        for reg_id, nombre in self.regiones:
+            self.provincias[reg_id] = []
+            self.padres[Region][reg_id] = (nombre, None)
+        for pro_id, reg_id, nombre in provincias:
+            # Provincias de regiones no vigentes quedan fuera junto con sus comunas
+            if reg_id in self.provincias:
+                self.provincias[reg_id].append((pro_id, nombre))
+                self.comunas[pro_id] = []
+                self.padres[Provincia][pro_id] = (nombre, reg_id)
+        for com_id, pro_id, nombre in comunas:
+            if pro_id in self.comunas:
+                self.comunas[pro_id].append((com_id, nombre))
+                self.padres[Comuna][com_id] = (nombre, pro_id)
+
+        regiones_data = [
+            {'id': reg_id, 'nombre': reg_nombre, 'provincias': [
+                {'id': pro_id, 'nombre': pro_nombre, 'comunas': [
+                    {'id': com_id, 'nombre': com_nombre} for com_id, com_nombre in self.comunas[pro_id]
+                ]}
+                for pro_id, pro_nombre in self.provincias[reg_id]
+            ]}
+            for reg_id, reg_nombre in self.regiones
+        ]
+        renderer = FastJSONRenderer()
+        self.version = hashlib.md5(renderer.render(regiones_data)).hexdigest()
+        self.etag = quote_etag(self.version)
+        self.data = {'version': self.version, 'regiones': regiones_data}
+        self.contenido = renderer.render(self.data)
+
+    def choices(self, model, padre=None):
+        """Opciones (id, nombre) de regiones, o de provincias/comunas del padre indicado"""
+        if model is Region:
+            return list(self.regiones)
+        indice = self.provincias if model is Provincia else self.comunas
+        try:
+            return list(indice.get(int(padre), ())) if padre not in (None, '') else []
+        except (TypeError, ValueError):
+            return []
+
+    def instancia(self, model, pk):
+        """Instancia del modelo armada desde el árbol (sin consulta), o None si no está vigente"""
+        try:
+            nombre, padre = self.padres[model][pk]
+        except KeyError:
+            return None
+        if model is Region:
+            return Region(reg_id=pk, reg_descripcion=nombre, reg_vigente=True)
+        if model is Provincia:
+            return Provincia(pro_id=pk, reg_id_id=padre, pro_descripcion=nombre, pro_vigente=True)
+        return Comuna(com_id=pk, pro_id_id=padre, com_descripcion=nombre, com_vigente=True)
+
+
+def construir_arbol(versiones=None):
+    versiones = versiones or _versiones()
+    return ArbolGeografico(
+        Region.objects.filter(reg_vigente=True).order_by('reg_descripcion', 'reg_id')
+        .values_list('reg_id', 'reg_descripcion'),
+        Provincia.objects.filter(pro_vigente=True).order_by('pro_descripcion', 'pro_id')
+        .values_list('pro_id', 'reg_id', 'pro_descripcion'),
+        Comuna.objects.filter(com_vigente=True).order_by('com_descripcion', 'com_id')
+        .values_list('com_id', 'pro_id', 'com_descripcion'),
+        versiones,
+    )
+
+
+def _versiones():
+    return tuple(get_model_version(model) for model in MODELOS)
+
+
+def get_arbol():
+    """Árbol del proceso, reconstruido solo si cambió alguna tabla geográfica"""
+    global _arbol
+    versiones = _versiones()
+    arbol = _arbol
+    if arbol is not None and arbol.versiones == versiones:
+        return arbol
+    with _lock:
+        if _arbol is None or _arbol.versiones != versiones:
+            _arbol = construir_arbol(versiones)
+        return _arbol
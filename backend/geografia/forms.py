@@ -0,0 +1,22 @@
+from django import forms
+
+from .arbol import get_arbol
+
+
+class ArbolChoiceField(forms.ChoiceField):
+    """
+    ChoiceField de Region/Provincia/Comuna con opciones del árbol geográfico en
+    memoria; clean() retorna la instancia armada desde el árbol, sin consultas.
+    """
+    def __init__(self, model, *args, **kwargs):
+        self.model = model
+        super().__init__(*args, **kwargs)
+
+    def prepare_value(self, value):
+        return getattr(value, 'pk', value)
+
+    def clean(self, value):
+        value = super().clean(self.prepare_value(value))
+        if value in self.empty_values:
+            return None
+        return get_arbol().instancia(self.model, int(value))
@@ -0,0 +1,122 @@
+"""
+Tabla de clausura de la jerarquía scout (Zona → Distrito → Grupo)
+
+jerarquia_scout guarda una fila por cada par ancestro/descendiente (incluido
+cada nodo consigo mismo), así "todo lo que está bajo la zona X" es un filtro
+indexado por (ancestro, tipo de descendiente) en vez de recorrer Grupo →
+Distrito → Zona. Los signals (geografia/signals.py) resincronizan el nodo
+guardado o eliminado; las cargas que no emiten signals (bulk_create, SQL
+directo) llaman a reconstruir_jerarquia() o al comando rebuild_jerarquia.
+
+personas_por_nodo() retorna las personas vigentes bajo un nodo: las de
+PersonaGrupo en sus grupos y las de PersonaIndividual asignadas a sus
+distritos o a la zona, cada conjunto con un semi-join sobre la clausura.
+"""
+from django.db import transaction
+from django.db.models import Q
+
+from personas.models import Persona, PersonaGrupo, PersonaIndividual
+from .models import Zona, Distrito, Grupo, JerarquiaScout
+
+ZONA, DISTRITO, GRUPO = 'zona', 'distrito', 'grupo'
+
+
+def _fila(ancestro_tipo, ancestro_id, descendiente_tipo, descendiente_id, profundidad):
+    return JerarquiaScout(
+        jer_ancestro_tipo=ancestro_tipo, jer_ancestro_id=ancestro_id,
+        jer_descendiente_tipo=descendiente_tipo, jer_descendiente_id=descendiente_id,
+        jer_profundidad=profundidad,
+    )
+
+
+def _filas_distrito(dis_id, zon_id):
+    return [_fila(DISTRITO, dis_id, DISTRITO, dis_id, 0), _fila(ZONA, zon_id, DISTRITO, dis_id, 1)]
+
+
+def _filas_grupo(gru_id, dis_id, zon_id):
+    return [
+        _fila(GRUPO, gru_id, GRUPO, gru_id, 0),
+        _fila(DISTRITO, dis_id, GRUPO, gru_id, 1),
+        _fila(ZONA, zon_id, GRUPO, gru_id, 2),
+    ]
+
+
+def _como_descendiente(tipo, ids):
+    return JerarquiaScout.objects.filter(jer_descendiente_tipo=tipo, jer_descendiente_id__in=ids)
+
+
+def sincronizar_zona(zona):
+    JerarquiaScout.objects.get_or_create(
+        jer_ancestro_tipo=ZONA, jer_ancestro_id=zona.pk, jer_descendiente_tipo=ZONA,
+        jer_descendiente_id=zona.pk, defaults={'jer_profundidad': 0},
+    )
+
+
+@transaction.atomic
+def sincronizar_distrito(distrito):
+    """Filas del distrito y de sus grupos; solo se reescriben si es nuevo o cambió de zona"""
+    if JerarquiaScout.objects.filter(jer_ancestro_tipo=ZONA, jer_ancestro_id=distrito.zon_id_id,
+                                     jer_descendiente_tipo=DISTRITO, jer_descendiente_id=distrito.pk).exists():
+        return
+    grupos = list(Grupo.objects.filter(dis_id=distrito.pk).values_list('gru_id', flat=True))
+    _como_descendiente(DISTRITO, [distrito.pk]).delete()
+    _como_descendiente(GRUPO, grupos).delete()
+    filas = _filas_distrito(distrito.pk, distrito.zon_id_id)
+    for gru_id in grupos:
+        filas += _filas_grupo(gru_id, distrito.pk, distrito.zon_id_id)
+    JerarquiaScout.objects.bulk_create(filas)
+
+
+@transaction.atomic
+def sincronizar_grupo(grupo):
+    """Filas del grupo; solo se reescriben si es nuevo o cambió de distrito"""
+    if JerarquiaScout.objects.filter(jer_ancestro_tipo=DISTRITO, jer_ancestro_id=grupo.dis_id_id,
+                                     jer_descendiente_tipo=GRUPO, jer_descendiente_id=grupo.pk).exists():
+        return
+    zon_id = Distrito.objects.values_list('zon_id', flat=True).get(pk=grupo.dis_id_id)
+    _como_descendiente(GRUPO, [grupo.pk]).delete()
+    JerarquiaScout.objects.bulk_create(_filas_grupo(grupo.pk, grupo.dis_id_id, zon_id))
+
+
+def eliminar_nodo(tipo, pk):
+    JerarquiaScout.objects.filter(
+        Q(jer_ancestro_tipo=tipo, jer_ancestro_id=pk) | Q(jer_descendiente_tipo=tipo, jer_descendiente_id=pk)
+    ).delete()
+
+
+@transaction.atomic
+def reconstruir_jerarquia(batch_size=5000):
+    """Regenera la tabla completa desde Zona, Distrito y Grupo; retorna las filas escritas"""
+    zonas = {}
+    filas = []
+    for zon_id in Zona.objects.values_list('zon_id', flat=True):
+        filas.append(_fila(ZONA, zon_id, ZONA, zon_id, 0))
+    for dis_id, zon_id in Distrito.objects.values_list('dis_id', 'zon_id'):
+        zonas[dis_id] = zon_id
+        filas += _filas_distrito(dis_id, zon_id)
+    for gru_id, dis_id in Grupo.objects.values_list('gru_id', 'dis_id'):
+        filas += _filas_grupo(gru_id, dis_id, zonas[dis_id])
+    JerarquiaScout.objects.all().delete()
+    JerarquiaScout.objects.bulk_create(filas, batch_size=batch_size)
+    return len(filas)
+
+
+def descendientes(tipo, pk, descendiente_tipo):
+    """ids de los nodos del tipo indicado bajo el nodo (incluido él mismo), como subconsulta"""
+    return JerarquiaScout.objects.filter(
+        jer_ancestro_tipo=tipo, jer_ancestro_id=pk, jer_descendiente_tipo=descendiente_tipo,
+    ).values('jer_descendiente_id')
+
+
+def personas_por_nodo(tipo, pk):
+    """Personas vigentes con membresía vigente en el nodo o bajo él"""
+    en_grupos = PersonaGrupo.objects.filter(
+        peg_vigente=True, gru_id__in=descendientes(tipo, pk, GRUPO),
+    ).values('per_id')
+    filtro = Q(pk__in=en_grupos)
+    if tipo != GRUPO:
+        individuales = PersonaIndividual.objects.filter(pei_vigente=True).filter(
+            Q(dis_id__in=descendientes(tipo, pk, DISTRITO)) | Q(zon_id__in=descendientes(tipo, pk, ZONA))
+        ).values('per_id')
+        filtro |= Q(pk__in=individuales)
+    return Persona.objects.filter(filtro, per_vigente=True)
@@ -0,0 +1,27 @@
+"""
+Management command to rebuild the scout hierarchy closure table
+Usage: python manage.py rebuild_jerarquia
+
+Regenera jerarquia_scout desde Zona, Distrito y Grupo. Necesario tras cargas
+por bulk_create o SQL directo, que no emiten los signals que la mantienen.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from geografia.jerarquia import reconstruir_jerarquia
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the jerarquia_scout closure table (Zona -> Distrito -> Grupo)'
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        filas = reconstruir_jerarquia()
+
+        self.stdout.write(self.style.SUCCESS('=' * 60))
+        self.stdout.write(self.style.SUCCESS(
+            f'jerarquia_scout: {filas} rows rebuilt in {time.perf_counter() - started:.2f} s'
+        ))
+        self.stdout.write(self.style.SUCCESS('=' * 60))
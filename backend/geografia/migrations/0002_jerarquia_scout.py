@@ -0,0 +1,54 @@
+# Generated by Django 5.2.8 on 2026-10-18 11:10
+
+from django.db import migrations, models
+
+
+def poblar_jerarquia(apps, schema_editor):
+    # Misma regla que geografia.jerarquia.reconstruir_jerarquia, con los modelos históricos
+    Zona = apps.get_model('geografia', 'Zona')
+    Distrito = apps.get_model('geografia', 'Distrito')
+    Grupo = apps.get_model('geografia', 'Grupo')
+    JerarquiaScout = apps.get_model('geografia', 'JerarquiaScout')
+
+    def fila(ancestro_tipo, ancestro_id, descendiente_tipo, descendiente_id, profundidad):
+        return JerarquiaScout(jer_ancestro_tipo=ancestro_tipo, jer_ancestro_id=ancestro_id,
+                              jer_descendiente_tipo=descendiente_tipo, jer_descendiente_id=descendiente_id,
+                              jer_profundidad=profundidad)
+
+    filas = [fila('zona', zon_id, 'zona', zon_id, 0) for zon_id in Zona.objects.values_list('zon_id', flat=True)]
+    zonas = dict(Distrito.objects.values_list('dis_id', 'zon_id'))
+    for dis_id, zon_id in zonas.items():
+        filas += [fila('distrito', dis_id, 'distrito', dis_id, 0), fila('zona', zon_id, 'distrito', dis_id, 1)]
+    for gru_id, dis_id in Grupo.objects.values_list('gru_id', 'dis_id'):
+        filas += [fila('grupo', gru_id, 'grupo', gru_id, 0), fila('distrito', dis_id, 'grupo', gru_id, 1),
+                  fila('zona', zonas[dis_id], 'grupo', gru_id, 2)]
+    JerarquiaScout.objects.bulk_create(filas, batch_size=5000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('geografia', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JerarquiaScout',
+            fields=[
+                ('jer_id', models.AutoField(primary_key=True, serialize=False)),
+                ('jer_ancestro_tipo', models.CharField(choices=[('zona', 'Zona'), ('distrito', 'Distrito'), ('grupo', 'Grupo')], max_length=8)),
+                ('jer_ancestro_id', models.IntegerField()),
+                ('jer_descendiente_tipo', models.CharField(choices=[('zona', 'Zona'), ('distrito', 'Distrito'), ('grupo', 'Grupo')], max_length=8)),
+                ('jer_descendiente_id', models.IntegerField()),
+                ('jer_profundidad', models.SmallIntegerField()),
+            ],
+            options={
+                'verbose_name': 'Jerarquía Scout',
+                'verbose_name_plural': 'Jerarquía Scout',
+                'db_table': 'jerarquia_scout',
+                'indexes': [models.Index(fields=['jer_descendiente_tipo', 'jer_descendiente_id'], name='jerarquia_descendiente_idx')],
+                'unique_together': {('jer_ancestro_tipo', 'jer_ancestro_id', 'jer_descendiente_tipo', 'jer_descendiente_id')},
+            },
+        ),
+        migrations.RunPython(poblar_jerarquia, migrations.RunPython.noop),
+    ]
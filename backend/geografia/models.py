@@ -111,3 +111,31 @@ class Grupo(models.Model):
 
     def __str__(self):
         return self.gru_descripcion
+
+# Tabla: jerarquia_scout (tabla de clausura Zona → Distrito → Grupo, mantenida por geografia/jerarquia.py)
+class JerarquiaScout(models.Model):
+    TIPOS = [('zona', 'Zona'), ('distrito', 'Distrito'), ('grupo', 'Grupo')]
+
+    # jer_id: Identificador único de la fila (clave primaria)
+    jer_id = models.AutoField(primary_key=True)
+    # jer_ancestro_tipo / jer_ancestro_id: Nodo ancestro (zona, distrito o grupo)
+    jer_ancestro_tipo = models.CharField(max_length=8, choices=TIPOS)
+    jer_ancestro_id = models.IntegerField()
+    # jer_descendiente_tipo / jer_descendiente_id: Nodo descendiente (cada nodo es descendiente de sí mismo)
+    jer_descendiente_tipo = models.CharField(max_length=8, choices=TIPOS)
+    jer_descendiente_id = models.IntegerField()
+    # jer_profundidad: Niveles entre ancestro y descendiente (0 para el mismo nodo)
+    jer_profundidad = models.SmallIntegerField()
+
+    class Meta:
+        db_table = 'jerarquia_scout'
+        verbose_name = 'Jerarquía Scout'
+        verbose_name_plural = 'Jerarquía Scout'
+        unique_together = (('jer_ancestro_tipo', 'jer_ancestro_id', 'jer_descendiente_tipo', 'jer_descendiente_id'),)
+        indexes = [
+            # Ancestros de un nodo (resincronización al mover un distrito o grupo)
+            models.Index(fields=['jer_descendiente_tipo', 'jer_descendiente_id'], name='jerarquia_descendiente_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.jer_ancestro_tipo} {self.jer_ancestro_id} → {self.jer_descendiente_tipo} {self.jer_descendiente_id}"
@@ -1,32 +1,39 @@
 from rest_framework import serializers
+from scout_project.fieldsets import DynamicFieldsMixin, expandable
 from .models import Region, Provincia, Comuna, Zona, Distrito, Grupo
 
-class RegionSerializer(serializers.ModelSerializer):
+@expandable
+class RegionSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Region
         fields = '__all__'
 
-class ProvinciaSerializer(serializers.ModelSerializer):
+@expandable
+class ProvinciaSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Provincia
         fields = '__all__'
 
-class ComunaSerializer(serializers.ModelSerializer):
+@expandable
+class ComunaSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Comuna
         fields = '__all__'
 
-class ZonaSerializer(serializers.ModelSerializer):
+@expandable
+class ZonaSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Zona
         fields = '__all__'
 
-class DistritoSerializer(serializers.ModelSerializer):
+@expandable
+class DistritoSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Distrito
         fields = '__all__'
 
-class GrupoSerializer(serializers.ModelSerializer):
+@expandable
+class GrupoSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Grupo
         fields = '__all__'
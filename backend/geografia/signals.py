@@ -0,0 +1,30 @@
+from django.db.models.signals import post_save, post_delete
+
+from scout_project.cache import connect_version_signals
+from .jerarquia import ZONA, DISTRITO, GRUPO, eliminar_nodo, sincronizar_zona, sincronizar_distrito, sincronizar_grupo
+from .models import Region, Provincia, Comuna, Zona, Distrito, Grupo
+
+# Invalidación de la caché de catálogos geográficos
+connect_version_signals([Region, Provincia, Comuna, Zona, Distrito, Grupo])
+
+# Tabla de clausura de la jerarquía scout (geografia/jerarquia.py)
+JERARQUIA = {
+    Zona: (ZONA, sincronizar_zona),
+    Distrito: (DISTRITO, sincronizar_distrito),
+    Grupo: (GRUPO, sincronizar_grupo),
+}
+
+
+def sincronizar_jerarquia(sender, instance, raw=False, **kwargs):
+    if not raw:
+        JERARQUIA[sender][1](instance)
+
+
+def eliminar_de_jerarquia(sender, instance, **kwargs):
+    eliminar_nodo(JERARQUIA[sender][0], instance.pk)
+
+
+for model in JERARQUIA:
+    uid = f'jerarquia:{model._meta.label_lower}'
+    post_save.connect(sincronizar_jerarquia, sender=model, dispatch_uid=uid)
+    post_delete.connect(eliminar_de_jerarquia, sender=model, dispatch_uid=uid)
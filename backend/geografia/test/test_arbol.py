@@ -0,0 +1,75 @@
+import pytest
+from django.core.exceptions import ValidationError
+
+from geografia.arbol import get_arbol
+from geografia.models import Region, Provincia, Comuna
+from preinscripcion.forms import PreinscripcionPersonaForm
+
+
+@pytest.fixture
+def geografia(db, django_capture_on_commit_callbacks):
+    # Las versiones de caché se incrementan al confirmarse la transacción
+    with django_capture_on_commit_callbacks(execute=True):
+        norte = Region.objects.create(reg_descripcion='Atacama', reg_vigente=True)
+        cerrada = Region.objects.create(reg_descripcion='Antigua', reg_vigente=False)
+        copiapo = Provincia.objects.create(reg_id=norte, pro_descripcion='Copiapó', pro_vigente=True)
+        Provincia.objects.create(reg_id=cerrada, pro_descripcion='Huérfana', pro_vigente=True)
+        caldera = Comuna.objects.create(pro_id=copiapo, com_descripcion='Caldera', com_vigente=True)
+        Comuna.objects.create(pro_id=copiapo, com_descripcion='Cerrada', com_vigente=False)
+    return norte, copiapo, caldera
+
+
+@pytest.mark.django_db
+def test_arbol_anidado_con_etag(api_client, geografia, django_assert_num_queries):
+    norte, copiapo, caldera = geografia
+    response = api_client.get('/api/geografia/arbol/')
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data['regiones'] == [{'id': norte.pk, 'nombre': 'Atacama', 'provincias': [
+        {'id': copiapo.pk, 'nombre': 'Copiapó', 'comunas': [{'id': caldera.pk, 'nombre': 'Caldera'}]},
+    ]}]
+    assert response['ETag'] == f'"{data["version"]}"'
+
+    with django_assert_num_queries(0):
+        assert api_client.get('/api/geografia/arbol/').json() == data
+        assert api_client.get('/api/geografia/arbol/', HTTP_IF_NONE_MATCH=response['ETag']).status_code == 304
+
+
+@pytest.mark.django_db
+def test_arbol_se_reconstruye_al_cambiar_geografia(api_client, geografia, django_capture_on_commit_callbacks):
+    norte, copiapo, caldera = geografia
+    anterior = api_client.get('/api/geografia/arbol/')
+
+    caldera.com_descripcion = 'Caldera Norte'
+    with django_capture_on_commit_callbacks(execute=True):
+        caldera.save()
+    response = api_client.get('/api/geografia/arbol/', HTTP_IF_NONE_MATCH=anterior['ETag'])
+
+    assert response.status_code == 200 and response['ETag'] != anterior['ETag']
+    assert response.json()['regiones'][0]['provincias'][0]['comunas'][0]['nombre'] == 'Caldera Norte'
+    # Guardar sin cambios reconstruye el árbol pero conserva la versión del contenido
+    version = get_arbol().version
+    with django_capture_on_commit_callbacks(execute=True):
+        norte.save()
+    assert get_arbol().version == version
+
+
+@pytest.mark.django_db
+def test_formulario_en_cascada_sin_consultas(geografia, django_assert_num_queries):
+    norte, copiapo, caldera = geografia
+    get_arbol()
+    data = {'reg_id': str(norte.pk), 'pro_id': str(copiapo.pk), 'com_id': str(caldera.pk)}
+
+    with django_assert_num_queries(0):
+        form = PreinscripcionPersonaForm(data=data)
+        assert list(form.fields['reg_id'].choices) == [(norte.pk, 'Atacama')]
+        assert list(form.fields['pro_id'].choices) == [(copiapo.pk, 'Copiapó')]
+        comuna = form.fields['com_id'].clean(data['com_id'])
+        assert form.fields['reg_id'].clean(data['reg_id']).reg_descripcion == 'Atacama'
+
+    assert (comuna.pk, comuna.pro_id_id, comuna.com_descripcion) == (caldera.pk, copiapo.pk, 'Caldera')
+    assert PreinscripcionPersonaForm().fields['pro_id'].choices == []
+    form = PreinscripcionPersonaForm(reg_id=norte.pk, pro_id=copiapo.pk)
+    with pytest.raises(ValidationError):
+        form.fields['com_id'].clean(str(caldera.pk + 1))
@@ -0,0 +1,76 @@
+import pytest
+
+from geografia.models import Region, Provincia
+
+
+@pytest.mark.django_db
+def test_list_returns_etag_and_last_modified(api_client):
+    Region.objects.create(reg_descripcion='Atacama', reg_vigente=True)
+    response = api_client.get('/api/geografia/regiones/')
+
+    assert response.status_code == 200
+    assert response['ETag'].startswith('"')
+    assert 'Last-Modified' in response
+
+
+@pytest.mark.django_db
+def test_matching_etag_returns_304_without_queries(api_client, django_assert_num_queries):
+    Region.objects.create(reg_descripcion='Atacama', reg_vigente=True)
+    etag = api_client.get('/api/geografia/regiones/')['ETag']
+
+    with django_assert_num_queries(0):
+        response = api_client.get('/api/geografia/regiones/', HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 304
+    assert response['ETag'] == etag
+    assert response.content == b''
+
+
+@pytest.mark.django_db
+def test_etag_changes_when_table_changes(api_client, django_capture_on_commit_callbacks):
+    region = Region.objects.create(reg_descripcion='Atacama', reg_vigente=True)
+    etag = api_client.get(f'/api/geografia/regiones/{region.pk}/')['ETag']
+
+    region.reg_descripcion = 'Coquimbo'
+    with django_capture_on_commit_callbacks() as callbacks:
+        region.save()
+    # Hasta el commit la versión no cambia: una lectura concurrente no cachea datos viejos bajo la nueva
+    assert api_client.get(f'/api/geografia/regiones/{region.pk}/', HTTP_IF_NONE_MATCH=etag).status_code == 304
+    for callback in callbacks:
+        callback()
+    response = api_client.get(f'/api/geografia/regiones/{region.pk}/', HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 200
+    assert response['ETag'] != etag
+    assert response.json()['reg_descripcion'] == 'Coquimbo'
+
+
+@pytest.mark.django_db
+def test_etag_differs_per_query_string(api_client):
+    Region.objects.create(reg_descripcion='Atacama', reg_vigente=True)
+    first = api_client.get('/api/geografia/regiones/')['ETag']
+    second = api_client.get('/api/geografia/regiones/?ordering=-reg_id')['ETag']
+
+    assert first != second
+
+
+@pytest.mark.django_db
+def test_expand_invalida_cache_y_etag_con_el_modelo_relacionado(api_client, django_capture_on_commit_callbacks):
+    region = Region.objects.create(reg_descripcion='Atacama', reg_vigente=True)
+    Provincia.objects.create(reg_id=region, pro_descripcion='Copiapó', pro_vigente=True)
+    url = '/api/geografia/provincias/?expand=reg_id'
+    anterior = api_client.get(url)
+    assert anterior.json()['results'][0]['reg_id']['reg_descripcion'] == 'Atacama'
+
+    region.reg_descripcion = 'Coquimbo'
+    with django_capture_on_commit_callbacks(execute=True):
+        region.save()
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=anterior['ETag'])
+
+    assert response.status_code == 200 and response['ETag'] != anterior['ETag']
+    assert response.json()['results'][0]['reg_id']['reg_descripcion'] == 'Coquimbo'
+    # Sin expand la respuesta solo depende de Provincia
+    etag = api_client.get('/api/geografia/provincias/')['ETag']
+    with django_capture_on_commit_callbacks(execute=True):
+        region.save()
+    assert api_client.get('/api/geografia/provincias/', HTTP_IF_NONE_MATCH=etag).status_code == 304
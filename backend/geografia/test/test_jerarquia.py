@@ -0,0 +1,88 @@
+import pytest
+
+from geografia.jerarquia import GRUPO, ZONA, personas_por_nodo, reconstruir_jerarquia
+from geografia.models import Zona, Distrito, Grupo, JerarquiaScout
+from maestros.models import Cargo
+from personas.models import PersonaGrupo, PersonaIndividual
+
+
+def _filas():
+    return set(JerarquiaScout.objects.values_list(
+        'jer_ancestro_tipo', 'jer_ancestro_id', 'jer_descendiente_tipo', 'jer_descendiente_id', 'jer_profundidad'))
+
+
+@pytest.fixture
+def jerarquia(db):
+    norte = Zona.objects.create(zon_descripcion='Norte', zon_unilateral=False, zon_vigente=True)
+    sur = Zona.objects.create(zon_descripcion='Sur', zon_unilateral=False, zon_vigente=True)
+    costa = Distrito.objects.create(zon_id=norte, dis_descripcion='Costa', dis_vigente=True)
+    valle = Distrito.objects.create(zon_id=sur, dis_descripcion='Valle', dis_vigente=True)
+    faro = Grupo.objects.create(dis_id=costa, gru_descripcion='Faro', gru_vigente=True)
+    puerto = Grupo.objects.create(dis_id=costa, gru_descripcion='Puerto', gru_vigente=True)
+    rio = Grupo.objects.create(dis_id=valle, gru_descripcion='Río', gru_vigente=True)
+    return norte, sur, costa, valle, faro, puerto, rio
+
+
+@pytest.mark.django_db
+def test_clausura_sincronizada_con_los_cambios(jerarquia):
+    norte, sur, costa, valle, faro, puerto, rio = jerarquia
+    assert ('zona', norte.pk, 'grupo', faro.pk, 2) in _filas()
+    assert len(_filas()) == 2 + 2 * 2 + 3 * 3
+
+    # Mover un grupo y un distrito arrastra sus ancestros
+    puerto.dis_id = valle
+    puerto.save()
+    costa.zon_id = sur
+    costa.save()
+    assert ('zona', sur.pk, 'grupo', puerto.pk, 2) in _filas()
+    assert ('zona', sur.pk, 'grupo', faro.pk, 2) in _filas()
+    assert not JerarquiaScout.objects.filter(jer_ancestro_tipo=ZONA, jer_ancestro_id=norte.pk,
+                                             jer_profundidad__gt=0).exists()
+
+    # Borrar el distrito elimina en cascada sus grupos y sus filas
+    valle.delete()
+    assert not JerarquiaScout.objects.filter(jer_descendiente_tipo=GRUPO, jer_descendiente_id=rio.pk).exists()
+    incremental = _filas()
+    assert reconstruir_jerarquia() == len(incremental)
+    assert _filas() == incremental
+
+
+@pytest.mark.django_db
+def test_personas_por_nodo(jerarquia, persona_factory, django_assert_num_queries):
+    norte, sur, costa, valle, faro, puerto, rio = jerarquia
+    en_dos_grupos, inactiva, de_baja, distrital, zonal, del_sur = (persona_factory() for _ in range(6))
+    PersonaGrupo.objects.create(per_id=en_dos_grupos, gru_id=faro, peg_vigente=True)
+    PersonaGrupo.objects.create(per_id=en_dos_grupos, gru_id=puerto, peg_vigente=True)
+    PersonaGrupo.objects.create(per_id=de_baja, gru_id=faro, peg_vigente=False)
+    PersonaGrupo.objects.create(per_id=del_sur, gru_id=rio, peg_vigente=True)
+    inactiva.per_vigente = False
+    inactiva.save()
+    PersonaGrupo.objects.create(per_id=inactiva, gru_id=faro, peg_vigente=True)
+    cargo = Cargo.objects.create(car_descripcion='Comisionado', car_vigente=True)
+    PersonaIndividual.objects.create(per_id=distrital, car_id=cargo, dis_id=costa, pei_vigente=True)
+    PersonaIndividual.objects.create(per_id=zonal, car_id=cargo, zon_id=norte, pei_vigente=True)
+
+    with django_assert_num_queries(1):
+        ids = set(personas_por_nodo(ZONA, norte.pk).values_list('pk', flat=True))
+    assert ids == {en_dos_grupos.pk, distrital.pk, zonal.pk}
+    assert set(personas_por_nodo('distrito', costa.pk).values_list('pk', flat=True)) == {en_dos_grupos.pk, distrital.pk}
+    assert list(personas_por_nodo(GRUPO, rio.pk)) == [del_sur]
+
+
+@pytest.mark.django_db
+def test_api_personas_por_nodo(api_client, auth_client, jerarquia, persona_factory):
+    norte, sur, costa, valle, faro, puerto, rio = jerarquia
+    for grupo in (faro, puerto, rio):
+        PersonaGrupo.objects.create(per_id=persona_factory(), gru_id=grupo, peg_vigente=True)
+
+    response = auth_client.get(f'/api/geografia/zonas/{norte.pk}/personas/?fields=per_id,per_nombres')
+    assert response.status_code == 200
+    assert response.json()['count'] == 2
+    assert set(response.json()['results'][0]) == {'per_id', 'per_nombres'}
+    assert auth_client.get(f'/api/geografia/distritos/{valle.pk}/personas/conteo/').json() == {
+        'tipo': 'distrito', 'id': valle.pk, 'personas': 1,
+    }
+    assert auth_client.get('/api/geografia/grupos/999999/personas/conteo/').status_code == 404
+
+    api_client.force_authenticate(user=None)
+    assert api_client.get(f'/api/geografia/zonas/{norte.pk}/personas/').status_code == 401
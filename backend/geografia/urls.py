@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import RegionViewSet, ProvinciaViewSet, ComunaViewSet, ZonaViewSet, DistritoViewSet, GrupoViewSet
+from .views import ArbolGeograficoViewSet, RegionViewSet, ProvinciaViewSet, ComunaViewSet, ZonaViewSet, DistritoViewSet, GrupoViewSet
 
 router = DefaultRouter()
 router.register(r'regiones', RegionViewSet)
@@ -9,6 +9,7 @@ router.register(r'comunas', ComunaViewSet)
 router.register(r'zonas', ZonaViewSet)
 router.register(r'distritos', DistritoViewSet)
 router.register(r'grupos', GrupoViewSet)
+router.register(r'arbol', ArbolGeograficoViewSet, basename='arbol')
 
 urlpatterns = [
     path('', include(router.urls)),
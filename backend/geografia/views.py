@@ -1,27 +1,87 @@
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from scout_project.metrics import MetricsMixin
+from scout_project.fieldsets import SparseFieldsMixin
+from scout_project.cache import CatalogCacheMixin, ConditionalGetMixin
+from usuarios.permisos import PermisoAplicacion
+from personas.serializers import PersonaSerializer
+from .arbol import get_arbol
+from .jerarquia import ZONA, DISTRITO, GRUPO, personas_por_nodo
 from .models import Region, Provincia, Comuna, Zona, Distrito, Grupo
 from .serializers import RegionSerializer, ProvinciaSerializer, ComunaSerializer, ZonaSerializer, DistritoSerializer, GrupoSerializer
 
-class RegionViewSet(viewsets.ModelViewSet):
+class RegionViewSet(MetricsMixin, ConditionalGetMixin, CatalogCacheMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Region.objects.all()
     serializer_class = RegionSerializer
 
-class ProvinciaViewSet(viewsets.ModelViewSet):
+class ProvinciaViewSet(MetricsMixin, ConditionalGetMixin, CatalogCacheMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Provincia.objects.all()
     serializer_class = ProvinciaSerializer
 
-class ComunaViewSet(viewsets.ModelViewSet):
+class ComunaViewSet(MetricsMixin, ConditionalGetMixin, CatalogCacheMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Comuna.objects.all()
     serializer_class = ComunaSerializer
 
-class ZonaViewSet(viewsets.ModelViewSet):
+class JerarquiaPersonasMixin:
+    """
+    Personas vigentes bajo un nodo de la jerarquía scout (tabla de clausura, ver geografia/jerarquia.py)
+    GET /api/geografia/zonas/{id}/personas/          (paginado, admite ?fields=)
+    GET /api/geografia/zonas/{id}/personas/conteo/
+    """
+    nodo_tipo = None
+    # Las acciones exponen personas: exigen el permiso de esa aplicación
+    aplicacion = 'personas'
+
+    def _personas(self, pk):
+        # Sin get_object(): ?fields= se refiere a Persona, no al serializer del nodo
+        nodo = get_object_or_404(self.get_queryset(), pk=pk)
+        return nodo.pk, personas_por_nodo(self.nodo_tipo, nodo.pk)
+
+    @action(detail=True, methods=['get'], url_path='personas', permission_classes=[IsAuthenticated, PermisoAplicacion])
+    def personas(self, request, pk=None):
+        _, personas = self._personas(pk)
+        page = self.paginate_queryset(personas.order_by('pk'))
+        serializer = PersonaSerializer(page, many=True, context=self.get_serializer_context())
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=True, methods=['get'], url_path='personas/conteo', permission_classes=[IsAuthenticated, PermisoAplicacion])
+    def personas_conteo(self, request, pk=None):
+        nodo_id, personas = self._personas(pk)
+        return Response({'tipo': self.nodo_tipo, 'id': nodo_id, 'personas': personas.count()})
+
+class ZonaViewSet(MetricsMixin, JerarquiaPersonasMixin, ConditionalGetMixin, CatalogCacheMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Zona.objects.all()
     serializer_class = ZonaSerializer
+    nodo_tipo = ZONA
 
-class DistritoViewSet(viewsets.ModelViewSet):
+class DistritoViewSet(MetricsMixin, JerarquiaPersonasMixin, ConditionalGetMixin, CatalogCacheMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Distrito.objects.all()
     serializer_class = DistritoSerializer
+    nodo_tipo = DISTRITO
 
-class GrupoViewSet(viewsets.ModelViewSet):
+class GrupoViewSet(MetricsMixin, JerarquiaPersonasMixin, ConditionalGetMixin, CatalogCacheMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Grupo.objects.all()
     serializer_class = GrupoSerializer
+    nodo_tipo = GRUPO
+
+class ArbolGeograficoViewSet(MetricsMixin, viewsets.ViewSet):
+    """
+    GET /api/geografia/arbol/
+
+    Regiones, provincias y comunas vigentes anidadas en una sola respuesta,
+    servida desde memoria (ver geografia/arbol.py). ETag = version del árbol.
+    """
+    def list(self, request):
+        arbol = get_arbol()
+        not_modified = get_conditional_response(request, etag=arbol.etag)
+        if not_modified is not None:
+            not_modified['ETag'] = arbol.etag
+            return not_modified
+        response = HttpResponse(arbol.contenido, content_type='application/json')
+        response['ETag'] = arbol.etag
+        return response
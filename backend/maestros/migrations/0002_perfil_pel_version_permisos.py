@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 11:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('maestros', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='perfil',
+            name='pel_version_permisos',
+            field=models.BigIntegerField(default=0),
+        ),
+    ]
@@ -19,6 +19,8 @@ class Perfil(models.Model):
     pel_id = models.AutoField(primary_key=True)
     pel_descripcion = models.CharField(max_length=50)
     pel_vigente = models.BooleanField()
+    # Versión de los permisos del perfil embebidos en el JWT (usuarios/permisos.py)
+    pel_version_permisos = models.BigIntegerField(default=0)
 
     class Meta:
         db_table = 'perfil'
@@ -1,78 +1,88 @@
 from rest_framework import serializers
+from scout_project.fieldsets import DynamicFieldsMixin, expandable
 from .models import EstadoCivil, Cargo, Nivel, Rama, Rol, TipoArchivo, TipoCurso, Alimentacion, ConceptoContable
 from geografia.models import Region, Provincia, Comuna, Zona, Distrito, Grupo
 
-class RegionSerializer(serializers.ModelSerializer):
+class RegionSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Region
         fields = '__all__'
 
-class ProvinciaSerializer(serializers.ModelSerializer):
+class ProvinciaSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Provincia
         fields = '__all__'
 
-class ComunaSerializer(serializers.ModelSerializer):
+class ComunaSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Comuna
         fields = '__all__'
 
-class ZonaSerializer(serializers.ModelSerializer):
+class ZonaSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Zona
         fields = '__all__'
 
-class DistritoSerializer(serializers.ModelSerializer):
+class DistritoSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Distrito
         fields = '__all__'
 
-class GrupoSerializer(serializers.ModelSerializer):
+class GrupoSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Grupo
         fields = '__all__'
 
-class EstadoCivilSerializer(serializers.ModelSerializer):
+@expandable
+class EstadoCivilSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = EstadoCivil
         fields = '__all__'
 
-class CargoSerializer(serializers.ModelSerializer):
+@expandable
+class CargoSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Cargo
         fields = '__all__'
 
-class NivelSerializer(serializers.ModelSerializer):
+@expandable
+class NivelSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Nivel
         fields = '__all__'
 
-class RamaSerializer(serializers.ModelSerializer):
+@expandable
+class RamaSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Rama
         fields = '__all__'
 
-class RolSerializer(serializers.ModelSerializer):
+@expandable
+class RolSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Rol
         fields = '__all__'
 
-class TipoArchivoSerializer(serializers.ModelSerializer):
+@expandable
+class TipoArchivoSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = TipoArchivo
         fields = '__all__'
 
-class TipoCursoSerializer(serializers.ModelSerializer):
+@expandable
+class TipoCursoSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = TipoCurso
         fields = '__all__'
 
-class AlimentacionSerializer(serializers.ModelSerializer):
+@expandable
+class AlimentacionSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Alimentacion
         fields = '__all__'
 
-class ConceptoContableSerializer(serializers.ModelSerializer):
+@expandable
+class ConceptoContableSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = ConceptoContable
         fields = '__all__'
@@ -0,0 +1,5 @@
+from scout_project.cache import connect_version_signals
+from .models import EstadoCivil, Cargo, Nivel, Rama, Rol, TipoArchivo, TipoCurso, Alimentacion, ConceptoContable
+
+# Invalidación de la caché de catálogos maestros
+connect_version_signals([EstadoCivil, Cargo, Nivel, Rama, Rol, TipoArchivo, TipoCurso, Alimentacion, ConceptoContable])
@@ -0,0 +1,39 @@
+import pytest
+
+from geografia.models import Region
+from maestros.models import Rama
+
+
+@pytest.mark.django_db
+def test_catalog_list_is_served_from_cache(api_client, django_assert_num_queries):
+    Rama.objects.create(ram_descripcion='Lobatos', ram_vigente=True)
+    first = api_client.get('/api/maestros/ramas/')
+
+    with django_assert_num_queries(0):
+        second = api_client.get('/api/maestros/ramas/')
+
+    assert second.status_code == 200
+    assert second.json() == first.json()
+
+
+@pytest.mark.django_db
+def test_catalog_cache_is_invalidated_on_save_and_delete(api_client, django_capture_on_commit_callbacks):
+    region = Region.objects.create(reg_descripcion='Valparaíso', reg_vigente=True)
+    assert api_client.get('/api/geografia/regiones/').json()['count'] == 1
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Region.objects.create(reg_descripcion='Biobío', reg_vigente=True)
+    assert api_client.get('/api/geografia/regiones/').json()['count'] == 2
+
+    with django_capture_on_commit_callbacks(execute=True):
+        region.delete()
+    assert api_client.get('/api/geografia/regiones/').json()['count'] == 1
+
+
+@pytest.mark.django_db
+def test_catalog_cache_key_includes_query_string(api_client):
+    Rama.objects.create(ram_descripcion='Lobatos', ram_vigente=True)
+    Rama.objects.create(ram_descripcion='Rovers', ram_vigente=True)
+
+    assert api_client.get('/api/maestros/ramas/').json()['count'] == 2
+    assert api_client.get('/api/maestros/ramas/?page=2').status_code == 404
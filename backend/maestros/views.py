@@ -1,81 +1,84 @@
 from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from scout_project.metrics import MetricsMixin
+from scout_project.fieldsets import SparseFieldsMixin
+from scout_project.cache import CatalogCacheMixin, ConditionalGetMixin
 from .models import EstadoCivil, Cargo, Nivel, Rama, Rol, TipoArchivo, TipoCurso, Alimentacion, ConceptoContable
 from geografia.models import Region, Provincia, Comuna, Zona, Distrito, Grupo
 from .serializers import EstadoCivilSerializer, CargoSerializer, NivelSerializer, RamaSerializer, RolSerializer, TipoArchivoSerializer, TipoCursoSerializer, AlimentacionSerializer, ConceptoContableSerializer
 from geografia.serializers import RegionSerializer, ProvinciaSerializer, ComunaSerializer, ZonaSerializer, DistritoSerializer, GrupoSerializer
 
-class RegionViewSet(viewsets.ModelViewSet):
+class RegionViewSet(MetricsMixin, ConditionalGetMixin, CatalogCacheMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Region.objects.all()
     serializer_class = RegionSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
 
-class ProvinciaViewSet(viewsets.ModelViewSet):
+class ProvinciaViewSet(MetricsMixin, ConditionalGetMixin, CatalogCacheMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Provincia.objects.all()
     serializer_class = ProvinciaSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
 
-class ComunaViewSet(viewsets.ModelViewSet):
+class ComunaViewSet(MetricsMixin, ConditionalGetMixin, CatalogCacheMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Comuna.objects.all()
     serializer_class = ComunaSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
 
-class ZonaViewSet(viewsets.ModelViewSet):
+class ZonaViewSet(MetricsMixin, ConditionalGetMixin, CatalogCacheMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Zona.objects.all()
     serializer_class = ZonaSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
 
-class DistritoViewSet(viewsets.ModelViewSet):
+class DistritoViewSet(MetricsMixin, ConditionalGetMixin, CatalogCacheMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Distrito.objects.all()
     serializer_class = DistritoSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
 
-class GrupoViewSet(viewsets.ModelViewSet):
+class GrupoViewSet(MetricsMixin, ConditionalGetMixin, CatalogCacheMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Grupo.objects.all()
     serializer_class = GrupoSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
 
-class EstadoCivilViewSet(viewsets.ModelViewSet):
+class EstadoCivilViewSet(MetricsMixin, ConditionalGetMixin, CatalogCacheMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = EstadoCivil.objects.all()
     serializer_class = EstadoCivilSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
 
-class CargoViewSet(viewsets.ModelViewSet):
+class CargoViewSet(MetricsMixin, ConditionalGetMixin, CatalogCacheMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Cargo.objects.all()
     serializer_class = CargoSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
 
-class NivelViewSet(viewsets.ModelViewSet):
+class NivelViewSet(MetricsMixin, ConditionalGetMixin, CatalogCacheMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Nivel.objects.all()
     serializer_class = NivelSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
 
-class RamaViewSet(viewsets.ModelViewSet):
+class RamaViewSet(MetricsMixin, ConditionalGetMixin, CatalogCacheMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Rama.objects.all()
     serializer_class = RamaSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
 
-class RolViewSet(viewsets.ModelViewSet):
+class RolViewSet(MetricsMixin, ConditionalGetMixin, CatalogCacheMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Rol.objects.all()
     serializer_class = RolSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
 
-class TipoArchivoViewSet(viewsets.ModelViewSet):
+class TipoArchivoViewSet(MetricsMixin, ConditionalGetMixin, CatalogCacheMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = TipoArchivo.objects.all()
     serializer_class = TipoArchivoSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
 
-class TipoCursoViewSet(viewsets.ModelViewSet):
+class TipoCursoViewSet(MetricsMixin, ConditionalGetMixin, CatalogCacheMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = TipoCurso.objects.all()
     serializer_class = TipoCursoSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
 
-class AlimentacionViewSet(viewsets.ModelViewSet):
+class AlimentacionViewSet(MetricsMixin, ConditionalGetMixin, CatalogCacheMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Alimentacion.objects.all()
     serializer_class = AlimentacionSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
 
-class ConceptoContableViewSet(viewsets.ModelViewSet):
+class ConceptoContableViewSet(MetricsMixin, ConditionalGetMixin, CatalogCacheMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = ConceptoContable.objects.all()
     serializer_class = ConceptoContableSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
@@ -0,0 +1,187 @@
+"""
+Conciliación de pagos por curso y persona
+
+Cruza en unas pocas consultas agrupadas lo que debe cada inscrito (la cuota
+según su alimentación), lo pagado (ingresos menos egresos), los prepagos
+vigentes aún no aplicados a un pago y lo respaldado por comprobantes.
+El resultado puede materializarse en ResumenPago, que se actualiza por
+persona y curso cada vez que cambia un pago (ver signals.py).
+"""
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, Exists, F, OuterRef, Q, Sum
+from django.utils import timezone
+
+from cursos.models import Curso, CursoCuota
+from personas.models import PersonaCurso
+from scout_project.db import opciones_upsert
+from .models import PagoPersona, PagoComprobante, ComprobantePago, Prepago, ResumenPago
+
+CERO = Decimal('0')
+# pap_tipo
+TIPO_INGRESO = 1
+TIPO_EGRESO = 2
+# cuu_tipo / ali_tipo
+CUOTA_CON_ALMUERZO = 1
+CUOTA_SIN_ALMUERZO = 2
+
+CAMPOS_MONTO = ('adeudado', 'pagado', 'prepagado', 'comprobado', 'saldo')
+
+
+def _filtrar(queryset, campo_curso, campo_persona, cursos, personas):
+    if cursos is not None:
+        queryset = queryset.filter(**{f'{campo_curso}__in': cursos})
+    if personas is not None:
+        queryset = queryset.filter(**{f'{campo_persona}__in': personas})
+    return queryset
+
+
+def cuotas_vigentes(cursos=None, fecha=None):
+    """
+    Cuota por curso y tipo de alimentación: {cur_id: {tipo: valor}}.
+
+    La última CursoCuota ya vigente de cada tipo reemplaza el valor base del curso.
+    """
+    fecha = fecha or timezone.now()
+    cuotas = {
+        cur_id: {CUOTA_CON_ALMUERZO: con_almuerzo, CUOTA_SIN_ALMUERZO: sin_almuerzo}
+        for cur_id, con_almuerzo, sin_almuerzo in _filtrar(Curso.objects.all(), 'cur_id', None, cursos, None)
+        .values_list('cur_id', 'cur_cuota_con_almuerzo', 'cur_cuota_sin_almuerzo')
+    }
+    vigentes = _filtrar(CursoCuota.objects.filter(cuu_fecha__lte=fecha), 'cur_id', None, cursos, None)
+    for cur_id, tipo, valor in vigentes.order_by('cur_id', 'cuu_tipo', 'cuu_fecha', 'cuu_id').values_list(
+            'cur_id', 'cuu_tipo', 'cuu_valor'):
+        cuotas.setdefault(cur_id, {})[tipo] = valor
+    return cuotas
+
+
+def conciliar(cursos=None, personas=None):
+    """
+    Calcula la conciliación por (cur_id, per_id).
+
+    Sin filtros recorre todos los cursos. saldo = adeudado - pagado - prepagado:
+    positivo es deuda, negativo saldo a favor. Los prepagos asociados a un pago
+    ya están contados en pagado.
+    """
+    filas = {}
+
+    def fila(cur_id, per_id):
+        if (cur_id, per_id) not in filas:
+            filas[cur_id, per_id] = {
+                'cur_id': cur_id, 'per_id': per_id, 'adeudado': CERO, 'pagado': CERO, 'prepagado': CERO,
+                'comprobado': CERO, 'pagos': 0, 'pagos_sin_comprobante': 0,
+            }
+        return filas[cur_id, per_id]
+
+    cuotas = cuotas_vigentes(cursos)
+    inscripciones = _filtrar(PersonaCurso.objects.all(), 'cus_id__cur_id', 'per_id', cursos, personas)
+    for item in inscripciones.values(cur=F('cus_id__cur_id'), per=F('per_id'), tipo=F('ali_id__ali_tipo')).annotate(
+            total=Count('pec_id')).order_by():
+        cuota = cuotas.get(item['cur'], {}).get(item['tipo'], CERO)
+        fila(item['cur'], item['per'])['adeudado'] += cuota * item['total']
+
+    tiene_comprobante = Exists(PagoComprobante.objects.filter(pap_id=OuterRef('pk')))
+    pagos = _filtrar(PagoPersona.objects.all(), 'cur_id', 'per_id', cursos, personas)
+    for item in pagos.values('cur_id', 'per_id').annotate(
+            ingresos=Sum('pap_valor', filter=Q(pap_tipo=TIPO_INGRESO)),
+            egresos=Sum('pap_valor', filter=Q(pap_tipo=TIPO_EGRESO)),
+            total=Count('pap_id'),
+            sin_comprobante=Count('pap_id', filter=~Q(tiene_comprobante))).order_by():
+        actual = fila(item['cur_id'], item['per_id'])
+        actual['pagado'] = (item['ingresos'] or CERO) - (item['egresos'] or CERO)
+        actual['pagos'] = item['total']
+        actual['pagos_sin_comprobante'] = item['sin_comprobante']
+
+    prepagos = _filtrar(Prepago.objects.filter(ppa_vigente=True, pap_id__isnull=True), 'cur_id', 'per_id',
+                        cursos, personas)
+    for item in prepagos.values('cur_id', 'per_id').annotate(total=Sum('ppa_valor')).order_by():
+        fila(item['cur_id'], item['per_id'])['prepagado'] = item['total']
+
+    comprobantes = _filtrar(ComprobantePago.objects.all(), 'pec_id__cus_id__cur_id', 'pec_id__per_id',
+                            cursos, personas)
+    for item in comprobantes.values(cur=F('pec_id__cus_id__cur_id'), per=F('pec_id__per_id')).annotate(
+            total=Sum('cpa_valor')).order_by():
+        fila(item['cur'], item['per'])['comprobado'] = item['total']
+
+    for actual in filas.values():
+        actual['saldo'] = actual['adeudado'] - actual['pagado'] - actual['prepagado']
+    return filas
+
+
+def totales_por_curso(filas):
+    """Suma las filas de conciliar() por curso"""
+    cursos = {}
+    for actual in filas:
+        total = cursos.setdefault(actual['cur_id'], {
+            'cur_id': actual['cur_id'], 'personas': 0, 'deudores': 0, 'pagos': 0, 'pagos_sin_comprobante': 0,
+            **{campo: CERO for campo in CAMPOS_MONTO},
+        })
+        total['personas'] += 1
+        total['deudores'] += actual['saldo'] > 0
+        total['pagos'] += actual['pagos']
+        total['pagos_sin_comprobante'] += actual['pagos_sin_comprobante']
+        for campo in CAMPOS_MONTO:
+            total[campo] += actual[campo]
+    return list(cursos.values())
+
+
+def _a_resumen(actual):
+    return ResumenPago(
+        cur_id_id=actual['cur_id'], per_id_id=actual['per_id'],
+        rpa_adeudado=actual['adeudado'], rpa_pagado=actual['pagado'], rpa_prepagado=actual['prepagado'],
+        rpa_comprobado=actual['comprobado'], rpa_saldo=actual['saldo'], rpa_pagos=actual['pagos'],
+        rpa_pagos_sin_comprobante=actual['pagos_sin_comprobante'], rpa_fecha_hora=timezone.now(),
+    )
+
+
+def _guardar(filas):
+    ResumenPago.objects.bulk_create(
+        [_a_resumen(actual) for actual in filas], batch_size=1000,
+        **opciones_upsert(ResumenPago, ['cur_id', 'per_id'], [
+            'rpa_adeudado', 'rpa_pagado', 'rpa_prepagado', 'rpa_comprobado', 'rpa_saldo', 'rpa_pagos',
+            'rpa_pagos_sin_comprobante', 'rpa_fecha_hora',
+        ]),
+    )
+
+
+def actualizar_resumen(pares):
+    """
+    Recalcula ResumenPago sólo para los pares (cur_id, per_id) indicados.
+
+    Es la actualización incremental tras registrar o modificar pagos; los pares
+    que ya no tienen movimientos se eliminan del resumen.
+    """
+    pares = set(pares)
+    if not pares:
+        return
+    filas = conciliar(cursos={cur for cur, _ in pares}, personas={per for _, per in pares})
+    with transaction.atomic():
+        _guardar([filas[par] for par in pares if par in filas])
+        vacios = pares - filas.keys()
+        if vacios:
+            condicion = Q()
+            for cur_id, per_id in vacios:
+                condicion |= Q(cur_id=cur_id, per_id=per_id)
+            ResumenPago.objects.filter(condicion).delete()
+
+
+def refrescar_resumen(cursos=None):
+    """Reconstruye ResumenPago completo (o de los cursos indicados) y devuelve las filas"""
+    filas = conciliar(cursos=cursos)
+    with transaction.atomic():
+        _filtrar(ResumenPago.objects.all(), 'cur_id', None, cursos, None).delete()
+        _guardar(filas.values())
+    return filas
+
+
+def leer_resumen(cursos=None):
+    """Filas de conciliación desde la tabla materializada, con las mismas claves que conciliar()"""
+    return {
+        (resumen['cur_id'], resumen['per_id']): resumen
+        for resumen in _filtrar(ResumenPago.objects.all(), 'cur_id', None, cursos, None).values(
+            'cur_id', 'per_id', adeudado=F('rpa_adeudado'), pagado=F('rpa_pagado'), prepagado=F('rpa_prepagado'),
+            comprobado=F('rpa_comprobado'), saldo=F('rpa_saldo'), pagos=F('rpa_pagos'),
+            pagos_sin_comprobante=F('rpa_pagos_sin_comprobante'),
+        )
+    }
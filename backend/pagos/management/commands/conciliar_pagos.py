@@ -0,0 +1,53 @@
+"""
+Management command to reconcile course payments
+Usage: python manage.py conciliar_pagos [--curso 1 --curso 2] [--detalle] [--materializar]
+
+Calcula por curso lo adeudado, pagado, prepagado, comprobado y el saldo con
+consultas agrupadas. Con --materializar reconstruye la tabla resumen_pago
+(útil al activar PAGOS_RESUMEN_MATERIALIZADO o tras cargas sin signals).
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from pagos.conciliacion import conciliar, refrescar_resumen, totales_por_curso
+
+
+class Command(BaseCommand):
+    help = 'Reconcile payments, prepayments and receipts against course fees'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--curso', type=int, action='append', help='Course id (repeatable, default: all)')
+        parser.add_argument('--detalle', action='store_true', help='Also list every person with a non-zero balance')
+        parser.add_argument('--materializar', action='store_true',
+                            help='Rebuild the resumen_pago table with the computed rows')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        if options['materializar']:
+            filas = refrescar_resumen(options['curso'])
+        else:
+            filas = conciliar(cursos=options['curso'])
+        elapsed = time.perf_counter() - started
+        cursos = sorted(totales_por_curso(filas.values()), key=lambda total: total['cur_id'])
+
+        self.stdout.write(self.style.SUCCESS('=' * 60))
+        self.stdout.write(self.style.SUCCESS(
+            f'Reconciled {len(filas)} person/course rows in {len(cursos)} courses ({elapsed:.2f} s)'
+        ))
+        self.stdout.write(self.style.SUCCESS('=' * 60))
+        self.stdout.write(f"{'curso':>6} {'personas':>8} {'adeudado':>14} {'pagado':>14} {'prepagado':>12} "
+                          f"{'saldo':>14} {'sin comp.':>9}")
+        for total in cursos:
+            self.stdout.write(
+                f"{total['cur_id']:>6} {total['personas']:>8} {total['adeudado']:>14,.0f} {total['pagado']:>14,.0f} "
+                f"{total['prepagado']:>12,.0f} {total['saldo']:>14,.0f} {total['pagos_sin_comprobante']:>9}"
+            )
+
+        if options['detalle']:
+            for fila in sorted(filas.values(), key=lambda fila: (fila['cur_id'], fila['per_id'])):
+                if fila['saldo']:
+                    self.stdout.write(f"  curso {fila['cur_id']} persona {fila['per_id']}: saldo {fila['saldo']:,.0f}")
+        if options['materializar']:
+            self.stdout.write(self.style.SUCCESS('resumen_pago rebuilt'))
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-18 10:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pagos', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comprobantepago',
+            index=models.Index(fields=['pec_id', 'cpa_fecha'], name='comprobante_pec_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pagopersona',
+            index=models.Index(fields=['cur_id', 'per_id', 'pap_valor'], name='pago_persona_cur_per_idx'),
+        ),
+    ]
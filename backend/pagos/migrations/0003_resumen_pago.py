@@ -0,0 +1,39 @@
+# Generated by Django 5.2.8 on 2026-10-18 10:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cursos', '0001_initial'),
+        ('pagos', '0002_indices_consultas'),
+        ('personas', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumenPago',
+            fields=[
+                ('rpa_id', models.AutoField(primary_key=True, serialize=False)),
+                ('rpa_adeudado', models.DecimalField(decimal_places=6, max_digits=21)),
+                ('rpa_pagado', models.DecimalField(decimal_places=6, max_digits=21)),
+                ('rpa_prepagado', models.DecimalField(decimal_places=6, max_digits=21)),
+                ('rpa_comprobado', models.DecimalField(decimal_places=6, max_digits=21)),
+                ('rpa_saldo', models.DecimalField(decimal_places=6, max_digits=21)),
+                ('rpa_pagos', models.IntegerField()),
+                ('rpa_pagos_sin_comprobante', models.IntegerField()),
+                ('rpa_fecha_hora', models.DateTimeField()),
+                ('cur_id', models.ForeignKey(db_column='cur_id', on_delete=django.db.models.deletion.CASCADE, to='cursos.curso')),
+                ('per_id', models.ForeignKey(db_column='per_id', on_delete=django.db.models.deletion.CASCADE, to='personas.persona')),
+            ],
+            options={
+                'verbose_name': 'Resumen de Pagos',
+                'verbose_name_plural': 'Resúmenes de Pagos',
+                'db_table': 'resumen_pago',
+                'indexes': [models.Index(fields=['cur_id', 'rpa_saldo'], name='resumen_pago_cur_saldo_idx')],
+                'unique_together': {('cur_id', 'per_id')},
+            },
+        ),
+    ]
@@ -27,6 +27,10 @@ class PagoPersona(models.Model):
         db_table = 'pago_persona'
         verbose_name = 'Pago de Persona'
         verbose_name_plural = 'Pagos de Personas'
+        indexes = [
+            # Pagos de una persona en un curso; pap_valor hace el índice cubriente para SUM()
+            models.Index(fields=['cur_id', 'per_id', 'pap_valor'], name='pago_persona_cur_per_idx'),
+        ]
 
     def __str__(self):
         return f"Pago {self.pap_id} de {self.per_id} por {self.pap_valor}"
@@ -54,6 +58,10 @@ class ComprobantePago(models.Model):
         db_table = 'comprobante_pago'
         verbose_name = 'Comprobante de Pago'
         verbose_name_plural = 'Comprobantes de Pago'
+        indexes = [
+            # Comprobantes de una inscripción ordenados por fecha
+            models.Index(fields=['pec_id', 'cpa_fecha'], name='comprobante_pec_fecha_idx'),
+        ]
 
     def __str__(self):
         return f"Comprobante {self.cpa_numero} ({self.cpa_valor})"
@@ -121,3 +129,41 @@ class Prepago(models.Model):
 
     def __str__(self):
         return f"Prepago {self.ppa_id} de {self.per_id} por {self.ppa_valor} para {self.cur_id}"
+
+# Tabla: resumen_pago (conciliación materializada por persona y curso, ver pagos/conciliacion.py)
+class ResumenPago(models.Model):
+    # rpa_id: Identificador único del resumen (clave primaria)
+    rpa_id = models.AutoField(primary_key=True)
+    # cur_id: Clave foránea a Curso
+    cur_id = models.ForeignKey(Curso, on_delete=models.CASCADE, db_column='cur_id')
+    # per_id: Clave foránea a Persona
+    per_id = models.ForeignKey('personas.Persona', on_delete=models.CASCADE, db_column='per_id')
+    # rpa_adeudado: Cuotas de las inscripciones de la persona en el curso
+    rpa_adeudado = models.DecimalField(max_digits=21, decimal_places=6)
+    # rpa_pagado: Ingresos menos egresos registrados en PagoPersona
+    rpa_pagado = models.DecimalField(max_digits=21, decimal_places=6)
+    # rpa_prepagado: Prepagos vigentes aún no asociados a un pago
+    rpa_prepagado = models.DecimalField(max_digits=21, decimal_places=6)
+    # rpa_comprobado: Total de comprobantes emitidos para las inscripciones
+    rpa_comprobado = models.DecimalField(max_digits=21, decimal_places=6)
+    # rpa_saldo: adeudado - pagado - prepagado (positivo = deuda)
+    rpa_saldo = models.DecimalField(max_digits=21, decimal_places=6)
+    # rpa_pagos: Cantidad de pagos registrados
+    rpa_pagos = models.IntegerField()
+    # rpa_pagos_sin_comprobante: Pagos sin comprobante asociado
+    rpa_pagos_sin_comprobante = models.IntegerField()
+    # rpa_fecha_hora: Fecha y hora del último recálculo
+    rpa_fecha_hora = models.DateTimeField()
+
+    class Meta:
+        db_table = 'resumen_pago'
+        verbose_name = 'Resumen de Pagos'
+        verbose_name_plural = 'Resúmenes de Pagos'
+        unique_together = ('cur_id', 'per_id')
+        indexes = [
+            # Deudores de un curso
+            models.Index(fields=['cur_id', 'rpa_saldo'], name='resumen_pago_cur_saldo_idx'),
+        ]
+
+    def __str__(self):
+        return f"Resumen {self.cur_id} / {self.per_id}: saldo {self.rpa_saldo}"
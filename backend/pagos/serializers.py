@@ -1,32 +1,82 @@
+from decimal import Decimal
+
 from rest_framework import serializers
+from scout_project.fieldsets import DynamicFieldsMixin, expandable
+from usuarios.permisos import UsuarioActualDefault
 from .models import PagoPersona, ComprobantePago, PagoComprobante, PagoCambioPersona, Prepago
 
 
-class PagoPersonaSerializer(serializers.ModelSerializer):
+@expandable
+class PagoPersonaSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = PagoPersona
         fields = '__all__'
 
 
-class ComprobantePagoSerializer(serializers.ModelSerializer):
+@expandable
+class ComprobantePagoSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = ComprobantePago
         fields = '__all__'
 
 
-class PagoComprobanteSerializer(serializers.ModelSerializer):
+class PagoComprobanteSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = PagoComprobante
         fields = '__all__'
 
 
-class PagoCambioPersonaSerializer(serializers.ModelSerializer):
+class PagoCambioPersonaSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = PagoCambioPersona
         fields = '__all__'
 
 
-class PrepagoSerializer(serializers.ModelSerializer):
+class PrepagoSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Prepago
         fields = '__all__'
+
+
+class ConciliacionPersonaSerializer(serializers.Serializer):
+    cur_id = serializers.IntegerField()
+    per_id = serializers.IntegerField()
+    adeudado = serializers.DecimalField(max_digits=21, decimal_places=6)
+    pagado = serializers.DecimalField(max_digits=21, decimal_places=6)
+    prepagado = serializers.DecimalField(max_digits=21, decimal_places=6)
+    comprobado = serializers.DecimalField(max_digits=21, decimal_places=6)
+    saldo = serializers.DecimalField(max_digits=21, decimal_places=6)
+    pagos = serializers.IntegerField()
+    pagos_sin_comprobante = serializers.IntegerField()
+
+
+class ConciliacionCursoSerializer(ConciliacionPersonaSerializer):
+    per_id = None
+    personas = serializers.IntegerField()
+    deudores = serializers.IntegerField()
+
+
+class ComprobanteLoteSerializer(serializers.Serializer):
+    coc_id = serializers.IntegerField()
+    cpa_numero = serializers.IntegerField()
+    cpa_fecha = serializers.DateField(required=False)
+    # Por defecto el valor del pago
+    cpa_valor = serializers.DecimalField(max_digits=21, decimal_places=6, required=False)
+
+
+class PagoLoteItemSerializer(serializers.Serializer):
+    per_id = serializers.IntegerField()
+    cur_id = serializers.IntegerField()
+    pap_tipo = serializers.ChoiceField(choices=[(1, 'Ingreso'), (2, 'Egreso')], default=1)
+    pap_valor = serializers.DecimalField(max_digits=21, decimal_places=6, min_value=Decimal('0'))
+    pap_observacion = serializers.CharField(max_length=100, required=False, allow_null=True, allow_blank=True)
+    pap_fecha_hora = serializers.DateTimeField(required=False)
+    comprobante = ComprobanteLoteSerializer(required=False)
+
+
+class PagoLoteSerializer(serializers.Serializer):
+    # Autor de los pagos: el usuario del token, no un valor del cuerpo
+    usu_id = serializers.HiddenField(default=UsuarioActualDefault())
+    # Cada ítem se valida por separado para informar errores por posición
+    pagos = serializers.ListField(child=serializers.DictField(), allow_empty=False, max_length=5000)
+    atomico = serializers.BooleanField(default=False)
@@ -0,0 +1,147 @@
+"""
+Registro masivo de pagos
+
+registrar_pagos() valida los ítems en memoria contra mapas de personas,
+cursos, conceptos e inscripciones obtenidos con una consulta cada uno, e
+inserta pagos, comprobantes y sus vínculos con bulk_create en una sola
+transacción. Devuelve un resultado por ítem en el orden recibido.
+"""
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from cursos.models import Curso
+from cursos.resumen import programar_resumen
+from maestros.models import ConceptoContable
+from personas.models import Persona, PersonaCurso
+from .conciliacion import actualizar_resumen
+from .models import PagoPersona, ComprobantePago, PagoComprobante
+from .serializers import PagoLoteItemSerializer
+
+LOTE_INSERT = 1000
+
+
+def _validar_forma(items):
+    # Una sola instancia: DRF copia los campos del serializer en cada instanciación
+    serializer = PagoLoteItemSerializer()
+    validos, errores = {}, {}
+    for indice, item in enumerate(items):
+        try:
+            validos[indice] = serializer.run_validation(item)
+        except ValidationError as exc:
+            errores[indice] = exc.detail
+    return validos, errores
+
+
+def _validar_referencias(validos, errores):
+    """Verifica FKs e inscripciones con un mapa por tabla en vez de una consulta por ítem"""
+    per_ids = {item['per_id'] for item in validos.values()}
+    cur_ids = {item['cur_id'] for item in validos.values()}
+    personas = set(Persona.objects.filter(pk__in=per_ids).values_list('pk', flat=True))
+    cursos = set(Curso.objects.filter(pk__in=cur_ids).values_list('pk', flat=True))
+    conceptos = set(ConceptoContable.objects.filter(
+        pk__in={item['comprobante']['coc_id'] for item in validos.values() if 'comprobante' in item},
+        coc_vigente=True,
+    ).values_list('pk', flat=True))
+    inscripciones = {}
+    if any('comprobante' in item for item in validos.values()):
+        for pec_id, per_id, cur_id in PersonaCurso.objects.filter(
+                per_id__in=per_ids, cus_id__cur_id__in=cur_ids).order_by('pec_id').values_list(
+                'pec_id', 'per_id', 'cus_id__cur_id'):
+            inscripciones.setdefault((per_id, cur_id), pec_id)
+
+    for indice, item in list(validos.items()):
+        error = {}
+        if item['per_id'] not in personas:
+            error['per_id'] = ['La persona no existe.']
+        if item['cur_id'] not in cursos:
+            error['cur_id'] = ['El curso no existe.']
+        comprobante = item.get('comprobante')
+        if comprobante and not error:
+            if comprobante['coc_id'] not in conceptos:
+                error['comprobante'] = {'coc_id': ['El concepto contable no existe o no está vigente.']}
+            elif (item['per_id'], item['cur_id']) not in inscripciones:
+                error['comprobante'] = {'pec_id': ['La persona no está inscrita en el curso.']}
+            else:
+                comprobante['pec_id'] = inscripciones[item['per_id'], item['cur_id']]
+        if error:
+            errores[indice] = error
+            del validos[indice]
+
+
+def _insertar(objetos):
+    """
+    bulk_create con los pks asignados a cada objeto.
+
+    Backends que no devuelven pks en inserciones múltiples (MySQL) bloquean el
+    final del índice de la pk (next-key lock sobre la última fila) antes de
+    insertar, de modo que ningún otro INSERT entra en el rango, y releen los
+    pks mayores al máximo previo. Debe llamarse dentro de una transacción.
+    """
+    if not objetos:
+        return
+    model = type(objetos[0])
+    if connection.features.can_return_rows_from_bulk_insert:
+        model.objects.bulk_create(objetos, batch_size=LOTE_INSERT)
+        return
+    previo = model.objects.select_for_update().order_by('-pk').values_list('pk', flat=True).first() or 0
+    model.objects.bulk_create(objetos, batch_size=LOTE_INSERT)
+    pks = list(model.objects.filter(pk__gt=previo).order_by('pk').values_list('pk', flat=True)[:len(objetos) + 1])
+    if len(pks) != len(objetos):
+        # Otra transacción insertó en el rango (p. ej. sin gap locks en READ COMMITTED): se revierte el lote
+        raise DatabaseError(f'No fue posible asociar los pks insertados en {model._meta.db_table}.')
+    for objeto, pk in zip(objetos, pks):
+        objeto.pk = pk
+
+
+def registrar_pagos(items, usuario, atomico=False):
+    """
+    Registra un lote de pagos con sus comprobantes opcionales.
+
+    Con atomico=True un solo error impide insertar el lote completo. Retorna
+    {'resultados': [...], 'creados': n, 'errores': n}; cada resultado tiene
+    indice y pap_id/cpa_id o errores.
+    """
+    validos, errores = _validar_forma(items)
+    if validos:
+        _validar_referencias(validos, errores)
+
+    creados = {}
+    if validos and not (atomico and errores):
+        ahora = timezone.now()
+        pagos, comprobantes = {}, {}
+        for indice, item in validos.items():
+            pagos[indice] = PagoPersona(
+                per_id_id=item['per_id'], cur_id_id=item['cur_id'], usu_id=usuario,
+                pap_fecha_hora=item.get('pap_fecha_hora', ahora), pap_tipo=item['pap_tipo'],
+                pap_valor=item['pap_valor'], pap_observacion=item.get('pap_observacion'),
+            )
+            comprobante = item.get('comprobante')
+            if comprobante:
+                comprobantes[indice] = ComprobantePago(
+                    usu_id=usuario, pec_id_id=comprobante['pec_id'], coc_id_id=comprobante['coc_id'],
+                    cpa_fecha_hora=ahora, cpa_fecha=comprobante.get('cpa_fecha', timezone.localdate(ahora)),
+                    cpa_numero=comprobante['cpa_numero'], cpa_valor=comprobante.get('cpa_valor', item['pap_valor']),
+                )
+
+        with transaction.atomic():
+            _insertar(list(pagos.values()))
+            _insertar(list(comprobantes.values()))
+            PagoComprobante.objects.bulk_create(
+                [PagoComprobante(pap_id=pagos[indice], cpa_id=comprobante) for indice, comprobante in comprobantes.items()],
+                batch_size=LOTE_INSERT,
+            )
+            if settings.PAGOS_RESUMEN_MATERIALIZADO:
+                actualizar_resumen({(pago.cur_id_id, pago.per_id_id) for pago in pagos.values()})
+            programar_resumen({pago.cur_id_id for pago in pagos.values()})
+
+        for indice, pago in pagos.items():
+            creados[indice] = {'indice': indice, 'pap_id': pago.pk,
+                               'cpa_id': comprobantes[indice].pk if indice in comprobantes else None}
+
+    resultados = [
+        creados.get(indice) or {'indice': indice, 'errores': errores.get(indice, {})}
+        for indice in range(len(items))
+    ]
+    return {'resultados': resultados, 'creados': len(creados), 'errores': len(errores)}
@@ -0,0 +1,71 @@
+"""
+Actualización incremental de ResumenPago
+
+Sólo actúa con PAGOS_RESUMEN_MATERIALIZADO activo. Cada cambio recalcula los
+pares (curso, persona) afectados, incluido el par anterior si el registro se
+movió de curso o persona. Las cargas masivas que no emiten signals deben
+llamar a conciliacion.actualizar_resumen con los pares que tocaron.
+"""
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from cursos.models import Curso, CursoCuota
+from personas.models import PersonaCurso
+from .conciliacion import actualizar_resumen, refrescar_resumen
+from .models import PagoPersona, PagoComprobante, ComprobantePago, Prepago
+
+MODELOS_PAGO = (PagoPersona, Prepago, PersonaCurso, ComprobantePago, PagoComprobante)
+
+
+def par_afectado(instance):
+    """(cur_id, per_id) al que corresponde un registro de pago, prepago, inscripción o comprobante"""
+    if isinstance(instance, (PagoPersona, Prepago)):
+        return instance.cur_id_id, instance.per_id_id
+    if isinstance(instance, PersonaCurso):
+        return instance.cus_id.cur_id_id, instance.per_id_id
+    if isinstance(instance, ComprobantePago):
+        return par_afectado(instance.pec_id)
+    return par_afectado(instance.pap_id)
+
+
+def _materializado():
+    return settings.PAGOS_RESUMEN_MATERIALIZADO
+
+
+def guardar_par_anterior(sender, instance, raw=False, **kwargs):
+    if raw or not _materializado() or instance.pk is None:
+        return
+    anterior = sender.objects.filter(pk=instance.pk).first()
+    instance._resumen_par_anterior = par_afectado(anterior) if anterior else None
+
+
+def actualizar_par(sender, instance, raw=False, **kwargs):
+    if raw or not _materializado():
+        return
+    try:
+        pares = {par_afectado(instance)}
+    except ObjectDoesNotExist:
+        # Borrado en cascada: el curso o la inscripción ya no existen y sus resúmenes caen con ellos
+        return
+    anterior = getattr(instance, '_resumen_par_anterior', None)
+    if anterior:
+        pares.add(anterior)
+    actualizar_resumen(pares)
+
+
+for modelo in MODELOS_PAGO:
+    pre_save.connect(guardar_par_anterior, sender=modelo, dispatch_uid=f'resumen_pago_anterior_{modelo.__name__}')
+    post_save.connect(actualizar_par, sender=modelo, dispatch_uid=f'resumen_pago_guardado_{modelo.__name__}')
+    post_delete.connect(actualizar_par, sender=modelo, dispatch_uid=f'resumen_pago_eliminado_{modelo.__name__}')
+
+
+@receiver(post_save, sender=Curso, dispatch_uid='resumen_pago_curso')
+@receiver(post_save, sender=CursoCuota, dispatch_uid='resumen_pago_cuota')
+@receiver(post_delete, sender=CursoCuota, dispatch_uid='resumen_pago_cuota_eliminada')
+def refrescar_curso(sender, instance, created=False, raw=False, **kwargs):
+    """Un cambio de cuota afecta lo adeudado por todos los inscritos del curso"""
+    if raw or created and sender is Curso or not _materializado():
+        return
+    refrescar_resumen([instance.pk if sender is Curso else instance.cur_id_id])
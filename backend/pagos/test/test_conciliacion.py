@@ -0,0 +1,113 @@
+import io
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from cursos.models import CursoCuota
+from maestros.models import ConceptoContable
+from pagos.conciliacion import conciliar, refrescar_resumen, totales_por_curso
+from pagos.models import ComprobantePago, PagoComprobante, PagoPersona, Prepago, ResumenPago
+
+AHORA = datetime(2025, 3, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def pagar(curso, usuario):
+    def make(persona, valor, tipo=1):
+        return PagoPersona.objects.create(per_id=persona, cur_id=curso, usu_id=usuario, pap_fecha_hora=AHORA,
+                                          pap_tipo=tipo, pap_valor=Decimal(valor))
+    return make
+
+
+@pytest.fixture
+def escenario(curso, usuario, persona_factory, inscribir, pagar):
+    """Ana debe 25.000 y pagó todo con comprobante; Beto debe 20.000, pagó 5.000 y tiene 3.000 prepagados"""
+    ana, beto = persona_factory(), persona_factory()
+    inscripcion_ana = inscribir(ana, tipo=1)
+    inscribir(beto, tipo=2)
+    pago_ana = pagar(ana, '30000')
+    pagar(ana, '5000', tipo=2)
+    pagar(beto, '5000')
+    concepto = ConceptoContable.objects.create(coc_descripcion='Cuota', coc_vigente=True)
+    comprobante = ComprobantePago.objects.create(usu_id=usuario, pec_id=inscripcion_ana, coc_id=concepto,
+                                                 cpa_fecha_hora=AHORA, cpa_fecha=AHORA.date(), cpa_numero=1,
+                                                 cpa_valor=Decimal('25000'))
+    PagoComprobante.objects.create(pap_id=pago_ana, cpa_id=comprobante)
+    Prepago.objects.create(per_id=beto, cur_id=curso, ppa_valor=Decimal('3000'), ppa_vigente=True)
+    Prepago.objects.create(per_id=beto, cur_id=curso, ppa_valor=Decimal('9999'), ppa_vigente=False)
+    return ana, beto
+
+
+@pytest.mark.django_db
+def test_conciliacion_por_persona_y_curso(curso, escenario):
+    ana, beto = escenario
+
+    with CaptureQueriesContext(connection) as queries:
+        filas = conciliar(cursos=[curso.pk])
+
+    assert len(queries) == 6
+    assert (filas[curso.pk, ana.pk]['adeudado'], filas[curso.pk, ana.pk]['pagado']) == (25000, 25000)
+    assert filas[curso.pk, ana.pk]['comprobado'] == 25000
+    assert filas[curso.pk, ana.pk]['pagos_sin_comprobante'] == 1
+    assert filas[curso.pk, beto.pk]['prepagado'] == 3000
+    assert filas[curso.pk, beto.pk]['saldo'] == Decimal('12000')
+    total, = totales_por_curso(filas.values())
+    assert (total['personas'], total['deudores'], total['saldo']) == (2, 1, Decimal('12000'))
+
+
+@pytest.mark.django_db
+def test_cuota_vigente_reemplaza_valor_base(curso, persona, inscribir):
+    inscribir(persona, tipo=2)
+    CursoCuota.objects.create(cur_id=curso, cuu_tipo=2, cuu_fecha=AHORA, cuu_valor=Decimal('18000'))
+    CursoCuota.objects.create(cur_id=curso, cuu_tipo=2, cuu_fecha=datetime(2999, 1, 1, tzinfo=timezone.utc),
+                              cuu_valor=Decimal('1'))
+
+    assert conciliar()[curso.pk, persona.pk]['adeudado'] == 18000
+
+
+@pytest.mark.django_db
+def test_resumen_materializado_se_actualiza_con_cada_pago(settings, curso, escenario, pagar, auth_client):
+    ana, beto = escenario
+    settings.PAGOS_RESUMEN_MATERIALIZADO = True
+    call_command('conciliar_pagos', '--materializar', stdout=io.StringIO())
+    assert ResumenPago.objects.get(per_id=beto).rpa_saldo == 12000
+
+    pago = pagar(beto, '12000')
+    assert ResumenPago.objects.get(per_id=beto).rpa_saldo == 0
+    curso.cur_cuota_sin_almuerzo = Decimal('21000')
+    curso.save()
+    assert ResumenPago.objects.get(per_id=beto).rpa_saldo == 1000
+    pago.delete()
+    assert ResumenPago.objects.get(per_id=beto).rpa_saldo == 13000
+
+    response = auth_client.get(f'/api/pagos/conciliacion/?curso={curso.pk}&detalle=1&solo_deudores=1')
+    assert response.status_code == 200
+    data = response.json()
+    assert data['fuente'] == 'resumen'
+    assert data['cursos'][0]['saldo'] == '13000.000000'
+    assert [fila['per_id'] for fila in data['personas']] == [beto.pk]
+    vivo = auth_client.get(f'/api/pagos/conciliacion/?curso={curso.pk}&fuente=vivo').json()
+    assert vivo['cursos'] == data['cursos']
+
+
+@pytest.mark.django_db
+def test_refrescar_resumen_sin_objetivo_de_conflicto_como_mysql(curso, escenario, monkeypatch):
+    ana, beto = escenario
+    # MySQL: ON DUPLICATE KEY UPDATE no admite unique_fields (NotSupportedError si se pasan)
+    monkeypatch.setattr(connection.features, 'supports_update_conflicts_with_target', False)
+
+    refrescar_resumen(cursos=[curso.pk])
+
+    assert ResumenPago.objects.get(per_id=beto).rpa_saldo == 12000
+    assert ResumenPago.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_api_valida_parametros(auth_client):
+    assert auth_client.get('/api/pagos/conciliacion/?curso=x').status_code == 400
+    assert auth_client.get('/api/pagos/conciliacion/?fuente=otra').status_code == 400
+    assert auth_client.get('/api/pagos/conciliacion/').json() == {'fuente': 'vivo', 'cursos': []}
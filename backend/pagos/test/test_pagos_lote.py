@@ -0,0 +1,129 @@
+import time
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from maestros.models import ConceptoContable
+from pagos.models import ComprobantePago, PagoComprobante, PagoPersona, ResumenPago
+from pagos.services import registrar_pagos
+
+URL = '/api/pagos/pagopersonas/lote/'
+
+
+@pytest.fixture
+def concepto(db):
+    return ConceptoContable.objects.create(coc_descripcion='Cuota curso', coc_vigente=True)
+
+
+@pytest.mark.django_db
+def test_lote_con_resultados_por_item(usuario_client, usuario, curso, persona_factory, inscribir, concepto):
+    inscrita, sin_inscripcion = persona_factory(), persona_factory()
+    inscribir(inscrita)
+
+    response = usuario_client.post(URL, {'pagos': [
+        {'per_id': inscrita.pk, 'cur_id': curso.pk, 'pap_valor': '25000',
+         'comprobante': {'coc_id': concepto.pk, 'cpa_numero': 101}},
+        {'per_id': sin_inscripcion.pk, 'cur_id': curso.pk, 'pap_valor': '5000'},
+        {'per_id': sin_inscripcion.pk, 'cur_id': curso.pk, 'pap_valor': '5000',
+         'comprobante': {'coc_id': concepto.pk, 'cpa_numero': 102}},
+        {'per_id': 999999, 'cur_id': curso.pk, 'pap_valor': '1'},
+        {'per_id': inscrita.pk, 'cur_id': curso.pk, 'pap_valor': '-3'},
+    ]}, format='json')
+
+    assert response.status_code == 200
+    data = response.json()
+    assert (data['creados'], data['errores']) == (2, 3)
+    resultados = data['resultados']
+    assert [r['indice'] for r in resultados] == [0, 1, 2, 3, 4]
+    comprobante = ComprobantePago.objects.get(pk=resultados[0]['cpa_id'])
+    assert (comprobante.cpa_numero, comprobante.cpa_valor, comprobante.pec_id.per_id_id) == (101, 25000, inscrita.pk)
+    assert PagoComprobante.objects.filter(pap_id=resultados[0]['pap_id'], cpa_id=comprobante).exists()
+    assert resultados[1]['cpa_id'] is None
+    assert 'pec_id' in resultados[2]['errores']['comprobante']
+    assert 'per_id' in resultados[3]['errores']
+    assert 'pap_valor' in resultados[4]['errores']
+    assert PagoPersona.objects.count() == 2
+    # El autor es el usuario del token
+    assert list(PagoPersona.objects.values_list('usu_id', flat=True).distinct()) == [usuario.pk]
+
+
+@pytest.mark.django_db
+def test_lote_atomico_no_inserta_si_hay_errores(usuario_client, curso, persona):
+    response = usuario_client.post(URL, {'atomico': True, 'pagos': [
+        {'per_id': persona.pk, 'cur_id': curso.pk, 'pap_valor': '1000'},
+        {'per_id': persona.pk, 'cur_id': 999999, 'pap_valor': '1000'},
+    ]}, format='json')
+
+    assert response.status_code == 400
+    assert response.json()['resultados'][1]['errores'] == {'cur_id': ['El curso no existe.']}
+    assert not PagoPersona.objects.exists()
+    assert usuario_client.post(URL, {'pagos': []}, format='json').status_code == 400
+
+
+@pytest.mark.django_db
+def test_lote_exige_usuario_del_sistema(auth_client, usuario, curso, persona):
+    response = auth_client.post(URL, {'usu_id': usuario.pk, 'pagos': [
+        {'per_id': persona.pk, 'cur_id': curso.pk, 'pap_valor': '1000'},
+    ]}, format='json')
+
+    assert response.status_code == 400
+    assert not PagoPersona.objects.exists()
+
+
+@pytest.mark.django_db
+def test_lote_actualiza_resumen_una_vez(settings, usuario, curso, persona_factory, inscribir, concepto):
+    settings.PAGOS_RESUMEN_MATERIALIZADO = True
+    personas = [persona_factory() for _ in range(20)]
+    for persona in personas:
+        inscribir(persona)
+    items = [{'per_id': p.pk, 'cur_id': curso.pk, 'pap_valor': '25000',
+              'comprobante': {'coc_id': concepto.pk, 'cpa_numero': n}} for n, p in enumerate(personas)]
+
+    with CaptureQueriesContext(connection) as queries:
+        resultado = registrar_pagos(items, usuario)
+
+    assert resultado['creados'] == 20
+    # 4 mapas + 3 bulk_create + recálculo del resumen, sin importar el tamaño del lote
+    assert len(queries) < 20
+    assert list(ResumenPago.objects.values_list('rpa_saldo', 'rpa_pagos_sin_comprobante').distinct()) == [(0, 0)]
+
+
+@pytest.mark.slow
+@pytest.mark.django_db
+def test_rendimiento_lote(usuario, curso, persona_factory, inscribir, concepto):
+    personas = [persona_factory() for _ in range(200)]
+    for persona in personas:
+        inscribir(persona)
+    items = [{'per_id': personas[n % 200].pk, 'cur_id': curso.pk, 'pap_valor': '1000',
+              'comprobante': {'coc_id': concepto.pk, 'cpa_numero': n}} for n in range(3000)]
+
+    inicio = time.perf_counter()
+    resultado = registrar_pagos(items, usuario)
+    segundos = time.perf_counter() - inicio
+
+    print(f'\nLote de {len(items)} pagos con comprobante: {segundos:.2f} s ({len(items) / segundos:.0f} filas/s)')
+    assert resultado['creados'] == 3000
+    assert len(items) / segundos > 1000
+
+
+@pytest.mark.django_db
+def test_lote_sin_pks_en_bulk_insert_como_mysql(monkeypatch, usuario, curso, persona_factory, inscribir, concepto):
+    monkeypatch.setattr(type(connection.features), 'can_return_rows_from_bulk_insert', False)
+    personas = [persona_factory() for _ in range(5)]
+    for persona in personas:
+        inscribir(persona)
+    registrar_pagos([{'per_id': personas[0].pk, 'cur_id': curso.pk, 'pap_valor': '1'}], usuario)
+    items = [{'per_id': p.pk, 'cur_id': curso.pk, 'pap_valor': str(1000 * (n + 1)),
+              'comprobante': {'coc_id': concepto.pk, 'cpa_numero': n}} for n, p in enumerate(personas)]
+
+    with CaptureQueriesContext(connection) as queries:
+        resultado = registrar_pagos(items, usuario)
+
+    # bulk_create más la relectura de pks, no un INSERT por fila
+    assert sum(q['sql'].startswith('INSERT') for q in queries) == 3
+    for n, fila in enumerate(resultado['resultados']):
+        pago = PagoPersona.objects.get(pk=fila['pap_id'])
+        assert (pago.per_id_id, pago.pap_valor) == (personas[n].pk, 1000 * (n + 1))
+        assert ComprobantePago.objects.get(pk=fila['cpa_id']).cpa_numero == n
+        assert PagoComprobante.objects.filter(pap_id=pago, cpa_id=fila['cpa_id']).exists()
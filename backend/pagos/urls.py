@@ -6,6 +6,7 @@ from .views import (
     PagoComprobanteViewSet,
     PagoCambioPersonaViewSet,
     PrepagoViewSet,
+    ConciliacionViewSet,
 )
 
 router = DefaultRouter()
@@ -14,6 +15,7 @@ router.register(r'comprobantes', ComprobantePagoViewSet)
 router.register(r'pagocomprobantes', PagoComprobanteViewSet)
 router.register(r'pago-cambios', PagoCambioPersonaViewSet)
 router.register(r'prepagos', PrepagoViewSet)
+router.register(r'conciliacion', ConciliacionViewSet, basename='conciliacion')
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -1,7 +1,20 @@
-from rest_framework import viewsets
+from django.conf import settings
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from scout_project.metrics import MetricsMixin
+from scout_project.fieldsets import SparseFieldsMixin
+from scout_project.pagination import OptionalCursorPagination
+from usuarios.permisos import PermisoAplicacion
+from . import services
+from .conciliacion import conciliar, leer_resumen, totales_por_curso
 from .models import PagoPersona, ComprobantePago, PagoComprobante, PagoCambioPersona, Prepago
 from .serializers import (
+	ConciliacionCursoSerializer,
+	ConciliacionPersonaSerializer,
+	PagoLoteSerializer,
 	PagoPersonaSerializer,
 	ComprobantePagoSerializer,
 	PagoComprobanteSerializer,
@@ -10,31 +23,93 @@ from .serializers import (
 )
 
 
-class PagoPersonaViewSet(viewsets.ModelViewSet):
+class PagoPersonaViewSet(MetricsMixin, SparseFieldsMixin, viewsets.ModelViewSet):
 	queryset = PagoPersona.objects.all()
 	serializer_class = PagoPersonaSerializer
-	permission_classes = [IsAuthenticated]
+	permission_classes = [IsAuthenticated, PermisoAplicacion]
+	aplicacion = 'pagos'
+	pagination_class = OptionalCursorPagination
+	cursor_ordering = '-pk'
 
+	@action(detail=False, methods=['post'], url_path='lote')
+	def lote(self, request):
+		"""
+		Registro masivo de pagos con comprobante opcional
+		POST /api/pagos/pagopersonas/lote/
+		Body: {"atomico": false, "pagos": [{"per_id", "cur_id", "pap_valor", "pap_tipo": opcional,
+		       "pap_observacion": opcional, "comprobante": {"coc_id", "cpa_numero", "cpa_valor": opcional}}]}
+		Los pagos quedan a nombre del usuario del token.
+		"""
+		serializer = PagoLoteSerializer(data=request.data, context={'request': request})
+		serializer.is_valid(raise_exception=True)
+		data = serializer.validated_data
+		resultado = services.registrar_pagos(data['pagos'], data['usu_id'], atomico=data['atomico'])
+		if data['atomico'] and resultado['errores']:
+			return Response(resultado, status=status.HTTP_400_BAD_REQUEST)
+		return Response(resultado, status=status.HTTP_200_OK)
 
-class ComprobantePagoViewSet(viewsets.ModelViewSet):
+
+class ComprobantePagoViewSet(MetricsMixin, SparseFieldsMixin, viewsets.ModelViewSet):
 	queryset = ComprobantePago.objects.all()
 	serializer_class = ComprobantePagoSerializer
-	permission_classes = [IsAuthenticated]
+	permission_classes = [IsAuthenticated, PermisoAplicacion]
+	aplicacion = 'pagos'
+	pagination_class = OptionalCursorPagination
+	cursor_ordering = '-pk'
 
 
-class PagoComprobanteViewSet(viewsets.ModelViewSet):
+class PagoComprobanteViewSet(MetricsMixin, SparseFieldsMixin, viewsets.ModelViewSet):
 	queryset = PagoComprobante.objects.all()
 	serializer_class = PagoComprobanteSerializer
-	permission_classes = [IsAuthenticated]
+	permission_classes = [IsAuthenticated, PermisoAplicacion]
+	aplicacion = 'pagos'
 
 
-class PagoCambioPersonaViewSet(viewsets.ModelViewSet):
+class PagoCambioPersonaViewSet(MetricsMixin, SparseFieldsMixin, viewsets.ModelViewSet):
 	queryset = PagoCambioPersona.objects.all()
 	serializer_class = PagoCambioPersonaSerializer
-	permission_classes = [IsAuthenticated]
+	permission_classes = [IsAuthenticated, PermisoAplicacion]
+	aplicacion = 'pagos'
 
 
-class PrepagoViewSet(viewsets.ModelViewSet):
+class PrepagoViewSet(MetricsMixin, SparseFieldsMixin, viewsets.ModelViewSet):
 	queryset = Prepago.objects.all()
 	serializer_class = PrepagoSerializer
-	permission_classes = [IsAuthenticated]
+	permission_classes = [IsAuthenticated, PermisoAplicacion]
+	aplicacion = 'pagos'
+
+
+class ConciliacionViewSet(MetricsMixin, viewsets.ViewSet):
+	"""
+	GET /api/pagos/conciliacion/?curso=1,2&detalle=1&solo_deudores=1&fuente=vivo
+
+	Totales por curso (y por persona con detalle=1) de adeudado, pagado,
+	prepagado, comprobado y saldo. Con PAGOS_RESUMEN_MATERIALIZADO se lee la
+	tabla resumen_pago; fuente=vivo fuerza el cálculo con las consultas agrupadas.
+	"""
+	permission_classes = [IsAuthenticated, PermisoAplicacion]
+	aplicacion = 'pagos'
+
+	def list(self, request):
+		cursos = None
+		if request.query_params.get('curso'):
+			try:
+				cursos = [int(cur_id) for cur_id in request.query_params['curso'].split(',')]
+			except ValueError:
+				raise ValidationError({'curso': 'Debe ser una lista de ids separados por coma'})
+
+		fuente = request.query_params.get('fuente') or ('resumen' if settings.PAGOS_RESUMEN_MATERIALIZADO else 'vivo')
+		if fuente not in ('vivo', 'resumen'):
+			raise ValidationError({'fuente': 'Valores válidos: vivo, resumen'})
+		filas = list((conciliar(cursos=cursos) if fuente == 'vivo' else leer_resumen(cursos)).values())
+
+		data = {
+			'fuente': fuente,
+			'cursos': ConciliacionCursoSerializer(totales_por_curso(filas), many=True).data,
+		}
+		if request.query_params.get('detalle') in ('1', 'true'):
+			if request.query_params.get('solo_deudores') in ('1', 'true'):
+				filas = [fila for fila in filas if fila['saldo'] > 0]
+			filas.sort(key=lambda fila: (fila['cur_id'], fila['per_id']))
+			data['personas'] = ConciliacionPersonaSerializer(filas, many=True).data
+		return Response(data)
@@ -0,0 +1,260 @@
+"""
+Importación masiva de Personas desde CSV/XLSX
+Lee el archivo fila a fila, valida cada fila en memoria (RUN/DV, email, fechas
+y claves foráneas resueltas contra mapas precargados) y escribe con
+bulk_create en lotes, sin cargar el archivo completo.
+"""
+import csv
+import io
+from datetime import datetime, time
+
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from geografia.models import Comuna
+from maestros.models import EstadoCivil
+from .models import Persona
+from .validators import run_valido
+
+
+REQUIRED_COLUMNS = [
+    'per_run', 'per_dv', 'per_nombres', 'per_apelpat', 'per_email', 'per_fecha_nac',
+    'per_direccion', 'per_tipo_fono', 'per_fono', 'per_apodo', 'comuna', 'estado_civil',
+]
+OPTIONAL_COLUMNS = [
+    'per_apelmat', 'per_alergia_enfermedad', 'per_limitacion', 'per_nom_emergencia',
+    'per_fono_emergencia', 'per_otros', 'per_profesion', 'per_tiempo_nnaj',
+    'per_tiempo_adulto', 'per_religion', 'per_num_mmaa',
+]
+TIPOS_FONO = {1, 2, 3, 4}
+# Largo máximo de las columnas de texto según el modelo: un valor más largo se
+# reporta como error de la fila en vez de fallar (o truncarse) en bulk_create
+LARGOS_MAXIMOS = {
+    column: Persona._meta.get_field(column).max_length
+    for column in REQUIRED_COLUMNS + OPTIONAL_COLUMNS
+    if column.startswith('per_') and getattr(Persona._meta.get_field(column), 'max_length', None)
+}
+MAX_ERRORES_REPORTADOS = 1000
+
+
+class ImportFileError(Exception):
+    """El archivo no se puede leer como CSV/XLSX"""
+
+
+def iter_rows(file, filename):
+    """Itera las filas del archivo como diccionarios columna -> valor"""
+    if filename.lower().endswith('.xlsx'):
+        return _iter_xlsx(file)
+    return _iter_csv(file)
+
+
+def _iter_csv(file):
+    text = io.TextIOWrapper(file, encoding='utf-8-sig', newline='')
+    try:
+        sample = text.read(4096)
+        text.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=',;\t')
+        except csv.Error:
+            dialect = csv.excel
+        for row in csv.DictReader(text, dialect=dialect):
+            yield {(key or '').strip().lower(): value for key, value in row.items()}
+    except UnicodeDecodeError:
+        raise ImportFileError('El archivo CSV debe estar codificado en UTF-8.')
+
+
+def _iter_xlsx(file):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ImportFileError('La importación XLSX requiere openpyxl instalado.')
+    try:
+        workbook = load_workbook(file, read_only=True, data_only=True)
+    except Exception:
+        raise ImportFileError('El archivo no es un XLSX válido.')
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(cell or '').strip().lower() for cell in next(rows, ())]
+        for values in rows:
+            if not any(value not in (None, '') for value in values):
+                continue
+            yield dict(zip(header, values))
+    finally:
+        workbook.close()
+
+
+class PersonaImporter:
+    """
+    Valida y crea Personas en lotes.
+    Las comunas y estados civiles se resuelven por id o por descripción.
+    """
+    def __init__(self, usuario, batch_size=1000, dry_run=False, on_progress=None):
+        self.usuario = usuario
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.on_progress = on_progress
+        self.comunas = self._lookup(Comuna.objects.values_list('com_id', 'com_descripcion'))
+        self.estados_civiles = self._lookup(EstadoCivil.objects.values_list('esc_id', 'esc_descripcion'))
+        self.processed = 0
+        self.created = 0
+        self.error_count = 0
+        self.errors = []
+        self._runs = set()
+
+    @staticmethod
+    def _lookup(pairs):
+        lookup = {}
+        for pk, descripcion in pairs:
+            lookup[str(pk)] = pk
+            lookup[descripcion.strip().lower()] = pk
+        return lookup
+
+    def run(self, rows):
+        """Procesa todas las filas y retorna el resumen de la importación"""
+        batch = []
+        for row_number, row in enumerate(rows, start=2):
+            self.processed += 1
+            persona, errors = self.build(row)
+            if errors:
+                self._add_error(row_number, errors)
+            else:
+                batch.append((row_number, persona))
+            if len(batch) >= self.batch_size:
+                self._flush(batch)
+                batch = []
+        self._flush(batch)
+        return self.summary()
+
+    def summary(self):
+        return {
+            'processed': self.processed,
+            'created': self.created,
+            'error_count': self.error_count,
+            'errors': self.errors,
+            'dry_run': self.dry_run,
+        }
+
+    def build(self, row):
+        """Construye la Persona (sin guardar) o retorna los errores de la fila"""
+        errors = {}
+        values = {key: _clean(row.get(key)) for key in REQUIRED_COLUMNS + OPTIONAL_COLUMNS}
+
+        for column in REQUIRED_COLUMNS:
+            if values[column] in (None, ''):
+                errors[column] = 'Campo requerido.'
+        for column, max_length in LARGOS_MAXIMOS.items():
+            if values[column] and len(str(values[column])) > max_length:
+                errors[column] = f'Máximo {max_length} caracteres.'
+
+        run = _to_int(values['per_run'])
+        if values['per_run'] and run is None:
+            errors['per_run'] = 'RUN inválido.'
+        elif run is not None and values['per_dv'] and not run_valido(run, values['per_dv']):
+            errors['per_dv'] = 'El dígito verificador no es válido para el RUN ingresado.'
+        elif run is not None and run in self._runs:
+            errors['per_run'] = 'RUN duplicado en el archivo.'
+
+        if values['per_email']:
+            try:
+                validate_email(values['per_email'])
+            except ValidationError:
+                errors['per_email'] = 'Correo electrónico inválido.'
+
+        fecha_nac = _to_datetime(values['per_fecha_nac'])
+        if values['per_fecha_nac'] and fecha_nac is None:
+            errors['per_fecha_nac'] = 'Fecha inválida (formato AAAA-MM-DD).'
+
+        tipo_fono = _to_int(values['per_tipo_fono'])
+        if values['per_tipo_fono'] and tipo_fono not in TIPOS_FONO:
+            errors['per_tipo_fono'] = 'Tipo de teléfono inválido (1-4).'
+
+        num_mmaa = _to_int(values['per_num_mmaa'])
+        if values['per_num_mmaa'] and num_mmaa is None:
+            errors['per_num_mmaa'] = 'Debe ser un número entero.'
+
+        com_id = self.comunas.get(str(values['comuna'] or '').lower())
+        if values['comuna'] and com_id is None:
+            errors['comuna'] = 'Comuna no encontrada.'
+        esc_id = self.estados_civiles.get(str(values['estado_civil'] or '').lower())
+        if values['estado_civil'] and esc_id is None:
+            errors['estado_civil'] = 'Estado civil no encontrado.'
+
+        if errors:
+            return None, errors
+
+        self._runs.add(run)
+        persona = Persona(
+            com_id_id=com_id,
+            esc_id_id=esc_id,
+            usu_id=self.usuario,
+            per_run=run,
+            per_dv=values['per_dv'].upper(),
+            per_fecha_nac=fecha_nac,
+            per_tipo_fono=tipo_fono,
+            per_num_mmaa=num_mmaa,
+            per_vigente=True,
+            **{
+                column: values[column]
+                for column in REQUIRED_COLUMNS + OPTIONAL_COLUMNS
+                if column.startswith('per_') and column not in ('per_run', 'per_dv', 'per_fecha_nac', 'per_tipo_fono', 'per_num_mmaa')
+            },
+        )
+        return persona, None
+
+    def _flush(self, batch):
+        if batch:
+            # Un solo SELECT por lote para detectar RUN ya registrados
+            existing = set(
+                Persona.objects.filter(per_run__in=[persona.per_run for _, persona in batch])
+                .values_list('per_run', flat=True)
+            )
+            personas = []
+            for row_number, persona in batch:
+                if persona.per_run in existing:
+                    self._add_error(row_number, {'per_run': 'Ya existe una persona con este RUN.'})
+                else:
+                    personas.append(persona)
+            if personas and not self.dry_run:
+                with transaction.atomic():
+                    Persona.objects.bulk_create(personas, batch_size=self.batch_size)
+            self.created += len(personas)
+        if self.on_progress:
+            self.on_progress(self.summary())
+
+    def _add_error(self, row_number, errors):
+        self.error_count += 1
+        if len(self.errors) < MAX_ERRORES_REPORTADOS:
+            self.errors.append({'row': row_number, 'errors': errors})
+
+
+def _clean(value):
+    if isinstance(value, str):
+        value = value.strip()
+        return value or None
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return value if value is None or isinstance(value, datetime) else str(value)
+
+
+def _to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_datetime(value):
+    if isinstance(value, datetime):
+        fecha = value
+    else:
+        try:
+            parsed = parse_date(value) if value else None
+        except ValueError:
+            parsed = None
+        if parsed is None:
+            return None
+        fecha = datetime.combine(parsed, time.min)
+    return timezone.make_aware(fecha) if timezone.is_naive(fecha) else fecha
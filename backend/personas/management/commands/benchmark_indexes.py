@@ -0,0 +1,207 @@
+"""
+Management command to compare query plans with and without the composite indexes
+Usage: python manage.py benchmark_indexes [--seed 1000000] [--repeat 20] [--force]
+
+Para cada índice declarado en Meta.indexes de las rutas calientes (persona,
+persona_curso, pago_persona, comprobante_pago, preinscripcion y su log), elimina
+el índice, obtiene EXPLAIN y el tiempo promedio de la consulta, lo vuelve a
+crear y repite la medición. Ejecutar sólo contra una base de benchmark.
+"""
+
+import random
+import time
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from cursos.models import Curso, CursoSeccion
+from geografia.models import Region, Provincia, Comuna
+from maestros.models import Perfil, EstadoCivil, Cargo, TipoCurso, Rol, Alimentacion, ConceptoContable
+from pagos.models import PagoPersona, ComprobantePago
+from personas.models import Persona, PersonaCurso
+from preinscripcion.models import Preinscripcion, PreinscripcionEstadoLog
+from usuarios.models import Usuario
+
+
+SEED_RUN_BASE = 30000000
+ESTADOS = ['enviado', 'en_revision_grupo', 'en_revision_distrito', 'validado', 'confirmado_pago']
+
+
+class Command(BaseCommand):
+    help = 'Compare EXPLAIN plans and timings of the hot lookup queries before/after their composite indexes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=0,
+                            help='Number of Persona rows (with inscripciones, pagos and preinscripciones) to seed first')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per bulk_create batch when seeding')
+        parser.add_argument('--repeat', type=int, default=20, help='Executions per query when timing')
+        parser.add_argument('--force', action='store_true',
+                            help='Allow dropping and recreating indexes when DEBUG is False')
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options['force']:
+            raise CommandError('This command drops and recreates indexes; use --force outside DEBUG.')
+
+        if options['seed']:
+            self.seed(options['seed'], options['batch_size'])
+
+        for model, index_name, queryset in self.hot_queries():
+            if queryset is None:
+                self.stdout.write(self.style.WARNING(f'{index_name}: no data, skipping'))
+                continue
+            index = next(i for i in model._meta.indexes if i.name == index_name)
+
+            with connection.schema_editor() as editor:
+                editor.remove_index(model, index)
+            try:
+                before_plan, before_ms = self.measure(queryset, options['repeat'])
+            finally:
+                with connection.schema_editor() as editor:
+                    editor.add_index(model, index)
+            after_plan, after_ms = self.measure(queryset, options['repeat'])
+
+            self.stdout.write(self.style.SUCCESS('=' * 60))
+            self.stdout.write(self.style.SUCCESS(f'{model._meta.db_table} / {index_name}'))
+            self.stdout.write(self.style.SUCCESS('=' * 60))
+            self.stdout.write(f'Before ({before_ms:.3f} ms):')
+            self.stdout.write(f'  {before_plan}')
+            self.stdout.write(f'After ({after_ms:.3f} ms):')
+            self.stdout.write(f'  {after_plan}')
+            self.stdout.write('')
+
+    def measure(self, queryset, repeat):
+        plan = queryset.explain()
+        started = time.perf_counter()
+        for _ in range(repeat):
+            list(queryset.all())
+        return plan, (time.perf_counter() - started) * 1000 / repeat
+
+    def hot_queries(self):
+        """Consultas representativas, parametrizadas con una fila existente"""
+        persona = Persona.objects.order_by('-per_id').first()
+        inscripcion = PersonaCurso.objects.order_by('-pec_id').first()
+        pago = PagoPersona.objects.order_by('-pap_id').first()
+        comprobante = ComprobantePago.objects.order_by('-cpa_id').first()
+        preinscripcion = Preinscripcion.objects.order_by('-id').first()
+
+        return [
+            (Persona, 'persona_run_dv_idx',
+             persona and Persona.objects.filter(per_run=persona.per_run, per_dv=persona.per_dv)),
+            (Persona, 'persona_email_idx',
+             persona and Persona.objects.filter(per_email=persona.per_email)),
+            (PersonaCurso, 'persona_curso_cus_rol_idx',
+             inscripcion and PersonaCurso.objects.filter(cus_id=inscripcion.cus_id_id, rol_id=inscripcion.rol_id_id)),
+            (PagoPersona, 'pago_persona_cur_per_idx',
+             pago and PagoPersona.objects.filter(cur_id=pago.cur_id_id, per_id=pago.per_id_id).values_list('pap_valor')),
+            (ComprobantePago, 'comprobante_pec_fecha_idx',
+             comprobante and ComprobantePago.objects.filter(pec_id=comprobante.pec_id_id).order_by('cpa_fecha')),
+            (Preinscripcion, 'preinsc_curso_estado_idx',
+             preinscripcion and Preinscripcion.objects.filter(curso=preinscripcion.curso_id, estado=preinscripcion.estado)),
+            (PreinscripcionEstadoLog, 'preinsc_log_fecha_idx',
+             preinscripcion and PreinscripcionEstadoLog.objects.filter(preinscripcion=preinscripcion.id)),
+        ]
+
+    def seed(self, total, batch_size):
+        """Inserta `total` personas con sus filas dependientes usando bulk_create"""
+        rng = random.Random(42)
+        self.stdout.write(f'Seeding {total} personas...')
+        refs = self._seed_references(max(total // 200, 1))
+        now = datetime.now(timezone.utc)
+        run_base = SEED_RUN_BASE + Persona.objects.filter(per_run__gte=SEED_RUN_BASE).count()
+
+        for offset in range(0, total, batch_size):
+            size = min(batch_size, total - offset)
+            start = run_base + offset
+            with transaction.atomic():
+                Persona.objects.bulk_create([
+                    Persona(
+                        esc_id=refs['estado_civil'], com_id=refs['comuna'], usu_id=refs['usuario'],
+                        per_run=run, per_dv=str(run % 10), per_apelpat='Bench', per_nombres=f'Persona {run}',
+                        per_email=f'{run}@bench.gic', per_fecha_nac=now, per_direccion='Benchmark 1',
+                        per_tipo_fono=2, per_fono='900000000', per_apodo='bench', per_vigente=True,
+                    )
+                    for run in range(start, start + size)
+                ], batch_size=batch_size)
+                personas = list(
+                    Persona.objects.filter(per_run__gte=start, per_run__lt=start + size)
+                    .order_by('per_id').values_list('per_id', flat=True)
+                )
+                first, last = personas[0], personas[-1]
+                cursos = [rng.choice(refs['secciones']) for _ in personas]
+
+                PersonaCurso.objects.bulk_create([
+                    PersonaCurso(per_id_id=per_id, cus_id=seccion, rol_id=rng.choice(refs['roles']),
+                                 ali_id=refs['alimentacion'], pec_registro=True, pec_acreditado=False)
+                    for per_id, seccion in zip(personas, cursos)
+                ], batch_size=batch_size)
+                PagoPersona.objects.bulk_create([
+                    PagoPersona(per_id_id=per_id, cur_id_id=seccion.cur_id_id, usu_id=refs['usuario'],
+                                pap_fecha_hora=now, pap_tipo=1, pap_valor=Decimal(rng.choice([10000, 20000, 25000])))
+                    for per_id, seccion in zip(personas, cursos)
+                ], batch_size=batch_size)
+                inscripciones = PersonaCurso.objects.filter(per_id__gte=first, per_id__lte=last).values_list('pec_id', flat=True)
+                ComprobantePago.objects.bulk_create([
+                    ComprobantePago(usu_id=refs['usuario'], pec_id_id=pec_id, coc_id=refs['concepto'],
+                                    cpa_fecha_hora=now, cpa_fecha=date.today() - timedelta(days=rng.randint(0, 365)),
+                                    cpa_numero=pec_id, cpa_valor=Decimal('25000'))
+                    for pec_id in inscripciones.iterator()
+                ], batch_size=batch_size)
+                Preinscripcion.objects.bulk_create([
+                    Preinscripcion(persona_id=per_id, curso_id=seccion.cur_id_id, estado=rng.choice(ESTADOS))
+                    for per_id, seccion in zip(personas, cursos)
+                ], batch_size=batch_size)
+                preinscripciones = Preinscripcion.objects.filter(persona__gte=first, persona__lte=last).values_list('id', 'estado')
+                PreinscripcionEstadoLog.objects.bulk_create([
+                    log
+                    for pre_id, estado in preinscripciones.iterator()
+                    for log in (
+                        PreinscripcionEstadoLog(preinscripcion_id=pre_id, estado_anterior='borrador', estado_nuevo='enviado'),
+                        PreinscripcionEstadoLog(preinscripcion_id=pre_id, estado_anterior='enviado', estado_nuevo=estado),
+                    )
+                ], batch_size=batch_size)
+            self.stdout.write(f'  {offset + size}/{total}')
+
+    def _seed_references(self, cursos):
+        """Crea (o reutiliza) las filas de catálogo que referencian los datos sembrados"""
+        perfil, _ = Perfil.objects.get_or_create(pel_descripcion='Benchmark', defaults={'pel_vigente': True})
+        usuario, _ = Usuario.objects.get_or_create(
+            usu_username='benchmark', defaults={'pel_id': perfil, 'usu_email': 'benchmark@bench.gic', 'usu_password': '!'}
+        )
+        region, _ = Region.objects.get_or_create(reg_descripcion='Benchmark', defaults={'reg_vigente': True})
+        provincia, _ = Provincia.objects.get_or_create(reg_id=region, pro_descripcion='Benchmark', defaults={'pro_vigente': True})
+        comuna, _ = Comuna.objects.get_or_create(pro_id=provincia, com_descripcion='Benchmark', defaults={'com_vigente': True})
+        estado_civil, _ = EstadoCivil.objects.get_or_create(esc_descripcion='Benchmark', defaults={'esc_vigente': True})
+        tipo_curso, _ = TipoCurso.objects.get_or_create(tcu_descripcion='Benchmark', defaults={'tcu_tipo': 1, 'tcu_vigente': True})
+        cargo, _ = Cargo.objects.get_or_create(car_descripcion='Benchmark', defaults={'car_vigente': True})
+        alimentacion, _ = Alimentacion.objects.get_or_create(ali_descripcion='Benchmark', defaults={'ali_tipo': 1, 'ali_vigente': True})
+        concepto, _ = ConceptoContable.objects.get_or_create(coc_descripcion='Benchmark', defaults={'coc_vigente': True})
+        roles = [
+            Rol.objects.get_or_create(rol_descripcion=f'Benchmark {n}', defaults={'rol_tipo': n, 'rol_vigente': True})[0]
+            for n in range(1, 4)
+        ]
+        now = datetime.now(timezone.utc)
+        responsable, _ = Persona.objects.get_or_create(
+            per_run=SEED_RUN_BASE - 1,
+            defaults=dict(esc_id=estado_civil, com_id=comuna, usu_id=usuario, per_dv='0', per_apelpat='Bench',
+                          per_nombres='Responsable', per_email='responsable@bench.gic', per_fecha_nac=now,
+                          per_direccion='Benchmark 1', per_tipo_fono=2, per_fono='900000000', per_apodo='bench',
+                          per_vigente=True),
+        )
+        for n in range(Curso.objects.filter(cur_codigo__startswith='B').count(), cursos):
+            curso = Curso.objects.create(
+                usu_id=usuario, tcu_id=tipo_curso, per_id_responsable=responsable, car_id_responsable=cargo,
+                com_id_lugar=comuna, cur_fecha_solicitud=now, cur_codigo=f'B{n:07d}', cur_administra=1,
+                cur_cuota_con_almuerzo=Decimal('25000'), cur_cuota_sin_almuerzo=Decimal('20000'),
+                cur_modalidad=1, cur_tipo_curso=1, cur_estado=1,
+            )
+            CursoSeccion.objects.bulk_create([
+                CursoSeccion(cur_id=curso, cus_seccion=seccion, cus_cant_participante=300) for seccion in (1, 2)
+            ])
+        secciones = list(CursoSeccion.objects.filter(cur_id__cur_codigo__startswith='B'))
+        return {
+            'usuario': usuario, 'comuna': comuna, 'estado_civil': estado_civil, 'alimentacion': alimentacion,
+            'concepto': concepto, 'roles': roles, 'secciones': secciones,
+        }
@@ -0,0 +1,92 @@
+"""
+Management command to compare DRF's stock JSON path with the project's one
+Usage: python manage.py benchmark_json [--rows 1000] [--repeat 5]
+
+Arma en memoria (sin tocar la base) una página de Persona y otra de
+PagoPersona y mide serialización y render con un ModelSerializer y
+JSONRenderer de DRF sin cambios contra los serializers del proyecto
+(FAST_FIELD_MAPPING) y FastJSONRenderer. Verifica que ambos caminos generen
+exactamente el mismo JSON.
+"""
+
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+
+from pagos.models import PagoPersona
+from pagos.serializers import PagoPersonaSerializer
+from personas.models import Persona
+from personas.serializers import PersonaSerializer
+from scout_project.renderers import FastJSONRenderer, orjson
+
+REFERENCIA = datetime(2026, 3, 1, 12, 30, tzinfo=timezone.utc)
+
+
+def stock_serializer(model):
+    meta = type('Meta', (), {'model': model, 'fields': '__all__'})
+    return type(f'{model.__name__}StockSerializer', (serializers.ModelSerializer,), {'Meta': meta})
+
+
+def personas(rows):
+    return [
+        Persona(per_id=n, esc_id_id=1, com_id_id=n % 300 + 1, usu_id_id=1,
+                per_fecha_hora=REFERENCIA - timedelta(minutes=n), per_run=10000000 + n, per_dv='K',
+                per_apelpat='González', per_apelmat='Muñoz', per_nombres=f'Persona {n}',
+                per_email=f'persona{n}@dataset.gic', per_fecha_nac=datetime(1990, 1, 1, tzinfo=timezone.utc),
+                per_direccion='Av. Siempre Viva 742', per_tipo_fono=1, per_fono='+56911111111',
+                per_profesion='Profesor', per_religion='Ninguna', per_apodo=f'P{n}', per_vigente=True)
+        for n in range(1, rows + 1)
+    ]
+
+
+def pagos(rows):
+    return [
+        PagoPersona(pap_id=n, per_id_id=n, cur_id_id=n % 50 + 1, usu_id_id=1,
+                    pap_fecha_hora=REFERENCIA - timedelta(seconds=n), pap_tipo=1 if n % 10 else 2,
+                    pap_valor=Decimal(15000 + n % 7 * 2500), pap_observacion='Pago en puerta')
+        for n in range(1, rows + 1)
+    ]
+
+
+class Command(BaseCommand):
+    help = 'Compare serialization and JSON rendering throughput of large Persona/PagoPersona pages'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000, help='Rows per page')
+        parser.add_argument('--repeat', type=int, default=5, help='Renders per measurement (best one is reported)')
+
+    def handle(self, *args, **options):
+        rows, repeat = options['rows'], options['repeat']
+        self.stdout.write(self.style.SUCCESS('=' * 60))
+        self.stdout.write(self.style.SUCCESS(
+            f'JSON benchmark: {rows} rows, best of {repeat} (orjson: {"yes" if orjson else "no"})'
+        ))
+        self.stdout.write(self.style.SUCCESS('=' * 60))
+        self.stdout.write(f'{"page":<14} {"path":<8} {"serialize ms":>13} {"render ms":>10} {"rows/s":>10}')
+
+        for nombre, objetos, proyecto in (('persona', personas(rows), PersonaSerializer),
+                                          ('pago_persona', pagos(rows), PagoPersonaSerializer)):
+            stock = self.measure(stock_serializer(proyecto.Meta.model), JSONRenderer(), objetos, repeat)
+            fast = self.measure(proyecto, FastJSONRenderer(), objetos, repeat)
+            if stock[2] != fast[2]:
+                raise CommandError(f'{nombre}: the project renderer output differs from DRF\'s')
+            for camino, (serializar, render, _) in (('drf', stock), ('project', fast)):
+                self.stdout.write(f'{nombre:<14} {camino:<8} {serializar:>13.1f} {render:>10.1f} '
+                                  f'{rows / (serializar + render) * 1000:>10.0f}')
+            self.stdout.write(f'{"":<14} speedup {(stock[0] + stock[1]) / (fast[0] + fast[1]):>.2f}x')
+
+    def measure(self, serializer_class, renderer, objetos, repeat):
+        serializar = render = float('inf')
+        for _ in range(repeat):
+            started = time.perf_counter()
+            data = serializer_class(objetos, many=True).data
+            serializado = time.perf_counter()
+            contenido = renderer.render(data)
+            terminado = time.perf_counter()
+            serializar = min(serializar, (serializado - started) * 1000)
+            render = min(render, (terminado - serializado) * 1000)
+        return serializar, render, contenido
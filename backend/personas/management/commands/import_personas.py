@@ -0,0 +1,53 @@
+"""
+Management command to bulk import Personas from a CSV or XLSX file
+Usage: python manage.py import_personas archivo.csv --usuario admin_test [--batch-size 1000] [--dry-run]
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from usuarios.models import Usuario
+from personas.bulk_import import PersonaImporter, ImportFileError, iter_rows, REQUIRED_COLUMNS
+
+
+class Command(BaseCommand):
+    help = 'Stream a CSV/XLSX file of Personas, validate each row and insert them with bulk_create'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or XLSX file. Required columns: ' + ', '.join(REQUIRED_COLUMNS))
+        parser.add_argument('--usuario', required=True, help='Username recorded as usu_id of the new Personas')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per bulk_create batch')
+        parser.add_argument('--dry-run', action='store_true', help='Validate only, do not write')
+
+    def handle(self, *args, **options):
+        try:
+            usuario = Usuario.objects.get(usu_username=options['usuario'])
+        except Usuario.DoesNotExist:
+            raise CommandError(f'User "{options["usuario"]}" does not exist.')
+
+        importer = PersonaImporter(
+            usuario,
+            batch_size=options['batch_size'],
+            dry_run=options['dry_run'],
+            on_progress=self.report_progress,
+        )
+        try:
+            with open(options['path'], 'rb') as file:
+                summary = importer.run(iter_rows(file, options['path']))
+        except (OSError, ImportFileError) as exc:
+            raise CommandError(str(exc))
+
+        for error in summary['errors']:
+            messages = '; '.join(f'{field}: {message}' for field, message in error['errors'].items())
+            self.stdout.write(self.style.WARNING(f'Row {error["row"]}: {messages}'))
+
+        self.stdout.write('')
+        self.stdout.write(self.style.SUCCESS('=' * 60))
+        self.stdout.write(self.style.SUCCESS('Persona Import Summary' + (' (dry run)' if summary['dry_run'] else '')))
+        self.stdout.write(self.style.SUCCESS('=' * 60))
+        self.stdout.write(f'Processed: {summary["processed"]}')
+        self.stdout.write(f'Created: {summary["created"]}')
+        self.stdout.write(f'Errors: {summary["error_count"]}')
+
+    def report_progress(self, summary):
+        self.stdout.write(
+            f'  processed {summary["processed"]} / created {summary["created"]} / errors {summary["error_count"]}'
+        )
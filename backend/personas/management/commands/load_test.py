@@ -0,0 +1,74 @@
+"""
+Management command to run the local load suite over the seeded dataset
+Usage: python manage.py load_test [--scenario apertura|checkin|cierre|all] [--users 20] [--duration 60]
+                                  [--iterations N] [--base-url http://localhost:8000]
+
+Requiere el dataset de seed_dataset (usuarios carga-NNN). Sin --base-url los
+requests se ejecutan en proceso (un hilo y una conexión a la base por usuario
+virtual); con --base-url se envían por HTTP a un servidor en ejecución. Los
+flujos de cada escenario están en scout_project/carga.py. Los escenarios que
+escriben (preinscripciones, pagos) modifican la base: usar una de prueba.
+"""
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from personas.management.commands.seed_dataset import CARGA_EMAIL
+from scout_project.carga import ESCENARIOS, ClienteHTTP, ClienteLocal, Contexto, Medicion, ejecutar, emitir_token
+from usuarios.models import Usuario
+
+
+class Command(BaseCommand):
+    help = 'Run the load scenarios (registration opening, check-in day, month-end) and report p50/p95/p99 per endpoint'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scenario', choices=[*ESCENARIOS, 'all'], default='all', help='Scenario to run')
+        parser.add_argument('--users', type=int, default=20, help='Concurrent virtual users')
+        parser.add_argument('--duration', type=float, default=60, help='Seconds per scenario')
+        parser.add_argument('--iterations', type=int, help='Flows per virtual user (instead of --duration)')
+        parser.add_argument('--base-url', help='Send requests to a running server instead of in-process')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed for the flows')
+        parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+
+    def handle(self, *args, **options):
+        usuarios = list(Usuario.objects.select_related('pel_id').filter(
+            usu_email__in=[CARGA_EMAIL.format(n) for n in range(1, options['users'] + 1)]
+        ).order_by('usu_id'))
+        if not usuarios:
+            raise CommandError('No load-test users found; run seed_dataset first.')
+        tokens = [emitir_token(usuario) for usuario in usuarios]
+        escenarios = list(ESCENARIOS) if options['scenario'] == 'all' else [options['scenario']]
+        duracion = None if options['iterations'] else options['duration']
+
+        reportes = {}
+        for escenario in escenarios:
+            contexto = Contexto(usuarios[0], semilla=options['seed'])
+            medicion = Medicion()
+            clientes = [
+                ClienteHTTP(options['base_url'], tokens[n % len(tokens)], medicion) if options['base_url']
+                else ClienteLocal(tokens[n % len(tokens)], medicion)
+                for n in range(options['users'])
+            ]
+            filas, segundos = ejecutar(escenario, clientes, contexto, iteraciones=options['iterations'],
+                                       duracion=duracion, semilla=options['seed'])
+            reportes[escenario] = {'segundos': segundos, 'endpoints': filas}
+            if not options['json']:
+                self.imprimir(escenario, len(clientes), segundos, filas)
+
+        if options['json']:
+            self.stdout.write(json.dumps(reportes, indent=2))
+
+    def imprimir(self, escenario, usuarios, segundos, filas):
+        total = sum(fila['requests'] for fila in filas)
+        self.stdout.write(self.style.SUCCESS('=' * 60))
+        self.stdout.write(self.style.SUCCESS(
+            f'{escenario}: {total} requests, {usuarios} users, {segundos:.1f} s ({total / segundos:.1f} req/s)'
+        ))
+        self.stdout.write(self.style.SUCCESS('=' * 60))
+        self.stdout.write(f'{"endpoint":<40} {"n":>6} {"err":>5} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8} {"req/s":>7}')
+        for fila in filas:
+            linea = (f'{fila["endpoint"]:<40} {fila["requests"]:>6} {fila["errores"]:>5} {fila["p50"]:>8.1f} '
+                     f'{fila["p95"]:>8.1f} {fila["p99"]:>8.1f} {fila["rps"]:>7.1f}')
+            self.stdout.write(self.style.WARNING(linea) if fila['errores'] else linea)
+        self.stdout.write('')
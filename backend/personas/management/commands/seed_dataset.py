@@ -0,0 +1,349 @@
+"""
+Management command to seed a reproducible synthetic dataset
+Usage: python manage.py seed_dataset [--scale 1.0] [--seed 42] [--batch-size 5000]
+
+Con --scale 1.0 genera 1.000.000 personas y 5.000 cursos; cualquier otra
+escala es proporcional (--personas y --cursos la reemplazan). Siembra la
+geografía (regiones -> comunas), la estructura scout (zonas -> grupos),
+catálogos, cursos con secciones, fechas, cuotas y cupos, y por persona sus
+inscripciones, pagos, comprobantes, prepagos y preinscripciones con su log.
+Todo con bulk_create y un random.Random(seed): la misma semilla sobre una
+base vacía produce los mismos datos. También crea los usuarios carga-NNN que
+usa load_test. Al final reconstruye curso_resumen (y resumen_pago si está
+materializado).
+"""
+
+import random
+import time
+import unicodedata
+from array import array
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Max, OuterRef, Subquery
+
+from cursos.models import Curso, CursoSeccion, CursoFecha, CursoCuota
+from cursos.resumen import actualizar_resumen
+from geografia.jerarquia import reconstruir_jerarquia
+from geografia.models import Region, Provincia, Comuna, Zona, Distrito, Grupo
+from maestros.models import Perfil, EstadoCivil, Cargo, TipoCurso, Rol, Rama, Alimentacion, ConceptoContable
+from pagos.conciliacion import refrescar_resumen
+from pagos.models import PagoPersona, ComprobantePago, PagoComprobante, Prepago
+from personas.models import Persona, PersonaCurso, PersonaGrupo
+from personas.validators import calcular_dv
+from preinscripcion.models import Preinscripcion, PreinscripcionEstadoLog, CupoConfiguracion
+from usuarios.models import Usuario
+from usuarios.permisos import otorgar_todos_los_permisos
+
+
+PERSONAS_POR_ESCALA = 1_000_000
+CURSOS_POR_ESCALA = 5_000
+DATASET_RUN_BASE = 10_000_000
+DATASET_USUARIO = 'dataset'
+CARGA_EMAIL = 'carga-{:03d}@dataset.gic'
+CARGA_PASSWORD = 'Carga123!'
+# Fechas relativas a una referencia fija para que la semilla determine todo
+REFERENCIA = datetime(2026, 3, 1, tzinfo=timezone.utc)
+
+REGIONES = [
+    'Arica y Parinacota', 'Tarapacá', 'Antofagasta', 'Atacama', 'Coquimbo', 'Valparaíso', 'Metropolitana',
+    "O'Higgins", 'Maule', 'Ñuble', 'Biobío', 'La Araucanía', 'Los Ríos', 'Los Lagos', 'Aysén', 'Magallanes',
+]
+PROVINCIAS_POR_REGION = 4
+COMUNAS_POR_PROVINCIA = 6
+ZONAS = 16
+DISTRITOS_POR_ZONA = 8
+GRUPOS_POR_DISTRITO = 10
+
+NOMBRES = [
+    'Sofía', 'Martina', 'Florencia', 'Isidora', 'Agustina', 'Josefa', 'Catalina', 'Antonia', 'Fernanda', 'Javiera',
+    'Benjamín', 'Vicente', 'Martín', 'Matías', 'Joaquín', 'Agustín', 'Tomás', 'Cristóbal', 'Maximiliano', 'Lucas',
+]
+APELLIDOS = [
+    'González', 'Muñoz', 'Rojas', 'Díaz', 'Pérez', 'Soto', 'Contreras', 'Silva', 'Martínez', 'Sepúlveda',
+    'Morales', 'Rodríguez', 'López', 'Fuentes', 'Hernández', 'Torres', 'Araya', 'Flores', 'Espinoza', 'Valenzuela',
+]
+ESTADOS_INSCRITO = ['validado', 'confirmado_pago', 'acreditado']
+# Estados de las preinscripciones sin inscripción, con su peso relativo
+ESTADOS_PENDIENTES = {
+    'enviado': 30, 'en_revision_grupo': 20, 'en_revision_distrito': 12, 'en_revision_zona': 8,
+    'en_lista_espera': 10, 'rechazado': 15, 'borrador': 5,
+}
+
+
+def _ascii(texto):
+    return unicodedata.normalize('NFKD', texto).encode('ascii', 'ignore').decode().lower().replace("'", '')
+
+
+class Command(BaseCommand):
+    help = 'Seed a reproducible synthetic dataset (geography, personas, cursos, pagos, preinscripciones) with bulk_create'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, default=0.01,
+                            help=f'1.0 = {PERSONAS_POR_ESCALA} personas and {CURSOS_POR_ESCALA} cursos (default 0.01)')
+        parser.add_argument('--personas', type=int, help='Number of personas (overrides --scale)')
+        parser.add_argument('--cursos', type=int, help='Number of cursos (overrides --scale)')
+        parser.add_argument('--usuarios', type=int, default=20, help='Load-test users carga-NNN to create')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per bulk_create batch')
+
+    def handle(self, *args, **options):
+        total = options['personas'] or max(int(PERSONAS_POR_ESCALA * options['scale']), 1)
+        cursos = options['cursos'] or max(int(CURSOS_POR_ESCALA * options['scale']), 1)
+        if Usuario.objects.filter(usu_username=DATASET_USUARIO).exists():
+            raise CommandError('The dataset is already seeded; run against an empty database (manage.py flush).')
+
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.conteos = {}
+        started = time.perf_counter()
+
+        with transaction.atomic():
+            self.seed_catalogos(options['usuarios'])
+            self.seed_geografia()
+        personas = self.seed_personas(total)
+        with transaction.atomic():
+            self.seed_cursos(cursos, personas)
+        for offset in range(0, len(personas), self.batch_size):
+            with transaction.atomic():
+                self.seed_actividad(personas[offset:offset + self.batch_size])
+            self.stdout.write(f'  actividad {min(offset + self.batch_size, len(personas))}/{len(personas)}')
+        with transaction.atomic():
+            self.seed_cupos()
+
+        actualizar_resumen()
+        if settings.PAGOS_RESUMEN_MATERIALIZADO:
+            refrescar_resumen()
+
+        self.stdout.write(self.style.SUCCESS('=' * 60))
+        self.stdout.write(self.style.SUCCESS(
+            f'Dataset seeded in {time.perf_counter() - started:.1f} s (seed {options["seed"]})'
+        ))
+        self.stdout.write(self.style.SUCCESS('=' * 60))
+        for tabla, filas in self.conteos.items():
+            self.stdout.write(f'{tabla:<28} {filas:>10}')
+
+    def crear(self, model, objetos):
+        """
+        bulk_create por lotes; retorna los pks en el orden de `objetos`.
+
+        En backends sin RETURNING en inserciones múltiples (MySQL) relee los pks
+        mayores al máximo previo: el comando asume que es el único que escribe.
+        """
+        tabla = model._meta.db_table
+        self.conteos[tabla] = self.conteos.get(tabla, 0) + len(objetos)
+        if connection.features.can_return_rows_from_bulk_insert:
+            model.objects.bulk_create(objetos, batch_size=self.batch_size)
+            return [objeto.pk for objeto in objetos]
+        previo = model.objects.aggregate(maximo=Max('pk'))['maximo'] or 0
+        model.objects.bulk_create(objetos, batch_size=self.batch_size)
+        return list(model.objects.filter(pk__gt=previo).order_by('pk').values_list('pk', flat=True))
+
+    def seed_catalogos(self, usuarios):
+        """Catálogos (reutiliza los existentes por descripción), el usuario dueño y los usuarios de carga"""
+        def catalogo(model, campo, nombres, **defaults):
+            return [model.objects.get_or_create(**{campo: nombre}, defaults=defaults)[0].pk for nombre in nombres]
+
+        perfil, _ = Perfil.objects.get_or_create(pel_descripcion='Dataset', defaults={'pel_vigente': True})
+        # Todos los permisos sobre las aplicaciones de la API para los usuarios de carga
+        otorgar_todos_los_permisos(perfil)
+        self.usuario = Usuario.objects.create(pel_id=perfil, usu_username=DATASET_USUARIO,
+                                              usu_email='dataset@dataset.gic', usu_password='!')
+        password = make_password(CARGA_PASSWORD)
+        self.crear(Usuario, [
+            Usuario(pel_id=perfil, usu_username=f'carga-{n:03d}', usu_email=CARGA_EMAIL.format(n), usu_password=password)
+            for n in range(1, usuarios + 1)
+        ])
+        self.estados_civiles = catalogo(EstadoCivil, 'esc_descripcion', ['Soltero/a', 'Casado/a', 'Divorciado/a', 'Viudo/a'],
+                                        esc_vigente=True)
+        self.cargos = catalogo(Cargo, 'car_descripcion', ['Director de curso', 'Coordinador', 'Formador'], car_vigente=True)
+        self.tipos_curso = catalogo(TipoCurso, 'tcu_descripcion', ['Curso Inicial', 'Curso Medio', 'Curso Avanzado'],
+                                    tcu_tipo=1, tcu_vigente=True)
+        self.ramas = catalogo(Rama, 'ram_descripcion', ['Lobatos', 'Scouts', 'Pioneros', 'Caminantes'], ram_vigente=True)
+        self.alimentaciones = catalogo(Alimentacion, 'ali_descripcion', ['Normal', 'Vegetariana', 'Celíaca'],
+                                       ali_tipo=1, ali_vigente=True)
+        self.conceptos = catalogo(ConceptoContable, 'coc_descripcion', ['Cuota de curso', 'Alimentación'], coc_vigente=True)
+        self.rol_participante, = catalogo(Rol, 'rol_descripcion', ['Participante'], rol_tipo=1, rol_vigente=True)
+        self.rol_formador, = catalogo(Rol, 'rol_descripcion', ['Formador'], rol_tipo=2, rol_vigente=True)
+
+    def seed_geografia(self):
+        regiones = self.crear(Region, [Region(reg_descripcion=nombre, reg_vigente=True) for nombre in REGIONES])
+        provincias = self.crear(Provincia, [
+            Provincia(reg_id_id=reg_id, pro_descripcion=f'{REGIONES[r]} {p}', pro_vigente=True)
+            for r, reg_id in enumerate(regiones) for p in range(1, PROVINCIAS_POR_REGION + 1)
+        ])
+        self.comunas = self.crear(Comuna, [
+            Comuna(pro_id_id=pro_id, com_descripcion=f'Comuna {n * COMUNAS_POR_PROVINCIA + c:03d}', com_vigente=True)
+            for n, pro_id in enumerate(provincias) for c in range(1, COMUNAS_POR_PROVINCIA + 1)
+        ])
+        zonas = self.crear(Zona, [
+            Zona(zon_descripcion=f'Zona {REGIONES[z]}', zon_unilateral=False, zon_vigente=True) for z in range(ZONAS)
+        ])
+        distritos = self.crear(Distrito, [
+            Distrito(zon_id_id=zon_id, dis_descripcion=f'Distrito {z + 1}-{d}', dis_vigente=True)
+            for z, zon_id in enumerate(zonas) for d in range(1, DISTRITOS_POR_ZONA + 1)
+        ])
+        self.grupos = self.crear(Grupo, [
+            Grupo(dis_id_id=dis_id, gru_descripcion=f'Grupo {n * GRUPOS_POR_DISTRITO + g:04d}', gru_vigente=True)
+            for n, dis_id in enumerate(distritos) for g in range(1, GRUPOS_POR_DISTRITO + 1)
+        ])
+        # bulk_create no emite signals: la tabla de clausura se arma de una vez
+        reconstruir_jerarquia(self.batch_size)
+
+    def seed_personas(self, total):
+        """Personas (con RUN y DV válidos) y su grupo; retorna los per_id en orden de RUN"""
+        rng = self.rng
+        personas = array('l')
+        self.stdout.write(f'Seeding {total} personas...')
+        for offset in range(0, total, self.batch_size):
+            lote = []
+            for run in range(DATASET_RUN_BASE + offset, DATASET_RUN_BASE + min(offset + self.batch_size, total)):
+                nombre, paterno, materno = rng.choice(NOMBRES), rng.choice(APELLIDOS), rng.choice(APELLIDOS)
+                lote.append(Persona(
+                    esc_id_id=rng.choice(self.estados_civiles), com_id_id=rng.choice(self.comunas), usu_id=self.usuario,
+                    per_run=run, per_dv=calcular_dv(run), per_apelpat=paterno, per_apelmat=materno, per_nombres=nombre,
+                    per_email=f'{_ascii(nombre)}.{_ascii(paterno)}.{run}@dataset.gic',
+                    per_fecha_nac=REFERENCIA - timedelta(days=rng.randint(14 * 365, 65 * 365)),
+                    per_direccion=f'Calle {rng.randint(1, 999)} #{rng.randint(1, 9999)}',
+                    per_tipo_fono=2, per_fono=f'9{rng.randint(10000000, 99999999)}', per_apodo=nombre,
+                    per_vigente=rng.random() < 0.98,
+                ))
+            with transaction.atomic():
+                ids = self.crear(Persona, lote)
+                self.crear(PersonaGrupo, [
+                    PersonaGrupo(per_id_id=per_id, gru_id_id=rng.choice(self.grupos), peg_vigente=True)
+                    for per_id in ids if rng.random() < 0.85
+                ])
+            personas.extend(ids)
+            self.stdout.write(f'  personas {len(personas)}/{total}')
+        return personas
+
+    def seed_cursos(self, total, personas):
+        """Cursos con 1 a 3 secciones, fechas de inicio/término y cuotas anticipada y normal"""
+        rng = self.rng
+        cursos = []
+        for n in range(total):
+            con_almuerzo = Decimal(rng.choice([25000, 30000, 35000, 40000]))
+            cursos.append(Curso(
+                usu_id=self.usuario, tcu_id_id=rng.choice(self.tipos_curso), per_id_responsable_id=rng.choice(personas),
+                car_id_responsable_id=self.cargos[0], com_id_lugar_id=rng.choice(self.comunas),
+                cur_fecha_solicitud=REFERENCIA - timedelta(days=rng.randint(30, 365)), cur_codigo=f'D{n:06d}',
+                cur_descripcion=f'Curso {n + 1}', cur_administra=rng.choice([1, 2]),
+                cur_cuota_con_almuerzo=con_almuerzo, cur_cuota_sin_almuerzo=con_almuerzo - 5000,
+                cur_modalidad=rng.choice([1, 2]), cur_tipo_curso=rng.choice([1, 2, 3]),
+                cur_estado=rng.choices([1, 2], weights=[70, 30])[0],
+            ))
+        ids = self.crear(Curso, cursos)
+
+        secciones, fechas, cuotas = [], [], []
+        self.cuotas = {}
+        for cur_id, curso in zip(ids, cursos):
+            for seccion in range(1, rng.randint(1, 3) + 1):
+                secciones.append(CursoSeccion(cur_id_id=cur_id, ram_id_id=rng.choice(self.ramas), cus_seccion=seccion,
+                                              cus_cant_participante=rng.randint(40, 120)))
+            inicio = REFERENCIA + timedelta(days=rng.randint(-180, 180), hours=9)
+            fechas.append(CursoFecha(cur_id_id=cur_id, cuf_fecha_inicio=inicio, cuf_fecha_termino=inicio + timedelta(days=2),
+                                     cuf_tipo=1))
+            fechas.append(CursoFecha(cur_id_id=cur_id, cuf_fecha_inicio=inicio + timedelta(days=14),
+                                     cuf_fecha_termino=inicio + timedelta(days=15), cuf_tipo=2))
+            for tipo, valor in ((1, curso.cur_cuota_con_almuerzo), (2, curso.cur_cuota_sin_almuerzo)):
+                cuotas.append(CursoCuota(cur_id_id=cur_id, cuu_tipo=tipo, cuu_fecha=inicio - timedelta(days=60),
+                                         cuu_valor=valor - 3000))
+            self.cuotas[cur_id] = (curso.cur_cuota_con_almuerzo, curso.cur_cuota_sin_almuerzo)
+        seccion_ids = self.crear(CursoSeccion, secciones)
+        self.crear(CursoFecha, fechas)
+        self.crear(CursoCuota, cuotas)
+        self.cursos = ids
+        self.secciones = {cur_id: [] for cur_id in ids}
+        self.cupos = {cur_id: [0, 0] for cur_id in ids}
+        for cus_id, seccion in zip(seccion_ids, secciones):
+            self.secciones[seccion.cur_id_id].append(cus_id)
+            self.cupos[seccion.cur_id_id][0] += seccion.cus_cant_participante
+
+    def seed_actividad(self, personas):
+        """
+        Por persona: 0 a 2 inscripciones con su preinscripción validada, pagos
+        (completos, parciales y alguna devolución), comprobantes y prepagos, más
+        una preinscripción pendiente en otro curso para una de cada cinco.
+        """
+        rng = self.rng
+        inscripciones, preinscripciones, cursos_inscripcion = [], [], []
+        for per_id in personas:
+            cursos = rng.sample(self.cursos, min(rng.choices([0, 1, 2], weights=[35, 50, 15])[0], len(self.cursos)))
+            for cur_id in cursos:
+                cus_id = rng.choice(self.secciones[cur_id])
+                acreditado = rng.random() < 0.4
+                inscripciones.append(PersonaCurso(
+                    per_id_id=per_id, cus_id_id=cus_id, ali_id_id=rng.choice(self.alimentaciones),
+                    rol_id_id=self.rol_formador if rng.random() < 0.1 else self.rol_participante,
+                    pec_registro=rng.random() < 0.9, pec_acreditado=acreditado,
+                ))
+                estado = 'acreditado' if acreditado else rng.choice(ESTADOS_INSCRITO[:2])
+                preinscripciones.append(Preinscripcion(persona_id=per_id, curso_id=cur_id, estado=estado,
+                                                       tiene_cupo=True))
+                cursos_inscripcion.append(cur_id)
+                self.cupos[cur_id][1] += 1
+            if rng.random() < 0.2:
+                cur_id = rng.choice(self.cursos)
+                if cur_id not in cursos:
+                    estado = rng.choices(list(ESTADOS_PENDIENTES), weights=list(ESTADOS_PENDIENTES.values()))[0]
+                    preinscripciones.append(Preinscripcion(persona_id=per_id, curso_id=cur_id, estado=estado,
+                                                           en_lista_espera=estado == 'en_lista_espera'))
+
+        pec_ids = self.crear(PersonaCurso, inscripciones)
+        pagos, comprobantes, prepagos = [], [], []
+        for pec_id, inscripcion, cur_id in zip(pec_ids, inscripciones, cursos_inscripcion):
+            per_id = inscripcion.per_id_id
+            if rng.random() < 0.25:
+                if rng.random() < 0.08:
+                    prepagos.append(Prepago(per_id_id=per_id, cur_id_id=cur_id, ppa_valor=Decimal(5000), ppa_vigente=True))
+                continue
+            cuota = self.cuotas[cur_id][rng.choice([0, 1])]
+            valor = cuota if rng.random() < 0.8 else (cuota / 2).quantize(Decimal(1))
+            fecha = REFERENCIA - timedelta(days=rng.randint(0, 180), minutes=rng.randint(0, 1440))
+            pagos.append(PagoPersona(per_id_id=per_id, cur_id_id=cur_id, usu_id=self.usuario, pap_fecha_hora=fecha,
+                                     pap_tipo=1, pap_valor=valor))
+            comprobantes.append(ComprobantePago(
+                usu_id=self.usuario, pec_id_id=pec_id, coc_id_id=self.conceptos[0], cpa_fecha_hora=fecha,
+                cpa_fecha=fecha.date(), cpa_numero=pec_id, cpa_valor=valor,
+            ) if rng.random() < 0.85 else None)
+            if rng.random() < 0.05:
+                pagos.append(PagoPersona(per_id_id=per_id, cur_id_id=cur_id, usu_id=self.usuario,
+                                         pap_fecha_hora=fecha + timedelta(days=7), pap_tipo=2,
+                                         pap_valor=(valor / 10).quantize(Decimal(1)), pap_observacion='Devolución'))
+                comprobantes.append(None)
+
+        pap_ids = self.crear(PagoPersona, pagos)
+        con_comprobante = [(pap_id, comprobante) for pap_id, comprobante in zip(pap_ids, comprobantes) if comprobante]
+        cpa_ids = self.crear(ComprobantePago, [comprobante for _, comprobante in con_comprobante])
+        self.crear(PagoComprobante, [
+            PagoComprobante(pap_id_id=pap_id, cpa_id_id=cpa_id) for (pap_id, _), cpa_id in zip(con_comprobante, cpa_ids)
+        ])
+        self.crear(Prepago, prepagos)
+
+        pre_ids = self.crear(Preinscripcion, preinscripciones)
+        logs = []
+        for pre_id, preinscripcion in zip(pre_ids, preinscripciones):
+            if preinscripcion.estado == 'borrador':
+                continue
+            logs.append(PreinscripcionEstadoLog(preinscripcion_id=pre_id, estado_anterior='borrador',
+                                                estado_nuevo='enviado', cambiado_por=self.usuario))
+            if preinscripcion.estado != 'enviado':
+                logs.append(PreinscripcionEstadoLog(preinscripcion_id=pre_id, estado_anterior='enviado',
+                                                    estado_nuevo=preinscripcion.estado, cambiado_por=self.usuario))
+        self.crear(PreinscripcionEstadoLog, logs)
+
+    def seed_cupos(self):
+        """Cupo de participantes por curso: la capacidad de sus secciones y los inscritos como usados"""
+        self.crear(CupoConfiguracion, [
+            CupoConfiguracion(curso_id=cur_id, rol_id=self.rol_participante, cupo_total=max(total, usado),
+                              cupo_usado=usado)
+            for cur_id, (total, usado) in self.cupos.items()
+        ])
+        Preinscripcion.objects.filter(curso_id__in=self.cursos, tiene_cupo=True).update(cupo_id=Subquery(
+            CupoConfiguracion.objects.filter(curso_id=OuterRef('curso_id'), rol_id=self.rol_participante).values('id')[:1]
+        ))
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.8 on 2026-10-18 10:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('personas', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='persona',
+            index=models.Index(fields=['per_run', 'per_dv'], name='persona_run_dv_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='persona',
+            index=models.Index(fields=['per_email'], name='persona_email_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='personacurso',
+            index=models.Index(fields=['cus_id', 'rol_id'], name='persona_curso_cus_rol_idx'),
+        ),
+    ]
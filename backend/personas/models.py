@@ -38,6 +38,11 @@ class Persona(models.Model):
         db_table = 'persona'
         verbose_name = 'Persona'
         verbose_name_plural = 'Personas'
+        indexes = [
+            # Búsqueda por RUN (login de preinscripción, validación de duplicados)
+            models.Index(fields=['per_run', 'per_dv'], name='persona_run_dv_idx'),
+            models.Index(fields=['per_email'], name='persona_email_idx'),
+        ]
 
     def __str__(self):
         return f"{self.per_nombres} {self.per_apelpat}"
@@ -128,6 +133,10 @@ class PersonaCurso(models.Model):
         verbose_name = 'Inscripción de Persona en Curso'
         verbose_name_plural = 'Inscripciones de Personas en Cursos'
         unique_together = ('per_id', 'cus_id') # Una persona solo puede inscribirse una vez por sección de curso
+        indexes = [
+            # Participantes de una sección filtrados por rol
+            models.Index(fields=['cus_id', 'rol_id'], name='persona_curso_cus_rol_idx'),
+        ]
 
     def __str__(self):
         return f"{self.per_id} en {self.cus_id}"
@@ -1,7 +1,22 @@
 from rest_framework import serializers
+from scout_project.fieldsets import DynamicFieldsMixin, expandable
+from usuarios.permisos import UsuarioActualDefault
 from .models import Persona
 
-class PersonaSerializer(serializers.ModelSerializer):
+@expandable
+class PersonaSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Persona
         fields = '__all__'
+
+class PersonaImportSerializer(serializers.Serializer):
+    archivo = serializers.FileField()
+    # Autor de las personas importadas: el usuario del token, no un valor del formulario
+    usu_id = serializers.HiddenField(default=UsuarioActualDefault())
+    batch_size = serializers.IntegerField(min_value=1, max_value=10000, default=1000)
+    dry_run = serializers.BooleanField(default=False)
+
+    def validate_archivo(self, value):
+        if not value.name.lower().endswith(('.csv', '.xlsx')):
+            raise serializers.ValidationError('El archivo debe ser CSV o XLSX.')
+        return value
@@ -0,0 +1,30 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+
+from personas.models import Persona
+from preinscripcion.models import PreinscripcionEstadoLog
+
+
+@pytest.mark.django_db(transaction=True)
+def test_benchmark_indexes_seeds_and_restores_indexes():
+    out = StringIO()
+    call_command('benchmark_indexes', seed=40, batch_size=15, repeat=1, force=True, stdout=out)
+
+    assert Persona.objects.filter(per_email__endswith='@bench.gic').count() == 41
+    assert PreinscripcionEstadoLog.objects.count() == 80
+    output = out.getvalue()
+    assert 'persona / persona_run_dv_idx' in output
+    assert 'preinscripcion_estado_log / preinsc_log_fecha_idx' in output
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, 'pago_persona')
+    assert 'pago_persona_cur_per_idx' in constraints
+
+
+@pytest.mark.django_db
+def test_benchmark_indexes_requires_force_outside_debug():
+    with pytest.raises(CommandError, match='--force'):
+        call_command('benchmark_indexes', stdout=StringIO())
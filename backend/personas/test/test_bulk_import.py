@@ -0,0 +1,135 @@
+import io
+from io import StringIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+
+from personas.models import Persona
+from usuarios.models import Usuario
+from personas.validators import calcular_dv
+
+HEADER = 'per_run;per_dv;per_nombres;per_apelpat;per_email;per_fecha_nac;per_direccion;per_tipo_fono;per_fono;per_apodo;comuna;estado_civil\n'
+
+
+def _row(run, dv=None, email=None, comuna='Santiago Centro', fecha='1990-05-01', nombres='Ana', fono='912345678'):
+    dv = calcular_dv(run) if dv is None else dv
+    email = email or f'{run}@test.com'
+    return f'{run};{dv};{nombres};Rojas;{email};{fecha};Calle 1;2;{fono};Anita;{comuna};Soltero\n'
+
+
+def test_calcular_dv():
+    assert calcular_dv(12345678) == '5'
+    assert calcular_dv(11111111) == '1'
+    assert calcular_dv(10000013) == 'K'
+
+
+@pytest.mark.django_db
+def test_import_command_creates_valid_rows_and_reports_errors(tmp_path, usuario, comuna, estado_civil):
+    path = tmp_path / 'personas.csv'
+    path.write_text(
+        HEADER
+        + _row(12345678)
+        + _row(11111111, dv='9')
+        + _row(22222222, comuna='Atlantis')
+        + _row(12345678)
+        + _row(33333333, fecha='1990-02-30')
+        + _row(44444444),
+        encoding='utf-8',
+    )
+    out = StringIO()
+
+    call_command('import_personas', str(path), usuario=usuario.usu_username, batch_size=2, stdout=out)
+
+    assert sorted(Persona.objects.values_list('per_run', flat=True)) == [12345678, 44444444]
+    output = out.getvalue()
+    assert 'Row 3: per_dv' in output
+    assert 'Row 4: comuna' in output
+    assert 'Row 5: per_run: RUN duplicado' in output
+    assert 'Row 6: per_fecha_nac' in output
+    assert 'Created: 2' in output
+
+
+@pytest.mark.django_db
+def test_import_reports_values_longer_than_the_column(tmp_path, usuario, comuna, estado_civil):
+    path = tmp_path / 'personas.csv'
+    path.write_text(
+        HEADER
+        + _row(12345678, nombres='A' * 51)
+        + _row(11111111, fono='9' * 16, email=f"{'a' * 95}@test.com")
+        + _row(44444444, nombres='A' * 50),
+        encoding='utf-8',
+    )
+    out = StringIO()
+
+    call_command('import_personas', str(path), usuario=usuario.usu_username, stdout=out)
+
+    assert list(Persona.objects.values_list('per_run', flat=True)) == [44444444]
+    output = out.getvalue()
+    assert 'Row 2: per_nombres: Máximo 50 caracteres.' in output
+    assert 'per_fono: Máximo 15 caracteres.' in output
+    assert 'per_email: Máximo 100 caracteres.' in output
+
+
+@pytest.mark.django_db
+def test_import_skips_runs_already_registered(tmp_path, usuario, persona_factory):
+    persona_factory(per_run=12345678, per_dv='5')
+    path = tmp_path / 'personas.csv'
+    path.write_text(HEADER + _row(12345678) + _row(44444444), encoding='utf-8')
+
+    call_command('import_personas', str(path), usuario=usuario.usu_username, stdout=StringIO())
+
+    assert Persona.objects.filter(per_run=12345678).count() == 1
+    assert Persona.objects.filter(per_run=44444444).exists()
+
+
+@pytest.mark.django_db
+def test_import_endpoint_dry_run(usuario_client, usuario, comuna, estado_civil):
+    archivo = SimpleUploadedFile('personas.csv', (HEADER + _row(12345678) + _row(1, dv='5')).encode())
+
+    response = usuario_client.post(
+        '/api/personas/personas/importar/',
+        {'archivo': archivo, 'dry_run': 'true'},
+        format='multipart',
+    )
+
+    assert response.status_code == 200
+    assert response.json()['created'] == 1
+    assert response.json()['error_count'] == 1
+    assert response.json()['errors'][0]['row'] == 3
+    assert not Persona.objects.exists()
+
+
+@pytest.mark.django_db
+def test_import_endpoint_reads_xlsx(usuario_client, usuario, comuna, estado_civil):
+    openpyxl = pytest.importorskip('openpyxl')
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(HEADER.strip().split(';'))
+    sheet.append(_row(12345678).strip().split(';'))
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+
+    otro = Usuario.objects.create(pel_id=usuario.pel_id, usu_username='otro', usu_email='otro@test.com', usu_password='!')
+    response = usuario_client.post(
+        '/api/personas/personas/importar/',
+        # usu_id del formulario se ignora: el autor es el usuario del token
+        {'archivo': SimpleUploadedFile('personas.xlsx', buffer.getvalue()), 'usu_id': otro.pk},
+        format='multipart',
+    )
+
+    assert response.status_code == 200
+    assert Persona.objects.get().per_email == '12345678@test.com'
+    assert Persona.objects.get().usu_id_id == usuario.pk
+
+
+@pytest.mark.django_db
+def test_import_endpoint_requires_a_system_user(auth_client, comuna, estado_civil):
+    response = auth_client.post(
+        '/api/personas/personas/importar/',
+        {'archivo': SimpleUploadedFile('personas.csv', (HEADER + _row(12345678)).encode())},
+        format='multipart',
+    )
+
+    assert response.status_code == 400
+    assert not Persona.objects.exists()
@@ -0,0 +1,34 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from personas.models import Persona
+
+
+@pytest.mark.django_db
+def test_default_pagination_is_page_number(auth_client, persona_factory):
+    for _ in range(3):
+        persona_factory()
+
+    data = auth_client.get('/api/personas/personas/').json()
+
+    assert data['count'] == 3
+
+
+@pytest.mark.django_db
+def test_cursor_pagination_walks_all_rows_without_count(auth_client, persona_factory):
+    for _ in range(45):
+        persona_factory()
+
+    seen = []
+    url = '/api/personas/personas/?paginacion=cursor'
+    with CaptureQueriesContext(connection) as queries:
+        while url:
+            data = auth_client.get(url).json()
+            assert 'count' not in data
+            seen.extend(row['per_id'] for row in data['results'])
+            url = data['next']
+
+    assert seen == sorted(Persona.objects.values_list('per_id', flat=True))
+    assert not any('COUNT(' in query['sql'].upper() for query in queries.captured_queries)
+    assert not any('OFFSET' in query['sql'].upper() for query in queries.captured_queries)
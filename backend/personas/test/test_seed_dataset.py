@@ -0,0 +1,58 @@
+import io
+import json
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from cursos.models import Curso, CursoResumen, CursoSeccion
+from pagos.models import PagoPersona
+from personas.models import Persona, PersonaCurso
+from personas.validators import run_valido
+from preinscripcion.models import CupoConfiguracion, Preinscripcion
+from scout_project.carga import percentil
+from scout_project.throttling import get_limiter
+
+
+@pytest.fixture
+def dataset(db):
+    call_command('seed_dataset', '--personas', '400', '--cursos', '6', '--usuarios', '2', '--batch-size', '150',
+                 stdout=io.StringIO())
+
+
+@pytest.mark.django_db
+def test_dataset_sembrado(dataset):
+    assert Persona.objects.count() == 400
+    assert all(run_valido(run, dv) for run, dv in Persona.objects.values_list('per_run', 'per_dv'))
+    assert Curso.objects.count() == CursoResumen.objects.count() == CupoConfiguracion.objects.count() == 6
+    assert CursoSeccion.objects.count() >= 6
+    assert PersonaCurso.objects.count() > 200 and PagoPersona.objects.exists()
+    inscritas = Preinscripcion.objects.filter(estado__in=['validado', 'confirmado_pago', 'acreditado']).count()
+    assert inscritas == PersonaCurso.objects.count()
+    with pytest.raises(CommandError):
+        call_command('seed_dataset', '--personas', '1', stdout=io.StringIO())
+
+
+@pytest.mark.django_db
+def test_escenarios_de_carga(settings, dataset):
+    settings.THROTTLE_REDIS_URL = ''
+    cache.clear()
+    get_limiter().clear()
+    salida = io.StringIO()
+
+    call_command('load_test', '--users', '1', '--iterations', '15', '--json', stdout=salida)
+
+    reportes = json.loads(salida.getvalue())
+    assert set(reportes) == {'apertura', 'checkin', 'cierre'}
+    for reporte in reportes.values():
+        for fila in reporte['endpoints']:
+            assert fila['errores'] == 0, fila
+            assert fila['p50'] <= fila['p95'] <= fila['p99']
+    assert Preinscripcion.objects.filter(estado='enviado').exists()
+
+
+def test_percentil():
+    valores = list(range(1, 101))
+    assert (percentil(valores, 50), percentil(valores, 95), percentil(valores, 99)) == (50, 95, 99)
+    assert percentil([], 50) == 0.0
@@ -0,0 +1,23 @@
+def calcular_dv(run):
+    """Calcula el dígito verificador (módulo 11) de un RUN chileno"""
+    if not run:
+        return ''
+    run_str = str(run)
+    f = 2
+    s = 0
+    while run_str:
+        s += int(run_str[-1]) * f
+        run_str = run_str[:-1]
+        f = 2 if f == 7 else f + 1  # serie 2..7
+    dv = 11 - (s % 11)
+    if dv == 11:
+        return '0'
+    elif dv == 10:
+        return 'K'
+    else:
+        return str(dv)
+
+
+def run_valido(run, dv):
+    """Indica si el dígito verificador corresponde al RUN"""
+    return bool(dv) and calcular_dv(run) == str(dv).upper()
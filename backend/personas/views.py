@@ -1,9 +1,46 @@
-from rest_framework import viewsets
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from scout_project.metrics import MetricsMixin
+from scout_project.fieldsets import SparseFieldsMixin
+from scout_project.pagination import OptionalCursorPagination
+from usuarios.permisos import PermisoAplicacion
+from .bulk_import import PersonaImporter, ImportFileError, iter_rows
 from .models import Persona
-from .serializers import PersonaSerializer
+from .serializers import PersonaSerializer, PersonaImportSerializer
 
-class PersonaViewSet(viewsets.ModelViewSet):
+class PersonaViewSet(MetricsMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Persona.objects.all()
     serializer_class = PersonaSerializer
-    permission_classes = [IsAuthenticated]
\ No newline at end of file
+    permission_classes = [IsAuthenticated, PermisoAplicacion]
+    aplicacion = 'personas'
+    pagination_class = OptionalCursorPagination
+    cursor_ordering = 'pk'
+
+    @action(detail=False, methods=['post'], url_path='importar', parser_classes=[MultiPartParser])
+    def importar(self, request):
+        """
+        Importación masiva desde CSV/XLSX
+        POST /api/personas/personas/importar/
+        Form data: archivo, batch_size (opcional), dry_run (opcional)
+        Las personas quedan a nombre del usuario del token.
+        """
+        serializer = PersonaImportSerializer(data=request.data, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+        archivo = serializer.validated_data['archivo']
+
+        importer = PersonaImporter(
+            serializer.validated_data['usu_id'],
+            batch_size=serializer.validated_data['batch_size'],
+            dry_run=serializer.validated_data['dry_run'],
+        )
+        try:
+            summary = importer.run(iter_rows(archivo, archivo.name))
+        except ImportFileError as exc:
+            return Response(
+                {'error': str(exc), **importer.summary()},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(summary, status=status.HTTP_200_OK)
@@ -2,7 +2,13 @@ from django import forms
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 from .models import Preinscripcion, CupoConfiguracion, PreinscripcionEstadoLog
-from personas.models import Persona, Region, Provincia, Comuna, Grupo, Rol, Rama
+from personas.models import Persona
+from personas.validators import calcular_dv
+from cursos.models import Curso
+from geografia.arbol import get_arbol
+from geografia.forms import ArbolChoiceField
+from geografia.models import Region, Provincia, Comuna, Grupo
+from maestros.models import Rol, Rama
 from usuarios.models import Usuario
 from maestros.models import EstadoCivil # Assuming EstadoCivil is in maestros
 from archivos.models import Archivo # Assuming Archivo is in archivos
@@ -25,12 +31,11 @@ class PreinscripcionPersonaForm(forms.ModelForm):
 
     # Campos de selección (ForeignKey)
     esc_id = forms.ModelChoiceField(queryset=EstadoCivil.objects.filter(esc_vigente=True), label="Estado Civil", required=True)
-    reg_id = forms.ModelChoiceField(queryset=Region.objects.filter(reg_vigente=True), label="Región", required=True)
-
-    # Define pro_id and com_id here with initial querysets.
-    # The __init__ method will update these querysets dynamically.
-    pro_id = forms.ModelChoiceField(queryset=Provincia.objects.none(), label="Provincia", required=True) # Initial empty queryset
-    com_id = forms.ModelChoiceField(queryset=Comuna.objects.none(), label="Comuna", required=True) # Initial empty queryset
+    # Región, provincia y comuna salen del árbol geográfico en memoria (geografia/arbol.py): sin consultas.
+    # The __init__ method will update pro_id and com_id choices dynamically.
+    reg_id = ArbolChoiceField(Region, label="Región", required=True)
+    pro_id = ArbolChoiceField(Provincia, label="Provincia", required=True)
+    com_id = ArbolChoiceField(Comuna, label="Comuna", required=True)
 
     # Campos de teléfono
     per_tipo_fono = forms.ChoiceField(
@@ -79,23 +84,7 @@ class PreinscripcionPersonaForm(forms.ModelForm):
         return per_dv
 
     def calcular_dv(self, run):
-        # Implementación simplificada del cálculo del dígito verificador
-        if not run:
-            return ''
-        run_str = str(run)
-        f = 2
-        s = 0
-        while run_str:
-            s += int(run_str[-1]) * f
-            run_str = run_str[:-1]
-            f = 3 if f > 6 else f + 1
-        dv = 11 - (s % 11)
-        if dv == 11:
-            return '0'
-        elif dv == 10:
-            return 'K'
-        else:
-            return str(dv)
+        return calcular_dv(run)
 
     # Override __init__ to handle dynamic filtering of FKs
     def __init__(self, *args, **kwargs):
@@ -105,21 +94,17 @@ class PreinscripcionPersonaForm(forms.ModelForm):
 
         super().__init__(*args, **kwargs)
 
-        # Access fields and explicitly declare their types to help Pylance
-        pro_field: forms.ModelChoiceField = self.fields['pro_id']
-        com_field: forms.ModelChoiceField = self.fields['com_id']
+        # Without explicit params, the cascade follows the submitted region/province
+        if self.reg_id_param is None and self.is_bound:
+            self.reg_id_param = self.data.get(self.add_prefix('reg_id'))
+        if self.pro_id_param is None and self.is_bound:
+            self.pro_id_param = self.data.get(self.add_prefix('pro_id'))
 
-        # Filter Provincia queryset based on reg_id
-        if self.reg_id_param:
-            pro_field.queryset = Provincia.objects.filter(reg_id=self.reg_id_param, pro_vigente=True)
-        else:
-            pro_field.queryset = Provincia.objects.none()
-
-        # Filter Comuna queryset based on pro_id
-        if self.pro_id_param:
-            com_field.queryset = Comuna.objects.filter(pro_id=self.pro_id_param, com_vigente=True)
-        else:
-            com_field.queryset = Comuna.objects.none()
+        # Choices of each level filtered by its parent, from the in-memory tree
+        arbol = get_arbol()
+        self.fields['reg_id'].choices = arbol.choices(Region)
+        self.fields['pro_id'].choices = arbol.choices(Provincia, self.reg_id_param)
+        self.fields['com_id'].choices = arbol.choices(Comuna, self.pro_id_param)
 
         # Ensure required fields are marked as required in the form definition
         self.fields['per_run'].required = True
@@ -141,7 +126,7 @@ class PreinscripcionPersonaForm(forms.ModelForm):
 # Form for the main Preinscripcion details
 class PreinscripcionForm(forms.ModelForm):
     # Campos relacionados con el curso y la inscripción
-    curso = forms.ModelChoiceField(queryset=Curso.objects.filter(estado='published'), label="Curso", required=True)
+    curso = forms.ModelChoiceField(queryset=Curso.objects.filter(cur_estado=1), label="Curso", required=True)  # 1: curso vigente
     rama = forms.ModelChoiceField(queryset=Rama.objects.filter(ram_vigente=True), label="Rama", required=True)
     grupo_asignado = forms.ModelChoiceField(queryset=Grupo.objects.filter(gru_vigente=True), label="Grupo Scout", required=True)
     rol = forms.ModelChoiceField(queryset=Rol.objects.filter(rol_vigente=True), label="Rol en el Curso", required=True) # Assuming Rol is used for role in course
@@ -186,7 +171,7 @@ class PreinscripcionForm(forms.ModelForm):
         # If persona_id is provided, we might want to pre-fill or validate
         if self.persona_id_param:
             try:
-                persona = Persona.objects.get(id=self.persona_id_param)
+                persona = Persona.objects.get(pk=self.persona_id_param)
                 # Pre-fill some fields if possible, or use for validation
                 # e.g., self.initial['rama'] = persona.rama_nivel
                 # e.g., self.initial['grupo_asignado'] = persona.grupo
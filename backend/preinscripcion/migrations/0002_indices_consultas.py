@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-18 10:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('preinscripcion', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='preinscripcion',
+            index=models.Index(fields=['curso', 'estado'], name='preinsc_curso_estado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='preinscripcionestadolog',
+            index=models.Index(fields=['preinscripcion', '-fecha'], name='preinsc_log_fecha_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.8 on 2026-10-18 11:24
+
+from django.db import migrations, models
+
+
+def marcar_cupos_tomados(apps, schema_editor):
+    # Sin registro previo de la reserva: las validadas en adelante son las que ocupan cupo
+    Preinscripcion = apps.get_model('preinscripcion', 'Preinscripcion')
+    Preinscripcion.objects.filter(
+        estado__in=['validado', 'confirmado_pago', 'acreditado'], en_lista_espera=False,
+    ).update(tiene_cupo=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('preinscripcion', '0002_indices_consultas'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='preinscripcion',
+            name='tiene_cupo',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(marcar_cupos_tomados, migrations.RunPython.noop),
+    ]
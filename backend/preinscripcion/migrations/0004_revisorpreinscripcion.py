@@ -0,0 +1,31 @@
+# Generated by Django 5.2.8 on 2026-10-18 11:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('preinscripcion', '0003_preinscripcion_tiene_cupo'),
+        ('usuarios', '0003_usuario_usu_version_permisos'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RevisorPreinscripcion',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('nivel', models.CharField(choices=[('grupo', 'Grupo'), ('distrito', 'Distrito'), ('zona', 'Zona')], max_length=10)),
+                ('nodo_id', models.IntegerField()),
+                ('vigente', models.BooleanField(default=True)),
+                ('usuario', models.ForeignKey(db_column='usuario_id', on_delete=django.db.models.deletion.CASCADE, related_name='ambitos_revision', to='usuarios.usuario')),
+            ],
+            options={
+                'verbose_name': 'Revisor de Preinscripciones',
+                'verbose_name_plural': 'Revisores de Preinscripciones',
+                'db_table': 'preinscripcion_revisor',
+                'unique_together': {('usuario', 'nivel', 'nodo_id')},
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.8 on 2026-10-18 11:46
+
+from collections import defaultdict
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def asignar_cupos(apps, schema_editor):
+    # El rol de la reserva no quedó registrado: se asume la configuración de la rama o la general del curso
+    Preinscripcion = apps.get_model('preinscripcion', 'Preinscripcion')
+    CupoConfiguracion = apps.get_model('preinscripcion', 'CupoConfiguracion')
+    configuraciones = {}
+    for cupo_id, curso_id, rama_id in CupoConfiguracion.objects.order_by('-id').values_list('id', 'curso_id', 'rama_id'):
+        configuraciones[curso_id, rama_id] = cupo_id
+    por_cupo = defaultdict(list)
+    for pk, curso_id, rama_id in Preinscripcion.objects.filter(tiene_cupo=True).values_list('id', 'curso_id', 'rama_id').iterator():
+        cupo_id = configuraciones.get((curso_id, rama_id)) or configuraciones.get((curso_id, None))
+        if cupo_id:
+            por_cupo[cupo_id].append(pk)
+    for cupo_id, pks in por_cupo.items():
+        for inicio in range(0, len(pks), 1000):
+            Preinscripcion.objects.filter(pk__in=pks[inicio:inicio + 1000]).update(cupo_id=cupo_id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('preinscripcion', '0004_revisorpreinscripcion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='preinscripcion',
+            name='cupo',
+            field=models.ForeignKey(blank=True, db_column='cupo_id', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='preinscripciones', to='preinscripcion.cupoconfiguracion'),
+        ),
+        migrations.RunPython(asignar_cupos, migrations.RunPython.noop),
+    ]
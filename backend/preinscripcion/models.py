@@ -44,6 +44,10 @@ class Preinscripcion(models.Model):
     confirmado_por_pago = models.ForeignKey('pagos.PagoPersona', on_delete=models.SET_NULL, db_column='confirmado_por_pago_id', null=True, blank=True, related_name='preinscripciones_confirmadas')
     # en_lista_espera: Indica si la persona está en lista de espera
     en_lista_espera = models.BooleanField(default=False)
+    # tiene_cupo: Indica si la preinscripción ocupa un cupo de CupoConfiguracion (reservar_cupo/liberar_cupo)
+    tiene_cupo = models.BooleanField(default=False)
+    # cupo: Configuración de la que se tomó el cupo, para devolverlo al rechazar o pasar a lista de espera
+    cupo = models.ForeignKey('CupoConfiguracion', on_delete=models.SET_NULL, db_column='cupo_id', null=True, blank=True, related_name='preinscripciones')
     # motivo_rechazo: Motivo si la preinscripción es rechazada
     motivo_rechazo = models.TextField(null=True, blank=True)
     # version_optimistic_lock: Para control de concurrencia (versión del registro)
@@ -59,6 +63,10 @@ class Preinscripcion(models.Model):
         verbose_name_plural = 'Preinscripciones'
         # Asegurar que una persona solo pueda tener una preinscripción activa por curso
         unique_together = ('persona', 'curso')
+        indexes = [
+            # Bandejas de revisión: preinscripciones de un curso en un estado
+            models.Index(fields=['curso', 'estado'], name='preinsc_curso_estado_idx'),
+        ]
 
     def __str__(self):
         return f"Preinscripción {self.id} de {self.persona} para {self.curso}"
@@ -85,6 +93,10 @@ class PreinscripcionEstadoLog(models.Model):
         verbose_name = 'Log de Estado de Preinscripción'
         verbose_name_plural = 'Logs de Estado de Preinscripciones'
         ordering = ['-fecha'] # Ordenar por fecha descendente
+        indexes = [
+            # Historial de una preinscripción en el orden por defecto (-fecha)
+            models.Index(fields=['preinscripcion', '-fecha'], name='preinsc_log_fecha_idx'),
+        ]
 
     def __str__(self):
         return f"Log {self.id}: {self.preinscripcion} de {self.estado_anterior} a {self.estado_nuevo}"
@@ -114,6 +126,35 @@ class CupoConfiguracion(models.Model):
     def __str__(self):
         return f"Cupos para {self.curso} ({self.rol} - {self.rama if self.rama else 'General'}): {self.cupo_usado}/{self.cupo_total}"
 
+# Niveles de revisión (services.APROBACIONES)
+NIVEL_REVISION_CHOICES = [
+    ('grupo', 'Grupo'),
+    ('distrito', 'Distrito'),
+    ('zona', 'Zona'),
+]
+
+# Tabla: RevisorPreinscripcion (ámbito de aprobación de cada revisor)
+class RevisorPreinscripcion(models.Model):
+    # id: Identificador único del ámbito (clave primaria)
+    id = models.AutoField(primary_key=True)
+    # usuario: Usuario que aprueba en este ámbito
+    usuario = models.ForeignKey(Usuario, on_delete=models.CASCADE, db_column='usuario_id', related_name='ambitos_revision')
+    # nivel: Nivel de revisión que puede aprobar
+    nivel = models.CharField(max_length=10, choices=NIVEL_REVISION_CHOICES)
+    # nodo_id: gru_id, dis_id o zon_id según el nivel; cubre los grupos bajo ese nodo (geografia.JerarquiaScout)
+    nodo_id = models.IntegerField()
+    # vigente: Indica si el ámbito está activo
+    vigente = models.BooleanField(default=True)
+
+    class Meta:
+        db_table = 'preinscripcion_revisor'
+        verbose_name = 'Revisor de Preinscripciones'
+        verbose_name_plural = 'Revisores de Preinscripciones'
+        unique_together = ('usuario', 'nivel', 'nodo_id')
+
+    def __str__(self):
+        return f"{self.usuario} revisa {self.nivel} {self.nodo_id}"
+
 # Tabla: DocumentoPersona (extensión de Archivo para documentos médicos)
 # Asumiendo que Archivo es un modelo genérico en la app 'archivos'
 # Si Archivo no existe o no es adecuado, se crearía un modelo Documento genérico aquí.
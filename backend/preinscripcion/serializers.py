@@ -0,0 +1,55 @@
+from rest_framework import serializers
+from maestros.models import Rol
+from scout_project.fieldsets import DynamicFieldsMixin, expandable
+from .models import Preinscripcion, PreinscripcionEstadoLog, CupoConfiguracion, RevisorPreinscripcion, ESTADO_INSCRIPCION_CHOICES
+from .services import APROBACIONES
+
+
+@expandable
+class PreinscripcionSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    class Meta:
+        model = Preinscripcion
+        fields = '__all__'
+        # Los cambios de estado pasan por la máquina de estados (acciones transicionar/aprobar)
+        read_only_fields = ['estado', 'en_lista_espera', 'habilitado_por', 'habilitado_fecha', 'version_optimistic_lock']
+
+
+class PreinscripcionEstadoLogSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    class Meta:
+        model = PreinscripcionEstadoLog
+        fields = '__all__'
+
+
+class CupoConfiguracionSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    class Meta:
+        model = CupoConfiguracion
+        fields = '__all__'
+        read_only_fields = ['cupo_usado']
+
+
+class RevisorPreinscripcionSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    class Meta:
+        model = RevisorPreinscripcion
+        fields = '__all__'
+
+
+class TransicionLoteSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False, max_length=10000)
+    estado = serializers.ChoiceField(choices=ESTADO_INSCRIPCION_CHOICES)
+    detalle = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+
+    def validate_estado(self, value):
+        # El envío reserva cupo: pasa por la acción enviar, no por el cambio en lote
+        if value == 'enviado':
+            raise serializers.ValidationError('Use la acción enviar para enviar una preinscripción.')
+        return value
+
+
+class EnvioSerializer(serializers.Serializer):
+    rol = serializers.PrimaryKeyRelatedField(queryset=Rol.objects.all())
+
+
+class AprobacionLoteSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False, max_length=10000)
+    nivel = serializers.ChoiceField(choices=list(APROBACIONES))
+    detalle = serializers.CharField(required=False, allow_blank=True, allow_null=True)
@@ -0,0 +1,262 @@
+"""
+Servicios de preinscripción
+Reserva de cupos: el cupo se toma con un UPDATE condicional
+(cupo_usado < cupo_total) que la base de datos ejecuta de forma atómica, por lo
+que no hay sobrecupo aunque cientos de personas envíen al mismo tiempo. La
+preinscripción se actualiza con bloqueo optimista (version_optimistic_lock) en
+la misma transacción; ante conflicto se revierte la reserva y se reintenta con
+backoff exponencial.
+
+Máquina de estados: TRANSICIONES define los cambios de estado permitidos y
+transicionar() los aplica en lote (miles de filas) en una sola transacción,
+con un UPDATE por estado de origen y el log de auditoría vía bulk_create.
+Rechazar o pasar a lista de espera devuelve el cupo en la misma transacción.
+enviar() es el único camino a 'enviado': cambia el estado y reserva el cupo.
+aprobar() además limita cada fila al ámbito del revisor (RevisorPreinscripcion):
+el grupo asignado debe estar bajo alguno de sus nodos del nivel que aprueba.
+"""
+import random
+import time
+from collections import Counter
+
+from django.db import transaction, OperationalError
+from django.db.models import F, Q
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from cursos.resumen import ajustar_resumen, cuenta_en_lista_espera, programar_resumen
+from geografia.jerarquia import GRUPO
+from geografia.models import JerarquiaScout
+from .models import CupoConfiguracion, Preinscripcion, PreinscripcionEstadoLog, RevisorPreinscripcion
+
+
+MAX_INTENTOS = 5
+BACKOFF_BASE = 0.01
+
+
+class ReservaError(Exception):
+    """No fue posible reservar el cupo"""
+
+
+class ConflictoVersion(Exception):
+    """La preinscripción fue modificada por otro proceso"""
+
+
+def get_configuracion_cupo(curso_id, rol_id, rama_id=None):
+    """Configuración de cupo aplicable: la de la rama o, si no existe, la general"""
+    configuraciones = CupoConfiguracion.objects.filter(curso_id=curso_id, rol_id=rol_id).filter(
+        Q(rama_id=rama_id) | Q(rama__isnull=True)
+    ).order_by(F('rama_id').asc(nulls_last=True))
+    configuracion = configuraciones.first()
+    if configuracion is None:
+        raise ReservaError('El curso no tiene cupos configurados para este rol.')
+    return configuracion
+
+
+def reservar_cupo(preinscripcion, rol_id, max_intentos=MAX_INTENTOS):
+    """
+    Reserva un cupo para la preinscripción o la deja en lista de espera.
+    Retorna True si obtuvo cupo. La instancia queda con los valores guardados.
+    Es idempotente: si la preinscripción ya tiene cupo (doble envío,
+    reintento del cliente) retorna True sin tomar otro.
+    """
+    for intento in range(1, max_intentos + 1):
+        try:
+            if intento > 1:
+                preinscripcion.refresh_from_db(fields=['version_optimistic_lock', 'en_lista_espera', 'tiene_cupo'])
+            if preinscripcion.tiene_cupo:
+                return True
+            configuracion = get_configuracion_cupo(preinscripcion.curso_id, rol_id, preinscripcion.rama_id)
+            with transaction.atomic():
+                reservado = CupoConfiguracion.objects.filter(
+                    pk=configuracion.pk, cupo_usado__lt=F('cupo_total')
+                ).update(cupo_usado=F('cupo_usado') + 1) == 1
+
+                version = preinscripcion.version_optimistic_lock
+                # tiene_cupo=False en el filtro: otra solicitud que ya reservó hace fallar esta
+                actualizadas = Preinscripcion.objects.filter(
+                    pk=preinscripcion.pk, version_optimistic_lock=version, tiene_cupo=False
+                ).update(en_lista_espera=not reservado, tiene_cupo=reservado, cupo=configuracion if reservado else None,
+                         version_optimistic_lock=version + 1)
+                if not actualizadas:
+                    # Revierte también la reserva del cupo
+                    raise ConflictoVersion()
+                en_espera_antes = cuenta_en_lista_espera(preinscripcion.estado, preinscripcion.en_lista_espera)
+                en_espera = cuenta_en_lista_espera(preinscripcion.estado, not reservado)
+                ajustar_resumen(preinscripcion.curso_id, cre_cupo_usado=int(reservado),
+                                cre_lista_espera=int(en_espera) - int(en_espera_antes))
+        except (ConflictoVersion, OperationalError):
+            # OperationalError cubre deadlocks (MySQL) y bloqueos (SQLite)
+            if intento == max_intentos:
+                raise ReservaError('No fue posible reservar el cupo por concurrencia; reintente.')
+            time.sleep(BACKOFF_BASE * (2 ** (intento - 1)) * random.uniform(0.5, 1.5))
+            continue
+
+        preinscripcion.en_lista_espera = not reservado
+        preinscripcion.tiene_cupo = reservado
+        preinscripcion.cupo = configuracion if reservado else None
+        preinscripcion.version_optimistic_lock = version + 1
+        return reservado
+
+
+def _liberar_cupos(pks):
+    """
+    Devuelve a su CupoConfiguracion los cupos de las preinscripciones indicadas
+    que los tenían. Debe llamarse dentro de una transacción; retorna cuántos liberó.
+    """
+    con_cupo = Preinscripcion.objects.filter(pk__in=pks, tiene_cupo=True)
+    # select_for_update: dos liberaciones simultáneas no descuentan dos veces el mismo cupo
+    por_configuracion = Counter(con_cupo.select_for_update().values_list('cupo_id', flat=True))
+    if not por_configuracion:
+        return 0
+    con_cupo.update(tiene_cupo=False, cupo=None, version_optimistic_lock=F('version_optimistic_lock') + 1)
+    for cupo_id, cantidad in por_configuracion.items():
+        if cupo_id is not None:
+            CupoConfiguracion.objects.filter(pk=cupo_id).update(cupo_usado=Greatest(F('cupo_usado') - cantidad, 0))
+    return sum(por_configuracion.values())
+
+
+def liberar_cupo(preinscripcion):
+    """
+    Devuelve el cupo de una preinscripción que lo tenía.
+    Retorna False sin tocar CupoConfiguracion si no tenía cupo o ya se liberó.
+    """
+    with transaction.atomic():
+        liberado = _liberar_cupos([preinscripcion.pk]) == 1
+        if liberado:
+            ajustar_resumen(preinscripcion.curso_id, cre_cupo_usado=-1)
+    if liberado:
+        preinscripcion.refresh_from_db(fields=['version_optimistic_lock', 'tiene_cupo', 'cupo'])
+    return liberado
+
+
+TRANSICIONES = {
+    'borrador': {'enviado'},
+    'enviado': {'en_revision_grupo', 'en_lista_espera', 'rechazado'},
+    'en_lista_espera': {'en_revision_grupo', 'rechazado'},
+    'en_revision_grupo': {'en_revision_distrito', 'rechazado'},
+    'en_revision_distrito': {'en_revision_zona', 'rechazado'},
+    'en_revision_zona': {'validado', 'rechazado'},
+    'validado': {'confirmado_pago', 'rechazado'},
+    'confirmado_pago': {'acreditado'},
+    'acreditado': set(),
+    'rechazado': set(),
+}
+
+# Nivel revisor -> (estado que revisa, estado al aprobar)
+APROBACIONES = {
+    'grupo': ('en_revision_grupo', 'en_revision_distrito'),
+    'distrito': ('en_revision_distrito', 'en_revision_zona'),
+    'zona': ('en_revision_zona', 'validado'),
+}
+
+LOTE_TRANSICION = 1000
+
+# Estados que dejan a la preinscripción sin cupo: transicionar() lo devuelve en la misma transacción
+LIBERAN_CUPO = {'rechazado', 'en_lista_espera'}
+
+
+def transicion_valida(estado_actual, estado_nuevo):
+    return estado_nuevo in TRANSICIONES.get(estado_actual, ())
+
+
+def transicionar(ids, estado_nuevo, usu_id=None, detalle=None, estado_requerido=None, grupos=None):
+    """
+    Cambia de estado las preinscripciones indicadas en una sola transacción.
+    Las que no existen, no están en estado_requerido (si se indica), no tienen
+    su grupo asignado en grupos (si se indica) o no permiten la transición se
+    informan en 'errores' y no se modifican.
+    usu_id queda como autor en el log y, al validar, en habilitado_por.
+    Retorna {'actualizadas': [ids], 'errores': [{'id', 'error'}]}.
+    """
+    if estado_nuevo not in TRANSICIONES:
+        raise ValueError(f'Estado desconocido: {estado_nuevo}')
+
+    ids = list(dict.fromkeys(ids))
+    actualizadas = []
+    errores = []
+    cursos = set()
+    ahora = timezone.now()
+    cambios = {'estado': estado_nuevo, 'updated_at': ahora,
+               'version_optimistic_lock': F('version_optimistic_lock') + 1}
+    if estado_nuevo == 'validado':
+        cambios.update(habilitado_por_id=usu_id, habilitado_fecha=ahora)
+    if estado_nuevo == 'rechazado':
+        cambios['motivo_rechazo'] = detalle
+    if estado_nuevo == 'en_lista_espera':
+        cambios['en_lista_espera'] = True
+
+    with transaction.atomic():
+        for inicio in range(0, len(ids), LOTE_TRANSICION):
+            lote = ids[inicio:inicio + LOTE_TRANSICION]
+            # select_for_update bloquea las filas hasta el commit (no-op en SQLite)
+            estados = {
+                pk: (estado, curso_id, grupo_id) for pk, estado, curso_id, grupo_id in
+                Preinscripcion.objects.select_for_update().filter(pk__in=lote).values_list(
+                    'id', 'estado', 'curso_id', 'grupo_asignado_id')
+            }
+            por_origen = {}
+            for pk in lote:
+                estado, curso_id, grupo_id = estados.get(pk, (None, None, None))
+                if estado is None:
+                    errores.append({'id': pk, 'error': 'Preinscripción no encontrada.'})
+                elif grupos is not None and grupo_id not in grupos:
+                    errores.append({'id': pk, 'error': 'La preinscripción está fuera de su ámbito de revisión.'})
+                elif estado_requerido and estado != estado_requerido:
+                    errores.append({'id': pk, 'error': f'La preinscripción está en estado {estado}.'})
+                elif not transicion_valida(estado, estado_nuevo):
+                    errores.append({'id': pk, 'error': f'Transición no permitida: {estado} -> {estado_nuevo}.'})
+                else:
+                    por_origen.setdefault(estado, []).append(pk)
+                    cursos.add(curso_id)
+
+            logs = []
+            for estado_anterior, pks in por_origen.items():
+                Preinscripcion.objects.filter(pk__in=pks, estado=estado_anterior).update(**cambios)
+                logs.extend(
+                    PreinscripcionEstadoLog(preinscripcion_id=pk, estado_anterior=estado_anterior,
+                                            estado_nuevo=estado_nuevo, cambiado_por_id=usu_id, detalle=detalle)
+                    for pk in pks
+                )
+                actualizadas.extend(pks)
+            PreinscripcionEstadoLog.objects.bulk_create(logs, batch_size=LOTE_TRANSICION)
+            if estado_nuevo in LIBERAN_CUPO and logs:
+                _liberar_cupos([log.preinscripcion_id for log in logs])
+        # El UPDATE en lote no emite signals: el dashboard se recalcula al confirmar
+        programar_resumen(cursos)
+
+    return {'actualizadas': actualizadas, 'errores': errores}
+
+
+def grupos_del_revisor(usu_id, nivel):
+    """gru_id de los grupos bajo los nodos que el usuario revisa en el nivel indicado"""
+    nodos = RevisorPreinscripcion.objects.filter(usuario_id=usu_id, nivel=nivel, vigente=True).values('nodo_id')
+    return set(JerarquiaScout.objects.filter(
+        jer_ancestro_tipo=nivel, jer_ancestro_id__in=nodos, jer_descendiente_tipo=GRUPO,
+    ).values_list('jer_descendiente_id', flat=True))
+
+
+def enviar(preinscripcion, rol_id, usu_id=None):
+    """
+    Envía una preinscripción en borrador y le reserva cupo para el rol indicado.
+    Retorna True si obtuvo cupo y False si quedó en lista de espera. Reenviar
+    una ya enviada solo reintenta la reserva (reservar_cupo es idempotente).
+    """
+    if preinscripcion.estado == 'borrador':
+        transicionar([preinscripcion.pk], 'enviado', usu_id=usu_id, estado_requerido='borrador')
+        preinscripcion.refresh_from_db()
+    if preinscripcion.estado != 'enviado':
+        raise ReservaError('Solo se pueden enviar preinscripciones en borrador.')
+    return reservar_cupo(preinscripcion, rol_id)
+
+
+def aprobar(ids, nivel, usu_id=None, detalle=None):
+    """
+    Aprobación en lote de un revisor de grupo, distrito o zona.
+    Con usu_id solo aprueba las preinscripciones de grupos en su ámbito para
+    ese nivel; sin usu_id (procesos internos) no restringe el ámbito.
+    """
+    estado_revision, estado_aprobado = APROBACIONES[nivel]
+    grupos = grupos_del_revisor(usu_id, nivel) if usu_id is not None else None
+    return transicionar(ids, estado_aprobado, usu_id=usu_id, detalle=detalle, estado_requerido=estado_revision,
+                        grupos=grupos)
@@ -0,0 +1,182 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.db import connection
+
+from maestros.models import Rol, Rama
+from preinscripcion.models import CupoConfiguracion, Preinscripcion
+from preinscripcion.services import ReservaError, reservar_cupo, liberar_cupo, transicionar
+
+
+@pytest.fixture
+def rol(db):
+    return Rol.objects.create(rol_descripcion='Participante', rol_tipo=1, rol_vigente=True)
+
+
+def _preinscripciones(curso, persona_factory, total):
+    return [Preinscripcion.objects.create(persona=persona_factory(), curso=curso, estado='enviado') for _ in range(total)]
+
+
+@pytest.mark.django_db
+def test_reserva_hasta_completar_y_luego_lista_espera(curso, rol, persona_factory):
+    cupo = CupoConfiguracion.objects.create(curso=curso, rol=rol, cupo_total=2)
+    preinscripciones = _preinscripciones(curso, persona_factory, 3)
+
+    resultados = [reservar_cupo(pre, rol.pk) for pre in preinscripciones]
+
+    cupo.refresh_from_db()
+    assert resultados == [True, True, False]
+    assert cupo.cupo_usado == 2
+    assert Preinscripcion.objects.get(pk=preinscripciones[2].pk).en_lista_espera is True
+    assert all(pre.version_optimistic_lock == 1 for pre in preinscripciones)
+
+
+@pytest.mark.django_db
+def test_prefiere_cupo_de_la_rama(curso, rol, persona_factory):
+    rama = Rama.objects.create(ram_descripcion='Tropa', ram_vigente=True)
+    general = CupoConfiguracion.objects.create(curso=curso, rol=rol, cupo_total=5)
+    de_rama = CupoConfiguracion.objects.create(curso=curso, rol=rol, rama=rama, cupo_total=5)
+    pre = Preinscripcion.objects.create(persona=persona_factory(), curso=curso, rama=rama)
+
+    reservar_cupo(pre, rol.pk)
+
+    general.refresh_from_db()
+    de_rama.refresh_from_db()
+    assert (general.cupo_usado, de_rama.cupo_usado) == (0, 1)
+
+
+@pytest.mark.django_db
+def test_conflicto_de_version_revierte_el_cupo(curso, rol, persona_factory, monkeypatch):
+    monkeypatch.setattr('preinscripcion.services.BACKOFF_BASE', 0)
+    cupo = CupoConfiguracion.objects.create(curso=curso, rol=rol, cupo_total=5)
+    pre = _preinscripciones(curso, persona_factory, 1)[0]
+    # Otro proceso modificó la preinscripción: la copia en memoria queda obsoleta
+    Preinscripcion.objects.filter(pk=pre.pk).update(version_optimistic_lock=7)
+
+    assert reservar_cupo(pre, rol.pk) is True
+
+    cupo.refresh_from_db()
+    assert cupo.cupo_usado == 1
+    assert Preinscripcion.objects.get(pk=pre.pk).version_optimistic_lock == 8
+
+
+@pytest.mark.django_db
+def test_sin_configuracion_y_liberar(curso, rol, persona_factory):
+    pre = _preinscripciones(curso, persona_factory, 1)[0]
+    with pytest.raises(ReservaError):
+        reservar_cupo(pre, rol.pk)
+
+    cupo = CupoConfiguracion.objects.create(curso=curso, rol=rol, cupo_total=1, cupo_usado=1)
+    # Sin cupo tomado por esta preinscripción no se libera el de otra
+    assert liberar_cupo(pre) is False
+    cupo.refresh_from_db()
+    assert cupo.cupo_usado == 1
+
+    cupo.cupo_usado = 0
+    cupo.save()
+    assert reservar_cupo(pre, rol.pk) is True
+    assert liberar_cupo(pre) is True
+    assert liberar_cupo(pre) is False
+    cupo.refresh_from_db()
+    assert cupo.cupo_usado == 0
+    assert Preinscripcion.objects.get(pk=pre.pk).tiene_cupo is False
+
+
+@pytest.mark.django_db
+def test_rechazar_o_pasar_a_lista_de_espera_devuelve_el_cupo(curso, rol, persona_factory):
+    cupo = CupoConfiguracion.objects.create(curso=curso, rol=rol, cupo_total=3)
+    preinscripciones = _preinscripciones(curso, persona_factory, 3)
+    for pre in preinscripciones:
+        assert reservar_cupo(pre, rol.pk) is True
+
+    resultado = transicionar([preinscripciones[0].pk], 'rechazado')
+    resultado_espera = transicionar([preinscripciones[1].pk], 'en_lista_espera')
+
+    assert resultado['actualizadas'] == [preinscripciones[0].pk]
+    assert resultado_espera['actualizadas'] == [preinscripciones[1].pk]
+    cupo.refresh_from_db()
+    assert cupo.cupo_usado == 1
+    assert list(Preinscripcion.objects.filter(tiene_cupo=True).values_list('pk', flat=True)) == [preinscripciones[2].pk]
+    assert Preinscripcion.objects.get(pk=preinscripciones[0].pk).cupo_id is None
+    # El cupo liberado queda disponible para otra preinscripción
+    assert reservar_cupo(_preinscripciones(curso, persona_factory, 1)[0], rol.pk) is True
+
+
+@pytest.mark.django_db
+def test_reserva_idempotente(curso, rol, persona_factory):
+    cupo = CupoConfiguracion.objects.create(curso=curso, rol=rol, cupo_total=5)
+    pre = _preinscripciones(curso, persona_factory, 1)[0]
+    # Copia obsoleta, como la de una segunda solicitud del mismo envío
+    duplicada = Preinscripcion.objects.get(pk=pre.pk)
+
+    assert reservar_cupo(pre, rol.pk) is True
+    assert reservar_cupo(pre, rol.pk) is True
+    assert reservar_cupo(duplicada, rol.pk) is True
+
+    cupo.refresh_from_db()
+    assert cupo.cupo_usado == 1
+    assert Preinscripcion.objects.get(pk=pre.pk).tiene_cupo is True
+
+
+@pytest.mark.slow
+@pytest.mark.django_db(transaction=True)
+def test_500_solicitudes_concurrentes_sin_sobrecupo(curso, rol, persona_factory, monkeypatch):
+    monkeypatch.setattr('preinscripcion.services.BACKOFF_BASE', 0.001)
+    cupo = CupoConfiguracion.objects.create(curso=curso, rol=rol, cupo_total=120)
+    preinscripciones = _preinscripciones(curso, persona_factory, 500)
+
+    def reservar(pre):
+        try:
+            return reservar_cupo(pre, rol.pk, max_intentos=50)
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(max_workers=50) as pool:
+        resultados = list(pool.map(reservar, preinscripciones))
+
+    cupo.refresh_from_db()
+    assert resultados.count(True) == 120
+    assert cupo.cupo_usado == 120
+    assert Preinscripcion.objects.filter(en_lista_espera=True).count() == 380
+    assert Preinscripcion.objects.filter(tiene_cupo=True).count() == 120
+
+
+@pytest.mark.django_db
+def test_api_enviar_reserva_cupo_y_409_sin_cupo(usuario_client, usuario, curso, rol, persona_factory):
+    cupo = CupoConfiguracion.objects.create(curso=curso, rol=rol, cupo_total=1)
+    ids = []
+    for _ in range(2):
+        response = usuario_client.post('/api/preinscripcion/preinscripciones/',
+                                       {'persona': persona_factory().pk, 'curso': curso.pk}, format='json')
+        assert response.status_code == 201
+        ids.append(response.json()['id'])
+
+    response = usuario_client.post(f'/api/preinscripcion/preinscripciones/{ids[0]}/enviar/', {'rol': rol.pk}, format='json')
+    assert response.status_code == 200
+    assert response.json()['estado'] == 'enviado' and response.json()['tiene_cupo'] is True
+    # Reenviar no toma otro cupo
+    assert usuario_client.post(f'/api/preinscripcion/preinscripciones/{ids[0]}/enviar/',
+                               {'rol': rol.pk}, format='json').status_code == 200
+
+    response = usuario_client.post(f'/api/preinscripcion/preinscripciones/{ids[1]}/enviar/', {'rol': rol.pk}, format='json')
+    assert response.status_code == 409
+    assert response.json()['preinscripcion']['en_lista_espera'] is True
+    cupo.refresh_from_db()
+    assert cupo.cupo_usado == 1
+    segunda = Preinscripcion.objects.get(pk=ids[1])
+    assert segunda.estado == 'enviado' and segunda.estado_logs.get().cambiado_por_id == usuario.pk
+
+    # El envío sin reserva por la transición en lote se rechaza
+    response = usuario_client.post('/api/preinscripcion/preinscripciones/transicionar/',
+                                   {'ids': [ids[1]], 'estado': 'enviado'}, format='json')
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+def test_api_enviar_sin_configuracion_de_cupo(usuario_client, curso, rol, persona_factory):
+    pre = Preinscripcion.objects.create(persona=persona_factory(), curso=curso)
+
+    response = usuario_client.post(f'/api/preinscripcion/preinscripciones/{pre.pk}/enviar/', {'rol': rol.pk}, format='json')
+
+    assert response.status_code == 409
+    assert 'cupos configurados' in response.json()['detail']
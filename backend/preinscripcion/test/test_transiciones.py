@@ -0,0 +1,140 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from geografia.models import Zona, Distrito, Grupo
+from preinscripcion.models import Preinscripcion, PreinscripcionEstadoLog, RevisorPreinscripcion
+from preinscripcion.services import transicionar, aprobar
+from usuarios.models import Usuario
+
+
+@pytest.fixture
+def preinscripcion_factory(curso, persona_factory):
+    def make(estado='enviado', total=1):
+        return [
+            Preinscripcion.objects.create(persona=persona_factory(), curso=curso, estado=estado)
+            for _ in range(total)
+        ]
+    return make
+
+
+@pytest.mark.django_db
+def test_transicion_en_lote_con_errores_por_item(preinscripcion_factory, usuario):
+    validas = preinscripcion_factory('en_revision_zona', total=3)
+    invalida = preinscripcion_factory('borrador')[0]
+
+    resultado = transicionar([p.pk for p in validas] + [invalida.pk, 999999], 'validado', usu_id=usuario.pk)
+
+    assert resultado['actualizadas'] == [p.pk for p in validas]
+    assert [e['id'] for e in resultado['errores']] == [invalida.pk, 999999]
+    assert Preinscripcion.objects.filter(estado='validado', habilitado_por=usuario).count() == 3
+    assert Preinscripcion.objects.get(pk=invalida.pk).estado == 'borrador'
+    assert set(PreinscripcionEstadoLog.objects.values_list('estado_anterior', 'estado_nuevo')) == {
+        ('en_revision_zona', 'validado')
+    }
+    assert PreinscripcionEstadoLog.objects.count() == 3
+
+
+@pytest.mark.django_db
+def test_lote_grande_usa_consultas_constantes(preinscripcion_factory):
+    pendientes = preinscripcion_factory('en_revision_grupo', total=300)
+
+    with CaptureQueriesContext(connection) as queries:
+        resultado = aprobar([p.pk for p in pendientes], 'grupo')
+
+    assert len(resultado['actualizadas']) == 300
+    # SELECT de estados + UPDATE + INSERT del log (más savepoint/transacción)
+    assert len(queries) <= 6
+    assert Preinscripcion.objects.filter(estado='en_revision_distrito', version_optimistic_lock=1).count() == 300
+
+
+@pytest.mark.django_db
+def test_aprobar_exige_estado_del_nivel(preinscripcion_factory):
+    pre = preinscripcion_factory('en_revision_grupo')[0]
+
+    resultado = aprobar([pre.pk], 'distrito')
+
+    assert resultado['actualizadas'] == []
+    assert Preinscripcion.objects.get(pk=pre.pk).estado == 'en_revision_grupo'
+
+
+@pytest.fixture
+def grupos(db):
+    """Dos distritos de una zona, con un grupo cada uno"""
+    zona = Zona.objects.create(zon_descripcion='Norte', zon_unilateral=False, zon_vigente=True)
+    costa = Distrito.objects.create(zon_id=zona, dis_descripcion='Costa', dis_vigente=True)
+    valle = Distrito.objects.create(zon_id=zona, dis_descripcion='Valle', dis_vigente=True)
+    faro = Grupo.objects.create(dis_id=costa, gru_descripcion='Faro', gru_vigente=True)
+    rio = Grupo.objects.create(dis_id=valle, gru_descripcion='Río', gru_vigente=True)
+    return zona, costa, faro, rio
+
+
+@pytest.mark.django_db
+def test_api_aprobar_en_el_ambito_del_revisor_y_log_por_cursor(usuario_client, usuario, grupos, preinscripcion_factory):
+    zona, costa, faro, rio = grupos
+    RevisorPreinscripcion.objects.create(usuario=usuario, nivel='distrito', nodo_id=costa.pk)
+    pendientes = preinscripcion_factory('en_revision_distrito', total=3)
+    Preinscripcion.objects.filter(pk__in=[p.pk for p in pendientes[:2]]).update(grupo_asignado=faro)
+    Preinscripcion.objects.filter(pk=pendientes[2].pk).update(grupo_asignado=rio)
+
+    response = usuario_client.post(
+        '/api/preinscripcion/preinscripciones/aprobar/',
+        {'ids': [p.pk for p in pendientes], 'nivel': 'distrito', 'detalle': 'OK distrito'},
+        format='json',
+    )
+
+    assert response.status_code == 200
+    assert response.json()['actualizadas'] == [pendientes[0].pk, pendientes[1].pk]
+    assert [error['id'] for error in response.json()['errores']] == [pendientes[2].pk]
+    # Revisor de distrito: no aprueba como zona aunque el grupo esté bajo su distrito
+    Preinscripcion.objects.filter(pk=pendientes[0].pk).update(estado='en_revision_zona')
+    response = usuario_client.post('/api/preinscripcion/preinscripciones/aprobar/',
+                                   {'ids': [pendientes[0].pk], 'nivel': 'zona'}, format='json')
+    assert response.json()['actualizadas'] == []
+
+    logs = usuario_client.get('/api/preinscripcion/estado-logs/?paginacion=cursor').json()
+    assert [log['estado_nuevo'] for log in logs['results']] == ['en_revision_zona', 'en_revision_zona']
+    assert {log['cambiado_por'] for log in logs['results']} == {usuario.pk}
+    logs = usuario_client.get(f'/api/preinscripcion/estado-logs/?preinscripcion={pendientes[0].pk}').json()
+    assert [log['preinscripcion'] for log in logs['results']] == [pendientes[0].pk]
+    response = usuario_client.get('/api/preinscripcion/estado-logs/?preinscripcion=abc')
+    assert response.status_code == 400
+    assert 'preinscripcion' in response.json()
+
+
+@pytest.mark.django_db
+def test_api_aprobar_exige_usuario_revisor(auth_client, preinscripcion_factory):
+    pre = preinscripcion_factory('en_revision_grupo')[0]
+
+    response = auth_client.post('/api/preinscripcion/preinscripciones/aprobar/',
+                                {'ids': [pre.pk], 'nivel': 'grupo'}, format='json')
+
+    assert response.status_code == 403
+    assert Preinscripcion.objects.get(pk=pre.pk).estado == 'en_revision_grupo'
+
+
+@pytest.mark.django_db
+def test_api_rechaza_nivel_o_estado_invalido(auth_client, preinscripcion_factory):
+    pre = preinscripcion_factory()[0]
+
+    assert auth_client.post('/api/preinscripcion/preinscripciones/aprobar/',
+                            {'ids': [pre.pk], 'nivel': 'nacional'}, format='json').status_code == 400
+    assert auth_client.post('/api/preinscripcion/preinscripciones/transicionar/',
+                            {'ids': [pre.pk], 'estado': 'inexistente'}, format='json').status_code == 400
+    response = auth_client.patch(f'/api/preinscripcion/preinscripciones/{pre.pk}/',
+                                 {'estado': 'acreditado'}, format='json')
+    assert response.status_code == 200
+    assert Preinscripcion.objects.get(pk=pre.pk).estado == 'enviado'
+
+
+@pytest.mark.django_db
+def test_api_registra_al_usuario_del_token(usuario_client, usuario, preinscripcion_factory):
+    pre = preinscripcion_factory()[0]
+    otro = Usuario.objects.create(pel_id=usuario.pel_id, usu_username='otro', usu_email='otro@test.com', usu_password='!')
+
+    # usu_id en el cuerpo se ignora: el autor es siempre el del token
+    response = usuario_client.post('/api/preinscripcion/preinscripciones/transicionar/',
+                                   {'ids': [pre.pk], 'estado': 'en_revision_grupo', 'usu_id': otro.pk}, format='json')
+
+    assert response.status_code == 200
+    assert PreinscripcionEstadoLog.objects.get(preinscripcion=pre).cambiado_por_id == usuario.pk
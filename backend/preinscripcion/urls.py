@@ -0,0 +1,13 @@
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from .views import PreinscripcionViewSet, PreinscripcionEstadoLogViewSet, CupoConfiguracionViewSet, RevisorPreinscripcionViewSet
+
+router = DefaultRouter()
+router.register(r'preinscripciones', PreinscripcionViewSet)
+router.register(r'estado-logs', PreinscripcionEstadoLogViewSet)
+router.register(r'cupos', CupoConfiguracionViewSet)
+router.register(r'revisores', RevisorPreinscripcionViewSet)
+
+urlpatterns = [
+    path('', include(router.urls)),
+]
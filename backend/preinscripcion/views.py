@@ -1,3 +1,117 @@
-from django.shortcuts import render
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from scout_project.metrics import MetricsMixin
+from scout_project.fieldsets import SparseFieldsMixin
+from scout_project.pagination import OptionalCursorPagination
+from usuarios.permisos import PermisoAplicacion, usuario_id
+from .models import Preinscripcion, PreinscripcionEstadoLog, CupoConfiguracion, RevisorPreinscripcion
+from .serializers import (
+    PreinscripcionSerializer,
+    PreinscripcionEstadoLogSerializer,
+    CupoConfiguracionSerializer,
+    RevisorPreinscripcionSerializer,
+    TransicionLoteSerializer,
+    AprobacionLoteSerializer,
+    EnvioSerializer,
+)
+from . import services
 
-# Create your views here.
+
+class PreinscripcionViewSet(MetricsMixin, SparseFieldsMixin, viewsets.ModelViewSet):
+    queryset = Preinscripcion.objects.all()
+    serializer_class = PreinscripcionSerializer
+    permission_classes = [IsAuthenticated, PermisoAplicacion]
+    aplicacion = 'preinscripcion'
+    pagination_class = OptionalCursorPagination
+    cursor_ordering = '-pk'
+
+    @action(detail=True, methods=['post'], url_path='enviar')
+    def enviar(self, request, pk=None):
+        """
+        Envío de una preinscripción con reserva de cupo
+        POST /api/preinscripcion/preinscripciones/{id}/enviar/
+        Body: {"rol": id}
+        200 si obtuvo cupo; 409 si el curso no tiene cupo disponible (queda en
+        lista de espera) o no fue posible reservarlo.
+        """
+        preinscripcion = self.get_object()
+        serializer = EnvioSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            reservado = services.enviar(preinscripcion, serializer.validated_data['rol'].pk, usu_id=usuario_id(request))
+        except services.ReservaError as error:
+            return Response({'detail': str(error)}, status=status.HTTP_409_CONFLICT)
+        data = self.get_serializer(preinscripcion).data
+        if not reservado:
+            return Response({'detail': 'El curso no tiene cupos disponibles; la preinscripción quedó en lista de espera.',
+                             'preinscripcion': data}, status=status.HTTP_409_CONFLICT)
+        return Response(data, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['post'], url_path='transicionar')
+    def transicionar(self, request):
+        """
+        Cambio de estado en lote
+        POST /api/preinscripcion/preinscripciones/transicionar/
+        Body: {"ids": [...], "estado": "...", "detalle": opcional}
+        El cambio queda registrado a nombre del usuario del token.
+        """
+        serializer = TransicionLoteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        resultado = services.transicionar(data['ids'], data['estado'], usu_id=usuario_id(request), detalle=data.get('detalle'))
+        return Response(resultado, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['post'], url_path='aprobar')
+    def aprobar(self, request):
+        """
+        Aprobación en lote para revisores de grupo, distrito o zona
+        POST /api/preinscripcion/preinscripciones/aprobar/
+        Body: {"ids": [...], "nivel": "grupo|distrito|zona", "detalle": opcional}
+        Solo aprueba las de grupos en el ámbito del revisor (RevisorPreinscripcion)
+        para ese nivel; las demás se informan en 'errores'.
+        """
+        serializer = AprobacionLoteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        usu_id = usuario_id(request)
+        if usu_id is None:
+            raise PermissionDenied('La aprobación requiere un usuario revisor.')
+        resultado = services.aprobar(data['ids'], data['nivel'], usu_id=usu_id, detalle=data.get('detalle'))
+        return Response(resultado, status=status.HTTP_200_OK)
+
+
+class PreinscripcionEstadoLogViewSet(MetricsMixin, SparseFieldsMixin, viewsets.ReadOnlyModelViewSet):
+    queryset = PreinscripcionEstadoLog.objects.all()
+    serializer_class = PreinscripcionEstadoLogSerializer
+    permission_classes = [IsAuthenticated, PermisoAplicacion]
+    aplicacion = 'preinscripcion'
+    pagination_class = OptionalCursorPagination
+    cursor_ordering = '-pk'
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        preinscripcion = self.request.query_params.get('preinscripcion')
+        if preinscripcion:
+            if not preinscripcion.isdigit():
+                raise ValidationError({'preinscripcion': 'Debe ser un número entero'})
+            queryset = queryset.filter(preinscripcion=int(preinscripcion))
+        return queryset
+
+
+class CupoConfiguracionViewSet(MetricsMixin, SparseFieldsMixin, viewsets.ModelViewSet):
+    queryset = CupoConfiguracion.objects.all()
+    serializer_class = CupoConfiguracionSerializer
+    permission_classes = [IsAuthenticated, PermisoAplicacion]
+    aplicacion = 'preinscripcion'
+
+
+class RevisorPreinscripcionViewSet(MetricsMixin, SparseFieldsMixin, viewsets.ModelViewSet):
+    """Ámbitos de aprobación de los revisores (usuario, nivel, nodo)"""
+    queryset = RevisorPreinscripcion.objects.all()
+    serializer_class = RevisorPreinscripcionSerializer
+    permission_classes = [IsAuthenticated, PermisoAplicacion]
+    # Aplicación propia: editar preinscripciones no habilita para nombrar revisores
+    aplicacion = 'revisores'
@@ -1,7 +1,8 @@
 from rest_framework import serializers
+from scout_project.fieldsets import DynamicFieldsMixin
 from .models import Proveedor
 
-class ProveedorSerializer(serializers.ModelSerializer):
+class ProveedorSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Proveedor
         fields = '__all__'
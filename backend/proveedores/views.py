@@ -1,9 +1,13 @@
 from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
+from scout_project.metrics import MetricsMixin
+from scout_project.fieldsets import SparseFieldsMixin
+from usuarios.permisos import PermisoAplicacion
 from .models import Proveedor
 from .serializers import ProveedorSerializer
 
-class ProveedorViewSet(viewsets.ModelViewSet):
+class ProveedorViewSet(MetricsMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Proveedor.objects.all()
     serializer_class = ProveedorSerializer
-    permission_classes = [IsAuthenticated]
\ No newline at end of file
+    permission_classes = [IsAuthenticated, PermisoAplicacion]
+    aplicacion = 'proveedores'
\ No newline at end of file
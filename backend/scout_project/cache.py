@@ -0,0 +1,171 @@
+"""
+Caché de lectura y GET condicional para GIC
+Cada modelo registrado tiene un número de versión en caché que se incrementa
+con post_save/post_delete. Las tablas maestras (regiones, comunas, ramas,
+tipos de curso, etc.) guardan sus respuestas bajo una clave que incluye esa
+versión, y la misma versión alimenta los ETag de los endpoints de lectura, por
+lo que invalidar es O(1) y las entradas antiguas simplemente expiran. El
+incremento se aplica al confirmarse la transacción que hizo el cambio.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+from .fieldsets import parse_fieldsets
+
+
+def _version_key(model):
+    return f'version:{model._meta.label_lower}'
+
+
+def _modified_key(model):
+    return f'modified:{model._meta.label_lower}'
+
+
+def get_model_version(model):
+    """Retorna la versión vigente del modelo, inicializándola si no existe"""
+    key = _version_key(model)
+    version = cache.get(key)
+    if version is None:
+        # Se parte desde un timestamp para no reutilizar versiones si la clave expira
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def get_model_last_modified(model):
+    """Retorna el timestamp (segundos) del último cambio conocido del modelo"""
+    key = _modified_key(model)
+    modified = cache.get(key)
+    if modified is None:
+        cache.add(key, int(time.time()), None)
+        modified = cache.get(key)
+    return modified
+
+
+def bump_model_version(model):
+    """
+    Invalida las respuestas cacheadas y los ETag del modelo al confirmarse la
+    transacción en curso (de inmediato si no hay una). Antes del commit una
+    lectura concurrente aún ve los datos anteriores y los cachearía bajo la
+    versión nueva.
+    """
+    transaction.on_commit(lambda: _incrementar_version(model))
+
+
+def _incrementar_version(model):
+    key = _version_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+    cache.set(_modified_key(model), int(time.time()), None)
+
+
+def invalidate_model_version(sender, **kwargs):
+    """Receptor de post_save/post_delete para modelos versionados"""
+    bump_model_version(sender)
+
+
+def connect_version_signals(models):
+    """Conecta el incremento de versión para los modelos indicados"""
+    for model in models:
+        uid = f'model_version:{model._meta.label_lower}'
+        post_save.connect(invalidate_model_version, sender=model, dispatch_uid=uid)
+        post_delete.connect(invalidate_model_version, sender=model, dispatch_uid=uid)
+
+
+def expanded_models(model, request):
+    """
+    Modelos relacionados que ?expand= (o ?fields=fk.campo) anida en la
+    respuesta: sus versiones también invalidan la caché y el ETag.
+    """
+    _, _, expand = parse_fieldsets(request.query_params)
+    models = []
+    for nombre in sorted(expand):
+        try:
+            field = model._meta.get_field(nombre)
+        except FieldDoesNotExist:
+            continue
+        if field.is_relation and field.related_model not in models:
+            models.append(field.related_model)
+    return models
+
+
+def catalog_cache_key(model, request):
+    """Clave de respuesta: modelo + versión (y las de los modelos expandidos) + ruta completa con query string"""
+    path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    versions = '-'.join(str(get_model_version(m)) for m in [model, *expanded_models(model, request)])
+    return f'catalog:{model._meta.label_lower}:{versions}:{path}'
+
+
+class CatalogCacheMixin:
+    """
+    Mixin para ViewSets de catálogo: list/retrieve se sirven desde caché.
+    Autenticación, permisos y throttling se ejecutan igual (ocurren en initial()).
+    """
+    def list(self, request, *args, **kwargs):
+        return self._cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._cached_response(super().retrieve, request, *args, **kwargs)
+
+    def _cached_response(self, handler, request, *args, **kwargs):
+        key = catalog_cache_key(self.queryset.model, request)
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data, settings.CATALOG_CACHE_TIMEOUT)
+        return response
+
+
+class ConditionalGetMixin:
+    """
+    Mixin para ViewSets de lectura frecuente: agrega ETag y Last-Modified a
+    list/retrieve y responde 304 sin ejecutar consulta ni serializer cuando
+    el cliente ya tiene la versión vigente.
+
+    conditional_models define qué tablas afectan la representación; por
+    defecto solo el modelo del queryset. Se suman los modelos de ?expand=.
+    """
+    conditional_models = None
+
+    def list(self, request, *args, **kwargs):
+        return self._conditional_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._conditional_response(super().retrieve, request, *args, **kwargs)
+
+    def get_conditional_models(self):
+        return self.conditional_models or (self.queryset.model,)
+
+    def _conditional_response(self, handler, request, *args, **kwargs):
+        models = list(self.get_conditional_models())
+        models += [model for model in expanded_models(self.queryset.model, request) if model not in models]
+        fingerprint = ':'.join(
+            [request.get_full_path(), request.accepted_media_type or '']
+            + [f'{model._meta.label_lower}={get_model_version(model)}' for model in models]
+        )
+        etag = quote_etag(hashlib.md5(fingerprint.encode()).hexdigest())
+        last_modified = max(get_model_last_modified(model) for model in models)
+
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            not_modified['ETag'] = etag
+            return not_modified
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+        return response
@@ -0,0 +1,289 @@
+"""
+Suite de carga local sobre el dataset de seed_dataset (ver el comando load_test)
+
+Cada escenario es una lista ponderada de flujos; un flujo es la secuencia de
+requests de un usuario virtual, donde un paso puede usar la respuesta del
+anterior (p. ej. crear una preinscripción y enviarla). Los tiempos se agrupan
+por endpoint lógico ('POST preinscripciones', no la URL con ids) y se reporta
+p50/p95/p99 y throughput por endpoint.
+
+- apertura: apertura de inscripciones (catálogo de cursos, detalle, preinscribir)
+- checkin: día de check-in (ficha de la persona, acreditar, pago en puerta, listas)
+- cierre: cierre de mes de tesorería (conciliación, revisión de pagos, lotes)
+
+Los clientes usan un token JWT emitido directamente (el login tiene su propio
+throttle y su propio benchmark: benchmark_auth).
+"""
+import http.client
+import json
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.db import connections
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from cursos.models import Curso
+from maestros.models import ConceptoContable
+from personas.models import Persona, PersonaCurso
+from preinscripcion.models import CupoConfiguracion, Preinscripcion
+from usuarios.permisos import agregar_claims
+
+MUESTRA = 5000
+LOTE_PAGOS = 25
+
+
+def percentil(ordenados, p):
+    """Percentil por rango más cercano sobre una lista ya ordenada"""
+    if not ordenados:
+        return 0.0
+    return ordenados[min(len(ordenados) - 1, max(int(round(p / 100 * len(ordenados))) - 1, 0))]
+
+
+class Medicion:
+    """Tiempos (ms) y códigos de estado por endpoint, compartidos entre hilos"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.tiempos = {}
+        self.estados = {}
+
+    def registrar(self, endpoint, ms, estado):
+        with self.lock:
+            self.tiempos.setdefault(endpoint, []).append(ms)
+            conteo = self.estados.setdefault(endpoint, {})
+            conteo[estado] = conteo.get(estado, 0) + 1
+
+    def reporte(self, segundos):
+        filas = []
+        for endpoint in sorted(self.tiempos):
+            tiempos = sorted(self.tiempos[endpoint])
+            estados = self.estados[endpoint]
+            filas.append({
+                'endpoint': endpoint,
+                'requests': len(tiempos),
+                # 409 es una respuesta esperada (envío sin cupo): se informa en 'estados', no como error
+                'errores': sum(n for estado, n in estados.items() if estado >= 400 and estado != 409),
+                'estados': dict(sorted(estados.items())),
+                'p50': percentil(tiempos, 50),
+                'p95': percentil(tiempos, 95),
+                'p99': percentil(tiempos, 99),
+                'rps': len(tiempos) / segundos if segundos else 0.0,
+            })
+        return filas
+
+
+class ClienteLocal:
+    """Requests en proceso con el cliente de DRF (sin servidor ni red)"""
+
+    def __init__(self, token, medicion):
+        self.medicion = medicion
+        self.client = APIClient()
+        host = next((h for h in settings.ALLOWED_HOSTS if h not in ('*', '')), 'localhost').lstrip('.')
+        self.extra = {'HTTP_AUTHORIZATION': f'Bearer {token}', 'HTTP_HOST': host, 'secure': True}
+
+    def request(self, endpoint, metodo, ruta, datos=None):
+        inicio = time.perf_counter()
+        response = self.client.generic(metodo, ruta, json.dumps(datos) if datos is not None else '',
+                                       content_type='application/json', **self.extra)
+        cuerpo = b''.join(response.streaming_content) if response.streaming else response.content
+        self.medicion.registrar(endpoint, (time.perf_counter() - inicio) * 1000, response.status_code)
+        return response.status_code, _json(response.get('Content-Type', ''), cuerpo)
+
+    def cerrar(self):
+        # Cada hilo abre su propia conexión a la base; el hilo principal conserva la suya
+        if threading.current_thread() is not threading.main_thread():
+            connections.close_all()
+
+
+class ClienteHTTP:
+    """Requests contra un servidor en ejecución, con una conexión keep-alive por usuario virtual"""
+
+    def __init__(self, base_url, token, medicion):
+        self.medicion = medicion
+        url = urlsplit(base_url)
+        conexion = http.client.HTTPSConnection if url.scheme == 'https' else http.client.HTTPConnection
+        self.conexion = conexion(url.hostname, url.port, timeout=60)
+        self.prefijo = url.path.rstrip('/')
+        self.headers = {'Authorization': f'Bearer {token}', 'Content-Type': 'application/json'}
+
+    def request(self, endpoint, metodo, ruta, datos=None):
+        inicio = time.perf_counter()
+        try:
+            self.conexion.request(metodo, self.prefijo + ruta,
+                                  json.dumps(datos) if datos is not None else None, self.headers)
+            response = self.conexion.getresponse()
+            cuerpo, estado = response.read(), response.status
+            tipo = response.getheader('Content-Type', '')
+        except (OSError, http.client.HTTPException):
+            self.conexion.close()
+            cuerpo, estado, tipo = b'', 599, ''
+        self.medicion.registrar(endpoint, (time.perf_counter() - inicio) * 1000, estado)
+        return estado, _json(tipo, cuerpo)
+
+    def cerrar(self):
+        self.conexion.close()
+
+
+def _json(tipo, cuerpo):
+    return json.loads(cuerpo) if tipo.startswith('application/json') and cuerpo else None
+
+
+def emitir_token(usuario):
+    """Access token con los mismos claims que entrega el login"""
+    return str(agregar_claims(RefreshToken.for_user(usuario), usuario).access_token)
+
+
+class Pool:
+    """Valores que se consumen una sola vez entre todos los hilos (p. ej. personas sin preinscripción)"""
+
+    def __init__(self, valores):
+        self.valores = list(valores)
+        self.lock = threading.Lock()
+
+    def tomar(self, n=1):
+        with self.lock:
+            tomados, self.valores[-n:] = self.valores[-n:], []
+        return tomados
+
+
+class Contexto:
+    """Muestras del dataset que usan los flujos; se cargan una vez antes de lanzar los hilos"""
+
+    def __init__(self, usuario, semilla=0, muestra=MUESTRA):
+        rng = random.Random(semilla)
+        self.usuario = usuario.pk
+        self.concepto = ConceptoContable.objects.filter(coc_vigente=True).values_list('pk', flat=True).first()
+        self.cursos = list(Curso.objects.filter(cur_estado=1).values_list('pk', flat=True)[:muestra])
+        self.rol = CupoConfiguracion.objects.filter(curso_id__in=self.cursos).values_list('rol_id', flat=True).first()
+        self.personas = list(Persona.objects.order_by('?').values_list('pk', flat=True)[:muestra])
+        self.inscripciones = list(
+            PersonaCurso.objects.values_list('per_id', 'cus_id__cur_id').order_by('-pk')[:muestra]
+        )
+        sin_preinscripcion = Persona.objects.filter(preinscripciones__isnull=True)
+        self.por_preinscribir = Pool(
+            (per_id, rng.choice(self.cursos)) for per_id in sin_preinscripcion.values_list('pk', flat=True)[:muestra]
+        ) if self.cursos else Pool([])
+        self.por_acreditar = Pool(
+            Preinscripcion.objects.filter(estado='confirmado_pago').values_list('pk', flat=True)[:muestra]
+        )
+
+
+def ver_cursos(cliente, ctx, rng):
+    cliente.request('GET cursos/resumen?estado', 'GET', '/api/cursos/resumen/?estado=1&paginacion=cursor')
+    if ctx.cursos:
+        cliente.request('GET cursos/{id}?detalle', 'GET', f'/api/cursos/cursos/{rng.choice(ctx.cursos)}/?detalle=1')
+
+
+def ver_catalogos(cliente, ctx, rng):
+    cliente.request('GET geografia/regiones', 'GET', '/api/geografia/regiones/')
+    cliente.request('GET geografia/zonas', 'GET', '/api/geografia/zonas/')
+
+
+def preinscribir(cliente, ctx, rng):
+    for per_id, cur_id in ctx.por_preinscribir.tomar():
+        estado, data = cliente.request('POST preinscripciones', 'POST', '/api/preinscripcion/preinscripciones/',
+                                       {'persona': per_id, 'curso': cur_id})
+        if estado == 201 and ctx.rol:
+            # 409: sin cupo, queda en lista de espera
+            cliente.request('POST preinscripciones/{id}/enviar', 'POST',
+                            f"/api/preinscripcion/preinscripciones/{data['id']}/enviar/", {'rol': ctx.rol})
+
+
+def acreditar(cliente, ctx, rng):
+    cliente.request('GET personas/{id}', 'GET', f'/api/personas/personas/{rng.choice(ctx.personas)}/')
+    for pre_id in ctx.por_acreditar.tomar():
+        cliente.request('POST preinscripciones/transicionar', 'POST',
+                        '/api/preinscripcion/preinscripciones/transicionar/',
+                        {'ids': [pre_id], 'estado': 'acreditado'})
+
+
+def pagar_en_puerta(cliente, ctx, rng):
+    if ctx.inscripciones:
+        per_id, cur_id = rng.choice(ctx.inscripciones)
+        cliente.request('POST pagopersonas', 'POST', '/api/pagos/pagopersonas/', {
+            'per_id': per_id, 'cur_id': cur_id, 'usu_id': ctx.usuario, 'pap_tipo': 1, 'pap_valor': '5000',
+            'pap_fecha_hora': datetime.now(timezone.utc).isoformat(),
+        })
+
+
+def panel_curso(cliente, ctx, rng):
+    if ctx.cursos:
+        cliente.request('GET cursos/resumen/{id}', 'GET', f'/api/cursos/resumen/{rng.choice(ctx.cursos)}/')
+
+
+def lista_participantes(cliente, ctx, rng):
+    if ctx.cursos:
+        cliente.request('GET cursos/{id}/participantes/exportar', 'GET',
+                        f'/api/cursos/cursos/{rng.choice(ctx.cursos)}/participantes/exportar/?formato=csv')
+
+
+def conciliar_curso(cliente, ctx, rng):
+    if ctx.cursos:
+        cliente.request('GET pagos/conciliacion?curso', 'GET',
+                        f'/api/pagos/conciliacion/?curso={rng.choice(ctx.cursos)}&detalle=1')
+
+
+def revisar_pagos(cliente, ctx, rng):
+    cliente.request('GET pagopersonas?cursor', 'GET', '/api/pagos/pagopersonas/?paginacion=cursor')
+    cliente.request('GET comprobantes?cursor', 'GET', '/api/pagos/comprobantes/?paginacion=cursor')
+
+
+def cargar_lote(cliente, ctx, rng):
+    if ctx.inscripciones:
+        pagos = [
+            {'per_id': per_id, 'cur_id': cur_id, 'pap_valor': '1000',
+             'comprobante': {'coc_id': ctx.concepto, 'cpa_numero': rng.randint(1, 10 ** 9)}}
+            for per_id, cur_id in rng.sample(ctx.inscripciones, min(LOTE_PAGOS, len(ctx.inscripciones)))
+        ]
+        cliente.request('POST pagopersonas/lote', 'POST', '/api/pagos/pagopersonas/lote/',
+                        {'pagos': pagos})
+
+
+def panel_cursos(cliente, ctx, rng):
+    cliente.request('GET cursos/resumen', 'GET', '/api/cursos/resumen/?paginacion=cursor')
+
+
+# Escenario -> [(peso, flujo)]
+ESCENARIOS = {
+    'apertura': [(5, ver_cursos), (2, ver_catalogos), (3, preinscribir)],
+    'checkin': [(6, acreditar), (2, pagar_en_puerta), (2, panel_curso), (1, lista_participantes)],
+    'cierre': [(4, conciliar_curso), (3, revisar_pagos), (2, panel_cursos), (1, cargar_lote)],
+}
+
+
+def ejecutar(escenario, clientes, contexto, iteraciones=None, duracion=None, semilla=0):
+    """
+    Corre el escenario con un hilo por cliente (uno solo corre en el hilo actual)
+    hasta completar `iteraciones` flujos por cliente o `duracion` segundos.
+    Retorna (filas del reporte, segundos).
+    """
+    pesos, flujos = zip(*ESCENARIOS[escenario])
+    limite = time.perf_counter() + duracion if duracion else None
+    medicion = clientes[0].medicion
+
+    def usuario_virtual(n, cliente):
+        rng = random.Random(semilla * 1000 + n)
+        hechas = 0
+        try:
+            while (iteraciones is None or hechas < iteraciones) and (limite is None or time.perf_counter() < limite):
+                rng.choices(flujos, weights=pesos)[0](cliente, contexto, rng)
+                hechas += 1
+        finally:
+            cliente.cerrar()
+
+    inicio = time.perf_counter()
+    if len(clientes) == 1:
+        usuario_virtual(0, clientes[0])
+    else:
+        hilos = [threading.Thread(target=usuario_virtual, args=(n, cliente)) for n, cliente in enumerate(clientes)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+    segundos = time.perf_counter() - inicio
+    return medicion.reporte(segundos), segundos
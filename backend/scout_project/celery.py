@@ -0,0 +1,13 @@
+"""
+Aplicación Celery de GIC
+Worker: celery -A scout_project worker -l info
+"""
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'scout_project.settings')
+
+app = Celery('scout_project')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
@@ -0,0 +1,18 @@
+"""
+Utilidades de base de datos compartidas entre apps
+"""
+from django.db import connections, router
+
+
+def opciones_upsert(model, unique_fields, update_fields):
+    """
+    Argumentos de bulk_create para insertar o actualizar por unique_fields.
+
+    MySQL no admite indicar el objetivo del conflicto: ON DUPLICATE KEY UPDATE
+    usa cualquier índice único de la tabla, así que ahí unique_fields se omite
+    y los campos deben tener su propio índice único.
+    """
+    opciones = {'update_conflicts': True, 'update_fields': update_fields}
+    if connections[router.db_for_write(model)].features.supports_update_conflicts_with_target:
+        opciones['unique_fields'] = unique_fields
+    return opciones
@@ -0,0 +1,206 @@
+"""
+Campos a pedido en las APIs de lectura (?fields= y ?expand=)
+
+    GET /api/personas/personas/?fields=per_id,per_run,per_nombres
+    GET /api/pagos/pagopersonas/?fields=pap_id,pap_valor,per_id&expand=per_id
+    GET /api/pagos/pagopersonas/?fields=pap_id,per_id.per_nombres,per_id.per_run
+
+DynamicFieldsMixin (serializers) deja solo los campos pedidos y reemplaza las
+FK expandidas por el objeto anidado (per_id.campo expande per_id con esos
+campos). Solo se expanden las FK cuyo modelo tiene un serializer público
+registrado con @expandable (o uno declarado en Meta.expandable): nunca se
+genera un serializer con todos los campos del modelo relacionado, que
+expondría columnas como usu_password.
+
+SparseFieldsMixin (ViewSets) traduce lo mismo a la consulta: only() con las
+columnas que usan esos campos, select_related() de las FK expandidas y
+descarta los select_related/prefetch_related de la vista que ya no se usan.
+Sin parámetros la representación y la consulta son las de siempre; solo aplica
+a GET.
+"""
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.utils.module_loading import autodiscover_modules
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+from .renderers import FAST_FIELD_MAPPING
+
+FIELDS_PARAM = 'fields'
+EXPAND_PARAM = 'expand'
+
+
+def _lista(valor):
+    return [nombre.strip() for nombre in (valor or '').split(',') if nombre.strip()]
+
+
+def parse_fieldsets(query_params):
+    """
+    Retorna (campos, anidados, expand): los campos de primer nivel pedidos (None
+    si no se pidió ?fields=), {fk: [subcampos]} y el conjunto de FK a expandir.
+    """
+    campos, anidados = [], {}
+    for nombre in _lista(query_params.get(FIELDS_PARAM)):
+        base, _, sub = nombre.partition('.')
+        if sub:
+            anidados.setdefault(base, []).append(sub)
+        if base not in campos:
+            campos.append(base)
+    expand = set(_lista(query_params.get(EXPAND_PARAM))) | set(anidados)
+    return campos or None, anidados, expand
+
+
+_publicos = {}
+
+
+def expandable(serializer_class):
+    """
+    Decorador: registra el serializer como la representación pública de su
+    modelo para ?expand= (debe excluir los campos sensibles).
+    """
+    model = serializer_class.Meta.model
+    registrado = _publicos.setdefault(model, serializer_class)
+    if registrado is not serializer_class:
+        raise ImproperlyConfigured(f'{model.__name__} ya tiene serializer expandible: {registrado.__name__}')
+    return serializer_class
+
+
+@lru_cache(maxsize=None)
+def _registrar_publicos():
+    # Como admin.autodiscover: importa <app>/serializers.py para que corran los @expandable
+    autodiscover_modules('serializers')
+
+
+def expanded_serializer(model):
+    """Serializer público registrado para el modelo, o None si sus FK no se pueden expandir"""
+    _registrar_publicos()
+    return _publicos.get(model)
+
+
+def _es_raiz(serializer):
+    padre = serializer.parent
+    return padre is None or (isinstance(padre, serializers.ListSerializer) and padre.parent is None)
+
+
+class DynamicFieldsMixin:
+    """
+    Mixin para ModelSerializer. En el serializer raíz de un GET lee ?fields= y
+    ?expand= del request; los anidados reciben sus campos con fields=[...].
+    Meta.expandable = {'fk': SerializerClass} elige el serializer de una FK;
+    sin él se usa el registrado con @expandable para el modelo relacionado.
+    """
+    # Fechas y decimales con formato precompilado (ver scout_project/renderers.py)
+    serializer_field_mapping = {**serializers.ModelSerializer.serializer_field_mapping, **FAST_FIELD_MAPPING}
+
+    def __init__(self, *args, **kwargs):
+        self.campos_pedidos = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+
+    def _fieldsets(self):
+        if self.campos_pedidos is not None:
+            return self.campos_pedidos, {}, set()
+        request = self.context.get('request')
+        if request is None or request.method != 'GET' or not _es_raiz(self):
+            return None, {}, set()
+        return parse_fieldsets(request.query_params)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        campos, anidados, expand = self._fieldsets()
+        if campos is None and not expand:
+            return fields
+
+        desconocidos = [nombre for nombre in campos or () if nombre not in fields]
+        if desconocidos:
+            raise ValidationError({FIELDS_PARAM: [f'Campo desconocido: {", ".join(desconocidos)}.']})
+        for nombre in expand:
+            fields[nombre] = self._expandir(nombre, fields.get(nombre), anidados.get(nombre))
+        if campos is None:
+            return fields
+        return {nombre: field for nombre, field in fields.items() if nombre in campos}
+
+    def _expandir(self, nombre, field, subcampos):
+        # Relaciones ya anidadas por el serializer (p. ej. CursoDetalleSerializer): solo se recortan
+        anidado = field.child if isinstance(field, serializers.ListSerializer) else field
+        if isinstance(anidado, DynamicFieldsMixin):
+            anidado.campos_pedidos = subcampos
+            return field
+        if not isinstance(field, serializers.PrimaryKeyRelatedField):
+            raise ValidationError({EXPAND_PARAM: [f'{nombre} no es una relación expandible.']})
+        # Los campos aún no están enlazados: source es None si coincide con el nombre
+        source = field.source or nombre
+        model_field = self.Meta.model._meta.get_field(source)
+        clase = getattr(self.Meta, 'expandable', {}).get(nombre) or expanded_serializer(model_field.related_model)
+        if clase is None:
+            raise ValidationError({EXPAND_PARAM: [f'{nombre} no es una relación expandible.']})
+        kwargs = {'read_only': True, 'allow_null': model_field.null}
+        if source != nombre:
+            kwargs['source'] = source
+        if issubclass(clase, DynamicFieldsMixin):
+            kwargs['fields'] = subcampos
+        return clase(**kwargs)
+
+
+def _model_field(model, field):
+    if field.source == '*' or '.' in field.source:
+        return None
+    try:
+        model_field = model._meta.get_field(field.source)
+    except FieldDoesNotExist:
+        return None
+    return model_field if model_field.concrete and not model_field.many_to_many else None
+
+
+def _columnas(model, fields, prefijo=''):
+    """
+    Columnas para only() y FK a select_related que necesitan los campos del
+    serializer; columnas es None si algún campo no corresponde a una columna
+    (SerializerMethodField, source='*', relaciones inversas).
+    """
+    columnas, relaciones, completas = [prefijo + model._meta.pk.name], [], True
+    for field in fields.values():
+        model_field = _model_field(model, field)
+        if model_field is None:
+            completas = False
+            continue
+        columnas.append(prefijo + model_field.name)
+        if isinstance(field, serializers.BaseSerializer) and model_field.is_relation:
+            relaciones.append(prefijo + model_field.name)
+            anidadas, subrelaciones = _columnas(model_field.related_model, field.fields, f'{prefijo}{model_field.name}__')
+            relaciones += subrelaciones
+            if anidadas is None:
+                completas = False
+            else:
+                columnas += anidadas
+    return columnas if completas else None, relaciones
+
+
+class SparseFieldsMixin:
+    """
+    Mixin para ViewSets cuyo serializer usa DynamicFieldsMixin: ajusta la
+    consulta de list/retrieve a los campos pedidos con ?fields= / ?expand=.
+    """
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.request.method != 'GET':
+            return queryset
+        campos, _, expand = parse_fieldsets(self.request.query_params)
+        if campos is None and not expand:
+            return queryset
+
+        fields = self.get_serializer().fields
+        columnas, relaciones = _columnas(queryset.model, fields)
+        if campos is not None:
+            usados = {field.source.split('.')[0] for field in fields.values()}
+            select_related = queryset.query.select_related
+            if isinstance(select_related, dict):
+                relaciones += [nombre for nombre in select_related if nombre in usados]
+            prefetch = [lookup for lookup in queryset._prefetch_related_lookups
+                        if getattr(lookup, 'prefetch_through', lookup).split('__')[0] in usados]
+            queryset = queryset.select_related(None).prefetch_related(None).prefetch_related(*prefetch)
+        if relaciones:
+            queryset = queryset.select_related(*relaciones)
+        if campos is not None and columnas is not None:
+            queryset = queryset.only(*columnas)
+        return queryset
@@ -0,0 +1,251 @@
+"""
+Métricas Prometheus para GIC
+Registro en memoria de histogramas y contadores por ruta/método, expuesto en
+formato de texto Prometheus en /api/metrics/ (ver monitoring/prometheus.yml).
+El endpoint no es público: exige METRICS_TOKEN o una IP de METRICS_ALLOWED_IPS.
+
+El registro es por proceso: cada observación es un bisect y una suma bajo un
+lock, por lo que el costo por request se mide en microsegundos.
+"""
+import ipaddress
+import os
+import threading
+import time
+from bisect import bisect_left
+
+from django.conf import settings
+from django.db import connection
+from django.http import HttpResponse, HttpResponseForbidden, HttpResponseNotFound
+from django.utils.crypto import constant_time_compare
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labelnames, labels, extra=''):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, labels)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_number(value):
+    if isinstance(value, float) and value == float('inf'):
+        return '+Inf'
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Contador monotónico con etiquetas"""
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels=(), amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def collect(self):
+        with self._lock:
+            values = list(self._values.items())
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} counter']
+        for labels, value in sorted(values):
+            lines.append(f'{self.name}{_format_labels(self.labelnames, labels)} {_format_number(value)}')
+        return lines
+
+
+class Histogram:
+    """Histograma con buckets fijos y etiquetas"""
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value):
+        # bisect_left ubica el primer bucket con límite >= value (semántica "le")
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0]
+            series[0][index] += 1
+            series[1] += value
+
+    def collect(self):
+        with self._lock:
+            snapshot = [(labels, list(counts), total) for labels, (counts, total) in self._series.items()]
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        bounds = self.buckets + (float('inf'),)
+        for labels, counts, total in sorted(snapshot):
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                le = f'le="{_format_number(float(bound))}"'
+                lines.append(f'{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}')
+            label_str = _format_labels(self.labelnames, labels)
+            lines.append(f'{self.name}_sum{label_str} {_format_number(total)}')
+            lines.append(f'{self.name}_count{label_str} {cumulative}')
+        return lines
+
+
+REQUESTS_TOTAL = Counter(
+    'http_requests_total',
+    'Total de requests HTTP por ruta, método y status',
+    ('route', 'method', 'status'),
+)
+REQUEST_DURATION = Histogram(
+    'http_request_duration_seconds',
+    'Latencia de requests HTTP en segundos',
+    ('route', 'method'),
+)
+REQUEST_DB_QUERIES = Histogram(
+    'http_request_db_queries',
+    'Cantidad de consultas SQL ejecutadas por request',
+    ('route', 'method'),
+    buckets=QUERY_COUNT_BUCKETS,
+)
+RESPONSE_SIZE = Histogram(
+    'http_response_size_bytes',
+    'Tamaño del cuerpo de la respuesta en bytes',
+    ('route', 'method'),
+    buckets=SIZE_BUCKETS,
+)
+SERIALIZER_DURATION = Histogram(
+    'drf_serializer_duration_seconds',
+    'Tiempo de serialización DRF en segundos',
+    ('route', 'method'),
+)
+
+REGISTRY = [REQUESTS_TOTAL, REQUEST_DURATION, REQUEST_DB_QUERIES, RESPONSE_SIZE, SERIALIZER_DURATION]
+
+
+def _process_metrics():
+    """Métricas del proceso usadas por monitoring/alert_rules.yml"""
+    lines = [
+        '# HELP process_cpu_seconds_total Tiempo de CPU (usuario + sistema) del proceso',
+        '# TYPE process_cpu_seconds_total counter',
+        f'process_cpu_seconds_total {_format_number(time.process_time())}',
+    ]
+    try:
+        with open('/proc/self/statm') as statm:
+            rss_pages = int(statm.read().split()[1])
+        rss = rss_pages * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return lines
+    lines += [
+        '# HELP process_resident_memory_bytes Memoria residente del proceso en bytes',
+        '# TYPE process_resident_memory_bytes gauge',
+        f'process_resident_memory_bytes {rss}',
+    ]
+    return lines
+
+
+def render_metrics():
+    """Genera el texto de exposición Prometheus de todo el registro"""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.collect())
+    lines.extend(_process_metrics())
+    return '\n'.join(lines) + '\n'
+
+
+def scraper_autorizado(request):
+    """True si el request trae el token de métricas o viene de una IP/red permitida"""
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if token and constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return True
+    try:
+        origen = ipaddress.ip_address(request.META.get('REMOTE_ADDR', ''))
+    except ValueError:
+        return False
+    return any(origen in ipaddress.ip_network(red, strict=False)
+               for red in getattr(settings, 'METRICS_ALLOWED_IPS', ()))
+
+
+def metrics_view(request):
+    """
+    Endpoint de scraping para Prometheus
+    GET /api/metrics/
+    Solo para Prometheus (METRICS_TOKEN o METRICS_ALLOWED_IPS); el resto recibe 403.
+    """
+    if not getattr(settings, 'METRICS_ENABLED', True):
+        return HttpResponseNotFound()
+    if not scraper_autorizado(request):
+        return HttpResponseForbidden()
+    return HttpResponse(render_metrics(), content_type=CONTENT_TYPE)
+
+
+class MetricsMiddleware:
+    """
+    Registra latencia, consultas SQL, tamaño de respuesta y tiempo de
+    serialización de cada request. Debe ir primero en MIDDLEWARE.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'METRICS_ENABLED', True)
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        queries = [0]
+
+        def count_queries(execute, sql, params, many, context):
+            queries[0] += 1
+            return execute(sql, params, many, context)
+
+        started = time.perf_counter()
+        with connection.execute_wrapper(count_queries):
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - started
+
+        match = request.resolver_match
+        labels = (match.route if match else 'unmatched', request.method)
+        REQUESTS_TOTAL.inc(labels + (str(response.status_code),))
+        REQUEST_DURATION.observe(labels, elapsed)
+        REQUEST_DB_QUERIES.observe(labels, queries[0])
+        if not response.streaming:
+            RESPONSE_SIZE.observe(labels, len(response.content))
+        serializer_seconds = getattr(request, 'metrics_serializer_seconds', None)
+        if serializer_seconds is not None:
+            SERIALIZER_DURATION.observe(labels, serializer_seconds)
+        return response
+
+
+class MetricsMixin:
+    """
+    Mixin para ViewSets DRF que mide el tiempo de serialización de list/retrieve.
+    El cronómetro parte cuando la página u objeto ya fue obtenido y se detiene
+    en finalize_response, por lo que no incluye la consulta principal.
+    """
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        self._serializer_started = time.perf_counter()
+        return page
+
+    def get_object(self):
+        obj = super().get_object()
+        self._serializer_started = time.perf_counter()
+        return obj
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        started = getattr(self, '_serializer_started', None)
+        if started is not None and request.method == 'GET':
+            request._request.metrics_serializer_seconds = time.perf_counter() - started
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -0,0 +1,51 @@
+"""
+Paginación para tablas de alta cardinalidad
+Por defecto se mantiene PageNumberPagination (compatibilidad con el frontend).
+Con ?paginacion=cursor se usa paginación por llave (keyset): cada página es un
+WHERE pk < último ORDER BY pk LIMIT n, sin OFFSET ni COUNT(*), por lo que la
+página 5000 cuesta lo mismo que la primera.
+"""
+from rest_framework.pagination import PageNumberPagination, CursorPagination
+
+
+class KeysetPagination(CursorPagination):
+    """
+    CursorPagination con orden fijo: ignora ?ordering= para que el cursor
+    siempre recorra una columna indexada.
+    """
+    def get_ordering(self, request, queryset, view):
+        return (self.ordering,) if isinstance(self.ordering, str) else tuple(self.ordering)
+
+
+class OptionalCursorPagination(PageNumberPagination):
+    """
+    La vista define el orden del cursor con `cursor_ordering` (por defecto '-pk');
+    debe ser una columna única e inmutable con índice.
+    """
+    mode_query_param = 'paginacion'
+    cursor_query_param = 'cursor'
+
+    def __init__(self):
+        super().__init__()
+        self.cursor_paginator = None
+
+    def use_cursor(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == 'cursor'
+            or bool(request.query_params.get(self.cursor_query_param))
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.use_cursor(request):
+            self.cursor_paginator = None
+            return super().paginate_queryset(queryset, request, view)
+        self.cursor_paginator = KeysetPagination()
+        self.cursor_paginator.cursor_query_param = self.cursor_query_param
+        self.cursor_paginator.page_size = self.page_size
+        self.cursor_paginator.ordering = getattr(view, 'cursor_ordering', '-pk')
+        return self.cursor_paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
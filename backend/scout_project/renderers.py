@@ -0,0 +1,203 @@
+"""
+Renderer y parser JSON del proyecto (DEFAULT_RENDERER_CLASSES / DEFAULT_PARSER_CLASSES)
+
+FastJSONRenderer usa orjson si está instalado y si no el encoder C de la
+stdlib, creado una sola vez en vez de uno por respuesta. Los Decimal se
+escriben como string sin notación científica (igual que DecimalField con
+COERCE_DECIMAL_TO_STRING) y las fechas con DATETIME_FORMAT y DATE_FORMAT en
+la zona horaria vigente, también cuando la vista responde con valores del ORM
+sin serializer (conciliación, resultados de lotes): el encoder de DRF los
+escribía como float e ISO 8601.
+
+En una página grande la mayor parte del costo está antes del renderer, al
+formatear cada DateTimeField y DecimalField (strftime, conversión de zona,
+copia del contexto decimal por valor). FastDateTimeField, FastDateField y
+FastDecimalField producen el mismo texto con el formato precompilado;
+DynamicFieldsMixin los usa en todos los ModelSerializer (FAST_FIELD_MAPPING).
+`manage.py benchmark_json` compara ambos caminos.
+"""
+import decimal
+import json
+from datetime import date, datetime, timezone as dt_timezone
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import ISO_8601, api_settings
+from rest_framework.utils import encoders
+from rest_framework.utils.json import strict_constant
+
+try:
+    import orjson
+except ImportError:  # Opcional (requirements.txt); sin él se usa el encoder de la stdlib
+    orjson = None
+
+_DIRECTIVAS = {
+    'Y': '{0.year:04d}', 'm': '{0.month:02d}', 'd': '{0.day:02d}',
+    'H': '{0.hour:02d}', 'M': '{0.minute:02d}', 'S': '{0.second:02d}', '%': '%',
+}
+
+
+@lru_cache(maxsize=None)
+def compilar_formato(formato):
+    """
+    Traduce un formato strftime con %Y %m %d %H %M %S a una plantilla de
+    str.format equivalente; None si el formato usa otras directivas (o es
+    ISO 8601) y hay que seguir usando strftime.
+    """
+    if not isinstance(formato, str) or formato.lower() == ISO_8601:
+        return None
+    partes, i = [], 0
+    while i < len(formato):
+        if formato[i] == '%':
+            directiva = _DIRECTIVAS.get(formato[i + 1:i + 2])
+            if directiva is None:
+                return None
+            partes.append(directiva)
+            i += 2
+        else:
+            partes.append(formato[i].replace('{', '{{').replace('}', '}}'))
+            i += 1
+    return ''.join(partes).format
+
+
+def _a_zona(value, zona):
+    # Igual que DateTimeField.enforce_timezone para valores aware; los naive conservan su hora
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(zona or dt_timezone.utc)
+
+
+def formatear_fecha_hora(value):
+    """datetime -> texto con DATETIME_FORMAT en la zona vigente, como DateTimeField"""
+    zona = timezone.get_current_timezone() if settings.USE_TZ else None
+    plantilla = compilar_formato(api_settings.DATETIME_FORMAT)
+    if plantilla is None:
+        return serializers.DateTimeField().to_representation(value)
+    return plantilla(_a_zona(value, zona))
+
+
+def formatear_fecha(value):
+    """date -> texto con DATE_FORMAT, como DateField"""
+    plantilla = compilar_formato(api_settings.DATE_FORMAT)
+    if plantilla is None:
+        return serializers.DateField().to_representation(value)
+    return plantilla(value)
+
+
+class FastDateTimeField(serializers.DateTimeField):
+    """
+    DateTimeField que resuelve la zona horaria una vez por instancia (los campos
+    se copian por serializer, o sea por request) en vez de una vez por valor
+    """
+    def to_representation(self, value):
+        plantilla = compilar_formato(getattr(self, 'format', api_settings.DATETIME_FORMAT))
+        if plantilla is None or not isinstance(value, datetime):
+            return super().to_representation(value)
+        try:
+            zona = self._zona
+        except AttributeError:
+            zona = self._zona = self.timezone if hasattr(self, 'timezone') else self.default_timezone()
+        return plantilla(_a_zona(value, zona))
+
+
+class FastDateField(serializers.DateField):
+    def to_representation(self, value):
+        plantilla = compilar_formato(getattr(self, 'format', api_settings.DATE_FORMAT))
+        if plantilla is None or not isinstance(value, date) or isinstance(value, datetime):
+            return super().to_representation(value)
+        return plantilla(value)
+
+
+class FastDecimalField(serializers.DecimalField):
+    """DecimalField con el exponente y el contexto de redondeo calculados una vez y no por valor"""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.decimal_places is not None:
+            self.exponente = decimal.Decimal(1).scaleb(-self.decimal_places)
+            self.contexto = decimal.Context(prec=self.max_digits) if self.max_digits is not None else None
+
+    def quantize(self, value):
+        if self.decimal_places is None:
+            return value
+        return value.quantize(self.exponente, rounding=self.rounding,
+                              context=self.contexto or decimal.getcontext())
+
+
+FAST_FIELD_MAPPING = {
+    models.DateTimeField: FastDateTimeField,
+    models.DateField: FastDateField,
+    models.DecimalField: FastDecimalField,
+}
+
+
+class JSONEncoder(encoders.JSONEncoder):
+    """Encoder de DRF con Decimal como string y fechas con los formatos de REST_FRAMEWORK"""
+    def default(self, obj):
+        return encode_default(obj)
+
+
+_drf_encoder = encoders.JSONEncoder()
+
+
+def encode_default(obj):
+    if isinstance(obj, decimal.Decimal):
+        return '{:f}'.format(obj)
+    if isinstance(obj, datetime):
+        return formatear_fecha_hora(obj)
+    if isinstance(obj, date):
+        return formatear_fecha(obj)
+    return _drf_encoder.default(obj)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer de DRF con orjson (o un encoder de la stdlib reutilizado).
+    Con indentación (?format=api, Accept con indent=) delega en JSONRenderer
+    con el mismo encoder.
+    """
+    encoder_class = JSONEncoder
+
+    def __init__(self):
+        separators = (',', ':') if self.compact else (', ', ': ')
+        self.encoder = JSONEncoder(ensure_ascii=self.ensure_ascii, allow_nan=not self.strict, separators=separators)
+        self.use_orjson = orjson is not None and self.compact and not self.ensure_ascii
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.use_orjson:
+            ret = orjson.dumps(data, default=encode_default,
+                               option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS)
+            # Igual que JSONRenderer: U+2028/U+2029 escapados para que el JSON sea JavaScript válido
+            if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+                ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+            return ret
+        ret = self.encoder.encode(data)
+        if '\u2028' in ret or '\u2029' in ret:
+            ret = ret.replace('\u2028', '\\u2028').replace('\u2029', '\\u2029')
+        return ret.encode()
+
+
+class FastJSONParser(JSONParser):
+    """JSONParser que lee el cuerpo completo y lo decodifica de una vez (orjson si está disponible)"""
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        try:
+            contenido = stream.read()
+            if orjson is not None and self.strict and encoding.lower().replace('-', '') == 'utf8':
+                return orjson.loads(contenido)
+            parse_constant = strict_constant if self.strict else None
+            return json.loads(contenido.decode(encoding), parse_constant=parse_constant)
+        except ValueError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
@@ -2,92 +2,197 @@
 Middleware de seguridad para GIC
 Implementa protecciones adicionales contra XSS, CSRF, y otros ataques
 """
+import json
+import re
+
+from django.conf import settings
+from django.http import JsonResponse
+from django.http.response import ResponseHeaders
+
+
+def _formatear_csp(directivas):
+    return ' '.join(f"{nombre}{''.join(' ' + fuente for fuente in fuentes)};" for nombre, fuentes in directivas.items())
+
+
+def _formatear_permissions(features):
+    return ', '.join(f"{nombre}=({' '.join(origenes)})" for nombre, origenes in features.items())
+
+
+FORMATOS_HEADER = {
+    'Content-Security-Policy': _formatear_csp,
+    'Content-Security-Policy-Report-Only': _formatear_csp,
+    'Permissions-Policy': _formatear_permissions,
+}
+
+
+def construir_headers(politicas):
+    """
+    Convierte las políticas de settings en pares (nombre, valor) ya validados.
+
+    Los valores dict (directivas CSP, features de Permissions-Policy) se formatean
+    según el header; None omite el header. Cada valor pasa una vez por
+    ResponseHeaders, que rechaza saltos de línea y caracteres no codificables,
+    así un error de configuración falla al iniciar y no en cada respuesta.
+    """
+    headers = ResponseHeaders({})
+    for nombre, valor in politicas.items():
+        if valor is None:
+            continue
+        if isinstance(valor, dict):
+            valor = FORMATOS_HEADER[nombre](valor)
+        headers[nombre] = valor
+    return tuple(headers.items())
+
 
 class SecurityHeadersMiddleware:
     """
     Agrega headers de seguridad a todas las respuestas
+
+    Las políticas (SECURITY_HEADERS) y sus reemplazos por prefijo de ruta
+    (SECURITY_HEADERS_OVERRIDES) se formatean una sola vez al iniciar; por
+    respuesta sólo se busca el prefijo y se asignan los headers ya formateados.
     """
     def __init__(self, get_response):
         self.get_response = get_response
+        politicas = settings.SECURITY_HEADERS
+        self.headers = construir_headers(politicas)
+        # El prefijo más largo gana, así '/api/docs/x/' puede tener su propia política
+        self.overrides = tuple(
+            (prefijo, construir_headers({**politicas, **reemplazos}))
+            for prefijo, reemplazos in sorted(settings.SECURITY_HEADERS_OVERRIDES.items(),
+                                              key=lambda item: len(item[0]), reverse=True)
+        )
+        self.override_prefixes = tuple(prefijo for prefijo, _ in self.overrides)
 
     def __call__(self, request):
         response = self.get_response(request)
-        
-        # Content Security Policy - Previene XSS
-        response['Content-Security-Policy'] = (
-            "default-src 'self'; "
-            "script-src 'self' 'unsafe-inline' 'unsafe-eval'; "
-            "style-src 'self' 'unsafe-inline'; "
-            "img-src 'self' data: https:; "
-            "font-src 'self' data:; "
-            "connect-src 'self' http://localhost:* https:; "
-            "frame-ancestors 'none';"
-        )
-        
-        # Prevenir clickjacking
-        response['X-Frame-Options'] = 'DENY'
-        
-        # Prevenir MIME type sniffing
-        response['X-Content-Type-Options'] = 'nosniff'
-        
-        # XSS Protection (legacy pero útil para navegadores antiguos)
-        response['X-XSS-Protection'] = '1; mode=block'
-        
-        # Referrer Policy
-        response['Referrer-Policy'] = 'strict-origin-when-cross-origin'
-        
-        # Permissions Policy (antes Feature Policy)
-        response['Permissions-Policy'] = (
-            "geolocation=(), "
-            "microphone=(), "
-            "camera=(), "
-            "payment=()"
-        )
-        
+        headers = response.headers
+        for nombre, valor in self.headers_para(request.path_info):
+            headers[nombre] = valor
         return response
 
+    def headers_para(self, path):
+        if path.startswith(self.override_prefixes):
+            for prefijo, headers in self.overrides:
+                if path.startswith(prefijo):
+                    return headers
+        return self.headers
+
+
+XSS_PATTERNS = [
+    '<script',
+    'javascript:',
+    'onerror=',
+    'onload=',
+    'onclick=',
+    '<iframe',
+    'eval(',
+    'document.cookie',
+]
+
+
+
+def _anclar(patron):
+    """
+    Reescribe un patrón para que la alternativa empiece en su primer signo no alfanumérico.
+
+    Los signos (<, :, =, (, .) son raros en texto normal, así que el motor de re
+    descarta casi todas las posiciones con un solo carácter en vez de probar cada
+    alternativa: 'eval(' pasa a ser '\\((?<=eval\\()'.
+    """
+    corte = next((i for i, c in enumerate(patron) if not c.isalnum()), 0)
+    ancla = re.escape(patron[corte])
+    if corte == 0:
+        return ancla + re.escape(patron[1:])
+    return f'{ancla}(?<={re.escape(patron[:corte + 1])}){re.escape(patron[corte + 1:])}'
+
+
+# Un solo patrón precompilado para todos los valores; la versión bytes revisa el cuerpo JSON sin decodificarlo
+XSS_REGEX = re.compile('|'.join(_anclar(p) for p in XSS_PATTERNS), re.IGNORECASE)
+XSS_REGEX_BYTES = re.compile(XSS_REGEX.pattern.encode(), re.IGNORECASE)
+
+# Separador que no aparece en ningún patrón: evita coincidencias entre valores concatenados
+SEPARADOR = '\x00'
+
+
+def contiene_xss(texto):
+    return XSS_REGEX.search(texto) is not None
+
+
+def json_contiene_xss(cuerpo):
+    """
+    Revisa las claves y strings de un cuerpo JSON.
+
+    Sin secuencias de escape, ningún patrón puede formarse con la sintaxis JSON
+    (comillas, comas, dos puntos), así que basta una pasada sobre los bytes crudos.
+    Con escapes (p. ej. \\u003cscript) se decodifica y se recorren los strings.
+    """
+    if b'\\' not in cuerpo:
+        return XSS_REGEX_BYTES.search(cuerpo) is not None
+    try:
+        datos = json.loads(cuerpo)
+    except ValueError:
+        return False
+    pendientes = [datos]
+    while pendientes:
+        valor = pendientes.pop()
+        if isinstance(valor, str):
+            if contiene_xss(valor):
+                return True
+        elif isinstance(valor, dict):
+            pendientes.extend(valor.values())
+            pendientes.extend(valor.keys())
+        elif isinstance(valor, list):
+            pendientes.extend(valor)
+    return False
+
 
 class XSSProtectionMiddleware:
     """
     Detecta y bloquea intentos de XSS en parámetros de request
+
+    Revisa query string, formularios urlencoded y cuerpos JSON de hasta
+    XSS_JSON_MAX_BYTES. Las rutas que comienzan con algún prefijo de
+    XSS_EXEMPT_PATHS no se revisan.
     """
-    XSS_PATTERNS = [
-        '<script',
-        'javascript:',
-        'onerror=',
-        'onload=',
-        'onclick=',
-        '<iframe',
-        'eval(',
-        'document.cookie',
-    ]
-    
     def __init__(self, get_response):
         self.get_response = get_response
+        self.exempt_paths = tuple(getattr(settings, 'XSS_EXEMPT_PATHS', ()))
+        self.json_max_bytes = getattr(settings, 'XSS_JSON_MAX_BYTES', 1024 * 1024)
 
     def __call__(self, request):
-        # Verificar parámetros GET
+        if self.exempt_paths and request.path_info.startswith(self.exempt_paths):
+            return self.get_response(request)
+
         if self._contains_xss(request.GET):
-            from django.http import JsonResponse
-            return JsonResponse({
-                'error': 'Contenido peligroso detectado en la solicitud'
-            }, status=400)
-        
-        # Verificar parámetros POST (solo para form data, no JSON)
+            return self._rechazar()
+
+        # Formularios urlencoded; multipart se deja al parser de DRF para no consumir el stream de archivos
         if request.content_type == 'application/x-www-form-urlencoded':
             if self._contains_xss(request.POST):
-                from django.http import JsonResponse
-                return JsonResponse({
-                    'error': 'Contenido peligroso detectado en la solicitud'
-                }, status=400)
-        
+                return self._rechazar()
+        elif request.content_type == 'application/json' and self._json_contains_xss(request):
+            return self._rechazar()
+
         return self.get_response(request)
-    
+
+    def _rechazar(self):
+        return JsonResponse({
+            'error': 'Contenido peligroso detectado en la solicitud'
+        }, status=400)
+
     def _contains_xss(self, params):
-        """Verifica si los parámetros contienen patrones XSS"""
-        for value in params.values():
-            value_str = str(value).lower()
-            for pattern in self.XSS_PATTERNS:
-                if pattern in value_str:
-                    return True
-        return False
+        """Verifica si los parámetros contienen patrones XSS (todos los valores de cada clave)"""
+        if not params:
+            return False
+        return contiene_xss(SEPARADOR.join(SEPARADOR.join(values) for _, values in params.lists()))
+
+    def _json_contains_xss(self, request):
+        """Revisa el cuerpo JSON si no supera el tamaño máximo configurado"""
+        try:
+            length = int(request.META.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            return False
+        if not 0 < length <= self.json_max_bytes:
+            return False
+        return json_contiene_xss(request.body)
@@ -60,6 +60,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "scout_project.metrics.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
@@ -72,17 +73,63 @@ MIDDLEWARE = [
     "scout_project.security_middleware.XSSProtectionMiddleware",
 ]
 
+# Métricas Prometheus expuestas en /api/metrics/
+METRICS_ENABLED = config('METRICS_ENABLED', default=True, cast=bool)
+# Acceso a /api/metrics/: header "Authorization: Bearer <METRICS_TOKEN>" o IP de origen en
+# METRICS_ALLOWED_IPS (IPs o redes). nginx además no expone la ruta hacia afuera.
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+METRICS_ALLOWED_IPS = config('METRICS_ALLOWED_IPS', default='127.0.0.1,::1', cast=Csv())
+
+# SecurityHeadersMiddleware: headers agregados a cada respuesta (dict = directivas, None = no enviar)
+SECURITY_CSP = {
+    'default-src': ["'self'"],
+    'script-src': ["'self'", "'unsafe-inline'", "'unsafe-eval'"],
+    'style-src': ["'self'", "'unsafe-inline'"],
+    'img-src': ["'self'", 'data:', 'https:'],
+    'font-src': ["'self'", 'data:'],
+    'connect-src': ["'self'", 'http://localhost:*', 'https:'],
+    'frame-ancestors': ["'none'"],
+}
+SECURITY_HEADERS = {
+    'Content-Security-Policy': SECURITY_CSP,
+    'X-Frame-Options': 'DENY',
+    'X-Content-Type-Options': 'nosniff',
+    'X-XSS-Protection': '1; mode=block',
+    'Referrer-Policy': 'strict-origin-when-cross-origin',
+    'Permissions-Policy': {'geolocation': [], 'microphone': [], 'camera': [], 'payment': []},
+}
+# Reemplazos por prefijo de ruta: Swagger/ReDoc cargan el esquema desde workers blob:
+SECURITY_HEADERS_OVERRIDES = {
+    '/api/docs/': {'Content-Security-Policy': {**SECURITY_CSP, 'worker-src': ["'self'", 'blob:']}},
+    '/api/redoc/': {'Content-Security-Policy': {**SECURITY_CSP, 'worker-src': ["'self'", 'blob:']}},
+}
+
+# XSSProtectionMiddleware: prefijos de ruta que no se revisan y tamaño máximo del cuerpo JSON revisado
+XSS_EXEMPT_PATHS = config('XSS_EXEMPT_PATHS', default='', cast=Csv())
+XSS_JSON_MAX_BYTES = config('XSS_JSON_MAX_BYTES', default=1024 * 1024, cast=int)
+
 CORS_ALLOW_ALL_ORIGINS = config('CORS_ALLOW_ALL', default=False, cast=bool) and DEBUG
 
 # Configuración de Django REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # JWT sin consulta a la base de datos; valida la versión de los permisos embebidos
+        'usuarios.permisos.PermisosJWTAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
+    # JSON con orjson si está instalado; Decimal y fechas según DATETIME_FORMAT/DATE_FORMAT (ver scout_project/renderers.py)
+    'DEFAULT_RENDERER_CLASSES': [
+        'scout_project.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'scout_project.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_FILTER_BACKENDS': [
@@ -90,8 +137,8 @@ REST_FRAMEWORK = {
         'rest_framework.filters.OrderingFilter',
     ],
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle',
+        'scout_project.throttling.SlidingWindowAnonRateThrottle',
+        'scout_project.throttling.SlidingWindowUserRateThrottle',
     ],
     'DEFAULT_THROTTLE_RATES': {
         'anon': '100/hour',
@@ -151,6 +198,54 @@ CORS_ALLOW_HEADERS = [
     'x-requested-with',
 ]
 
+# Caché: Redis cuando REDIS_URL está definido (docker-compose), memoria local en desarrollo/tests.
+# En producción con varios workers debe usarse Redis para que la invalidación sea compartida.
+REDIS_URL = config('REDIS_URL', default='')
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django_redis.cache.RedisCache",
+            "LOCATION": REDIS_URL,
+            "OPTIONS": {
+                "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            },
+            "KEY_PREFIX": "gic",
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# Rate limiting compartido entre workers (sin URL se usa memoria local por proceso)
+THROTTLE_REDIS_URL = config('THROTTLE_REDIS_URL', default=REDIS_URL)
+
+# Tiempo de vida (segundos) de las respuestas cacheadas de catálogos maestros/geografía
+CATALOG_CACHE_TIMEOUT = config('CATALOG_CACHE_TIMEOUT', default=60 * 60 * 24, cast=int)
+
+# Permisos JWT (usuarios/permisos.py): segundos que se cachean las versiones de permisos leídas de la base.
+# Con caché por proceso (LocMem) es también lo que tarda otro worker en rechazar un token obsoleto.
+PERMISOS_CACHE_TIMEOUT = config('PERMISOS_CACHE_TIMEOUT', default=60, cast=int)
+
+# apl_id de cada módulo en la tabla aplicacion; PermisoAplicacion exige el permiso de PerfilAplicacion sobre él
+APLICACIONES = {
+    'personas': config('APL_PERSONAS', default=1, cast=int),
+    'cursos': config('APL_CURSOS', default=2, cast=int),
+    'preinscripcion': config('APL_PREINSCRIPCION', default=3, cast=int),
+    'pagos': config('APL_PAGOS', default=4, cast=int),
+    'archivos': config('APL_ARCHIVOS', default=5, cast=int),
+    'proveedores': config('APL_PROVEEDORES', default=6, cast=int),
+    'revisores': config('APL_REVISORES', default=7, cast=int),
+    # Datos de salud (alergias/enfermedades) en exportaciones: permiso aparte del de cursos
+    'datos_salud': config('APL_DATOS_SALUD', default=8, cast=int),
+}
+
+# Conciliación de pagos: mantener resumen_pago actualizado en cada pago y leerlo en /api/pagos/conciliacion/
+PAGOS_RESUMEN_MATERIALIZADO = config('PAGOS_RESUMEN_MATERIALIZADO', default=False, cast=bool)
+
 # Security settings for production
 if not DEBUG:
     SECURE_SSL_REDIRECT = True
@@ -215,6 +310,27 @@ else:
     }
 
 
+# Password hashing
+# El primero es el preferido; los hashes existentes con otro algoritmo se
+# re-hashean de forma transparente en el siguiente login exitoso.
+# scrypt (stdlib, N=2^14, p=1) cuesta ~8x menos CPU por login que PBKDF2 con
+# 1M iteraciones y es resistente a GPU por uso de memoria (16 MiB por hash).
+# argon2 requiere argon2-cffi. `manage.py benchmark_auth` compara los costos.
+PASSWORD_HASHER = config('PASSWORD_HASHER', default='scrypt')
+PASSWORD_SCRYPT_WORK_FACTOR = config('PASSWORD_SCRYPT_WORK_FACTOR', default=2 ** 14, cast=int)
+PASSWORD_SCRYPT_PARALLELISM = config('PASSWORD_SCRYPT_PARALLELISM', default=1, cast=int)
+_PASSWORD_HASHERS = {
+    'argon2': 'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'scrypt': 'usuarios.hashers.ConfigurableScryptPasswordHasher',
+    'pbkdf2': 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+}
+PASSWORD_HASHERS = [_PASSWORD_HASHERS[PASSWORD_HASHER]] + [
+    hasher for name, hasher in _PASSWORD_HASHERS.items() if name != PASSWORD_HASHER
+] + ['django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher']
+
+# Segundos que se recuerda un email inexistente en el login (evita la consulta)
+LOGIN_NEGATIVE_CACHE_TIMEOUT = config('LOGIN_NEGATIVE_CACHE_TIMEOUT', default=60, cast=int)
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -256,6 +372,24 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Las subidas se escriben siempre a un temporal en disco (nunca completas en memoria)
+# y se calcula su SHA-256 mientras se reciben los chunks
+FILE_UPLOAD_HANDLERS = ['archivos.uploads.HashingFileUploadHandler']
+
+# Celery: procesamiento en segundo plano de archivos (miniaturas, páginas PDF, escáner)
+CELERY_BROKER_URL = config('CELERY_BROKER_URL', default=REDIS_URL)
+# Sin broker configurado las tareas se ejecutan en el mismo proceso (desarrollo/tests)
+CELERY_TASK_ALWAYS_EAGER = config('CELERY_TASK_ALWAYS_EAGER', default=not CELERY_BROKER_URL, cast=bool)
+CELERY_TASK_ACKS_LATE = True
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+
+# Escáneres de archivos (p. ej. antivirus): rutas a funciones f(ruta) -> None si está limpio o el motivo de rechazo
+ARCHIVO_SCANNERS = [path for path in config('ARCHIVO_SCANNERS', default='').split(',') if path]
+ARCHIVO_MINIATURA_TAMANO = (256, 256)
+# Descargas vía nginx (X-Accel-Redirect a la location interna /media/); sin nginx Django transmite el archivo
+ARCHIVO_X_ACCEL = config('ARCHIVO_X_ACCEL', default=not DEBUG, cast=bool)
+ARCHIVO_X_ACCEL_PREFIX = MEDIA_URL
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
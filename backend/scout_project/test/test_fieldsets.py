@@ -0,0 +1,92 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from cursos.models import CursoSeccion
+from pagos.models import PagoPersona
+
+
+def _selects(queries, tabla):
+    return [q['sql'] for q in queries.captured_queries if q['sql'].startswith('SELECT') and f'"{tabla}"' in q['sql']]
+
+
+@pytest.mark.django_db
+def test_fields_limita_columnas_y_payload(auth_client, persona):
+    with CaptureQueriesContext(connection) as queries:
+        response = auth_client.get('/api/personas/personas/?paginacion=cursor&fields=per_id,per_run,per_nombres')
+
+    assert response.status_code == 200
+    assert response.json()['results'] == [{'per_id': persona.pk, 'per_run': persona.per_run,
+                                           'per_nombres': persona.per_nombres}]
+    sql, = _selects(queries, 'persona')
+    assert 'per_foto' not in sql and 'per_email' not in sql
+    completo = auth_client.get('/api/personas/personas/?paginacion=cursor').json()['results'][0]
+    assert 'per_foto' in completo and len(completo) > 20
+
+
+@pytest.mark.django_db
+def test_expand_con_select_related_sin_n_mas_1(auth_client, curso, usuario, persona_factory):
+    for _ in range(3):
+        PagoPersona.objects.create(per_id=persona_factory(), cur_id=curso, usu_id=usuario, pap_tipo=1,
+                                   pap_fecha_hora=datetime(2025, 3, 1, tzinfo=timezone.utc), pap_valor=Decimal('1000'))
+
+    with CaptureQueriesContext(connection) as queries:
+        response = auth_client.get('/api/pagos/pagopersonas/?paginacion=cursor'
+                                   '&fields=pap_id,pap_valor,per_id.per_nombres,per_id.per_run')
+
+    assert response.status_code == 200
+    fila = response.json()['results'][0]
+    assert set(fila) == {'pap_id', 'pap_valor', 'per_id'}
+    assert set(fila['per_id']) == {'per_nombres', 'per_run'}
+    sql, = _selects(queries, 'pago_persona')
+    assert 'JOIN "persona"' in sql and 'per_foto' not in sql
+
+    completo = auth_client.get('/api/pagos/pagopersonas/?expand=per_id,cur_id').json()['results'][0]
+    assert completo['per_id']['per_apelpat'] == 'Pérez' and completo['cur_id']['cur_codigo'] == curso.cur_codigo
+    assert isinstance(completo['usu_id'], int)
+
+
+@pytest.mark.django_db
+def test_detalle_omite_relaciones_no_pedidas(auth_client, curso):
+    CursoSeccion.objects.create(cur_id=curso, cus_seccion=1, cus_cant_participante=30)
+
+    with CaptureQueriesContext(connection) as queries:
+        response = auth_client.get(f'/api/cursos/cursos/{curso.pk}/?detalle=1&fields=cur_id,cur_codigo')
+    assert response.json() == {'cur_id': curso.pk, 'cur_codigo': curso.cur_codigo}
+    assert len(_selects(queries, 'curso_seccion')) == 0
+    assert 'JOIN' not in _selects(queries, 'curso')[0]
+
+    response = auth_client.get(f'/api/cursos/cursos/{curso.pk}/?detalle=1&fields=cur_id,secciones.cus_seccion')
+    assert response.json() == {'cur_id': curso.pk, 'secciones': [{'cus_seccion': 1}]}
+
+
+@pytest.mark.django_db
+def test_parametros_invalidos(auth_client, persona):
+    assert auth_client.get('/api/personas/personas/?fields=per_id,no_existe').status_code == 400
+    assert auth_client.get('/api/personas/personas/?expand=per_nombres').status_code == 400
+    response = auth_client.patch(f'/api/personas/personas/{persona.pk}/?fields=per_id',
+                                 {'per_apodo': 'Nuevo'}, format='json')
+    assert response.status_code == 200 and response.json()['per_apodo'] == 'Nuevo'
+
+
+@pytest.mark.django_db
+def test_expand_usa_serializer_publico_sin_password(auth_client, curso, usuario, persona):
+    PagoPersona.objects.create(per_id=persona, cur_id=curso, usu_id=usuario, pap_tipo=1,
+                               pap_fecha_hora=datetime(2025, 3, 1, tzinfo=timezone.utc), pap_valor=Decimal('1000'))
+
+    for url in (f'/api/personas/personas/{persona.pk}/?fields=per_id,usu_id&expand=usu_id',
+                '/api/pagos/pagopersonas/?expand=usu_id,per_id',
+                f'/api/cursos/cursos/{curso.pk}/?expand=usu_id'):
+        response = auth_client.get(url)
+        assert response.status_code == 200, url
+        assert b'usu_password' not in response.content and usuario.usu_password.encode() not in response.content
+    assert auth_client.get(f'/api/personas/personas/{persona.pk}/?expand=usu_id').json()['usu_id']['usu_username'] \
+        == usuario.usu_username
+
+    # Los campos que el serializer público no expone tampoco se pueden pedir
+    assert auth_client.get(f'/api/personas/personas/{persona.pk}/?fields=usu_id.usu_password').status_code == 400
+    # FK sin serializer público registrado
+    assert auth_client.get('/api/archivos/archivos/?expand=aco_id').status_code == 400
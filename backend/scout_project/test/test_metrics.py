@@ -0,0 +1,56 @@
+import pytest
+
+from geografia.models import Region
+from scout_project.metrics import Counter, Histogram, render_metrics
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram('test_latency_seconds', 'Test', ('route',), buckets=(0.1, 1.0))
+    histogram.observe(('r',), 0.05)
+    histogram.observe(('r',), 0.1)
+    histogram.observe(('r',), 5)
+    lines = histogram.collect()
+    assert 'test_latency_seconds_bucket{route="r",le="0.1"} 2' in lines
+    assert 'test_latency_seconds_bucket{route="r",le="1.0"} 2' in lines
+    assert 'test_latency_seconds_bucket{route="r",le="+Inf"} 3' in lines
+    assert 'test_latency_seconds_count{route="r"} 3' in lines
+
+
+def test_counter_escapes_label_values():
+    counter = Counter('test_total', 'Test', ('route',))
+    counter.inc(('a"b\\c',))
+    assert 'test_total{route="a\\"b\\\\c"} 1' in counter.collect()
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint_reports_viewset_requests(api_client):
+    Region.objects.create(reg_descripcion='Región Metropolitana', reg_vigente=True)
+
+    assert api_client.get('/api/maestros/regiones/').status_code == 200
+    response = api_client.get('/api/metrics/')
+
+    assert response.status_code == 200
+    assert response['Content-Type'].startswith('text/plain; version=0.0.4')
+    body = response.content.decode()
+    labels = 'route="api/maestros/regiones/$",method="GET"'
+    assert f'http_requests_total{{{labels},status="200"}}' in body
+    assert f'http_request_duration_seconds_count{{{labels}}}' in body
+    assert f'http_request_db_queries_count{{{labels}}}' in body
+    assert f'http_response_size_bytes_count{{{labels}}}' in body
+    assert f'drf_serializer_duration_seconds_count{{{labels}}}' in body
+    assert 'process_cpu_seconds_total' in render_metrics()
+
+
+@pytest.mark.django_db
+def test_metrics_requiere_token_o_ip_permitida(api_client, settings):
+    settings.METRICS_TOKEN = 'secreto'
+    settings.METRICS_ALLOWED_IPS = ['10.0.0.0/8']
+    url = '/api/metrics/'
+
+    assert api_client.get(url, REMOTE_ADDR='203.0.113.5').status_code == 403
+    assert api_client.get(url, REMOTE_ADDR='203.0.113.5', HTTP_AUTHORIZATION='Bearer otro').status_code == 403
+    assert api_client.get(url, REMOTE_ADDR='203.0.113.5', HTTP_AUTHORIZATION='Bearer secreto').status_code == 200
+    assert api_client.get(url, REMOTE_ADDR='10.1.2.3').status_code == 200
+    # Sin token configurado un header cualquiera no abre el acceso
+    settings.METRICS_TOKEN = ''
+    assert api_client.get(url, REMOTE_ADDR='203.0.113.5', HTTP_AUTHORIZATION='Bearer ').status_code == 403
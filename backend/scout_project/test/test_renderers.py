@@ -0,0 +1,79 @@
+import io
+import json
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from rest_framework import serializers
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+from pagos.serializers import PagoPersonaSerializer
+from personas.management.commands.benchmark_json import pagos, personas, stock_serializer
+from personas.serializers import PersonaSerializer
+from scout_project import renderers
+from scout_project.renderers import FastDateTimeField, FastDecimalField, FastJSONParser, FastJSONRenderer
+
+
+@pytest.mark.parametrize('serializer_class, objetos', [(PersonaSerializer, personas(20)), (PagoPersonaSerializer, pagos(20))])
+def test_campos_rapidos_igual_que_drf(serializer_class, objetos):
+    stock = stock_serializer(serializer_class.Meta.model)
+    assert FastJSONRenderer().render(serializer_class(objetos, many=True).data) == \
+        JSONRenderer().render(stock(objetos, many=True).data)
+
+
+def test_campos_rapidos_con_zona_y_redondeo(settings):
+    assert isinstance(PagoPersonaSerializer().fields['pap_fecha_hora'], FastDateTimeField)
+    settings.TIME_ZONE = 'America/Santiago'
+    valor = datetime(2026, 3, 1, 15, 0, tzinfo=timezone.utc)
+    assert FastDateTimeField().to_representation(valor) == serializers.DateTimeField().to_representation(valor)
+    assert FastDateTimeField(format='%d/%m/%Y').to_representation(valor) == '01/03/2026'
+    for valor in (Decimal('1.0000005'), Decimal('-3'), Decimal('99999.9999999')):
+        assert FastDecimalField(max_digits=12, decimal_places=6).to_representation(valor) == \
+            serializers.DecimalField(max_digits=12, decimal_places=6).to_representation(valor)
+
+
+@pytest.mark.parametrize('use_orjson', [True, False])
+def test_render_de_valores_sin_serializer(use_orjson):
+    renderer = FastJSONRenderer()
+    renderer.use_orjson = use_orjson and renderers.orjson is not None
+    data = {'saldo': Decimal('13000.000000'), 'exponente': Decimal('1E+3'),
+            'fecha': datetime(2026, 3, 1, 12, 30, 5, 123, tzinfo=timezone.utc), 'dia': date(2026, 3, 1),
+            'nombre': 'Ñuñoa\u2028', 1: None}
+
+    assert json.loads(renderer.render(data)) == {
+        'saldo': '13000.000000', 'exponente': '1000', 'fecha': '2026-03-01 12:30:05', 'dia': '2026-03-01',
+        'nombre': 'Ñuñoa\u2028', '1': None,
+    }
+    assert b'\\u2028' in renderer.render(data)
+    assert renderer.render(None) == b''
+    indentado = renderer.render(data, 'application/json; indent=2')
+    assert json.loads(indentado)['saldo'] == '13000.000000' and b'\n  ' in indentado
+
+
+def test_parser():
+    parser = FastJSONParser()
+    assert parser.parse(io.BytesIO('{"nombre": "Ñuñoa", "n": [1, 2.5]}'.encode())) == {'nombre': 'Ñuñoa', 'n': [1, 2.5]}
+    with pytest.raises(ParseError):
+        parser.parse(io.BytesIO(b'{"a": '))
+    with pytest.raises(ParseError):
+        parser.parse(io.BytesIO(b'{"a": NaN}'))
+    assert parser.parse(io.BytesIO('{"a": "é"}'.encode('latin-1')), parser_context={'encoding': 'latin-1'}) == {'a': 'é'}
+
+
+@pytest.mark.django_db
+def test_api_usa_renderer_y_parser(auth_client, persona):
+    response = auth_client.patch(f'/api/personas/personas/{persona.pk}/', b'{"per_apodo": "Nuevo"}',
+                                 content_type='application/json')
+    assert response.status_code == 200
+    assert isinstance(response.accepted_renderer, FastJSONRenderer)
+    assert response.json()['per_apodo'] == 'Nuevo'
+    assert auth_client.patch(f'/api/personas/personas/{persona.pk}/', b'{"per_apodo": ',
+                             content_type='application/json').status_code == 400
+
+
+def test_benchmark_json():
+    salida = io.StringIO()
+    call_command('benchmark_json', '--rows', '50', '--repeat', '1', stdout=salida)
+    assert salida.getvalue().count('speedup') == 2
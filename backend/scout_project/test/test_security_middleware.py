@@ -0,0 +1,206 @@
+import json
+import time
+
+import pytest
+from django.http import BadHeaderError, HttpResponse
+from django.test import RequestFactory
+
+from scout_project.security_middleware import SecurityHeadersMiddleware, XSSProtectionMiddleware, json_contiene_xss
+
+
+@pytest.fixture
+def middleware():
+    return XSSProtectionMiddleware(lambda request: HttpResponse('ok'))
+
+
+def _json(path, datos):
+    return RequestFactory().post(path, json.dumps(datos), content_type='application/json')
+
+
+LEGACY_CSP = (
+    "default-src 'self'; "
+    "script-src 'self' 'unsafe-inline' 'unsafe-eval'; "
+    "style-src 'self' 'unsafe-inline'; "
+    "img-src 'self' data: https:; "
+    "font-src 'self' data:; "
+    "connect-src 'self' http://localhost:* https:; "
+    "frame-ancestors 'none';"
+)
+
+
+class LegacySecurityHeaders:
+    """Implementación anterior: arma y asigna los seis headers en cada respuesta"""
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        response['Content-Security-Policy'] = (
+            "default-src 'self'; "
+            "script-src 'self' 'unsafe-inline' 'unsafe-eval'; "
+            "style-src 'self' 'unsafe-inline'; "
+            "img-src 'self' data: https:; "
+            "font-src 'self' data:; "
+            "connect-src 'self' http://localhost:* https:; "
+            "frame-ancestors 'none';"
+        )
+        response['X-Frame-Options'] = 'DENY'
+        response['X-Content-Type-Options'] = 'nosniff'
+        response['X-XSS-Protection'] = '1; mode=block'
+        response['Referrer-Policy'] = 'strict-origin-when-cross-origin'
+        response['Permissions-Policy'] = (
+            "geolocation=(), "
+            "microphone=(), "
+            "camera=(), "
+            "payment=()"
+        )
+        return response
+
+
+class LegacyXSSProtection:
+    """Implementación anterior (lower + substring por patrón), usada como referencia del benchmark"""
+    XSS_PATTERNS = ['<script', 'javascript:', 'onerror=', 'onload=', 'onclick=', '<iframe', 'eval(',
+                    'document.cookie']
+
+    def _contains_xss(self, params):
+        for value in params.values():
+            value_str = str(value).lower()
+            for pattern in self.XSS_PATTERNS:
+                if pattern in value_str:
+                    return True
+        return False
+
+
+@pytest.mark.parametrize('valor', ['<SCRIPT>alert(1)</script>', 'JavaScript:void(0)', 'x" OnError="y', 'eval(x)'])
+def test_query_string_con_patron_es_rechazado(middleware, valor):
+    response = middleware(RequestFactory().get('/api/personas/', {'q': valor}))
+
+    assert response.status_code == 400
+
+
+def test_revisa_todos_los_valores_de_una_clave(middleware):
+    response = middleware(RequestFactory().get('/api/personas/?tag=<iframe src=x>&tag=ok'))
+
+    assert response.status_code == 400
+
+
+def test_valores_limpios_pasan_y_no_se_unen_entre_si(middleware):
+    # "eval" y "(1)" en valores distintos no deben formar "eval("
+    response = middleware(RequestFactory().get('/api/personas/', {'a': 'eval', 'b': '(1)', 'c': 'Ñuñoa'}))
+
+    assert response.status_code == 200
+
+
+def test_cuerpo_json_anidado_y_con_escapes(middleware):
+    assert middleware(_json('/api/personas/', {'per': [{'nombre': 'Ana'}, {'obs': 'document.COOKIE'}]})).status_code == 400
+    assert middleware(_json('/api/personas/', {'nombre': 'Ana', 'obs': 'línea "citada"'})).status_code == 200
+    # < oculta el "<" en los bytes crudos; se detecta al decodificar los strings
+    escapado = b'{"obs": "\\u003cscript>alert(1)"}'
+    assert b'<script' not in escapado and json_contiene_xss(escapado) is True
+    assert json_contiene_xss(b'{"<script>": 1}') is True
+    assert json_contiene_xss(b'{"obs": "\\"eval\\"", "n": "(1)"}') is False
+
+
+def test_json_sobre_el_limite_no_se_lee(settings):
+    settings.XSS_JSON_MAX_BYTES = 64
+    middleware = XSSProtectionMiddleware(lambda request: HttpResponse('ok'))
+    request = _json('/api/personas/', {'obs': '<script>' + 'x' * 100})
+
+    assert middleware(request).status_code == 200
+    assert request._read_started is False
+
+
+def test_rutas_exentas_configurables(settings):
+    settings.XSS_EXEMPT_PATHS = ['/admin/', '/api/cursos/contenido/']
+    middleware = XSSProtectionMiddleware(lambda request: HttpResponse('ok'))
+
+    assert middleware(_json('/api/cursos/contenido/5/', {'html': '<iframe>'})).status_code == 200
+    assert middleware(_json('/api/cursos/', {'html': '<iframe>'})).status_code == 400
+
+
+@pytest.mark.django_db
+def test_vista_drf_sigue_leyendo_el_cuerpo_json(auth_client, comuna):
+    response = auth_client.post('/api/geografia/regiones/', {'reg_descripcion': '<script>x'}, format='json')
+    assert response.status_code == 400
+    assert 'peligroso' in response.json()['error']
+
+    response = auth_client.post('/api/geografia/regiones/', {'reg_descripcion': 'Ñuble', 'reg_vigente': True},
+                                format='json')
+    assert response.status_code == 201
+
+
+def _medir(func, iteraciones):
+    inicio = time.perf_counter()
+    for _ in range(iteraciones):
+        func()
+    return (time.perf_counter() - inicio) / iteraciones * 1e6
+
+
+@pytest.mark.slow
+def test_benchmark_contra_implementacion_anterior(middleware):
+    """Request típico de listado: 25 parámetros limpios (peor caso, ningún patrón corta la búsqueda)"""
+    params = RequestFactory().get('/api/personas/', {
+        f'campo_{n}': f'Valor de búsqueda número {n} con algo de texto' for n in range(25)
+    }).GET
+    legacy = LegacyXSSProtection()
+
+    assert legacy._contains_xss(params) is middleware._contains_xss(params) is False
+    antes = min(_medir(lambda: legacy._contains_xss(params), 2000) for _ in range(3))
+    ahora = min(_medir(lambda: middleware._contains_xss(params), 2000) for _ in range(3))
+
+    # Solo informa: comparar tiempos de reloj falla al azar en máquinas cargadas
+    print(f'\nXSS scan 25 params: anterior {antes:.1f} us, compilado {ahora:.1f} us ({antes / ahora:.1f}x)')
+
+
+def test_headers_por_defecto_iguales_a_los_anteriores():
+    request = RequestFactory().get('/api/personas/')
+    nuevos = SecurityHeadersMiddleware(lambda r: HttpResponse('ok'))(request)
+    anteriores = LegacySecurityHeaders(lambda r: HttpResponse('ok'))(request)
+
+    assert nuevos['Content-Security-Policy'] == LEGACY_CSP
+    assert dict(nuevos.headers) == dict(anteriores.headers)
+
+
+def test_headers_invalidos_fallan_al_iniciar(settings):
+    settings.SECURITY_HEADERS = {**settings.SECURITY_HEADERS, 'X-Frame-Options': 'DENY\nSet-Cookie: x=1'}
+
+    with pytest.raises(BadHeaderError):
+        SecurityHeadersMiddleware(lambda r: HttpResponse('ok'))
+
+
+def test_reemplazo_por_prefijo_mas_largo(settings):
+    settings.SECURITY_HEADERS_OVERRIDES = {
+        '/api/docs/': {'Content-Security-Policy': {'default-src': ["'self'"], 'worker-src': ['blob:']}},
+        '/api/docs/interno/': {'X-Frame-Options': None, 'Content-Security-Policy': "default-src 'none';"},
+    }
+    middleware = SecurityHeadersMiddleware(lambda r: HttpResponse('ok'))
+
+    docs = middleware(RequestFactory().get('/api/docs/'))
+    assert docs['Content-Security-Policy'] == "default-src 'self'; worker-src blob:;"
+    assert docs['X-Frame-Options'] == 'DENY'
+    interno = middleware(RequestFactory().get('/api/docs/interno/x/'))
+    assert interno['Content-Security-Policy'] == "default-src 'none';"
+    assert 'X-Frame-Options' not in interno
+    assert middleware(RequestFactory().get('/api/')).has_header('Permissions-Policy')
+
+
+def test_swagger_recibe_csp_con_workers_blob(api_client):
+    response = api_client.get('/api/docs/')
+
+    assert "worker-src 'self' blob:;" in response['Content-Security-Policy']
+    assert 'worker-src' not in api_client.get('/api/metrics/')['Content-Security-Policy']
+
+
+@pytest.mark.slow
+def test_benchmark_headers_contra_implementacion_anterior():
+    request = RequestFactory().get('/api/personas/')
+    respuesta = HttpResponse('ok')
+    anterior = LegacySecurityHeaders(lambda r: respuesta)
+    nuevo = SecurityHeadersMiddleware(lambda r: respuesta)
+
+    antes = min(_medir(lambda: anterior(request), 5000) for _ in range(3))
+    ahora = min(_medir(lambda: nuevo(request), 5000) for _ in range(3))
+
+    # Solo informa (la equivalencia la cubre test_headers_por_defecto_iguales_a_los_anteriores):
+    # comparar tiempos de reloj falla al azar en máquinas cargadas
+    print(f'\nSecurity headers por respuesta: anterior {antes:.2f} us, precalculado {ahora:.2f} us ({antes / ahora:.1f}x)')
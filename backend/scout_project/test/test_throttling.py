@@ -0,0 +1,57 @@
+import pytest
+
+from scout_project import throttling
+from scout_project.metrics import render_metrics
+
+
+def test_ventana_deslizante_local(monkeypatch):
+    reloj = [1000.0]
+    monkeypatch.setattr(throttling.time, 'monotonic', lambda: reloj[0])
+    limiter = throttling.LocalSlidingWindow()
+
+    assert [limiter.hit('k', 2, 60)[0] for _ in range(3)] == [True, True, False]
+    reloj[0] += 30
+    allowed, wait = limiter.hit('k', 2, 60)
+    assert (allowed, wait) == (False, 30)
+    # Ventana deslizante: a los 60 s de la primera request se libera un cupo
+    reloj[0] += 30.5
+    assert limiter.hit('k', 2, 60)[0] is True
+
+
+def test_registro_local_elimina_claves_expiradas(monkeypatch):
+    reloj = [0.0]
+    monkeypatch.setattr(throttling.time, 'monotonic', lambda: reloj[0])
+    monkeypatch.setattr(throttling.LocalSlidingWindow, 'SWEEP_EVERY', 10)
+    limiter = throttling.LocalSlidingWindow()
+
+    for n in range(9):
+        limiter.hit(f'ip-{n}', 5, 60)
+    reloj[0] += 61
+    limiter.hit('nueva', 5, 60)
+
+    assert list(limiter._hits) == ['nueva']
+
+
+def test_redis_caido_usa_registro_local(monkeypatch):
+    import redis
+
+    class ScriptCaido:
+        def __call__(self, **kwargs):
+            raise redis.ConnectionError('down')
+
+    limiter = throttling.RedisSlidingWindow('redis://localhost:1/0', throttling.LocalSlidingWindow())
+    limiter.script = ScriptCaido()
+
+    assert limiter.hit('k', 1, 60)[0] is True
+    assert limiter.hit('k', 1, 60)[0] is False
+    assert 'drf_throttle_backend_errors_total 2' in render_metrics()
+
+
+@pytest.mark.django_db
+def test_login_throttle_registra_metrica(api_client):
+    for _ in range(6):
+        response = api_client.post('/api/auth/login/', {'email': 'x@test.com', 'password': 'Secreta123!'}, format='json')
+
+    assert response.status_code == 429
+    assert int(response['Retry-After']) <= 60
+    assert 'drf_throttle_hits_total{scope="login"}' in render_metrics()
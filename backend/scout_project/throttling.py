@@ -0,0 +1,137 @@
+"""
+Rate limiting compartido entre workers
+Ventana deslizante exacta: cada request se registra con su timestamp y se
+cuentan los de los últimos `duration` segundos. Con THROTTLE_REDIS_URL (por
+defecto REDIS_URL) el registro vive en un sorted set de Redis y se actualiza
+con un script Lua atómico, por lo que 5/minute es 5/minute para todos los
+workers y contenedores. Sin Redis (desarrollo/tests) o si Redis falla se usa
+un registro local acotado en memoria.
+"""
+import threading
+import time
+import uuid
+from collections import deque
+
+from django.conf import settings
+from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
+
+from .metrics import Counter, REGISTRY
+
+
+THROTTLE_HITS = Counter(
+    'drf_throttle_hits_total',
+    'Requests rechazados por rate limiting',
+    ('scope',),
+)
+THROTTLE_BACKEND_ERRORS = Counter(
+    'drf_throttle_backend_errors_total',
+    'Errores del backend de rate limiting (se usa el registro local)',
+)
+REGISTRY.extend([THROTTLE_HITS, THROTTLE_BACKEND_ERRORS])
+
+SLIDING_WINDOW_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000000 + tonumber(t[2])
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], 0, now - window)
+if redis.call('ZCARD', KEYS[1]) < limit then
+    redis.call('ZADD', KEYS[1], now, ARGV[3])
+    redis.call('PEXPIRE', KEYS[1], math.ceil(window / 1000))
+    return {1, 0}
+end
+local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+return {0, tonumber(oldest[2]) + window - now}
+"""
+
+
+class LocalSlidingWindow:
+    """Registro en memoria por proceso; cada clave guarda a lo más `limit` timestamps"""
+    SWEEP_EVERY = 1000
+
+    def __init__(self):
+        self._hits = {}
+        self._lock = threading.Lock()
+        self._calls = 0
+
+    def hit(self, key, limit, duration):
+        now = time.monotonic()
+        with self._lock:
+            self._calls += 1
+            if self._calls % self.SWEEP_EVERY == 0:
+                self._sweep(now)
+            entry = self._hits.get(key)
+            if entry is None:
+                entry = self._hits[key] = (duration, deque(maxlen=limit))
+            history = entry[1]
+            while history and history[0] <= now - duration:
+                history.popleft()
+            if len(history) < limit:
+                history.append(now)
+                return True, 0
+            return False, history[0] + duration - now
+
+    def clear(self):
+        with self._lock:
+            self._hits.clear()
+
+    def _sweep(self, now):
+        # Elimina las claves sin requests dentro de su ventana
+        expired = [key for key, (duration, history) in self._hits.items() if not history or history[-1] <= now - duration]
+        for key in expired:
+            del self._hits[key]
+
+
+class RedisSlidingWindow:
+    def __init__(self, url, fallback):
+        import redis
+        self.errors = (redis.RedisError,)
+        self.client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        self.script = self.client.register_script(SLIDING_WINDOW_SCRIPT)
+        self.fallback = fallback
+
+    def hit(self, key, limit, duration):
+        try:
+            allowed, wait = self.script(keys=[f'throttle:{key}'], args=[limit, duration * 1000000, uuid.uuid4().hex])
+        except self.errors:
+            THROTTLE_BACKEND_ERRORS.inc()
+            return self.fallback.hit(key, limit, duration)
+        return bool(allowed), wait / 1000000
+
+
+_local = LocalSlidingWindow()
+_limiters = {}
+
+
+def get_limiter():
+    url = getattr(settings, 'THROTTLE_REDIS_URL', '')
+    if not url:
+        return _local
+    if url not in _limiters:
+        _limiters[url] = RedisSlidingWindow(url, _local)
+    return _limiters[url]
+
+
+class SlidingWindowThrottleMixin:
+    """Reemplaza el historial en caché de SimpleRateThrottle por el limitador compartido"""
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        allowed, self._wait = get_limiter().hit(self.key, self.num_requests, self.duration)
+        if not allowed:
+            THROTTLE_HITS.inc((self.scope,))
+        return allowed
+
+    def wait(self):
+        return getattr(self, '_wait', None)
+
+
+class SlidingWindowAnonRateThrottle(SlidingWindowThrottleMixin, AnonRateThrottle):
+    pass
+
+
+class SlidingWindowUserRateThrottle(SlidingWindowThrottleMixin, UserRateThrottle):
+    pass
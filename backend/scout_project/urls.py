@@ -19,6 +19,7 @@ from django.urls import path, include, re_path
 from rest_framework import permissions
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
+from scout_project.metrics import metrics_view
 
 # Configuración de Swagger/OpenAPI
 schema_view = get_schema_view(
@@ -43,6 +44,9 @@ urlpatterns = [
     path('api/redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
     re_path(r'^swagger(?P<format>\.json|\.yaml)$', schema_view.without_ui(cache_timeout=0), name='schema-json'),
     
+    # Monitoring
+    path("api/metrics/", metrics_view, name="metrics"),
+    
     # Authentication
     path("api/auth/", include("usuarios.auth_urls")),
     
@@ -53,4 +57,6 @@ urlpatterns = [
     path("api/proveedores/", include("proveedores.urls")),
     path("api/pagos/", include("pagos.urls")),
     path("api/geografia/", include("geografia.urls")),
+    path("api/preinscripcion/", include("preinscripcion.urls")),
+    path("api/archivos/", include("archivos.urls")),
 ]
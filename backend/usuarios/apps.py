@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class UsersConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "usuarios"
+
+    def ready(self):
+        from . import login, permisos  # noqa: F401
@@ -1,7 +1,7 @@
 from django.urls import path
-from rest_framework_simplejwt.views import TokenRefreshView
 from .auth_views import (
     CustomTokenObtainPairView,
+    PermisosTokenRefreshView,
     login_view,
     logout_view,
     me_view,
@@ -17,5 +17,5 @@ urlpatterns = [
     
     # JWT Token endpoints
     path('token/', CustomTokenObtainPairView.as_view(), name='token_obtain_pair'),
-    path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('token/refresh/', PermisosTokenRefreshView.as_view(), name='token_refresh'),
 ]
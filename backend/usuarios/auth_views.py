@@ -2,11 +2,14 @@ from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
-from django.contrib.auth.hashers import check_password
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from usuarios.login import autenticar
 from usuarios.models import Usuario
+from usuarios.permisos import agregar_claims
 from usuarios.throttles import LoginRateThrottle
 import re
 
@@ -45,40 +48,32 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         if not validate_email(email):
             raise Exception('Formato de email inválido')
 
-        try:
-            # Buscar usuario por email
-            usuario = Usuario.objects.select_related('pel_id').get(
-                usu_email=email,
-                usu_vigente=True
-            )
+        # Buscar usuario y verificar password (con caché negativa de emails inexistentes)
+        usuario = autenticar(email, password)
+        if usuario is None:
+            raise Exception('Credenciales inválidas')
 
-            # Verificar password usando check_password de Django
-            if not usuario.check_password(password):
-                raise Exception('Credenciales inválidas')
-
-            # Generar tokens
-            refresh = RefreshToken.for_user(usuario)
-            
-            # Agregar claims personalizados
-            refresh['email'] = usuario.usu_email
-            refresh['username'] = usuario.usu_username
-            refresh['perfil'] = usuario.pel_id.pel_descripcion if usuario.pel_id else None
-            refresh['user_id'] = usuario.usu_id
-
-            return {
-                'refresh': str(refresh),
-                'access': str(refresh.access_token),
-                'user': {
-                    'id': usuario.usu_id,
-                    'username': usuario.usu_username,
-                    'email': usuario.usu_email,
-                    'perfil': usuario.pel_id.pel_descripcion if usuario.pel_id else None,
-                    'foto': usuario.usu_ruta_foto,
-                }
-            }
+        # Generar tokens
+        refresh = RefreshToken.for_user(usuario)
 
-        except Usuario.DoesNotExist:
-            raise Exception('Credenciales inválidas')
+        # Agregar claims personalizados
+        refresh['email'] = usuario.usu_email
+        refresh['username'] = usuario.usu_username
+        refresh['perfil'] = usuario.pel_id.pel_descripcion if usuario.pel_id else None
+        refresh['user_id'] = usuario.usu_id
+        agregar_claims(refresh, usuario)
+
+        return {
+            'refresh': str(refresh),
+            'access': str(refresh.access_token),
+            'user': {
+                'id': usuario.usu_id,
+                'username': usuario.usu_username,
+                'email': usuario.usu_email,
+                'perfil': usuario.pel_id.pel_descripcion if usuario.pel_id else None,
+                'foto': usuario.usu_ruta_foto,
+            }
+        }
 
 
 class CustomTokenObtainPairView(TokenObtainPairView):
@@ -90,6 +85,39 @@ class CustomTokenObtainPairView(TokenObtainPairView):
     throttle_classes = [LoginRateThrottle]
 
 
+class PermisosTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Refresco con Usuario (el serializer base busca en auth.User). Recalcula
+    los permisos del token, para que un cambio de PerfilAplicacion no obligue
+    a iniciar sesión nuevamente.
+    """
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        usuario = Usuario.objects.filter(usu_id=refresh.payload.get('user_id'), usu_vigente=True).first()
+        if usuario is None:
+            raise AuthenticationFailed(self.error_messages['no_active_account'], 'no_active_account')
+        agregar_claims(refresh, usuario)
+
+        data = {'access': str(refresh.access_token)}
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                try:
+                    refresh.blacklist()
+                except AttributeError:
+                    # La app token_blacklist no está instalada
+                    pass
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            refresh.outstand()
+            data['refresh'] = str(refresh)
+        return data
+
+
+class PermisosTokenRefreshView(TokenRefreshView):
+    serializer_class = PermisosTokenRefreshSerializer
+
+
 @api_view(['POST'])
 @permission_classes([AllowAny])
 @throttle_classes([LoginRateThrottle])
@@ -123,21 +151,16 @@ def login_view(request):
         )
 
     try:
-        # Buscar usuario
-        usuario = Usuario.objects.select_related('pel_id').get(
-            usu_email=email,
-            usu_vigente=True
-        )
-
-        # Verificar password usando check_password de Django
-        if not usuario.check_password(password):
+        # Buscar usuario y verificar password (con caché negativa de emails inexistentes)
+        usuario = autenticar(email, password)
+        if usuario is None:
             return Response(
                 {'error': 'Credenciales inválidas'},
                 status=status.HTTP_401_UNAUTHORIZED
             )
 
-        # Generar tokens JWT
-        refresh = RefreshToken.for_user(usuario)
+        # Generar tokens JWT (con el bitmap de permisos del perfil)
+        refresh = agregar_claims(RefreshToken.for_user(usuario), usuario)
         
         return Response({
             'success': True,
@@ -152,11 +175,6 @@ def login_view(request):
             }
         })
 
-    except Usuario.DoesNotExist:
-        return Response(
-            {'error': 'Credenciales inválidas'},
-            status=status.HTTP_401_UNAUTHORIZED
-        )
     except Exception as e:
         return Response(
             {'error': 'Error al procesar la solicitud'},
@@ -196,7 +214,8 @@ def me_view(request):
     GET /api/auth/me
     """
     try:
-        usuario = request.user
+        # request.user es un TokenUser (sin consulta); aquí se necesitan los datos vigentes
+        usuario = Usuario.objects.select_related('pel_id').get(usu_id=request.user.id)
         return Response({
             'id': usuario.usu_id,
             'username': usuario.usu_username,
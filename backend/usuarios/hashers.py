@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.contrib.auth.hashers import ScryptPasswordHasher
+
+
+class ConfigurableScryptPasswordHasher(ScryptPasswordHasher):
+    """
+    scrypt con costo configurable (PASSWORD_SCRYPT_WORK_FACTOR / _PARALLELISM).
+    Usa el mismo algoritmo 'scrypt': al cambiar los parámetros, los hashes
+    existentes se actualizan en el siguiente login (must_update).
+    """
+    @property
+    def work_factor(self):
+        return settings.PASSWORD_SCRYPT_WORK_FACTOR
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_SCRYPT_PARALLELISM
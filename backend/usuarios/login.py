@@ -0,0 +1,44 @@
+"""
+Ruta crítica del login
+autenticar() concentra la búsqueda del usuario y la verificación del password
+para login_view y CustomTokenObtainPairSerializer. Los emails inexistentes se
+recuerdan unos segundos en caché para no repetir la consulta durante los picos
+de apertura de inscripciones; el LoginRateThrottle se aplica antes igual.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import Usuario
+
+LOGIN_FIELDS = ['usu_id', 'pel_id', 'usu_username', 'usu_email', 'usu_password', 'usu_ruta_foto', 'usu_vigente',
+                'pel_id__pel_descripcion']
+
+
+def _negative_key(email):
+    return 'login:desconocido:' + hashlib.sha256(email.encode()).hexdigest()
+
+
+def autenticar(email, password):
+    """Retorna el Usuario vigente si las credenciales son válidas, si no None"""
+    key = _negative_key(email)
+    if cache.get(key):
+        return None
+    usuario = Usuario.objects.select_related('pel_id').only(*LOGIN_FIELDS).filter(
+        usu_email=email, usu_vigente=True
+    ).first()
+    if usuario is None:
+        cache.set(key, True, settings.LOGIN_NEGATIVE_CACHE_TIMEOUT)
+        return None
+    if not usuario.check_password(password):
+        return None
+    return usuario
+
+
+@receiver(post_save, sender=Usuario, dispatch_uid='login_negative_cache')
+def olvidar_email_desconocido(sender, instance, **kwargs):
+    """Un usuario creado o reactivado puede ingresar de inmediato"""
+    cache.delete(_negative_key(instance.usu_email))
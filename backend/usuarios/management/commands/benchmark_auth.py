@@ -0,0 +1,93 @@
+"""
+Management command to benchmark the login hot path
+Usage: python manage.py benchmark_auth [--iterations 20]
+
+Mide, sin pasar por el throttle: el costo de verificación de cada hasher
+configurable, el login completo (consulta + check_password + emisión de JWT)
+con el hasher preferido y con un hash PBKDF2 heredado (incluye el re-hash),
+y el rechazo de emails inexistentes con y sin la caché negativa.
+"""
+
+import statistics
+import time
+
+from django.contrib.auth.hashers import check_password, get_hasher, make_password
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from maestros.models import Perfil
+from usuarios.login import autenticar, _negative_key
+from usuarios.models import Usuario
+
+BENCHMARK_EMAIL = 'benchmark-auth@bench.gic'
+BENCHMARK_PASSWORD = 'Benchmark123!'
+HASHERS = ['pbkdf2_sha256', 'scrypt', 'argon2']
+
+
+class Command(BaseCommand):
+    help = 'Benchmark password hashers and the login path (lookup, verification, token issue)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20, help='Executions per scenario')
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        results = []
+
+        for algorithm in HASHERS:
+            try:
+                encoded = make_password(BENCHMARK_PASSWORD, hasher=algorithm)
+            except (ValueError, ImportError) as exc:
+                self.stdout.write(self.style.WARNING(f'{algorithm}: not available ({exc})'))
+                continue
+            results.append((f'check_password {algorithm}',
+                            self.measure(lambda: check_password(BENCHMARK_PASSWORD, encoded), iterations)))
+
+        usuario = self._usuario()
+        preferred = get_hasher().algorithm
+        results.append((f'login ({preferred})', self.measure(self.login, iterations)))
+
+        legacy = make_password(BENCHMARK_PASSWORD, hasher='pbkdf2_sha256')
+
+        def login_legacy():
+            Usuario.objects.filter(pk=usuario.pk).update(usu_password=legacy)
+            self.login()
+        results.append(('login (pbkdf2 -> rehash)', self.measure(login_legacy, iterations)))
+
+        unknown = 'desconocido@bench.gic'
+
+        def unknown_uncached():
+            cache.delete(_negative_key(unknown))
+            autenticar(unknown, BENCHMARK_PASSWORD)
+        results.append(('unknown email (no cache)', self.measure(unknown_uncached, iterations)))
+        results.append(('unknown email (negative cache)',
+                        self.measure(lambda: autenticar(unknown, BENCHMARK_PASSWORD), iterations)))
+
+        self.stdout.write(self.style.SUCCESS('=' * 60))
+        self.stdout.write(self.style.SUCCESS(f'Login benchmark ({iterations} iterations, preferred hasher: {preferred})'))
+        self.stdout.write(self.style.SUCCESS('=' * 60))
+        for name, (mean, p95) in results:
+            self.stdout.write(f'{name:<36} mean {mean:8.3f} ms   p95 {p95:8.3f} ms')
+
+    def login(self):
+        usuario = autenticar(BENCHMARK_EMAIL, BENCHMARK_PASSWORD)
+        return str(RefreshToken.for_user(usuario).access_token)
+
+    def measure(self, func, iterations):
+        timings = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        return statistics.mean(timings), timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+
+    def _usuario(self):
+        perfil, _ = Perfil.objects.get_or_create(pel_descripcion='Benchmark', defaults={'pel_vigente': True})
+        usuario, _ = Usuario.objects.get_or_create(
+            usu_email=BENCHMARK_EMAIL, defaults={'pel_id': perfil, 'usu_username': 'benchmark-auth'}
+        )
+        usuario.set_password(BENCHMARK_PASSWORD)
+        usuario.save()
+        return usuario
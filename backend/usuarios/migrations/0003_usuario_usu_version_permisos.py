@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 11:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('usuarios', '0002_password_hashing_security'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='usuario',
+            name='usu_version_permisos',
+            field=models.BigIntegerField(default=0),
+        ),
+    ]
@@ -16,6 +16,8 @@ class Usuario(models.Model):
     usu_ruta_foto = models.CharField(max_length=255, blank=True, null=True)
     # usu_vigente: Indica si el usuario está activo (True) o inactivo (False)
     usu_vigente = models.BooleanField(default=True)
+    # usu_version_permisos: Versión de los claims del usuario en el JWT; cambia al guardarlo (usuarios/permisos.py)
+    usu_version_permisos = models.BigIntegerField(default=0)
 
     class Meta:
         db_table = 'usuario' # Nombre de la tabla en la base de datos
@@ -30,8 +32,15 @@ class Usuario(models.Model):
         self.usu_password = make_password(raw_password)
 
     def check_password(self, raw_password):
-        """Check if the provided password is correct"""
-        return check_password(raw_password, self.usu_password)
+        """
+        Check if the provided password is correct.
+        If the stored hash uses an outdated algorithm/cost it is upgraded
+        to the preferred PASSWORD_HASHERS entry.
+        """
+        def setter(raw_password):
+            self.set_password(raw_password)
+            Usuario.objects.filter(pk=self.pk).update(usu_password=self.usu_password)
+        return check_password(raw_password, self.usu_password, setter)
 
 
 from maestros.models import Perfil, Aplicacion
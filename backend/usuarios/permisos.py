@@ -0,0 +1,217 @@
+"""
+Permisos por aplicación embebidos en el JWT
+Al emitir el token se agrega el claim `perms`: un string hexadecimal donde el
+carácter en la posición apl_id es la máscara de 4 bits de PerfilAplicacion
+(consultar=1, ingresar=2, modificar=4, eliminar=8). PermisoAplicacion lo lee
+sin consultar la base de datos.
+
+Los claims `pv`/`uv` guardan la versión de permisos del perfil y del usuario
+al emitir el token (Perfil.pel_version_permisos, Usuario.usu_version_permisos).
+Cambiar un PerfilAplicacion, el Perfil o el Usuario escribe una versión nueva
+en la base y PermisosJWTAuthentication rechaza los tokens anteriores (el
+usuario debe refrescar o volver a iniciar sesión). Las versiones se leen de la
+caché por PERMISOS_CACHE_TIMEOUT segundos: perder la caché solo cuesta una
+consulta, y con una caché por proceso (LocMem) los demás workers ven el cambio
+a más tardar al expirar esa entrada.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.utils.translation import gettext_lazy as _
+from rest_framework import serializers
+from rest_framework.permissions import BasePermission
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from maestros.models import Aplicacion, Perfil
+from .models import Usuario, PerfilAplicacion
+
+CONSULTAR = 1
+INGRESAR = 2
+MODIFICAR = 4
+ELIMINAR = 8
+
+PERMISO_POR_CAMPO = {
+    'pea_consultar': CONSULTAR,
+    'pea_ingresar': INGRESAR,
+    'pea_modificar': MODIFICAR,
+    'pea_eliminar': ELIMINAR,
+}
+
+PERMISO_POR_METODO = {
+    'GET': CONSULTAR,
+    'HEAD': CONSULTAR,
+    'OPTIONS': CONSULTAR,
+    'POST': INGRESAR,
+    'PUT': MODIFICAR,
+    'PATCH': MODIFICAR,
+    'DELETE': ELIMINAR,
+}
+
+
+def _perfil_key(pel_id):
+    return f'permisos:perfil:{pel_id}'
+
+
+def _usuario_key(usu_id):
+    return f'permisos:usuario:{usu_id}'
+
+
+# Versión para perfiles o usuarios eliminados: no coincide con ningún token
+SIN_VERSION = -1
+
+
+def _versiones(pel_id, usu_id):
+    """(versión del perfil, versión del usuario) desde la caché; las que faltan se leen de la base"""
+    keys = [_perfil_key(pel_id), _usuario_key(usu_id)]
+    versiones = cache.get_many(keys)
+    if len(versiones) < len(keys):
+        faltantes = {}
+        if keys[0] not in versiones:
+            faltantes[keys[0]] = Perfil.objects.filter(pk=pel_id).values_list('pel_version_permisos', flat=True).first()
+        if keys[1] not in versiones:
+            faltantes[keys[1]] = Usuario.objects.filter(pk=usu_id).values_list('usu_version_permisos', flat=True).first()
+        faltantes = {key: SIN_VERSION if version is None else version for key, version in faltantes.items()}
+        cache.set_many(faltantes, settings.PERMISOS_CACHE_TIMEOUT)
+        versiones.update(faltantes)
+    return versiones[keys[0]], versiones[keys[1]]
+
+
+def _bump(model, campo, pk, key):
+    """Escribe una versión nueva en la base y descarta la cacheada"""
+    # Marca de tiempo en vez de contador: un save() con una instancia desactualizada
+    # vuelve a escribir una versión nueva, nunca una ya emitida en algún token
+    version = time.time_ns()
+    model.objects.filter(pk=pk).update(**{campo: version})
+    cache.delete(key)
+    # Una lectura concurrente pudo volver a cachear la versión anterior antes del commit
+    transaction.on_commit(lambda: cache.delete(key))
+    return version
+
+
+def bitmap_perfil(pel_id):
+    """Máscaras de PerfilAplicacion codificadas como un carácter hex por apl_id"""
+    mascaras = {}
+    for fila in PerfilAplicacion.objects.filter(pel_id=pel_id, apl_id__apl_vigente=True).values(
+        'apl_id', *PERMISO_POR_CAMPO
+    ):
+        mascaras[fila['apl_id']] = sum(bit for campo, bit in PERMISO_POR_CAMPO.items() if fila[campo])
+    if not mascaras:
+        return ''
+    return ''.join(format(mascaras.get(apl_id, 0), 'x') for apl_id in range(max(mascaras) + 1))
+
+
+def tiene_permiso(bitmap, apl_id, permiso):
+    if not bitmap or apl_id >= len(bitmap):
+        return False
+    return bool(int(bitmap[apl_id], 16) & permiso)
+
+
+def agregar_claims(token, usuario):
+    """Agrega al token (refresh o access) el bitmap de permisos y sus versiones"""
+    token['pel'] = usuario.pel_id_id
+    token['perms'] = bitmap_perfil(usuario.pel_id_id)
+    token['pv'], token['uv'] = _versiones(usuario.pel_id_id, usuario.usu_id)
+    return token
+
+
+def claims_vigentes(token):
+    """Compara las versiones del token con las vigentes (una lectura de caché)"""
+    if 'pv' not in token:
+        return True
+    return _versiones(token['pel'], token['user_id']) == (token['pv'], token['uv'])
+
+
+def usuario_id(request):
+    """usu_id del Usuario autenticado con JWT, o None (sesión de Django, sin Usuario)"""
+    token = request.auth
+    if token is None or not hasattr(token, 'get') or token.get(jwt_settings.USER_ID_CLAIM) is None:
+        return None
+    # El claim viaja como texto; se devuelve con el tipo de la pk
+    return Usuario._meta.pk.to_python(token.get(jwt_settings.USER_ID_CLAIM))
+
+
+class UsuarioActualDefault:
+    """
+    Default de HiddenField con el Usuario del token: el autor de un registro
+    no se acepta desde el cuerpo del request.
+    """
+    requires_context = True
+
+    def __call__(self, serializer_field):
+        usu_id = usuario_id(serializer_field.context['request'])
+        if usu_id is None:
+            raise serializers.ValidationError('Se requiere iniciar sesión con un usuario del sistema.')
+        return Usuario(usu_id=usu_id)
+
+
+def otorgar_todos_los_permisos(perfil):
+    """Permisos completos del perfil sobre las aplicaciones de settings.APLICACIONES (datos de prueba y carga)"""
+    for apl_id in settings.APLICACIONES.values():
+        aplicacion, _ = Aplicacion.objects.get_or_create(apl_id=apl_id, defaults={
+            'apl_descripcion': f'Aplicación {apl_id}', 'apl_vigente': True})
+        PerfilAplicacion.objects.update_or_create(pel_id=perfil, apl_id=aplicacion, defaults={
+            'pea_consultar': True, 'pea_ingresar': True, 'pea_modificar': True, 'pea_eliminar': True})
+
+
+class PermisosJWTAuthentication(JWTStatelessUserAuthentication):
+    """
+    Autenticación JWT sin consulta a la base de datos: request.user es un
+    TokenUser respaldado por los claims. Rechaza tokens con permisos obsoletos.
+    """
+    def get_validated_token(self, raw_token):
+        token = super().get_validated_token(raw_token)
+        if not claims_vigentes(token):
+            raise InvalidToken(_('Los permisos del usuario cambiaron; inicie sesión nuevamente.'))
+        return token
+
+
+def tiene_permiso_en(request, aplicacion, permiso):
+    """
+    Permiso del usuario del request sobre `aplicacion` (apl_id o clave de
+    settings.APLICACIONES). Las sesiones de Django solo lo tienen si son staff.
+    """
+    token = request.auth
+    if token is None or not hasattr(token, 'get'):
+        return bool(request.user and request.user.is_staff)
+    if isinstance(aplicacion, str):
+        aplicacion = settings.APLICACIONES[aplicacion]
+    return tiene_permiso(token.get('perms'), aplicacion, permiso)
+
+
+class PermisoAplicacion(BasePermission):
+    """
+    Exige el permiso de PerfilAplicacion que corresponde al método HTTP sobre
+    la aplicación `aplicacion` declarada en la vista: un apl_id o una clave de
+    settings.APLICACIONES. Las sesiones de Django (admin) no traen bitmap y
+    solo pasan si el usuario es staff.
+    """
+    message = 'No tiene permiso para esta operación en la aplicación.'
+
+    def has_permission(self, request, view):
+        permiso = PERMISO_POR_METODO.get(request.method)
+        return permiso is not None and tiene_permiso_en(request, view.aplicacion, permiso)
+
+
+@receiver(post_save, sender=PerfilAplicacion, dispatch_uid='permisos_perfil_aplicacion_save')
+@receiver(post_delete, sender=PerfilAplicacion, dispatch_uid='permisos_perfil_aplicacion_delete')
+def perfil_aplicacion_cambiado(sender, instance, **kwargs):
+    _bump(Perfil, 'pel_version_permisos', instance.pel_id_id, _perfil_key(instance.pel_id_id))
+
+
+@receiver(post_save, sender=Perfil, dispatch_uid='permisos_perfil_save')
+@receiver(post_delete, sender=Perfil, dispatch_uid='permisos_perfil_delete')
+def perfil_cambiado(sender, instance, **kwargs):
+    instance.pel_version_permisos = _bump(Perfil, 'pel_version_permisos', instance.pel_id, _perfil_key(instance.pel_id))
+
+
+@receiver(post_save, sender=Usuario, dispatch_uid='permisos_usuario_save')
+@receiver(post_delete, sender=Usuario, dispatch_uid='permisos_usuario_delete')
+def usuario_cambiado(sender, instance, **kwargs):
+    # Cubre cambio de perfil y desactivación (usu_vigente)
+    instance.usu_version_permisos = _bump(Usuario, 'usu_version_permisos', instance.usu_id, _usuario_key(instance.usu_id))
@@ -1,9 +1,11 @@
 from rest_framework import serializers
+from scout_project.fieldsets import DynamicFieldsMixin, expandable
 from .models import Usuario, PerfilAplicacion
 from maestros.models import Perfil, Aplicacion
 
 
-class UsuarioSerializer(serializers.ModelSerializer):
+@expandable
+class UsuarioSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     password = serializers.CharField(
         write_only=True,
         required=False,
@@ -39,19 +41,21 @@ class UsuarioSerializer(serializers.ModelSerializer):
         return instance
 
 
-class PerfilSerializer(serializers.ModelSerializer):
+@expandable
+class PerfilSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Perfil
         fields = '__all__'
 
 
-class AplicacionSerializer(serializers.ModelSerializer):
+@expandable
+class AplicacionSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Aplicacion
         fields = '__all__'
 
 
-class PerfilAplicacionSerializer(serializers.ModelSerializer):
+class PerfilAplicacionSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = PerfilAplicacion
         fields = '__all__'
\ No newline at end of file
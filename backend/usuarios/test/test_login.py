@@ -0,0 +1,98 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth.hashers import make_password
+
+from usuarios.login import autenticar
+from usuarios.models import Usuario
+
+PASSWORD = 'Secreta123!'
+
+
+@pytest.fixture
+def usuario_login(usuario):
+    usuario.set_password(PASSWORD)
+    usuario.save()
+    return usuario
+
+
+def _login(client, email, password=PASSWORD):
+    return client.post('/api/auth/login/', {'email': email, 'password': password}, format='json')
+
+
+@pytest.mark.django_db
+def test_login_exitoso_usa_hasher_preferido(api_client, usuario_login):
+    response = _login(api_client, usuario_login.usu_email)
+
+    assert response.status_code == 200
+    assert response.json()['accessToken']
+    assert usuario_login.usu_password.startswith('scrypt$')
+
+
+@pytest.mark.django_db
+def test_login_rehashea_hash_heredado(api_client, usuario):
+    Usuario.objects.filter(pk=usuario.pk).update(usu_password=make_password(PASSWORD, hasher='pbkdf2_sha256'))
+
+    assert _login(api_client, usuario.usu_email).status_code == 200
+
+    usuario.refresh_from_db()
+    assert usuario.usu_password.startswith('scrypt$')
+    assert usuario.check_password(PASSWORD)
+
+
+@pytest.mark.django_db
+def test_password_incorrecto_no_rehashea(api_client, usuario):
+    legacy = make_password(PASSWORD, hasher='pbkdf2_sha256')
+    Usuario.objects.filter(pk=usuario.pk).update(usu_password=legacy)
+
+    assert _login(api_client, usuario.usu_email, 'Incorrecta123').status_code == 401
+
+    usuario.refresh_from_db()
+    assert usuario.usu_password == legacy
+
+
+@pytest.mark.django_db
+def test_email_desconocido_se_recuerda_hasta_crear_el_usuario(api_client, usuario):
+    email = 'nuevo@test.com'
+    assert autenticar(email, PASSWORD) is None
+
+    with CaptureQueriesContext(connection) as queries:
+        assert autenticar(email, PASSWORD) is None
+    assert len(queries) == 0
+
+    nuevo = Usuario(pel_id=usuario.pel_id, usu_username='nuevo', usu_email=email)
+    nuevo.set_password(PASSWORD)
+    nuevo.save()
+    assert autenticar(email, PASSWORD) == nuevo
+
+
+@pytest.mark.django_db
+def test_throttle_de_login_se_mantiene_con_cache_negativa(api_client, usuario):
+    codes = [_login(api_client, 'desconocido@test.com').status_code for _ in range(6)]
+
+    assert codes == [401] * 5 + [429]
+
+
+@pytest.mark.django_db
+def test_benchmark_auth(usuario):
+    out = StringIO()
+
+    call_command('benchmark_auth', '--iterations', '2', stdout=out)
+
+    output = out.getvalue()
+    assert 'check_password scrypt' in output
+    assert 'login (pbkdf2 -> rehash)' in output
+    assert 'unknown email (negative cache)' in output
+
+
+@pytest.mark.django_db
+def test_cambio_de_costo_scrypt_rehashea(api_client, usuario_login, settings):
+    settings.PASSWORD_SCRYPT_WORK_FACTOR = 2 ** 12
+
+    assert _login(api_client, usuario_login.usu_email).status_code == 200
+
+    usuario_login.refresh_from_db()
+    assert usuario_login.usu_password.startswith('scrypt$4096$')
@@ -0,0 +1,140 @@
+import pytest
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+
+from maestros.models import Aplicacion
+from usuarios.models import PerfilAplicacion
+from usuarios.permisos import PermisoAplicacion, bitmap_perfil, tiene_permiso, CONSULTAR, INGRESAR, ELIMINAR
+
+PASSWORD = 'Secreta123!'
+
+
+class PersonasView(APIView):
+    permission_classes = [PermisoAplicacion]
+    aplicacion = None
+
+    def get(self, request):
+        return Response({'ok': True})
+
+    def post(self, request):
+        return Response({'ok': True})
+
+
+@pytest.fixture
+def aplicacion(db):
+    return Aplicacion.objects.create(apl_descripcion='Personas', apl_vigente=True)
+
+
+@pytest.fixture
+def perfil_aplicacion(usuario, aplicacion):
+    usuario.set_password(PASSWORD)
+    usuario.save()
+    return PerfilAplicacion.objects.create(pel_id=usuario.pel_id, apl_id=aplicacion, pea_consultar=True,
+                                           pea_ingresar=False, pea_modificar=False, pea_eliminar=False)
+
+
+def _tokens(client, usuario):
+    data = client.post('/api/auth/login/', {'email': usuario.usu_email, 'password': PASSWORD}, format='json').json()
+    return data['accessToken'], data['refreshToken']
+
+
+def _llamar(metodo, access, aplicacion):
+    request = getattr(APIRequestFactory(), metodo)('/', HTTP_AUTHORIZATION=f'Bearer {access}')
+    return PersonasView.as_view(aplicacion=aplicacion.apl_id)(request)
+
+
+@pytest.mark.django_db
+def test_bitmap_codifica_un_nibble_por_aplicacion(usuario, perfil_aplicacion, aplicacion):
+    otra = Aplicacion.objects.create(apl_descripcion='Pagos', apl_vigente=True)
+    PerfilAplicacion.objects.create(pel_id=usuario.pel_id, apl_id=otra, pea_consultar=True,
+                                    pea_ingresar=True, pea_modificar=False, pea_eliminar=True)
+
+    bitmap = bitmap_perfil(usuario.pel_id_id)
+
+    assert len(bitmap) == otra.apl_id + 1
+    assert tiene_permiso(bitmap, aplicacion.apl_id, CONSULTAR)
+    assert not tiene_permiso(bitmap, aplicacion.apl_id, INGRESAR)
+    assert tiene_permiso(bitmap, otra.apl_id, ELIMINAR)
+    assert not tiene_permiso(bitmap, otra.apl_id + 5, CONSULTAR)
+
+
+@pytest.mark.django_db
+def test_permiso_se_verifica_sin_consultas(api_client, usuario, perfil_aplicacion, aplicacion):
+    access, _ = _tokens(api_client, usuario)
+
+    with CaptureQueriesContext(connection) as queries:
+        assert _llamar('get', access, aplicacion).status_code == 200
+        assert _llamar('post', access, aplicacion).status_code == 403
+    assert len(queries) == 0
+
+
+@pytest.mark.django_db
+def test_cambio_de_permisos_invalida_token_y_refresh_lo_actualiza(api_client, usuario, perfil_aplicacion, aplicacion):
+    access, refresh = _tokens(api_client, usuario)
+
+    perfil_aplicacion.pea_ingresar = True
+    perfil_aplicacion.save()
+
+    assert _llamar('get', access, aplicacion).status_code == 401
+    response = api_client.post('/api/auth/token/refresh/', {'refresh': refresh}, format='json')
+    assert response.status_code == 200
+    assert _llamar('post', response.json()['access'], aplicacion).status_code == 200
+
+
+@pytest.mark.django_db
+def test_desactivar_usuario_invalida_token(api_client, usuario, perfil_aplicacion, aplicacion):
+    access, refresh = _tokens(api_client, usuario)
+
+    usuario.usu_vigente = False
+    usuario.save()
+
+    assert _llamar('get', access, aplicacion).status_code == 401
+    assert api_client.post('/api/auth/token/refresh/', {'refresh': refresh}, format='json').status_code == 401
+
+
+@pytest.mark.django_db
+def test_versiones_persisten_sin_cache(api_client, usuario, perfil_aplicacion, aplicacion):
+    access, _ = _tokens(api_client, usuario)
+
+    # Perder la caché (eviction, otro worker) no invalida los tokens vigentes
+    cache.clear()
+    with CaptureQueriesContext(connection) as queries:
+        assert _llamar('get', access, aplicacion).status_code == 200
+    assert len(queries) == 2
+    assert _llamar('get', access, aplicacion).status_code == 200
+
+    usuario.usu_email = 'otro@test.com'
+    usuario.save()
+    cache.clear()
+    assert _llamar('get', access, aplicacion).status_code == 401
+
+
+@pytest.mark.django_db
+def test_viewsets_exigen_permiso_de_la_aplicacion(settings, api_client, usuario, perfil_aplicacion, aplicacion):
+    settings.APLICACIONES = {**settings.APLICACIONES, 'personas': aplicacion.apl_id}
+    access, _ = _tokens(api_client, usuario)
+    api_client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+
+    assert api_client.get('/api/personas/personas/').status_code == 200
+    assert api_client.post('/api/personas/personas/', {}, format='json').status_code == 403
+    assert api_client.get('/api/pagos/pagopersonas/').status_code == 403
+
+    api_client.credentials()
+    api_client.force_authenticate(user=User(username='sin_staff'))
+    assert api_client.get('/api/personas/personas/').status_code == 403
+
+
+@pytest.mark.django_db
+def test_me_con_token(api_client, usuario, perfil_aplicacion):
+    access, _ = _tokens(api_client, usuario)
+    api_client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+
+    response = api_client.get('/api/auth/me/')
+
+    assert response.status_code == 200
+    assert response.json()['email'] == usuario.usu_email
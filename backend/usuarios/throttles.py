@@ -1,9 +1,10 @@
-from rest_framework.throttling import AnonRateThrottle
+from scout_project.throttling import SlidingWindowAnonRateThrottle
 
-class LoginRateThrottle(AnonRateThrottle):
+class LoginRateThrottle(SlidingWindowAnonRateThrottle):
     """
     Límite de rate para intentos de login
     Permite máximo 5 intentos por minuto para prevenir ataques de fuerza bruta
+    (ventana deslizante compartida entre workers vía Redis)
     """
     scope = 'login'
     rate = '5/minute'
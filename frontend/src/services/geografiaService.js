@@ -12,6 +12,17 @@ export const getRegiones = async () => {
   }
 };
 
+// Regiones → provincias → comunas vigentes en una sola respuesta (con ETag)
+export const getArbolGeografico = async () => {
+  try {
+    const response = await api.get(`${API_URL}/arbol/`);
+    return response.data;
+  } catch (error) {
+    console.error('Error fetching arbol geografico:', error);
+    throw error;
+  }
+};
+
 export const getProvincias = async () => {
   try {
     const response = await api.get(`${API_URL}/provincias/`);